@@ -12,64 +12,61 @@ import pandas as pd
 import numpy as np
 import datetime as dt
 import pandasql as ps
-import statsmodels.api as sm
 from linearmodels import PanelOLS
 from datetime import timedelta
 import seaborn as sns
 import matplotlib.pyplot as plt
 import re
+import sys
+import os
 
 # Directories
 data_directory = "/raw data/"
 output_directory = "/cleaned files/"
+code_directory = "/code/1_combine_data/"
 
+# Intermediate daily files (ds_dsf_*) are saved as parquet in output_directory;
+# set to True to also save csv copies (the final panel files are always csv for Stata)
+checkpoint_csv = False
 
-''' Read in WRDS-Datastream Daily Stock File '''
-# This contains daily stock information for different samples
-
-# Media coverage sample
-ds_dsf_mediaCoverage = pd.read_csv(data_directory+"tr_ds_equities_media_v3.csv")
-ds_dsf_mediaCoverage = ds_dsf_mediaCoverage.sort_values(by=['ISIN','MarketDate'])
-
-ds_dsf_mediaCoverage['MarketDate'] = pd.to_datetime(ds_dsf_mediaCoverage['MarketDate'])
-
-# CSR report sample
-ds_dsf_csrReport = pd.read_csv(data_directory+"tr_ds_equities_csrReport_v2.csv")
-ds_dsf_csrReport = ds_dsf_csrReport.sort_values(by=['ISIN','MarketDate'])
-
-ds_dsf_csrReport['MarketDate'] = pd.to_datetime(ds_dsf_csrReport['MarketDate'])
-
-# All CDP 2020 target sample
-all_2020_targets_all_years = pd.read_stata(output_directory+"all_2020_targets_all_years.dta")
-isin_list = pd.DataFrame(all_2020_targets_all_years['isin'].unique())
-isin_list.to_csv(data_directory+"all_cdp_isin_list.txt",header=None, index=None)
-
-ds_dsf_CDPrelease = pd.read_csv(data_directory+"tr_ds_equities_allCDP.csv")
-ds_dsf_CDPrelease = ds_dsf_CDPrelease.sort_values(by=['ISIN','MarketDate'])
+# Local copy of the WRDS World Indices returns; set wrds_offline = True to run without WRDS
+windices_cache = output_directory+"windices_dwcountryreturns.parquet"
+wrds_offline = False
 
-ds_dsf_CDPrelease['MarketDate'] = pd.to_datetime(ds_dsf_CDPrelease['MarketDate'])
+# Trading calendar for BDaysRelativeToEvent: 'weekdays' counts Monday-Friday (as np.busday_count),
+# 'observed' counts the trading dates observed in the daily files for each region (exchange holidays excluded)
+bdays_calendar = 'weekdays'
 
-# 2019 CDP release sample (contains target outcomes by 2018)
-ds_dsf_CDPrelease19 = pd.read_csv(data_directory+"tr_ds_equities_allCDP.csv")
-ds_dsf_CDPrelease19 = ds_dsf_CDPrelease19.sort_values(by=['ISIN','MarketDate'])
+# Store returns and volume of the daily frames as float32 (about half the memory, ~7 significant digits)
+float32_returns = False
 
-ds_dsf_CDPrelease19['MarketDate'] = pd.to_datetime(ds_dsf_CDPrelease19['MarketDate'])
+# Worker processes for the pipeline stages (None: one per core, the events being split by firm; 1: one pass in this process)
+sample_processes = None
+# Directory of the frames shared with the worker processes (memory-mapped Arrow files, see publish_frame);
+# on Linux, a directory on /dev/shm keeps them in shared memory. It is scratch space: the parts of the daily
+# frame given to the workers are deleted once the run is put back together, and the event windows left there
+# are overwritten by the next run (the outputs are saved in output_directory)
+shared_directory = output_directory+"shared/"
 
-# 2020 CDP release sample (contains target outcomes by 2019)
-ds_dsf_CDPrelease20 = pd.read_csv(data_directory+"tr_ds_equities_allCDP.csv")
-ds_dsf_CDPrelease20 = ds_dsf_CDPrelease20.sort_values(by=['ISIN','MarketDate'])
+# Incremental run: the events registered in an earlier run (event_registry.parquet in output_directory) keep their
+# stage outputs (ds_dsf_*, cube_*, marketModel_* files); only new events, e.g. a new CDP release added to
+# cdp_releases below, are read, go through the pipeline and are appended. Set to False to recompute everything.
+incremental = False
 
-ds_dsf_CDPrelease20['MarketDate'] = pd.to_datetime(ds_dsf_CDPrelease20['MarketDate'])
+# Helper functions (eventstudy_utils.py is saved next to this script)
+sys.path.append(code_directory)
+from eventstudy_utils import (read_daily_file, save_checkpoint, load_checkpoint, windices_returns,
+                              market_return_table, event_registry, registry_events, registry_rows, lean_frame, frame_memory, attach_frame, load_event_cube, trading_calendar,
+                              sample_pipeline, stored_sample, has_days, car_test, volume_test, split_groups,
+                              panel_metrics, event_panel)
 
 
-# 2020 target announcement sample
-ds_dsf_targetAnnounce = pd.read_csv(data_directory+"tr_ds_equities_media_v3.csv")
-ds_dsf_targetAnnounce = ds_dsf_targetAnnounce.sort_values(by=['ISIN','MarketDate'])
-
-ds_dsf_targetAnnounce['MarketDate'] = pd.to_datetime(ds_dsf_targetAnnounce['MarketDate'])
-
+''' Read in WRDS-Datastream Daily Stock File '''
+# This contains daily stock information for different samples
+# Each raw file is parsed once; samples drawn from the same file share the parsed table.
+# Only the columns used below and the rows around the sample events are loaded.
 
-''' Number of days relative to the event date'''
+### Event dates (read first, to filter the daily files while reading them)
 # Media coverage dates
 media_dates = pd.read_stata(output_directory+"media_final_2020_outcomes.dta")
 # CSR report dates
@@ -88,110 +85,10 @@ csrReport_date['EventDate'] = pd.to_datetime(csrReport_date['EventDate'])
 csrReport_date = csrReport_date.sort_values(by=['ISIN','EventDate'],ascending=True)
 csrReport_date = csrReport_date.drop_duplicates(subset=['ISIN'],keep='first')
 
-# Merge event dates to daily returns data
-ds_dsf_mediaCoverage = pd.merge(ds_dsf_mediaCoverage,media_dates,on=['ISIN'],how='left')
-ds_dsf_csrReport = pd.merge(ds_dsf_csrReport,csrReport_date,on=['ISIN'],how='left')
-
-# Clean CDP release date - set event date to 2021-10-11 (CDP 2021 release date)
-ds_dsf_CDPrelease['EventDate'] = pd.to_datetime('2021-10-11')
-# Get information on achieved, failed, disappeared status for 2020 target
-final_firm_level_broader_sample = pd.read_stata(output_directory+"final_firm_level_broader_sample.dta")
-final_firm_level_broader_sample.rename(columns={'isin':'ISIN'},inplace=True)
-ds_dsf_CDPrelease = pd.merge(ds_dsf_CDPrelease,final_firm_level_broader_sample,on='ISIN',how='inner')
-
-
-
-# Number of business days relative to the event date
-ds_dsf_mediaCoverage = ds_dsf_mediaCoverage.dropna(subset=['EventDate','MarketDate']) # require that we have market date and event date
-ds_dsf_csrReport = ds_dsf_csrReport.dropna(subset=['EventDate','MarketDate']) # require that we have market date and event date
-ds_dsf_CDPrelease = ds_dsf_CDPrelease.dropna(subset=['EventDate','MarketDate']) # require that we have market date and event date
-
-
-A = [d.date() for d in ds_dsf_mediaCoverage['EventDate']]
-B = [d.date() for d in ds_dsf_mediaCoverage['MarketDate']]
-ds_dsf_mediaCoverage['BDaysRelativeToEvent'] = np.busday_count(A, B)
-
-A = [d.date() for d in ds_dsf_csrReport['EventDate']]
-B = [d.date() for d in ds_dsf_csrReport['MarketDate']]
-ds_dsf_csrReport['BDaysRelativeToEvent'] = np.busday_count(A, B)
-
-A = [d.date() for d in ds_dsf_CDPrelease['EventDate']]
-B = [d.date() for d in ds_dsf_CDPrelease['MarketDate']]
-ds_dsf_CDPrelease['BDaysRelativeToEvent'] = np.busday_count(A, B)
-
-# Save
-# Only keep daily data within 365 days of event date
-ds_dsf_mediaCoverage = ds_dsf_mediaCoverage[(ds_dsf_mediaCoverage['BDaysRelativeToEvent']>=-365)&(ds_dsf_mediaCoverage['BDaysRelativeToEvent']<=365)]
-ds_dsf_csrReport = ds_dsf_csrReport[(ds_dsf_csrReport['BDaysRelativeToEvent']>=-365)&(ds_dsf_csrReport['BDaysRelativeToEvent']<=365)]
-ds_dsf_CDPrelease = ds_dsf_CDPrelease[(ds_dsf_CDPrelease['BDaysRelativeToEvent']>=-365)&(ds_dsf_CDPrelease['BDaysRelativeToEvent']<=365)]
-
-
-# Drop duplicates
-ds_dsf_mediaCoverage = ds_dsf_mediaCoverage.drop_duplicates(subset = ['InfoCode', 'dscode','MarketDate','EventDate','close', 'adjclose', 'close_usd', 'open',
-                                                                'high', 'low', 'bid', 'ask', 'vwap', 'mosttrdprc', 'RI', 'ret',
-                                                                'ri_usd', 'ret_usd','ISIN','id'])
-ds_dsf_mediaCoverage.to_csv(output_directory+"ds_dsf_mediaCoverage.csv",index=False)
-
-ds_dsf_csrReport.to_csv(output_directory+"ds_dsf_csrReport.csv",index=False)
-
-# Drop duplicates
-ds_dsf_CDPrelease = ds_dsf_CDPrelease.drop_duplicates(subset = ['InfoCode', 'dscode','MarketDate','close', 'adjclose', 'close_usd', 'open',
-                                                                'high', 'low', 'bid', 'ask', 'vwap', 'mosttrdprc', 'RI', 'ret',
-                                                                'ri_usd', 'ret_usd','ISIN','id','type'])
-ds_dsf_CDPrelease.to_csv(output_directory+"ds_dsf_CDPrelease.csv",index=False)
-
-
-##### 2019 CDP release
-# Set event date to 2019-10-31 (CDP 2019 release date)
-ds_dsf_CDPrelease19['EventDate'] = pd.to_datetime('2019-10-31')
-# Get information on achieved, failed, disappeared status for 2020 target
-final_firm_level_broader_sample = pd.read_stata(output_directory+"final_firm_level_broader_sample.dta")
-final_firm_level_broader_sample.rename(columns={'isin':'ISIN'},inplace=True)
-ds_dsf_CDPrelease19 = pd.merge(ds_dsf_CDPrelease19,final_firm_level_broader_sample,on='ISIN',how='inner')
-
-ds_dsf_CDPrelease19 = ds_dsf_CDPrelease19.dropna(subset=['EventDate','MarketDate']) # require that we have market date and event date
-
-A = [d.date() for d in ds_dsf_CDPrelease19['EventDate']]
-B = [d.date() for d in ds_dsf_CDPrelease19['MarketDate']]
-ds_dsf_CDPrelease19['BDaysRelativeToEvent'] = np.busday_count(A, B)
-
-# Save
-# Only keep daily data within 365 days of event date
-ds_dsf_CDPrelease19 = ds_dsf_CDPrelease19[(ds_dsf_CDPrelease19['BDaysRelativeToEvent']>=-365)&(ds_dsf_CDPrelease19['BDaysRelativeToEvent']<=365)]
-
-# Drop duplicates
-ds_dsf_CDPrelease19 = ds_dsf_CDPrelease19.drop_duplicates(subset = ['InfoCode', 'dscode','MarketDate','close', 'adjclose', 'close_usd', 'open',
-                                                                'high', 'low', 'bid', 'ask', 'vwap', 'mosttrdprc', 'RI', 'ret',
-                                                                'ri_usd', 'ret_usd','ISIN','id','type'])
-ds_dsf_CDPrelease19.to_csv(output_directory+"ds_dsf_CDPrelease19.csv",index=False)
-
-##### 2020 CDP release
-# Set event date to 2020-10-12 (CDP 2020 release date)
-ds_dsf_CDPrelease20['EventDate'] = pd.to_datetime('2020-10-12')
-
 # Get information on achieved, failed, disappeared status for 2020 target
 final_firm_level_broader_sample = pd.read_stata(output_directory+"final_firm_level_broader_sample.dta")
 final_firm_level_broader_sample.rename(columns={'isin':'ISIN'},inplace=True)
-ds_dsf_CDPrelease20 = pd.merge(ds_dsf_CDPrelease20,final_firm_level_broader_sample,on='ISIN',how='inner')
-
-ds_dsf_CDPrelease20 = ds_dsf_CDPrelease20.dropna(subset=['EventDate','MarketDate']) # require that we have market date and event date
-
-A = [d.date() for d in ds_dsf_CDPrelease20['EventDate']]
-B = [d.date() for d in ds_dsf_CDPrelease20['MarketDate']]
-ds_dsf_CDPrelease20['BDaysRelativeToEvent'] = np.busday_count(A, B)
-
-# Save
-# Only keep daily data within 365 days of event date
-ds_dsf_CDPrelease20 = ds_dsf_CDPrelease20[(ds_dsf_CDPrelease20['BDaysRelativeToEvent']>=-365)&(ds_dsf_CDPrelease20['BDaysRelativeToEvent']<=365)]
-
-# Drop duplicates
-ds_dsf_CDPrelease20 = ds_dsf_CDPrelease20.drop_duplicates(subset = ['InfoCode', 'dscode','MarketDate','close', 'adjclose', 'close_usd', 'open',
-                                                                'high', 'low', 'bid', 'ask', 'vwap', 'mosttrdprc', 'RI', 'ret',
-                                                                'ri_usd', 'ret_usd','ISIN','id','type'])
-ds_dsf_CDPrelease20.to_csv(output_directory+"ds_dsf_CDPrelease20.csv",index=False)
 
-
-##### Announcement/Media coverage of 2020 targets
 # Data on target announcement dates
 target_announce_dates = pd.read_stata(output_directory+"media_final_2020_announcements.dta")
 
@@ -200,42 +97,114 @@ target_announce_dates.rename(columns={'date':'EventDate','isin':'ISIN'},inplace=
 target_announce_dates['EventDate'] = pd.to_datetime(target_announce_dates['EventDate'])
 # For target announcement coverage, keep all dates
 target_announce_dates = target_announce_dates.sort_values(by=['ISIN','EventDate'],ascending=True)
-# Merge to daily returns data
-ds_dsf_targetAnnounce = pd.merge(ds_dsf_targetAnnounce,target_announce_dates,on=['ISIN'],how='inner')  # inner merge to keep only daily return data of companies with target announcement dates
-
-# Number of business days relative to the event date
-ds_dsf_targetAnnounce = ds_dsf_targetAnnounce.dropna(subset=['EventDate','MarketDate']) # require that we have market date and event date
 
-A = [d.date() for d in ds_dsf_targetAnnounce['EventDate']]
-B = [d.date() for d in ds_dsf_targetAnnounce['MarketDate']]
-ds_dsf_targetAnnounce['BDaysRelativeToEvent'] = np.busday_count(A, B)
+# CDP release dates: one sample per release, with all firms of the broader sample
+# (the 2019 release contains target outcomes by 2018 and the 2020 release target outcomes by 2019).
+# A release added here is registered, run and included in the CDP panel; its CAAR/AAR and volume tests by
+# group use release-specific columns (e.g. lag_behind_2020) and are written as a section of their own below
+cdp_releases = {'CDPrelease':'2021-10-11','CDPrelease19':'2019-10-31','CDPrelease20':'2020-10-12'}
+
+# Drop repeated events (the repeated daily rows are dropped when the daily files are read)
+media_dates = media_dates.drop_duplicates(subset=['ISIN','EventDate','id'])
+final_firm_level_broader_sample = final_firm_level_broader_sample.drop_duplicates(subset=['ISIN','id','type'])
+target_announce_dates = target_announce_dates.drop_duplicates(subset=['ISIN','EventDate','id'])
+
+# Event registry: the events of all samples in one table (event_id, ISIN, EventDate, sample and the event attributes).
+# Integer event identifiers, unique across samples: all grouping, merging and filtering below is on event_id
+# (one event per firm-date for media and target announcements, one per firm for CSR and each CDP release).
+# Event attributes are kept once per event here (string flags such as type as categoricals); the daily frames
+# carry only event_id and the attributes are attached to the event windows
+previous = load_checkpoint(output_directory+"event_registry") if incremental and os.path.exists(output_directory+"event_registry.parquet") else None
+registry = event_registry({'mediaCoverage':media_dates,'csrReport':csrReport_date,
+                           **{name: final_firm_level_broader_sample.assign(EventDate=pd.to_datetime(date)) for name, date in cdp_releases.items()},
+                           'targetAnnounce':target_announce_dates},
+                          previous=previous)
+
+# Events without stage outputs yet (all events, unless incremental): only these are read and run below
+pending = registry if previous is None else registry[~registry['event_id'].isin(previous['event_id'])]
+pending_samples = [name for name in registry['sample'].cat.categories if (pending['sample']==name).any()]
+
+# Columns used from the daily files (intraday prices open, high, low, bid, ask, vwap and mosttrdprc are not used)
+daily_columns = ['InfoCode','dscode','MarketDate','close','adjclose','close_usd','RI','ret','ri_usd','ret_usd',
+                 'ISIN','Region','Volume','numshrs']
+# Quote line kept for ISINs with several lines (InfoCode/dscode) in the daily files, see primary_listings:
+# 'coverage' (most days with returns), 'liquidity' (highest volume) or a Series ISIN -> InfoCode
+primary_listing = 'coverage'
+# Columns identifying a repeated daily row (dropped while reading, except for the CSR report sample)
+daily_dedup = ['InfoCode','dscode','MarketDate','close','adjclose','close_usd','RI','ret','ri_usd','ret_usd','ISIN']
+
+### Daily stock files: file -> (samples drawn from it, repeated rows dropped)
+# Media coverage and 2020 target announcement samples; CSR report sample; one daily file for all CDP release samples
+daily_files = {"tr_ds_equities_media_v3.csv":(['mediaCoverage','targetAnnounce'],daily_dedup),
+               "tr_ds_equities_csrReport_v2.csv":(['csrReport'],None),
+               "tr_ds_equities_allCDP.csv":(list(cdp_releases),daily_dedup)}
+daily = {file: read_daily_file(data_directory+file,columns=daily_columns,events=pending[pending['sample'].isin(names)],
+                               dedup=dedup,primary=primary_listing)
+         for file, (names, dedup) in daily_files.items() if set(names)&set(pending_samples)}
 
-# Save
-# Only keep daily data within 365 days of event date
-ds_dsf_targetAnnounce = ds_dsf_targetAnnounce[(ds_dsf_targetAnnounce['BDaysRelativeToEvent']>=-365)&(ds_dsf_targetAnnounce['BDaysRelativeToEvent']<=365)]
-# Drop duplicates
-ds_dsf_targetAnnounce = ds_dsf_targetAnnounce.drop_duplicates(subset = ['InfoCode', 'dscode','MarketDate','EventDate','close', 'adjclose', 'close_usd', 'open',
-                                                                'high', 'low', 'bid', 'ask', 'vwap', 'mosttrdprc', 'RI', 'ret',
-                                                                'ri_usd', 'ret_usd','ISIN','id'])
-ds_dsf_targetAnnounce.to_csv(output_directory+"ds_dsf_targetAnnounce.csv",index=False)
+# All CDP 2020 target sample
+all_2020_targets_all_years = pd.read_stata(output_directory+"all_2020_targets_all_years.dta")
+isin_list = pd.DataFrame(all_2020_targets_all_years['isin'].unique())
+isin_list.to_csv(data_directory+"all_cdp_isin_list.txt",header=None, index=None)
 
 
+''' Number of days relative to the event date'''
+# Trading calendar used to count business days relative to the event date. The observed trading dates are saved
+# with the registry (trading_dates in output_directory); an incremental run adds the dates observed in the earlier
+# runs to those of the files read now, so that the new events are counted on the calendar of all the daily rows
+# read so far rather than only on the rows of the new events (after changing bdays_calendar, set incremental = False)
+if bdays_calendar=='observed':
+    trading_dates = pd.concat([df[['MarketDate','Region']].drop_duplicates() for df in daily.values()]
+                              +([load_checkpoint(output_directory+"trading_dates")] if previous is not None else []),
+                              ignore_index=True).drop_duplicates(ignore_index=True)
+    calendar = trading_calendar(daily=trading_dates)
+else:
+    calendar = trading_calendar()
+
+# Merge event dates to daily returns data, for the events of all samples drawn from a daily file in one pass
+# (see registry_rows): the daily file is kept once per firm and only the rows within 365 business days of
+# each event are copied (same rows as merging on ISIN and keeping [-365,365]; there can be many events per firm)
+# The samples of a daily file stay in one frame (with a sample column) for the pipeline below
+ds_dsf = {file: registry_rows(daily[file],pending,[name for name in daily_files[file][0] if name in pending_samples],calendar)
+          for file in daily}
+del daily
+
+
+### Compact dtypes: categorical strings, int16 relative days and (with float32_returns) float32 returns and volume
+memory = frame_memory(ds_dsf)
+ds_dsf = {file: lean_frame(df,float32=float32_returns) for file, df in ds_dsf.items()}
+memory['MB_lean'] = frame_memory(ds_dsf)['MB']
+print(memory)
 
 
 
 ''' Merge in market returns (by country, use WRDS World Indices)'''
-import wrds
-db = wrds.Connection()
+# Read in country code link table
+country_code = pd.read_csv(data_directory+"country_codes_alpha2_3.csv")
+
+# WRDS World Indices are cached locally in windices_cache; only dates after the last cached date are
+# downloaded. With wrds_offline = True the cache is used without connecting to WRDS.
+if wrds_offline:
+    db = None
+else:
+    import wrds
+    db = wrds.Connection()
+
+# Only the countries and dates of the daily samples are needed
+samples = [df for df in ds_dsf.values() if len(df)]
+sample_regions = set().union(*[set(df['Region'].dropna().unique()) for df in samples])
+sample_fics = country_code.loc[country_code['Region'].isin(sample_regions),'fic']
 
 # This data does not contain info for US/CA. 
-windices_daily = db.get_table('wrdsapps_windices','dwcountryreturns')
+windices_daily = windices_returns(windices_cache,db,
+                                  start=min((df['MarketDate'].min() for df in samples),default=None),
+                                  end=max((df['MarketDate'].max() for df in samples),default=None),
+                                  fics=sample_fics)
 
 # Merge ex-US market index returns
 windices_daily_clean = windices_daily[['date','portret','fic']]
 windices_daily_clean.columns=['MarketDate','MarketReturn','fic']
 windices_daily_clean['MarketDate'] = pd.to_datetime(windices_daily_clean['MarketDate'])
-# Read in country code link table
-country_code = pd.read_csv(data_directory+"country_codes_alpha2_3.csv")
 windices_daily_clean = pd.merge(windices_daily_clean,country_code,on='fic',how='left')
 
 # US index return data from CRSP
@@ -244,3901 +213,573 @@ us_index_clean = us_index[['caldt','vwretd']]
 us_index_clean.columns = ['MarketDate','MarketReturn']
 us_index_clean['MarketDate'] = pd.to_datetime(us_index_clean['MarketDate'])
 
-# merge - media coverage exUS and US separately
-ds_dsf_mediaCoverage_exUS = ds_dsf_mediaCoverage[(ds_dsf_mediaCoverage['Region']!='US')&(ds_dsf_mediaCoverage['Region']!='CA')]
-ds_dsf_mediaCoverage_exUS = pd.merge(ds_dsf_mediaCoverage_exUS,windices_daily_clean,on=['MarketDate','Region'],how='left')
-ds_dsf_mediaCoverage_exUS = ds_dsf_mediaCoverage_exUS.drop(columns=['fic','Country'])
-
-ds_dsf_mediaCoverage_US = ds_dsf_mediaCoverage[(ds_dsf_mediaCoverage['Region']=='US')|(ds_dsf_mediaCoverage['Region']=='CA')]
-ds_dsf_mediaCoverage_US = pd.merge(ds_dsf_mediaCoverage_US,us_index_clean,on=['MarketDate'],how='left')
+# Market returns by trading day and region: World Indices for ex-US firms, CRSP for US/CA firms
+market_returns = market_return_table(windices_daily_clean,us_index_clean)
+
+
+''' Returns, volume, market model and event windows [t-15, t+15] of each sample '''
+# The events of all samples go through the same stages in one pass (see sample_pipeline): market-adjusted
+# returns (in percentages and logs), trading volume (in percentages), market model abnormal returns (alpha and
+# beta per firm or firm-event, estimation window [-130,-30)), the event window with NEWDaysRelativeToEvent
+# filling in missing dates, and the event-window cube. Every stage is keyed by event_id (unique across samples),
+# so all CDP release years share one market-model fit, one event window and one cube. With sample_processes,
+# the events are split by firm over worker processes that attach to their part in shared_directory and publish
+# their outputs there (no frame is pickled). The outputs are then split by sample: the daily frames with the
+# new columns are saved as checkpoints and read back below, and the cubes are saved as cube_* .npy files that
+# can be memory-mapped (see load_event_cube). In an incremental run, only the new events are run and their
+# outputs are appended to the saved ones; the saved outputs of the other samples are read back (see stored_sample).
+# The saved outputs of events no longer in the registry are dropped and the attributes of the others refreshed.
+sample_results = {name: stored_sample(name,output_directory,registry_events(registry,name),shared_directory,checkpoint_csv=checkpoint_csv)
+                  for name in registry['sample'].cat.categories if name not in pending_samples}
+if pending_samples:
+    sample_results.update(sample_pipeline(lean_frame(pd.concat(list(ds_dsf.values()),ignore_index=True)),registry,
+                                          # attributes of the events of each sample
+                                          {name: [c for c in registry_events(registry,name).columns if c!='event_id'] for name in pending_samples},
+                                          market_returns,output_directory,checkpoint_csv=checkpoint_csv,
+                                          isin_dedup=['targetAnnounce'], # there can be multiple events per firm
+                                          shared_directory=shared_directory,processes=sample_processes,
+                                          append=[name for name in pending_samples if previous is not None and (previous['sample']==name).any()]))
+del ds_dsf
+
+# All registered events now have stage outputs
+save_checkpoint(registry,output_directory+"event_registry")
+if bdays_calendar=='observed':
+    save_checkpoint(trading_dates,output_directory+"trading_dates")
+
+# Event windows (with DayBits: bitmask of the days in [-15,15] with data of each row's event; a window is
+# complete if all its bits are set) and cubes
+ds_dsf_mediaCoverage_sub = attach_frame(sample_results['mediaCoverage'][0])
+ds_dsf_csrReport_sub = attach_frame(sample_results['csrReport'][0])
+ds_dsf_CDPrelease_sub = attach_frame(sample_results['CDPrelease'][0])
+ds_dsf_CDPrelease19_sub = attach_frame(sample_results['CDPrelease19'][0])
+ds_dsf_CDPrelease20_sub = attach_frame(sample_results['CDPrelease20'][0])
+ds_dsf_targetAnnounce_sub = attach_frame(sample_results['targetAnnounce'][0])
+
+cube_mediaCoverage = load_event_cube(sample_results['mediaCoverage'][1])
+cube_csrReport = load_event_cube(sample_results['csrReport'][1])
+# Cubes of the CDP releases by sample (all releases of cdp_releases go into the panel below)
+cdp_cubes = {name: load_event_cube(sample_results[name][1]) for name in cdp_releases}
+cube_CDPrelease = cdp_cubes['CDPrelease']
+cube_CDPrelease19 = cdp_cubes['CDPrelease19']
+cube_CDPrelease20 = cdp_cubes['CDPrelease20']
+cube_targetAnnounce = load_event_cube(sample_results['targetAnnounce'][1])
+marketModel_summary = sample_results['targetAnnounce'][2]
+
+# Daily frames with returns, volume and abnormal returns (estimation windows of the volume tests)
+ds_dsf_mediaCoverage = load_checkpoint(output_directory+"ds_dsf_mediaCoverage")
+ds_dsf_csrReport = load_checkpoint(output_directory+"ds_dsf_csrReport")
+cdp_daily = {name: load_checkpoint(output_directory+"ds_dsf_"+name) for name in cdp_releases}
+ds_dsf_CDPrelease = cdp_daily['CDPrelease']
+ds_dsf_CDPrelease19 = cdp_daily['CDPrelease19']
+ds_dsf_CDPrelease20 = cdp_daily['CDPrelease20']
+ds_dsf_targetAnnounce = load_checkpoint(output_directory+"ds_dsf_targetAnnounce")
 
-# Concat ex-US and US merged data
-ds_dsf_mediaCoverage = pd.concat([ds_dsf_mediaCoverage_exUS,ds_dsf_mediaCoverage_US])
-# Save
-ds_dsf_mediaCoverage.to_csv(output_directory+"ds_dsf_mediaCoverage.csv",index=False)
 
 
-# Same for CSR report event dataset
-ds_dsf_csrReport_exUS = ds_dsf_csrReport[(ds_dsf_csrReport['Region']!='US')&(ds_dsf_csrReport['Region']!='CA')]
-ds_dsf_csrReport_exUS = pd.merge(ds_dsf_csrReport_exUS,windices_daily_clean,on=['MarketDate','Region'],how='left')
-ds_dsf_csrReport_exUS = ds_dsf_csrReport_exUS.drop(columns=['fic','Country'])
 
-ds_dsf_csrReport_US = ds_dsf_csrReport[(ds_dsf_csrReport['Region']=='US')|(ds_dsf_csrReport['Region']=='CA')]
-ds_dsf_csrReport_US = pd.merge(ds_dsf_csrReport_US,us_index_clean,on=['MarketDate'],how='left')
 
-# Concat ex-US and US merged data
-ds_dsf_csrReport = pd.concat([ds_dsf_csrReport_exUS,ds_dsf_csrReport_US])
-# Save
-ds_dsf_csrReport.to_csv(output_directory+"ds_dsf_csrReport.csv",index=False)
 
+####################################################################################
+####################################################################################
+''' Using Market Model '''
+####################################################################################
+####################################################################################
 
-# Same for 2021 CDP release Dates
-ds_dsf_CDPrelease_exUS = ds_dsf_CDPrelease[(ds_dsf_CDPrelease['Region']!='US')&(ds_dsf_CDPrelease['Region']!='CA')]
-ds_dsf_CDPrelease_exUS = pd.merge(ds_dsf_CDPrelease_exUS,windices_daily_clean,on=['MarketDate','Region'],how='left')
-ds_dsf_CDPrelease_exUS = ds_dsf_CDPrelease_exUS.drop(columns=['fic','Country'])
+'''
+####################################################################################
+##########   Around Media Coverage    #######################################
+###################################################################################
+'''
+#### There can be multiple media event per firm
 
-ds_dsf_CDPrelease_US = ds_dsf_CDPrelease[(ds_dsf_CDPrelease['Region']=='US')|(ds_dsf_CDPrelease['Region']=='CA')]
-ds_dsf_CDPrelease_US = pd.merge(ds_dsf_CDPrelease_US,us_index_clean,on=['MarketDate'],how='left')
+''' Returns Around Media Coverage (10 days window; -1 to +10) '''
+window_10 = ds_dsf_mediaCoverage_sub[(ds_dsf_mediaCoverage_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_mediaCoverage_sub['NEWDaysRelativeToEvent']<=10)]
 
-# Concat ex-US and US merged data
-ds_dsf_CDPrelease = pd.concat([ds_dsf_CDPrelease_exUS,ds_dsf_CDPrelease_US])
-# Save
-ds_dsf_CDPrelease.to_csv(output_directory+"ds_dsf_CDPrelease.csv",index=False)
+# Drop firms without all 10 days of data
+window_10 = window_10[has_days(window_10['DayBits'],-1,10)]
 
+# CAAR/AAR and cross-sectional t-stats for each group, in the full sample and in the subsamples
+# of the next sections (material industries only, COVID-affected industries dropped), in one pass
+groups = {'achieved':('achieved',1),'failed':('failed',1)}
+subsamples = {'all':None,'material':('emission_industry_high',1),'noncovid':('type_covid_industry',0)}
+media_10_summaries = split_groups(car_test(window_10,['event_id'],groups,subsamples=subsamples))
+achieved_10_summary = media_10_summaries['all','achieved']
+failed_10_summary = media_10_summaries['all','failed']
 
-# Same for 2019 CDP release Dates
-ds_dsf_CDPrelease19_exUS = ds_dsf_CDPrelease19[(ds_dsf_CDPrelease19['Region']!='US')&(ds_dsf_CDPrelease19['Region']!='CA')]
-ds_dsf_CDPrelease19_exUS = pd.merge(ds_dsf_CDPrelease19_exUS,windices_daily_clean,on=['MarketDate','Region'],how='left')
-ds_dsf_CDPrelease19_exUS = ds_dsf_CDPrelease19_exUS.drop(columns=['fic','Country'])
 
-ds_dsf_CDPrelease19_US = ds_dsf_CDPrelease19[(ds_dsf_CDPrelease19['Region']=='US')|(ds_dsf_CDPrelease19['Region']=='CA')]
-ds_dsf_CDPrelease19_US = pd.merge(ds_dsf_CDPrelease19_US,us_index_clean,on=['MarketDate'],how='left')
 
-# Concat ex-US and US merged data
-ds_dsf_CDPrelease19 = pd.concat([ds_dsf_CDPrelease19_exUS,ds_dsf_CDPrelease19_US])
-# Save
-ds_dsf_CDPrelease19.to_csv(output_directory+"ds_dsf_CDPrelease19.csv",index=False)
 
 
-# Same for 2020 CDP release Dates
-ds_dsf_CDPrelease20_exUS = ds_dsf_CDPrelease20[(ds_dsf_CDPrelease20['Region']!='US')&(ds_dsf_CDPrelease20['Region']!='CA')]
-ds_dsf_CDPrelease20_exUS = pd.merge(ds_dsf_CDPrelease20_exUS,windices_daily_clean,on=['MarketDate','Region'],how='left')
-ds_dsf_CDPrelease20_exUS = ds_dsf_CDPrelease20_exUS.drop(columns=['fic','Country'])
+''' Returns Around Media Coverage - ONLY MATERIAL FIRMS (-1 to +10) '''
+### Updated V3
+### Keep only material industries (firms with all 10 days of data, see above)
+achieved_10_summary = media_10_summaries['material','achieved']
+failed_10_summary = media_10_summaries['material','failed']
 
-ds_dsf_CDPrelease20_US = ds_dsf_CDPrelease20[(ds_dsf_CDPrelease20['Region']=='US')|(ds_dsf_CDPrelease20['Region']=='CA')]
-ds_dsf_CDPrelease20_US = pd.merge(ds_dsf_CDPrelease20_US,us_index_clean,on=['MarketDate'],how='left')
 
-# Concat ex-US and US merged data
-ds_dsf_CDPrelease20 = pd.concat([ds_dsf_CDPrelease20_exUS,ds_dsf_CDPrelease20_US])
-# Save
-ds_dsf_CDPrelease20.to_csv(output_directory+"ds_dsf_CDPrelease20.csv",index=False)
+''' Returns Around Media Coverage - DROP COVID FIRMS (-1 to +10) '''
+### Drop more COVID affected firms (firms with all 10 days of data, see above)
+achieved_10_summary = media_10_summaries['noncovid','achieved']
+failed_10_summary = media_10_summaries['noncovid','failed']
 
 
-# Announcement/media on 2020 targets
-ds_dsf_targetAnnounce_exUS = ds_dsf_targetAnnounce[(ds_dsf_targetAnnounce['Region']!='US')&(ds_dsf_targetAnnounce['Region']!='CA')]
-ds_dsf_targetAnnounce_exUS = pd.merge(ds_dsf_targetAnnounce_exUS,windices_daily_clean,on=['MarketDate','Region'],how='left')
-ds_dsf_targetAnnounce_exUS = ds_dsf_targetAnnounce_exUS.drop(columns=['fic','Country'])
 
-ds_dsf_targetAnnounce_US = ds_dsf_targetAnnounce[(ds_dsf_targetAnnounce['Region']=='US')|(ds_dsf_targetAnnounce['Region']=='CA')]
-ds_dsf_targetAnnounce_US = pd.merge(ds_dsf_targetAnnounce_US,us_index_clean,on=['MarketDate'],how='left')
 
-# Concat ex-US and US merged data
-ds_dsf_targetAnnounce = pd.concat([ds_dsf_targetAnnounce_exUS,ds_dsf_targetAnnounce_US])
-# Save
-ds_dsf_targetAnnounce.to_csv(output_directory+"ds_dsf_targetAnnounce.csv",index=False)
+''' Volume Test - 20 day around Media Coverage '''
+window_20 = ds_dsf_mediaCoverage_sub[(ds_dsf_mediaCoverage_sub['NEWDaysRelativeToEvent']>=-10)&(ds_dsf_mediaCoverage_sub['NEWDaysRelativeToEvent']<=10)]
 
 
-''' Calculate market adjusted returns (in percentages) '''
-ds_dsf_mediaCoverage['MarketReturn_pct'] = ds_dsf_mediaCoverage['MarketReturn']*100
-ds_dsf_mediaCoverage['ret_pct'] = pd.to_numeric(ds_dsf_mediaCoverage['ret'].str[0:-1])
-ds_dsf_mediaCoverage['ret'] = ds_dsf_mediaCoverage['ret_pct']/100
+# Drop firms without all 20 days of data
+window_20 = window_20[has_days(window_20['DayBits'],-10,10)]
 
-ds_dsf_mediaCoverage['MAReturn'] = ds_dsf_mediaCoverage['ret'] - ds_dsf_mediaCoverage['MarketReturn']
-ds_dsf_mediaCoverage['MAReturn_pct'] = ds_dsf_mediaCoverage['ret_pct'] - ds_dsf_mediaCoverage['MarketReturn_pct']
 
-# Log returns
-ds_dsf_mediaCoverage['MAReturn_log'] = np.log(1+ds_dsf_mediaCoverage['MAReturn'])
-ds_dsf_mediaCoverage['MAReturn_logPct'] = ds_dsf_mediaCoverage['MAReturn_log']*100
 
+# Abnormal volume and t-stats for each group
+# Estimation window = {-140,-40}; 100 days long gap 30 days
+groups = {'achieved':('achieved',1),'failed':('failed',1),'disappeared':('disappeared',1)}
+summaries = split_groups(volume_test(window_20,ds_dsf_mediaCoverage,['event_id'],groups,est_window=(-140,-40),events=registry))
+achieved_20_summary = summaries['achieved']
+failed_20_summary = summaries['failed']
+disappeared_20_summary = summaries['disappeared']
 
-ds_dsf_csrReport['MarketReturn_pct'] = ds_dsf_csrReport['MarketReturn']*100
-ds_dsf_csrReport['ret_pct'] = pd.to_numeric(ds_dsf_csrReport['ret'].str[0:-1])
-ds_dsf_csrReport['ret'] = ds_dsf_csrReport['ret_pct']/100
 
-ds_dsf_csrReport['MAReturn'] = ds_dsf_csrReport['ret'] - ds_dsf_csrReport['MarketReturn']
-ds_dsf_csrReport['MAReturn_pct'] = ds_dsf_csrReport['ret_pct'] - ds_dsf_csrReport['MarketReturn_pct']
 
-# Log returns
-ds_dsf_csrReport['MAReturn_log'] = np.log(1+ds_dsf_csrReport['MAReturn'])
-ds_dsf_csrReport['MAReturn_logPct'] = ds_dsf_csrReport['MAReturn_log']*100
 
 
-ds_dsf_CDPrelease['MarketReturn_pct'] = ds_dsf_CDPrelease['MarketReturn']*100
-ds_dsf_CDPrelease['ret_pct'] = pd.to_numeric(ds_dsf_CDPrelease['ret'].str[0:-1])
-ds_dsf_CDPrelease['ret'] = ds_dsf_CDPrelease['ret_pct']/100
 
-ds_dsf_CDPrelease['MAReturn'] = ds_dsf_CDPrelease['ret'] - ds_dsf_CDPrelease['MarketReturn']
-ds_dsf_CDPrelease['MAReturn_pct'] = ds_dsf_CDPrelease['ret_pct'] - ds_dsf_CDPrelease['MarketReturn_pct']
+'''
+####################################################################################
+##########   Around CSR Report Announcements  #######################################
+###################################################################################
+'''
 
-# Log returns
-ds_dsf_CDPrelease['MAReturn_log'] = np.log(1+ds_dsf_CDPrelease['MAReturn'])
-ds_dsf_CDPrelease['MAReturn_logPct'] = ds_dsf_CDPrelease['MAReturn_log']*100
+''' Returns Around CSR Reports (10 days window; -1 to +10) '''
 
-ds_dsf_CDPrelease19['MarketReturn_pct'] = ds_dsf_CDPrelease19['MarketReturn']*100
-ds_dsf_CDPrelease19['ret_pct'] = pd.to_numeric(ds_dsf_CDPrelease19['ret'].str[0:-1])
-ds_dsf_CDPrelease19['ret'] = ds_dsf_CDPrelease19['ret_pct']/100
+window_10 = ds_dsf_csrReport_sub[(ds_dsf_csrReport_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_csrReport_sub['NEWDaysRelativeToEvent']<=10)]
 
-ds_dsf_CDPrelease19['MAReturn'] = ds_dsf_CDPrelease19['ret'] - ds_dsf_CDPrelease19['MarketReturn']
-ds_dsf_CDPrelease19['MAReturn_pct'] = ds_dsf_CDPrelease19['ret_pct'] - ds_dsf_CDPrelease19['MarketReturn_pct']
+# Drop firms without all 10 days of data
+window_10 = window_10[has_days(window_10['DayBits'],-1,10)]
 
-# Log returns
-ds_dsf_CDPrelease19['MAReturn_log'] = np.log(1+ds_dsf_CDPrelease19['MAReturn'])
-ds_dsf_CDPrelease19['MAReturn_logPct'] = ds_dsf_CDPrelease19['MAReturn_log']*100
+# Material, COVID and ambition flags of the firms (the COVID flags are read from the copy in output_directory)
+cross_list = pd.read_excel(data_directory+'companies_with_failed_targets_CSRreport_sentences_with_dates.xlsx',
+                           sheet_name='list of failed with CSR dates')
+cross_list_covid = pd.read_excel(output_directory+'companies_with_failed_targets_CSRreport_sentences_with_dates.xlsx',
+                                 sheet_name='list of failed with CSR dates')
+material_list = cross_list[cross_list['emission_industry_high']==1]
+noncovid_list = cross_list_covid[cross_list_covid['type_covid_industry']==0]
+# There are only failed firms in this sample
+high_amb = cross_list[cross_list['failed_high_ambition']==1]
+low_amb = cross_list[cross_list['failed_high_ambition']==0]
 
-ds_dsf_CDPrelease20['MarketReturn_pct'] = ds_dsf_CDPrelease20['MarketReturn']*100
-ds_dsf_CDPrelease20['ret_pct'] = pd.to_numeric(ds_dsf_CDPrelease20['ret'].str[0:-1])
-ds_dsf_CDPrelease20['ret'] = ds_dsf_CDPrelease20['ret_pct']/100
+# CAAR/AAR and cross-sectional t-stats for each group, in the full sample and in the subsamples
+# of the next sections (material firms only, non-COVID firms only), in one pass
+groups = {'failed':None, # There are only failed firms in this sample
+          'failed_high':('ISIN',high_amb['isin']),
+          'failed_low':('ISIN',low_amb['isin'])}
+subsamples = {'all':None,
+              'material':('ISIN',material_list['isin']),
+              'noncovid':('ISIN',noncovid_list['isin'])}
+csr_10_summaries = split_groups(car_test(window_10,['event_id'],groups,subsamples=subsamples))
+failed_10_summary = csr_10_summaries['all','failed']
 
-ds_dsf_CDPrelease20['MAReturn'] = ds_dsf_CDPrelease20['ret'] - ds_dsf_CDPrelease20['MarketReturn']
-ds_dsf_CDPrelease20['MAReturn_pct'] = ds_dsf_CDPrelease20['ret_pct'] - ds_dsf_CDPrelease20['MarketReturn_pct']
 
-# Log returns
-ds_dsf_CDPrelease20['MAReturn_log'] = np.log(1+ds_dsf_CDPrelease20['MAReturn'])
-ds_dsf_CDPrelease20['MAReturn_logPct'] = ds_dsf_CDPrelease20['MAReturn_log']*100
+''' Returns Around CSR Reports - MATERIAL FIRMS ONLY ( -1 to +10) '''
+### Keep only material firms (firms with all 10 days of data, see above)
+failed_10_summary = csr_10_summaries['material','failed']
 
 
-ds_dsf_targetAnnounce['MarketReturn_pct'] = ds_dsf_targetAnnounce['MarketReturn']*100
-ds_dsf_targetAnnounce['ret_pct'] = pd.to_numeric(ds_dsf_targetAnnounce['ret'].str[0:-1])
-ds_dsf_targetAnnounce['ret'] = ds_dsf_targetAnnounce['ret_pct']/100
+''' Returns Around CSR Reports - NON-COVID FIRMS ONLY ( -1 to +10) '''
+### Drop covid firms (firms with all 10 days of data, see above)
+failed_10_summary = csr_10_summaries['noncovid','failed']
 
-ds_dsf_targetAnnounce['MAReturn'] = ds_dsf_targetAnnounce['ret'] - ds_dsf_targetAnnounce['MarketReturn']
-ds_dsf_targetAnnounce['MAReturn_pct'] = ds_dsf_targetAnnounce['ret_pct'] - ds_dsf_targetAnnounce['MarketReturn_pct']
 
-# Log returns
-ds_dsf_targetAnnounce['MAReturn_log'] = np.log(1+ds_dsf_targetAnnounce['MAReturn'])
-ds_dsf_targetAnnounce['MAReturn_logPct'] = ds_dsf_targetAnnounce['MAReturn_log']*100
+''' Returns Around CSR Reports - High vs. Low Ambition ( -1 to +10) '''
+# Firms with all 10 days of data, see above
+failed_high_10_summary = csr_10_summaries['all','failed_high']
+failed_low_10_summary = csr_10_summaries['all','failed_low']
 
 
 
 
-''' Calculate trading volume (in percentages) '''
-ds_dsf_mediaCoverage['Volume_pct'] = ds_dsf_mediaCoverage['Volume']/ds_dsf_mediaCoverage['numshrs']*100
-ds_dsf_mediaCoverage['Volume_pctlog'] = np.log(ds_dsf_mediaCoverage['Volume_pct']+0.000255) # small number added to prevent log transforming zero
+''' Volume Test - 20 day around CSR Report Announcements '''
+# T stats for abnormal volume are calculated based on the distribution of the abnormal volume during the estimation window (Campbell and Wasley, 1996).
 
-# Save
-ds_dsf_mediaCoverage.to_csv(output_directory+"ds_dsf_mediaCoverage.csv",index=False)
+window_20 = ds_dsf_csrReport_sub[(ds_dsf_csrReport_sub['NEWDaysRelativeToEvent']>=-10)&(ds_dsf_csrReport_sub['NEWDaysRelativeToEvent']<=10)]
 
+# Drop firms without all 20 days of data
+window_20 = window_20[has_days(window_20['DayBits'],-10,10)]
 
-ds_dsf_csrReport['Volume_pct'] = ds_dsf_csrReport['Volume']/ds_dsf_csrReport['numshrs']*100
-ds_dsf_csrReport['Volume_pctlog'] = np.log(ds_dsf_csrReport['Volume_pct']+0.000255) # small number added to prevent log transforming zero
+# Abnormal volume and t-stats for each group
+# Estimation window = {-140,-40}; 100 days long gap 30 days
+groups = {'failed':None} # There are only failed firms in this sample
+summaries = split_groups(volume_test(window_20,ds_dsf_csrReport,['event_id'],groups,est_window=(-140,-40),events=registry))
+failed_20_summary = summaries['failed']
 
-# Save
-ds_dsf_csrReport.to_csv(output_directory+"ds_dsf_csrReport.csv",index=False)
 
 
 
-ds_dsf_CDPrelease['Volume_pct'] = ds_dsf_CDPrelease['Volume']/ds_dsf_CDPrelease['numshrs']*100
-ds_dsf_CDPrelease['Volume_pctlog'] = np.log(ds_dsf_CDPrelease['Volume_pct']+0.000255) # small number added to prevent log transforming zero
 
-# Save
-ds_dsf_CDPrelease.to_csv(output_directory+"ds_dsf_CDPrelease.csv",index=False)
 
+'''
+############################################################################################################
+######   Around CDP Response Release   ###################
+############################################################################################################
+'''
+##############################################################################
+''' #### Use this code to remove outliers with other extreme events '''
+### Three companies with extreme events:  Amkor Tech, Lenovo, Pearson
+remove_list1 = ['US0316521006', 'HK0992009065', 'GB0006776081']
+ds_dsf_CDPrelease_sub = ds_dsf_CDPrelease_sub[~ds_dsf_CDPrelease_sub['ISIN'].isin(remove_list1)]
 
-ds_dsf_CDPrelease19['Volume_pct'] = ds_dsf_CDPrelease19['Volume']/ds_dsf_CDPrelease19['numshrs']*100
-ds_dsf_CDPrelease19['Volume_pctlog'] = np.log(ds_dsf_CDPrelease19['Volume_pct']+0.000255) # small number added to prevent log transforming zero
+### Additional outliers
+### ABB, Baker Hughes, Medtronic, Shawcor, Celestica, Loreal, Thule (achieved exp), 
+### Amorepacific, Intl Cons Airl Group (failed unexpected)
+remove_list2 = ['CH0012221716','US05722G1004','IE00BTN1Y115','CA8204391079','CA15101Q1081','FR0000120321','SE0006422390','US9497461015',
+                'KR7090430000','ES0177542018']
+ds_dsf_CDPrelease_sub = ds_dsf_CDPrelease_sub[~ds_dsf_CDPrelease_sub['ISIN'].isin(remove_list2)]
+##############################################################################
 
-# Save
-ds_dsf_CDPrelease19.to_csv(output_directory+"ds_dsf_CDPrelease19.csv",index=False)
 
 
-ds_dsf_CDPrelease20['Volume_pct'] = ds_dsf_CDPrelease20['Volume']/ds_dsf_CDPrelease20['numshrs']*100
-ds_dsf_CDPrelease20['Volume_pctlog'] = np.log(ds_dsf_CDPrelease20['Volume_pct']+0.000255) # small number added to prevent log transforming zero
+''' Returns Around CDP Report Release (5 days window; -1 to +3) '''
+window_5 = ds_dsf_CDPrelease_sub[(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']<=3)]
 
-# Save
-ds_dsf_CDPrelease20.to_csv(output_directory+"ds_dsf_CDPrelease20.csv",index=False)
+# Drop firms without all 5 days of data
+window_5 = window_5[has_days(window_5['DayBits'],-1,3)]
 
+# CAAR/AAR and cross-sectional t-stats for each group, in the full sample and in the subsamples of the
+# sections below (material firms only, COVID affected firms dropped, ambition of failed targets), in one pass
+groups = {'achieved':('type','Achieved'),'failed':('type','Failed'),
+          'dis_highReduction':('type','Disappeared High Reduction'),'dis_lowReduction':('type','Disappeared Low Reduction'),
+          'failed_amb':('failed_high_ambition',1),'failed_unamb':('failed_low_ambition',1)}
+subsamples = {'all':None,'material':('emission_industry_high',1),'noncovid':('type_covid_industry',0)}
+cdp_5_summaries = split_groups(car_test(window_5,['event_id'],groups,subsamples=subsamples))
+achieved_5_summary = cdp_5_summaries['all','achieved']
+failed_5_summary = cdp_5_summaries['all','failed']
+dis_highReduction_5_summary = cdp_5_summaries['all','dis_highReduction']
+dis_lowReduction_5_summary = cdp_5_summaries['all','dis_lowReduction']
 
-ds_dsf_targetAnnounce['Volume_pct'] = ds_dsf_targetAnnounce['Volume']/ds_dsf_targetAnnounce['numshrs']*100
-ds_dsf_targetAnnounce['Volume_pctlog'] = np.log(ds_dsf_targetAnnounce['Volume_pct']+0.000255) # small number added to prevent log transforming zero
 
-# Save
-ds_dsf_targetAnnounce.to_csv(output_directory+"ds_dsf_targetAnnounce.csv",index=False)
 
+''' Returns Around CDP Report Release (10 days window; -1 to +10) '''
+window_10 = ds_dsf_CDPrelease_sub[(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']<=10)]
 
+# Drop firms without all 10 days of data
+window_10 = window_10[has_days(window_10['DayBits'],-1,10)]
 
-''' Calculate Market Model Abnormal Returns '''
-ds_dsf_mediaCoverage = pd.read_csv(output_directory+"ds_dsf_mediaCoverage.csv")
-ds_dsf_csrReport = pd.read_csv(output_directory+"ds_dsf_csrReport.csv")
-ds_dsf_CDPrelease = pd.read_csv(output_directory+"ds_dsf_CDPrelease.csv")
-ds_dsf_CDPrelease19 = pd.read_csv(output_directory+"ds_dsf_CDPrelease19.csv")
-ds_dsf_CDPrelease20 = pd.read_csv(output_directory+"ds_dsf_CDPrelease20.csv")
-ds_dsf_targetAnnounce = pd.read_csv(output_directory+"ds_dsf_targetAnnounce.csv")
+# CAAR/AAR and cross-sectional t-stats for each group
+groups = {'achieved':('type','Achieved'),'failed':('type','Failed'),
+             'dis_highReduction':('type','Disappeared High Reduction'),'dis_lowReduction':('type','Disappeared Low Reduction')}
+summaries = split_groups(car_test(window_10,['event_id'],groups))
+achieved_10_summary = summaries['achieved']
+failed_10_summary = summaries['failed']
+dis_highReduction_10_summary = summaries['dis_highReduction']
+dis_lowReduction_10_summary = summaries['dis_lowReduction']
 
-### Media Coverage data - there can be multiple media coverage event per firm
-# List of companies
-marketModel_summary =  ds_dsf_mediaCoverage[['ISIN','EventDate']].dropna().drop_duplicates()
-# Loop through list of companies and get alpha and beta
-for row in marketModel_summary.itertuples():
-    reg_data = ds_dsf_mediaCoverage[(ds_dsf_mediaCoverage['ISIN']==row.ISIN)&(ds_dsf_mediaCoverage['EventDate']==row.EventDate)]
-    # Estimation window [-130,-30)
-    reg_data = reg_data[(reg_data['BDaysRelativeToEvent']>=-130)&(reg_data['BDaysRelativeToEvent']<-30)]
-    reg_data = reg_data.dropna(subset=['ret','MarketReturn'])
-    if len(reg_data)<60:
-        continue
-    Y = reg_data['ret']
-    X = reg_data['MarketReturn']
-    X = sm.add_constant(X)
 
-    mod = sm.OLS(Y,X)
-    res = mod.fit()
-    # Save alpha and beta
-    marketModel_summary.loc[row.Index,'alpha'] = res.params[0]
-    marketModel_summary.loc[row.Index,'beta'] = res.params[1]
 
 
-# Merge in alpha and beta
-ds_dsf_mediaCoverage = pd.merge(ds_dsf_mediaCoverage,marketModel_summary,on=['ISIN','EventDate'],how='left')
-ds_dsf_mediaCoverage['ret_MarketModel'] = ds_dsf_mediaCoverage['alpha'] + ds_dsf_mediaCoverage['beta']*ds_dsf_mediaCoverage['MarketReturn']
-ds_dsf_mediaCoverage['adjRet_MarketModel'] = ds_dsf_mediaCoverage['ret'] - ds_dsf_mediaCoverage['ret_MarketModel']
 
+''' Returns Around CDP Report Release - MATERIAL FIRM ONLY (-1 to +3) '''
+### Keep only material firms (firms with all 5 days of data, see above)
+achieved_5_summary = cdp_5_summaries['material','achieved']
+failed_5_summary = cdp_5_summaries['material','failed']
+dis_highReduction_5_summary = cdp_5_summaries['material','dis_highReduction']
+dis_lowReduction_5_summary = cdp_5_summaries['material','dis_lowReduction']
 
-### CSR Report
-# List of companies
-marketModel_summary =  ds_dsf_csrReport[['ISIN']].dropna().drop_duplicates()
-# Loop through list of companies and get alpha and beta
-for row in marketModel_summary.itertuples():
-    reg_data = ds_dsf_csrReport[ds_dsf_csrReport['ISIN']==row.ISIN]
-    # Estimation window [-130,-30)
-    reg_data = reg_data[(reg_data['BDaysRelativeToEvent']>=-130)&(reg_data['BDaysRelativeToEvent']<-30)]
-    reg_data = reg_data.dropna(subset=['ret','MarketReturn'])    
-    if len(reg_data)<60:
-        continue
-    Y = reg_data['ret']
-    X = reg_data['MarketReturn']
-    X = sm.add_constant(X)
-
-    mod = sm.OLS(Y,X)
-    res = mod.fit()
-    # Save alpha and beta
-    marketModel_summary.loc[row.Index,'alpha'] = res.params[0]
-    marketModel_summary.loc[row.Index,'beta'] = res.params[1]
-
-
-# Merge in alpha and beta
-ds_dsf_csrReport = pd.merge(ds_dsf_csrReport,marketModel_summary,on=['ISIN'],how='left')
-ds_dsf_csrReport['ret_MarketModel'] = ds_dsf_csrReport['alpha'] + ds_dsf_csrReport['beta']*ds_dsf_csrReport['MarketReturn']
-ds_dsf_csrReport['adjRet_MarketModel'] = ds_dsf_csrReport['ret'] - ds_dsf_csrReport['ret_MarketModel']
-
-
-### CDP release
-# List of companies
-marketModel_summary =  ds_dsf_CDPrelease[['ISIN']].dropna().drop_duplicates()
-# Loop through list of companies and get alpha and beta
-for row in marketModel_summary.itertuples():
-    reg_data = ds_dsf_CDPrelease[ds_dsf_CDPrelease['ISIN']==row.ISIN]
-    # Estimation window [-130,-30)
-    reg_data = reg_data[(reg_data['BDaysRelativeToEvent']>=-130)&(reg_data['BDaysRelativeToEvent']<-30)]
-    reg_data = reg_data.dropna(subset=['ret','MarketReturn'])
-    if len(reg_data)<60:
-        continue
-    Y = reg_data['ret']
-    X = reg_data['MarketReturn']
-    X = sm.add_constant(X)
-
-    mod = sm.OLS(Y,X)
-    res = mod.fit()
-    # Save alpha and beta
-    marketModel_summary.loc[row.Index,'alpha'] = res.params[0]
-    marketModel_summary.loc[row.Index,'beta'] = res.params[1]
-
-
-# Merge in alpha and beta
-ds_dsf_CDPrelease = pd.merge(ds_dsf_CDPrelease,marketModel_summary,on=['ISIN'],how='left')
-ds_dsf_CDPrelease['ret_MarketModel'] = ds_dsf_CDPrelease['alpha'] + ds_dsf_CDPrelease['beta']*ds_dsf_CDPrelease['MarketReturn']
-ds_dsf_CDPrelease['adjRet_MarketModel'] = ds_dsf_CDPrelease['ret'] - ds_dsf_CDPrelease['ret_MarketModel']
-
-
-### CDP release 2019
-# List of companies
-marketModel_summary =  ds_dsf_CDPrelease19[['ISIN']].dropna().drop_duplicates()
-# Loop through list of companies and get alpha and beta
-for row in marketModel_summary.itertuples():
-    reg_data = ds_dsf_CDPrelease19[ds_dsf_CDPrelease19['ISIN']==row.ISIN]
-    # Estimation window [-130,-30)
-    reg_data = reg_data[(reg_data['BDaysRelativeToEvent']>=-130)&(reg_data['BDaysRelativeToEvent']<-30)]
-    reg_data = reg_data.dropna(subset=['ret','MarketReturn'])
-    if len(reg_data)<60:
-        continue
-    Y = reg_data['ret']
-    X = reg_data['MarketReturn']
-    X = sm.add_constant(X)
-
-    mod = sm.OLS(Y,X)
-    res = mod.fit()
-    # Save alpha and beta
-    marketModel_summary.loc[row.Index,'alpha'] = res.params[0]
-    marketModel_summary.loc[row.Index,'beta'] = res.params[1]
-
-
-# Merge in alpha and beta
-ds_dsf_CDPrelease19 = pd.merge(ds_dsf_CDPrelease19,marketModel_summary,on=['ISIN'],how='left')
-ds_dsf_CDPrelease19['ret_MarketModel'] = ds_dsf_CDPrelease19['alpha'] + ds_dsf_CDPrelease19['beta']*ds_dsf_CDPrelease19['MarketReturn']
-ds_dsf_CDPrelease19['adjRet_MarketModel'] = ds_dsf_CDPrelease19['ret'] - ds_dsf_CDPrelease19['ret_MarketModel']
-
-
-### CDP release 2020
-# List of companies
-marketModel_summary =  ds_dsf_CDPrelease20[['ISIN']].dropna().drop_duplicates()
-# Loop through list of companies and get alpha and beta
-for row in marketModel_summary.itertuples():
-    reg_data = ds_dsf_CDPrelease20[ds_dsf_CDPrelease20['ISIN']==row.ISIN]
-    # Estimation window [-130,-30)
-    reg_data = reg_data[(reg_data['BDaysRelativeToEvent']>=-130)&(reg_data['BDaysRelativeToEvent']<-30)]
-    reg_data = reg_data.dropna(subset=['ret','MarketReturn'])
-    if len(reg_data)<60:
-        continue
-    Y = reg_data['ret']
-    X = reg_data['MarketReturn']
-    X = sm.add_constant(X)
-
-    mod = sm.OLS(Y,X)
-    res = mod.fit()
-    # Save alpha and beta
-    marketModel_summary.loc[row.Index,'alpha'] = res.params[0]
-    marketModel_summary.loc[row.Index,'beta'] = res.params[1]
-
-
-# Merge in alpha and beta
-ds_dsf_CDPrelease20 = pd.merge(ds_dsf_CDPrelease20,marketModel_summary,on=['ISIN'],how='left')
-ds_dsf_CDPrelease20['ret_MarketModel'] = ds_dsf_CDPrelease20['alpha'] + ds_dsf_CDPrelease20['beta']*ds_dsf_CDPrelease20['MarketReturn']
-ds_dsf_CDPrelease20['adjRet_MarketModel'] = ds_dsf_CDPrelease20['ret'] - ds_dsf_CDPrelease20['ret_MarketModel']
-
-
-### Announcement/Media coverage 2020 targets
-# There can be multiple media coverage of target announcement per firm
-# List of companies
-marketModel_summary =  ds_dsf_targetAnnounce[['ISIN','EventDate']].dropna().drop_duplicates()
-# Loop through list of companies and get alpha and beta
-for row in marketModel_summary.itertuples():
-    reg_data = ds_dsf_targetAnnounce[(ds_dsf_targetAnnounce['ISIN']==row.ISIN)&(ds_dsf_targetAnnounce['EventDate']==row.EventDate)]
-    # Estimation window [-130,-30)
-    reg_data = reg_data[(reg_data['BDaysRelativeToEvent']>=-130)&(reg_data['BDaysRelativeToEvent']<-30)]
-    reg_data = reg_data.dropna(subset=['ret','MarketReturn'])
-    if len(reg_data)<60:
-        continue
-    Y = reg_data['ret']
-    X = reg_data['MarketReturn']
-    X = sm.add_constant(X)
-
-    mod = sm.OLS(Y,X)
-    res = mod.fit()
-    # Save alpha and beta
-    marketModel_summary.loc[row.Index,'alpha'] = res.params[0]
-    marketModel_summary.loc[row.Index,'beta'] = res.params[1]
-
-
-# Merge in alpha and beta
-ds_dsf_targetAnnounce = pd.merge(ds_dsf_targetAnnounce,marketModel_summary,on=['ISIN','EventDate'],how='left')
-ds_dsf_targetAnnounce['ret_MarketModel'] = ds_dsf_targetAnnounce['alpha'] + ds_dsf_targetAnnounce['beta']*ds_dsf_targetAnnounce['MarketReturn']
-ds_dsf_targetAnnounce['adjRet_MarketModel'] = ds_dsf_targetAnnounce['ret'] - ds_dsf_targetAnnounce['ret_MarketModel']
-
-
-# Log returns
-ds_dsf_mediaCoverage['adjRet_MarketModel_log'] = np.log(1+ds_dsf_mediaCoverage['adjRet_MarketModel'])
-ds_dsf_mediaCoverage['adjRet_MarketModel_logPct'] = ds_dsf_mediaCoverage['adjRet_MarketModel_log']*100
-
-ds_dsf_csrReport['adjRet_MarketModel_log'] = np.log(1+ds_dsf_csrReport['adjRet_MarketModel'])
-ds_dsf_csrReport['adjRet_MarketModel_logPct'] = ds_dsf_csrReport['adjRet_MarketModel_log']*100
-
-ds_dsf_CDPrelease['adjRet_MarketModel_log'] = np.log(1+ds_dsf_CDPrelease['adjRet_MarketModel'])
-ds_dsf_CDPrelease['adjRet_MarketModel_logPct'] = ds_dsf_CDPrelease['adjRet_MarketModel_log']*100
-
-ds_dsf_CDPrelease19['adjRet_MarketModel_log'] = np.log(1+ds_dsf_CDPrelease19['adjRet_MarketModel'])
-ds_dsf_CDPrelease19['adjRet_MarketModel_logPct'] = ds_dsf_CDPrelease19['adjRet_MarketModel_log']*100
-
-ds_dsf_CDPrelease20['adjRet_MarketModel_log'] = np.log(1+ds_dsf_CDPrelease20['adjRet_MarketModel'])
-ds_dsf_CDPrelease20['adjRet_MarketModel_logPct'] = ds_dsf_CDPrelease20['adjRet_MarketModel_log']*100
-
-ds_dsf_targetAnnounce['adjRet_MarketModel_log'] = np.log(1+ds_dsf_targetAnnounce['adjRet_MarketModel'])
-ds_dsf_targetAnnounce['adjRet_MarketModel_logPct'] = ds_dsf_targetAnnounce['adjRet_MarketModel_log']*100
-
-
-# Save
-ds_dsf_mediaCoverage.to_csv(output_directory+"ds_dsf_mediaCoverage.csv",index=False)
-ds_dsf_csrReport.to_csv(output_directory+"ds_dsf_csrReport.csv",index=False)
-ds_dsf_CDPrelease.to_csv(output_directory+"ds_dsf_CDPrelease.csv",index=False)
-ds_dsf_CDPrelease19.to_csv(output_directory+"ds_dsf_CDPrelease19.csv",index=False)
-ds_dsf_CDPrelease20.to_csv(output_directory+"ds_dsf_CDPrelease20.csv",index=False)
-ds_dsf_targetAnnounce.to_csv(output_directory+"ds_dsf_targetAnnounce.csv",index=False)
 
 
 
-''' New Days Relative To Event filling in missing dates '''
-ds_dsf_mediaCoverage = pd.read_csv(output_directory+"ds_dsf_mediaCoverage.csv")
-ds_dsf_csrReport = pd.read_csv(output_directory+"ds_dsf_csrReport.csv")
-ds_dsf_CDPrelease = pd.read_csv(output_directory+"ds_dsf_CDPrelease.csv")
-ds_dsf_CDPrelease19 = pd.read_csv(output_directory+"ds_dsf_CDPrelease19.csv")
-ds_dsf_CDPrelease20 = pd.read_csv(output_directory+"ds_dsf_CDPrelease20.csv")
-ds_dsf_targetAnnounce = pd.read_csv(output_directory+"ds_dsf_targetAnnounce.csv")
+''' Returns Around CDP Report Release - DROPPING COVID FIRMS  (-1 to +3) '''
+### Drop covid affected firms (firms with all 5 days of data, see above)
+achieved_5_summary = cdp_5_summaries['noncovid','achieved']
+failed_5_summary = cdp_5_summaries['noncovid','failed']
+dis_highReduction_5_summary = cdp_5_summaries['noncovid','dis_highReduction']
+dis_lowReduction_5_summary = cdp_5_summaries['noncovid','dis_lowReduction']
 
 
-# Keep only data in [t-15, t+15] - do not save this
-ds_dsf_mediaCoverage_sub = ds_dsf_mediaCoverage[(ds_dsf_mediaCoverage['BDaysRelativeToEvent']>=-15)&(ds_dsf_mediaCoverage['BDaysRelativeToEvent']<=15)]
-ds_dsf_csrReport_sub = ds_dsf_csrReport[(ds_dsf_csrReport['BDaysRelativeToEvent']>=-15)&(ds_dsf_csrReport['BDaysRelativeToEvent']<=15)]
-ds_dsf_CDPrelease_sub = ds_dsf_CDPrelease[(ds_dsf_CDPrelease['BDaysRelativeToEvent']>=-15)&(ds_dsf_CDPrelease['BDaysRelativeToEvent']<=15)]
-ds_dsf_CDPrelease19_sub = ds_dsf_CDPrelease19[(ds_dsf_CDPrelease19['BDaysRelativeToEvent']>=-15)&(ds_dsf_CDPrelease19['BDaysRelativeToEvent']<=15)]
-ds_dsf_CDPrelease20_sub = ds_dsf_CDPrelease20[(ds_dsf_CDPrelease20['BDaysRelativeToEvent']>=-15)&(ds_dsf_CDPrelease20['BDaysRelativeToEvent']<=15)]
-ds_dsf_targetAnnounce_sub = ds_dsf_targetAnnounce[(ds_dsf_targetAnnounce['BDaysRelativeToEvent']>=-15)&(ds_dsf_targetAnnounce['BDaysRelativeToEvent']<=15)]
 
 
-# Remove dates with missing market-adjusted returns
-ds_dsf_mediaCoverage_sub = ds_dsf_mediaCoverage_sub.dropna(subset=['MAReturn_logPct'])
-ds_dsf_csrReport_sub = ds_dsf_csrReport_sub.dropna(subset=['MAReturn_logPct'])
-ds_dsf_CDPrelease_sub = ds_dsf_CDPrelease_sub.dropna(subset=['MAReturn_logPct'])
-ds_dsf_CDPrelease19_sub = ds_dsf_CDPrelease19_sub.dropna(subset=['MAReturn_logPct'])
-ds_dsf_CDPrelease20_sub = ds_dsf_CDPrelease20_sub.dropna(subset=['MAReturn_logPct'])
-ds_dsf_targetAnnounce_sub = ds_dsf_targetAnnounce_sub.dropna(subset=['MAReturn_logPct'])
 
-# Remove duplicates
-ds_dsf_mediaCoverage_sub = ds_dsf_mediaCoverage_sub.drop_duplicates(subset=['ISIN','MarketDate','EventDate','MAReturn_logPct','BDaysRelativeToEvent'],keep='last')
-ds_dsf_csrReport_sub = ds_dsf_csrReport_sub.drop_duplicates(subset=['ISIN','MarketDate','EventDate','MAReturn_logPct','BDaysRelativeToEvent'],keep='last')
-ds_dsf_CDPrelease_sub = ds_dsf_CDPrelease_sub.drop_duplicates(subset=['ISIN','MarketDate','EventDate','MAReturn_logPct','BDaysRelativeToEvent'],keep='last')
-ds_dsf_CDPrelease19_sub = ds_dsf_CDPrelease19_sub.drop_duplicates(subset=['ISIN','MarketDate','EventDate','MAReturn_logPct','BDaysRelativeToEvent'],keep='last')
-ds_dsf_CDPrelease20_sub = ds_dsf_CDPrelease20_sub.drop_duplicates(subset=['ISIN','MarketDate','EventDate','MAReturn_logPct','BDaysRelativeToEvent'],keep='last')
-ds_dsf_targetAnnounce_sub = ds_dsf_targetAnnounce_sub.drop_duplicates(subset=['ISIN','MarketDate','EventDate','MAReturn_logPct','BDaysRelativeToEvent'],keep='last')
+''' Returns Around CDP Report Release - Ambitious vs. Unambitious Failed  (-1 to +3) '''
+## High/Low target ambition (only applies to failed companies; firms with all 5 days of data, see above)
+failed_amb_5_summary = cdp_5_summaries['all','failed_amb']
+failed_unamb_5_summary = cdp_5_summaries['all','failed_unamb']
 
 
-# Fill in missing BDaysRelativeToEvent
-# Need to do it separately for pre-event and post-event data
-# Groupby ISIN and rank based on MarketDate and assign NEWDaysRelativeToEvent
 
-# Media coverage - there can be multiple events per firm
-mediaCoverage_tempPre = ds_dsf_mediaCoverage_sub[ds_dsf_mediaCoverage_sub['BDaysRelativeToEvent']<0]
-mediaCoverage_tempPost = ds_dsf_mediaCoverage_sub[ds_dsf_mediaCoverage_sub['BDaysRelativeToEvent']>=0]
 
-mediaCoverage_tempPre['NEWDaysRelativeToEvent'] = (mediaCoverage_tempPre.groupby(['ISIN','EventDate'])['MarketDate'].rank(ascending=False))*(-1)
-mediaCoverage_tempPost['NEWDaysRelativeToEvent'] = (mediaCoverage_tempPost.groupby(['ISIN','EventDate'])['MarketDate'].rank(ascending=True))-1
 
-ds_dsf_mediaCoverage_sub = pd.concat([mediaCoverage_tempPre,mediaCoverage_tempPost])
-ds_dsf_mediaCoverage_sub = ds_dsf_mediaCoverage_sub.sort_values(by=['ISIN','EventDate','NEWDaysRelativeToEvent'])
 
-# CSR report
-csrReport_tempPre = ds_dsf_csrReport_sub[ds_dsf_csrReport_sub['BDaysRelativeToEvent']<0]
-csrReport_tempPost = ds_dsf_csrReport_sub[ds_dsf_csrReport_sub['BDaysRelativeToEvent']>=0]
+''' Volume Test - 10 day around CDP report release '''
 
-csrReport_tempPre['NEWDaysRelativeToEvent'] = (csrReport_tempPre.groupby('ISIN')['MarketDate'].rank(ascending=False))*(-1)
-csrReport_tempPost['NEWDaysRelativeToEvent'] = (csrReport_tempPost.groupby('ISIN')['MarketDate'].rank(ascending=True))-1
+window_10 = ds_dsf_CDPrelease_sub[(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']>=-5)&(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']<=5)]
 
-ds_dsf_csrReport_sub = pd.concat([csrReport_tempPre,csrReport_tempPost])
-ds_dsf_csrReport_sub = ds_dsf_csrReport_sub.sort_values(by=['ISIN','NEWDaysRelativeToEvent'])
+# Drop firms without all 10 days of data
+window_10 = window_10[has_days(window_10['DayBits'],-5,5)]
 
-# CDP release date
-CDPrelease_tempPre = ds_dsf_CDPrelease_sub[ds_dsf_CDPrelease_sub['BDaysRelativeToEvent']<0]
-CDPrelease_tempPost = ds_dsf_CDPrelease_sub[ds_dsf_CDPrelease_sub['BDaysRelativeToEvent']>=0]
+# Abnormal volume and t-stats for each group
+# Estimation window = {-135,-35}; 100 days long gap 30 days
+groups = {'achieved':('type','Achieved'),'failed':('type','Failed'),
+          'dis_highReduction':('type','Disappeared High Reduction'),'dis_lowReduction':('type','Disappeared Low Reduction')}
+summaries = split_groups(volume_test(window_10,ds_dsf_CDPrelease,['event_id'],groups,est_window=(-135,-35),events=registry))
+achieved_10_summary = summaries['achieved']
+failed_10_summary = summaries['failed']
+dis_highReduction_10_summary = summaries['dis_highReduction']
+dis_lowReduction_10_summary = summaries['dis_lowReduction']
 
-CDPrelease_tempPre['NEWDaysRelativeToEvent'] = (CDPrelease_tempPre.groupby('ISIN')['MarketDate'].rank(ascending=False))*(-1)
-CDPrelease_tempPost['NEWDaysRelativeToEvent'] = (CDPrelease_tempPost.groupby('ISIN')['MarketDate'].rank(ascending=True))-1
 
-ds_dsf_CDPrelease_sub = pd.concat([CDPrelease_tempPre,CDPrelease_tempPost])
-ds_dsf_CDPrelease_sub = ds_dsf_CDPrelease_sub.sort_values(by=['ISIN','NEWDaysRelativeToEvent'])
 
-# 2019 CDP release date
-ds_dsf_CDPrelease19_sub = ds_dsf_CDPrelease19_sub.drop_duplicates(subset=['ISIN','MarketDate','BDaysRelativeToEvent'])
-CDPrelease19_tempPre = ds_dsf_CDPrelease19_sub[ds_dsf_CDPrelease19_sub['BDaysRelativeToEvent']<0]
-CDPrelease19_tempPost = ds_dsf_CDPrelease19_sub[ds_dsf_CDPrelease19_sub['BDaysRelativeToEvent']>=0]
+''' Volume Test - 20 day around CDP report release - MATERIAL FIRMS ONLY '''
+window_20 = ds_dsf_CDPrelease_sub[(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']>=-10)&(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']<=10)]
 
-CDPrelease19_tempPre['NEWDaysRelativeToEvent'] = (CDPrelease19_tempPre.groupby('ISIN')['MarketDate'].rank(ascending=False))*(-1)
-CDPrelease19_tempPost['NEWDaysRelativeToEvent'] = (CDPrelease19_tempPost.groupby('ISIN')['MarketDate'].rank(ascending=True))-1
+# Drop firms without all 10 days of data
+window_20 = window_20[has_days(window_20['DayBits'],-10,10)]
 
-ds_dsf_CDPrelease19_sub = pd.concat([CDPrelease19_tempPre,CDPrelease19_tempPost])
-ds_dsf_CDPrelease19_sub = ds_dsf_CDPrelease19_sub.sort_values(by=['ISIN','NEWDaysRelativeToEvent'])
+# Abnormal volume and t-stats for each group, in the subsamples of this and the next sections
+# (material firms only, COVID affected firms dropped, ambition of failed targets), in one pass
+# Estimation window = {-140,-40}; 100 days long gap 30 days
+groups = {'achieved':('type','Achieved'),'failed':('type','Failed'),
+          'dis_highReduction':('type','Disappeared High Reduction'),'dis_lowReduction':('type','Disappeared Low Reduction'),
+          'failed_amb':('failed_high_ambition',1),'failed_unamb':('failed_low_ambition',1)}
+subsamples = {'all':None,'material':('emission_industry_high',1),'noncovid':('type_covid_industry',0)}
+cdp_20_summaries = split_groups(volume_test(window_20,ds_dsf_CDPrelease,['event_id'],groups,est_window=(-140,-40),
+                                            events=registry,subsamples=subsamples))
 
-# 2020 CDP release date
-ds_dsf_CDPrelease20_sub = ds_dsf_CDPrelease20_sub.drop_duplicates(subset=['ISIN','MarketDate','BDaysRelativeToEvent'])
-CDPrelease20_tempPre = ds_dsf_CDPrelease20_sub[ds_dsf_CDPrelease20_sub['BDaysRelativeToEvent']<0]
-CDPrelease20_tempPost = ds_dsf_CDPrelease20_sub[ds_dsf_CDPrelease20_sub['BDaysRelativeToEvent']>=0]
+### Keep only material firms
+achieved_20_summary = cdp_20_summaries['material','achieved']
+failed_20_summary = cdp_20_summaries['material','failed']
+dis_highReduction_20_summary = cdp_20_summaries['material','dis_highReduction']
+dis_lowReduction_20_summary = cdp_20_summaries['material','dis_lowReduction']
 
-CDPrelease20_tempPre['NEWDaysRelativeToEvent'] = (CDPrelease20_tempPre.groupby('ISIN')['MarketDate'].rank(ascending=False))*(-1)
-CDPrelease20_tempPost['NEWDaysRelativeToEvent'] = (CDPrelease20_tempPost.groupby('ISIN')['MarketDate'].rank(ascending=True))-1
 
-ds_dsf_CDPrelease20_sub = pd.concat([CDPrelease20_tempPre,CDPrelease20_tempPost])
-ds_dsf_CDPrelease20_sub = ds_dsf_CDPrelease20_sub.sort_values(by=['ISIN','NEWDaysRelativeToEvent'])
 
-# Announcement/media coverage of 2020 target
-ds_dsf_targetAnnounce_sub = ds_dsf_targetAnnounce_sub.drop_duplicates(subset=['ISIN','MarketDate','BDaysRelativeToEvent'])
-targetAnnounce_tempPre = ds_dsf_targetAnnounce_sub[ds_dsf_targetAnnounce_sub['BDaysRelativeToEvent']<0]
-targetAnnounce_tempPost = ds_dsf_targetAnnounce_sub[ds_dsf_targetAnnounce_sub['BDaysRelativeToEvent']>=0]
+''' Volume Test - 20 day around CDP report release - DROPPING COVID FIRMS '''
+### Drop covid affected firms (firms with all 20 days of data, see above)
+achieved_20_summary = cdp_20_summaries['noncovid','achieved']
+failed_20_summary = cdp_20_summaries['noncovid','failed']
+dis_highReduction_20_summary = cdp_20_summaries['noncovid','dis_highReduction']
+dis_lowReduction_20_summary = cdp_20_summaries['noncovid','dis_lowReduction']
 
-targetAnnounce_tempPre['NEWDaysRelativeToEvent'] = (targetAnnounce_tempPre.groupby(['ISIN','EventDate'])['MarketDate'].rank(ascending=False))*(-1)
-targetAnnounce_tempPost['NEWDaysRelativeToEvent'] = (targetAnnounce_tempPost.groupby(['ISIN','EventDate'])['MarketDate'].rank(ascending=True))-1
 
-ds_dsf_targetAnnounce_sub = pd.concat([targetAnnounce_tempPre,targetAnnounce_tempPost])
-ds_dsf_targetAnnounce_sub = ds_dsf_targetAnnounce_sub.sort_values(by=['ISIN','EventDate','NEWDaysRelativeToEvent'])
 
+''' Volume Test - 20 day around CDP report release - Ambitious vs. Unambitious Failed '''
+## High/Low target ambition (only applies to failed companies; firms with all 20 days of data, see above)
+failed_amb_20_summary = cdp_20_summaries['all','failed_amb']
+failed_unamb_20_summary = cdp_20_summaries['all','failed_unamb']
 
 
 
 
 
-####################################################################################
-####################################################################################
-''' Using Market Model '''
-####################################################################################
-####################################################################################
 
 '''
-####################################################################################
-##########   Around Media Coverage    #######################################
-###################################################################################
+############################################################################################################
+######  Market Response to 2019 Target Completion Info   ###################
+############################################################################################################
 '''
-#### There can be multiple media event per firm
 
-''' Returns Around Media Coverage (10 days window; -1 to +10) '''
-window_10 = ds_dsf_mediaCoverage_sub[(ds_dsf_mediaCoverage_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_mediaCoverage_sub['NEWDaysRelativeToEvent']<=10)]
+''' Market Response to 2019 Target Completion Info (12 days window; -1 t0 +10) '''
+window_10 = ds_dsf_CDPrelease20_sub[(ds_dsf_CDPrelease20_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_CDPrelease20_sub['NEWDaysRelativeToEvent']<=10)]
 
 # Drop firms without all 10 days of data
-remove_list = window_10.groupby(['ISIN','EventDate'],as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<12] # This is the count of days
-remove_list['ISIN_EventDate'] = remove_list['ISIN'] + "_" + remove_list['EventDate'].astype(str)
-window_10['ISIN_EventDate'] = window_10['ISIN'] + "_" + window_10['EventDate'].astype(str)
-
-window_10 = window_10[~window_10['ISIN_EventDate'].isin(remove_list.ISIN_EventDate)]
-
-achieved_10 = window_10[window_10['achieved']==1]
-failed_10 = window_10[window_10['failed']==1]
-
-# Cumulative returns
-achieved_10['CAR_logPct'] = achieved_10.groupby(['ISIN_EventDate'])['adjRet_MarketModel_logPct'].cumsum()
-failed_10['CAR_logPct'] = failed_10.groupby(['ISIN_EventDate'])['adjRet_MarketModel_logPct'].cumsum()
+window_10 = window_10[has_days(window_10['DayBits'],-1,10)]
 
-# Get CAAR
-achieved_10_summary = achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-failed_10_summary = failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
+# CAAR/AAR and cross-sectional t-stats for each group
+groups = {'lagbehind':('lag_behind_2020',1),'ontrack':('lag_behind_2020',0),
+          'lagbehind_top10':('lag_top10_2020',1),'lagbehind_top20':('lag_top20_2020',1),
+          'ontrack_top10':('ontrack_top10_2020',1),'ontrack_top20':('ontrack_top20_2020',1)}
+summaries = split_groups(car_test(window_10,['event_id'],groups))
+lagbehind_10_summary = summaries['lagbehind']
+ontrack_10_summary = summaries['ontrack']
+lagbehind_top10_10_summary = summaries['lagbehind_top10']
+lagbehind_top20_10_summary = summaries['lagbehind_top20']
+ontrack_top10_10_summary = summaries['ontrack_top10']
+ontrack_top20_10_summary = summaries['ontrack_top20']
 
-achieved_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-failed_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
 
-# t-stat - Cross-sectional test
-achieved_10 = pd.merge(achieved_10,achieved_10_summary,on=['NEWDaysRelativeToEvent']) # Merge in CAAR
-achieved_10['CAR-CAAR'] = achieved_10['CAR_logPct'] - achieved_10['CAAR_logPct']
-achieved_10['CAR-CAAR_sq'] = achieved_10['CAR-CAAR']**2
 
-achieved_10_summary['sum_CAR-CAAR_sq'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
 
-achieved_10_summary['N'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-achieved_10_summary['VAR_CAAR'] = achieved_10_summary['sum_CAR-CAAR_sq'] / (achieved_10_summary['N']-1)
-achieved_10_summary['SD_CAAR'] = np.sqrt(achieved_10_summary['VAR_CAAR'])
-achieved_10_summary['T_CSecT'] = (np.sqrt(achieved_10_summary['N']))*achieved_10_summary['CAAR_logPct']/achieved_10_summary['SD_CAAR']
-
-# Get AAR
-achieved_10_summary['AAR_logPct'] = achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = achieved_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-achieved_10 = pd.merge(achieved_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-achieved_10['MAR-AAR'] = achieved_10['adjRet_MarketModel_logPct'] - achieved_10['AAR_logPct']
-achieved_10['MAR-AAR_sq'] = achieved_10['MAR-AAR']**2
-
-achieved_10_summary['sum_MAR-AAR_sq'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-achieved_10_summary['N'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-achieved_10_summary['VAR_AAR'] = achieved_10_summary['sum_MAR-AAR_sq'] / (achieved_10_summary['N']-1)
-achieved_10_summary['SD_AAR'] = np.sqrt(achieved_10_summary['VAR_AAR'])
-
-achieved_10_summary['T_MAR_CSecT'] = (np.sqrt(achieved_10_summary['N']))*achieved_10_summary['AAR_logPct']/achieved_10_summary['SD_AAR']
-
-
-
-# Failed  t-stat - Cross-sectional test
-failed_10 = pd.merge(failed_10,failed_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-failed_10['CAR-CAAR'] = failed_10['CAR_logPct'] - failed_10['CAAR_logPct']
-failed_10['CAR-CAAR_sq'] = failed_10['CAR-CAAR']**2
-
-failed_10_summary['sum_CAR-CAAR_sq'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-
-failed_10_summary['N'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-failed_10_summary['VAR_CAAR'] = failed_10_summary['sum_CAR-CAAR_sq'] / (failed_10_summary['N']-1)
-failed_10_summary['SD_CAAR'] = np.sqrt(failed_10_summary['VAR_CAAR'])
-failed_10_summary['T_CSecT'] = (np.sqrt(failed_10_summary['N']))*failed_10_summary['CAAR_logPct']/failed_10_summary['SD_CAAR']
-
-# Get AAR
-failed_10_summary['AAR_logPct'] = failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = failed_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-failed_10 = pd.merge(failed_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-failed_10['MAR-AAR'] = failed_10['adjRet_MarketModel_logPct'] - failed_10['AAR_logPct']
-failed_10['MAR-AAR_sq'] = failed_10['MAR-AAR']**2
-
-failed_10_summary['sum_MAR-AAR_sq'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-failed_10_summary['N'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-failed_10_summary['VAR_AAR'] = failed_10_summary['sum_MAR-AAR_sq'] / (failed_10_summary['N']-1)
-failed_10_summary['SD_AAR'] = np.sqrt(failed_10_summary['VAR_AAR'])
-
-failed_10_summary['T_MAR_CSecT'] = (np.sqrt(failed_10_summary['N']))*failed_10_summary['AAR_logPct']/failed_10_summary['SD_AAR']
-
-
-
-
-
-''' Returns Around Media Coverage - ONLY MATERIAL FIRMS (-1 to +10) '''
-### Updated V3
-window_10 = ds_dsf_mediaCoverage_sub[(ds_dsf_mediaCoverage_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_mediaCoverage_sub['NEWDaysRelativeToEvent']<=10)]
-
-
-# Drop firms without all 10 days of data
-remove_list = window_10.groupby(['ISIN','EventDate'],as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<12] # This is the count of days
-remove_list['ISIN_EventDate'] = remove_list['ISIN'] + "_" + remove_list['EventDate'].astype(str)
-window_10['ISIN_EventDate'] = window_10['ISIN'] + "_" + window_10['EventDate'].astype(str)
-
-window_10 = window_10[~window_10['ISIN_EventDate'].isin(remove_list.ISIN_EventDate)]
+''' Volume Test - Around 2019 Target Completion Info '''
 
+window_20 = ds_dsf_CDPrelease20_sub[(ds_dsf_CDPrelease20_sub['NEWDaysRelativeToEvent']>=-10)&(ds_dsf_CDPrelease20_sub['NEWDaysRelativeToEvent']<=10)]
 
-### Keep only material industries
-window_10 = window_10[window_10['emission_industry_high']==1]
+# Drop firms without all 20 days of data
+window_20 = window_20[has_days(window_20['DayBits'],-10,10)]
 
-achieved_10 = window_10[window_10['achieved']==1]
-failed_10 = window_10[window_10['failed']==1]
+# Abnormal volume and t-stats for each group
+# Estimation window = {-140,-40}; 100 days long gap 30 days
+groups = {'lagbehind':('lag_behind_2020',1)}
+summaries = split_groups(volume_test(window_20,ds_dsf_CDPrelease20,['event_id'],groups,est_window=(-140,-40),events=registry))
+lagbehind_20_summary = summaries['lagbehind']
 
-# Cumulative returns
-achieved_10['CAR_logPct'] = achieved_10.groupby(['ISIN_EventDate'])['adjRet_MarketModel_logPct'].cumsum()
-failed_10['CAR_logPct'] = failed_10.groupby(['ISIN_EventDate'])['adjRet_MarketModel_logPct'].cumsum()
 
-# Get CAAR
-achieved_10_summary = achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-failed_10_summary = failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
 
-achieved_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-failed_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
 
-# t-stat - Cross-sectional test
-achieved_10 = pd.merge(achieved_10,achieved_10_summary,on=['NEWDaysRelativeToEvent']) # Merge in CAAR
-achieved_10['CAR-CAAR'] = achieved_10['CAR_logPct'] - achieved_10['CAAR_logPct']
-achieved_10['CAR-CAAR_sq'] = achieved_10['CAR-CAAR']**2
+'''
+############################################################################################################
+######  Market Response to 2018 Target Completion Info   ###################
+############################################################################################################
+'''
 
-achieved_10_summary['sum_CAR-CAAR_sq'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-achieved_10_summary['N'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-achieved_10_summary['VAR_CAAR'] = achieved_10_summary['sum_CAR-CAAR_sq'] / (achieved_10_summary['N']-1)
-achieved_10_summary['SD_CAAR'] = np.sqrt(achieved_10_summary['VAR_CAAR'])
+''' Market Response to 2018 Target Completion Info (10 days window) '''
+window_10 = ds_dsf_CDPrelease19_sub[(ds_dsf_CDPrelease19_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_CDPrelease19_sub['NEWDaysRelativeToEvent']<=10)]
 
-achieved_10_summary['T_CSecT'] = (np.sqrt(achieved_10_summary['N']))*achieved_10_summary['CAAR_logPct']/achieved_10_summary['SD_CAAR']
+# Drop firms without all 20 days of data
+window_10 = window_10[has_days(window_10['DayBits'],-1,10)]
 
-# Get AAR
-achieved_10_summary['AAR_logPct'] = achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = achieved_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-achieved_10 = pd.merge(achieved_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-achieved_10['MAR-AAR'] = achieved_10['adjRet_MarketModel_logPct'] - achieved_10['AAR_logPct']
-achieved_10['MAR-AAR_sq'] = achieved_10['MAR-AAR']**2
+# CAAR/AAR and cross-sectional t-stats for each group
+groups = {'lagbehind':('lag_behind_2019',1),'ontrack':('lag_behind_2019',0),
+          'lagbehind_top10':('lag_top10_2019',1),'lagbehind_top20':('lag_top20_2019',1),
+          'ontrack_top10':('ontrack_top10_2019',1),'ontrack_top20':('ontrack_top20_2019',1)}
+summaries = split_groups(car_test(window_10,['event_id'],groups))
+lagbehind_10_summary = summaries['lagbehind']
+ontrack_10_summary = summaries['ontrack']
+lagbehind_top10_10_summary = summaries['lagbehind_top10']
+lagbehind_top20_10_summary = summaries['lagbehind_top20']
+ontrack_top10_10_summary = summaries['ontrack_top10']
+ontrack_top20_10_summary = summaries['ontrack_top20']
 
-achieved_10_summary['sum_MAR-AAR_sq'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-achieved_10_summary['N'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-achieved_10_summary['VAR_AAR'] = achieved_10_summary['sum_MAR-AAR_sq'] / (achieved_10_summary['N']-1)
-achieved_10_summary['SD_AAR'] = np.sqrt(achieved_10_summary['VAR_AAR'])
 
-achieved_10_summary['T_MAR_CSecT'] = (np.sqrt(achieved_10_summary['N']))*achieved_10_summary['AAR_logPct']/achieved_10_summary['SD_AAR']
 
+''' Volume Test - Around 2018 Target Completion Info '''
 
-# Control  t-stat - Cross-sectional test
-failed_10 = pd.merge(failed_10,failed_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-failed_10['CAR-CAAR'] = failed_10['CAR_logPct'] - failed_10['CAAR_logPct']
-failed_10['CAR-CAAR_sq'] = failed_10['CAR-CAAR']**2
+window_20 = ds_dsf_CDPrelease19_sub[(ds_dsf_CDPrelease19_sub['NEWDaysRelativeToEvent']>=-10)&(ds_dsf_CDPrelease19_sub['NEWDaysRelativeToEvent']<=10)]
 
-failed_10_summary['sum_CAR-CAAR_sq'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-failed_10_summary['N'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-failed_10_summary['VAR_CAAR'] = failed_10_summary['sum_CAR-CAAR_sq'] / (failed_10_summary['N']-1)
-failed_10_summary['SD_CAAR'] = np.sqrt(failed_10_summary['VAR_CAAR'])
+# Drop firms without all 20 days of data
+window_20 = window_20[has_days(window_20['DayBits'],-10,10)]
 
-failed_10_summary['T_CSecT'] = (np.sqrt(failed_10_summary['N']))*failed_10_summary['CAAR_logPct']/failed_10_summary['SD_CAAR']
+# Abnormal volume and t-stats for each group
+# Estimation window = {-140,-40}; 100 days long gap 30 days
+groups = {'lagbehind':('lag_behind_2019',1)}
+summaries = split_groups(volume_test(window_20,ds_dsf_CDPrelease19,['event_id'],groups,est_window=(-140,-40),events=registry))
+lagbehind_20_summary = summaries['lagbehind']
 
-# Get AAR
-failed_10_summary['AAR_logPct'] = failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = failed_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-failed_10 = pd.merge(failed_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-failed_10['MAR-AAR'] = failed_10['adjRet_MarketModel_logPct'] - failed_10['AAR_logPct']
-failed_10['MAR-AAR_sq'] = failed_10['MAR-AAR']**2
 
-failed_10_summary['sum_MAR-AAR_sq'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-failed_10_summary['N'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-failed_10_summary['VAR_AAR'] = failed_10_summary['sum_MAR-AAR_sq'] / (failed_10_summary['N']-1)
-failed_10_summary['SD_AAR'] = np.sqrt(failed_10_summary['VAR_AAR'])
 
-failed_10_summary['T_MAR_CSecT'] = (np.sqrt(failed_10_summary['N']))*failed_10_summary['AAR_logPct']/failed_10_summary['SD_AAR']
 
 
-''' Returns Around Media Coverage - DROP COVID FIRMS (-1 to +10) '''
 
-window_10 = ds_dsf_mediaCoverage_sub[(ds_dsf_mediaCoverage_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_mediaCoverage_sub['NEWDaysRelativeToEvent']<=10)]
+'''
+############################################################################################################
+######   Around Announcement/Media coverage of 2020 targets   ###################
+############################################################################################################
+'''
+''' Market Response to 2020 target announcement media coverage (10 days window) '''
+window_10 = ds_dsf_targetAnnounce_sub[(ds_dsf_targetAnnounce_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_targetAnnounce_sub['NEWDaysRelativeToEvent']<=10)]
 
 # Drop firms without all 10 days of data
-remove_list = window_10.groupby(['ISIN','EventDate'],as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<12] # This is the count of days
-remove_list['ISIN_EventDate'] = remove_list['ISIN'] + "_" + remove_list['EventDate'].astype(str)
-window_10['ISIN_EventDate'] = window_10['ISIN'] + "_" + window_10['EventDate'].astype(str)
-
-window_10 = window_10[~window_10['ISIN_EventDate'].isin(remove_list.ISIN_EventDate)]
-
-### Drop more COVID affected firms
-window_10 = window_10[window_10['type_covid_industry']==0]
-
-achieved_10 = window_10[window_10['achieved']==1]
-failed_10 = window_10[window_10['failed']==1]
-
-# Cumulative returns
-achieved_10['CAR_logPct'] = achieved_10.groupby(['ISIN_EventDate'])['adjRet_MarketModel_logPct'].cumsum()
-failed_10['CAR_logPct'] = failed_10.groupby(['ISIN_EventDate'])['adjRet_MarketModel_logPct'].cumsum()
-
-# Get CAAR
-achieved_10_summary = achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-failed_10_summary = failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-
-achieved_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-failed_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-
-# t-stat - Cross-sectional test
-achieved_10 = pd.merge(achieved_10,achieved_10_summary,on=['NEWDaysRelativeToEvent']) # Merge in CAAR
-achieved_10['CAR-CAAR'] = achieved_10['CAR_logPct'] - achieved_10['CAAR_logPct']
-achieved_10['CAR-CAAR_sq'] = achieved_10['CAR-CAAR']**2
-
-achieved_10_summary['sum_CAR-CAAR_sq'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-achieved_10_summary['N'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-achieved_10_summary['VAR_CAAR'] = achieved_10_summary['sum_CAR-CAAR_sq'] / (achieved_10_summary['N']-1)
-achieved_10_summary['SD_CAAR'] = np.sqrt(achieved_10_summary['VAR_CAAR'])
-
-achieved_10_summary['T_CSecT'] = (np.sqrt(achieved_10_summary['N']))*achieved_10_summary['CAAR_logPct']/achieved_10_summary['SD_CAAR']
-
-# Get AAR
-achieved_10_summary['AAR_logPct'] = achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = achieved_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-achieved_10 = pd.merge(achieved_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-achieved_10['MAR-AAR'] = achieved_10['adjRet_MarketModel_logPct'] - achieved_10['AAR_logPct']
-achieved_10['MAR-AAR_sq'] = achieved_10['MAR-AAR']**2
-
-achieved_10_summary['sum_MAR-AAR_sq'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-achieved_10_summary['N'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-achieved_10_summary['VAR_AAR'] = achieved_10_summary['sum_MAR-AAR_sq'] / (achieved_10_summary['N']-1)
-achieved_10_summary['SD_AAR'] = np.sqrt(achieved_10_summary['VAR_AAR'])
-
-achieved_10_summary['T_MAR_CSecT'] = (np.sqrt(achieved_10_summary['N']))*achieved_10_summary['AAR_logPct']/achieved_10_summary['SD_AAR']
-
-
-# Control  t-stat - Cross-sectional test
-failed_10 = pd.merge(failed_10,failed_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-failed_10['CAR-CAAR'] = failed_10['CAR_logPct'] - failed_10['CAAR_logPct']
-failed_10['CAR-CAAR_sq'] = failed_10['CAR-CAAR']**2
-
-failed_10_summary['sum_CAR-CAAR_sq'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-failed_10_summary['N'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-failed_10_summary['VAR_CAAR'] = failed_10_summary['sum_CAR-CAAR_sq'] / (failed_10_summary['N']-1)
-failed_10_summary['SD_CAAR'] = np.sqrt(failed_10_summary['VAR_CAAR'])
-
-failed_10_summary['T_CSecT'] = (np.sqrt(failed_10_summary['N']))*failed_10_summary['CAAR_logPct']/failed_10_summary['SD_CAAR']
+window_10 = window_10[has_days(window_10['DayBits'],-1,10)]
 
-# Get AAR
-failed_10_summary['AAR_logPct'] = failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = failed_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-failed_10 = pd.merge(failed_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-failed_10['MAR-AAR'] = failed_10['adjRet_MarketModel_logPct'] - failed_10['AAR_logPct']
-failed_10['MAR-AAR_sq'] = failed_10['MAR-AAR']**2
 
-failed_10_summary['sum_MAR-AAR_sq'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-failed_10_summary['N'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-failed_10_summary['VAR_AAR'] = failed_10_summary['sum_MAR-AAR_sq'] / (failed_10_summary['N']-1)
-failed_10_summary['SD_AAR'] = np.sqrt(failed_10_summary['VAR_AAR'])
+# CAAR/AAR and cross-sectional t-stats for each group
+groups = {'all':None,'achieved':('achieved',1),'failed':('failed',1),'disappeared':('disappeared',1)}
+summaries = split_groups(car_test(window_10,['event_id'],groups))
+all_10_summary = summaries['all']
+achieved_10_summary = summaries['achieved']
+failed_10_summary = summaries['failed']
+disappeared_10_summary = summaries['disappeared']
 
-failed_10_summary['T_MAR_CSecT'] = (np.sqrt(failed_10_summary['N']))*failed_10_summary['AAR_logPct']/failed_10_summary['SD_AAR']
 
 
 
+''' Volume Test - 20 day around 2020 Target announcement media coverage '''
 
-''' Volume Test - 20 day around Media Coverage '''
-window_20 = ds_dsf_mediaCoverage_sub[(ds_dsf_mediaCoverage_sub['NEWDaysRelativeToEvent']>=-10)&(ds_dsf_mediaCoverage_sub['NEWDaysRelativeToEvent']<=10)]
+window_20 = ds_dsf_targetAnnounce_sub[(ds_dsf_targetAnnounce_sub['NEWDaysRelativeToEvent']>=-10)&(ds_dsf_targetAnnounce_sub['NEWDaysRelativeToEvent']<=10)]
 
 
 # Drop firms without all 20 days of data
-remove_list = window_20.groupby(['ISIN','EventDate'],as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<21] # This is the count of days
-remove_list['ISIN_EventDate'] = remove_list['ISIN'] + "_" + remove_list['EventDate'].astype(str)
-window_20['ISIN_EventDate'] = window_20['ISIN'] + "_" + window_20['EventDate'].astype(str)
-
-window_20 = window_20[~window_20['ISIN_EventDate'].isin(remove_list.ISIN_EventDate)]
-
-
-
-achieved_20 = window_20[window_20['achieved']==1]
-failed_20 = window_20[(window_20['failed']==1)]
-disappeared_20 = window_20[(window_20['disappeared']==1)]
+window_20 = window_20[has_days(window_20['DayBits'],-10,10)]
 
 
-# Abnormal volume 
+# Abnormal volume and t-stats for each group
 # Estimation window = {-140,-40}; 100 days long gap 30 days
-vol_estWindow20 = ds_dsf_mediaCoverage[(ds_dsf_mediaCoverage['BDaysRelativeToEvent']>=-140)&(ds_dsf_mediaCoverage['BDaysRelativeToEvent']<=-40)]
-vol_estWindow20['ISIN_EventDate'] = vol_estWindow20['ISIN'] + "_" + vol_estWindow20['EventDate'].astype(str)
+groups = {'all':None,'achieved':('achieved',1),'failed':('failed',1),'disappeared':('disappeared',1)}
+summaries = split_groups(volume_test(window_20,ds_dsf_targetAnnounce,['event_id'],groups,est_window=(-140,-40),events=registry))
+all_20_summary = summaries['all']
+achieved_20_summary = summaries['achieved']
+failed_20_summary = summaries['failed']
+disappeared_20_summary = summaries['disappeared']
 
-achieved_estWin_win20 = vol_estWindow20[vol_estWindow20['achieved']==1]
-failed_estWin_win20 = vol_estWindow20[(vol_estWindow20['failed']==1)]
-disappeared_estWin_win20 = vol_estWindow20[(vol_estWindow20['disappeared']==1)]
 
 
-# Normal volume
-norVol_achieved20 = achieved_estWin_win20.groupby(['ISIN_EventDate'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_achieved20.columns = ['ISIN_EventDate','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-norVol_failed20 = failed_estWin_win20.groupby(['ISIN_EventDate'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_failed20.columns = ['ISIN_EventDate','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-norVol_disappeared20 = disappeared_estWin_win20.groupby(['ISIN_EventDate'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_disappeared20.columns = ['ISIN_EventDate','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
 
 
-# Merge it to window return/volume data
-achieved_20 = pd.merge(achieved_20,norVol_achieved20,on=['ISIN_EventDate'],how='left')
-failed_20 = pd.merge(failed_20,norVol_failed20,on=['ISIN_EventDate'],how='left')
-disappeared_20 = pd.merge(disappeared_20,norVol_disappeared20,on=['ISIN_EventDate'],how='left')
-
-achieved_20['AbnVolume'] = achieved_20['Volume'] - achieved_20['normal_Volume']
-achieved_20['AbnVol_pct'] = achieved_20['Volume_pct'] - achieved_20['normal_Volume_pct']
-achieved_20['AbnVol_pctlog'] = achieved_20['Volume_pctlog'] - achieved_20['normal_Volume_pctlog']
-
-failed_20['AbnVolume'] = failed_20['Volume'] - failed_20['normal_Volume']
-failed_20['AbnVol_pct'] = failed_20['Volume_pct'] - failed_20['normal_Volume_pct']
-failed_20['AbnVol_pctlog'] = failed_20['Volume_pctlog'] - failed_20['normal_Volume_pctlog']
-
-disappeared_20['AbnVolume'] = disappeared_20['Volume'] - disappeared_20['normal_Volume']
-disappeared_20['AbnVol_pct'] = disappeared_20['Volume_pct'] - disappeared_20['normal_Volume_pct']
-disappeared_20['AbnVol_pctlog'] = disappeared_20['Volume_pctlog'] - disappeared_20['normal_Volume_pctlog']
 
+'''
+############################################################################################################
+###### FIrm-Year Panel data on market response around CDP releases  ###################
+############################################################################################################
+'''
 
-# Merge normal volume to estimation window volume data to get sd
-achieved_estWin_win20 = pd.merge(achieved_estWin_win20,norVol_achieved20,on=['ISIN_EventDate'],how='left')
-achieved_estWin_win20['AbnVolume'] = achieved_estWin_win20['Volume'] - achieved_estWin_win20['normal_Volume']
-achieved_estWin_win20['AbnVol_pct'] = achieved_estWin_win20['Volume_pct'] - achieved_estWin_win20['normal_Volume_pct']
-achieved_estWin_win20['AbnVol_pctlog'] = achieved_estWin_win20['Volume_pctlog'] - achieved_estWin_win20['normal_Volume_pctlog']
+##############################################################################
+''' #### Use this code to remove outliers with other extreme events '''
+### Three companies with extreme events:  Amkor Tech, Lenovo, Pearson
+remove_list1 = ['US0316521006', 'HK0992009065', 'GB0006776081']
+ds_dsf_CDPrelease_sub = ds_dsf_CDPrelease_sub[~ds_dsf_CDPrelease_sub['ISIN'].isin(remove_list1)]
 
-failed_estWin_win20 = pd.merge(failed_estWin_win20,norVol_failed20,on=['ISIN_EventDate'],how='left')
-failed_estWin_win20['AbnVolume'] = failed_estWin_win20['Volume'] - failed_estWin_win20['normal_Volume']
-failed_estWin_win20['AbnVol_pct'] = failed_estWin_win20['Volume_pct'] - failed_estWin_win20['normal_Volume_pct']
-failed_estWin_win20['AbnVol_pctlog'] = failed_estWin_win20['Volume_pctlog'] - failed_estWin_win20['normal_Volume_pctlog']
+### Additional outliers
+### ABB, Baker Hughes, Medtronic, Shawcor, Celestica, Loreal, Thule (achieved exp), 
+### Amorepacific, Intl Cons Airl Group (failed unexpected)
+remove_list2 = ['CH0012221716','US05722G1004','IE00BTN1Y115','CA8204391079','CA15101Q1081','FR0000120321','SE0006422390','US9497461015',
+                'KR7090430000','ES0177542018']
+ds_dsf_CDPrelease_sub = ds_dsf_CDPrelease_sub[~ds_dsf_CDPrelease_sub['ISIN'].isin(remove_list2)]
+##############################################################################
 
-disappeared_estWin_win20 = pd.merge(disappeared_estWin_win20,norVol_disappeared20,on=['ISIN_EventDate'],how='left')
-disappeared_estWin_win20['AbnVolume'] = disappeared_estWin_win20['Volume'] - disappeared_estWin_win20['normal_Volume']
-disappeared_estWin_win20['AbnVol_pct'] = disappeared_estWin_win20['Volume_pct'] - disappeared_estWin_win20['normal_Volume_pct']
-disappeared_estWin_win20['AbnVol_pctlog'] = disappeared_estWin_win20['Volume_pctlog'] - disappeared_estWin_win20['normal_Volume_pctlog']
+### Panel measures of each release: output column -> (measure, window, ...), see panel_metrics
+### CARs: drop firms without all days of the window; CAR (-1,1) uses the firms with all 5 days of (-1,3)
+### Volume: drop firms without all days of the window; estimation window = {-135,-35} ({-140,-40} for (-10,10)); 100 days long gap 30 days
+panel_CDPrelease_specs = {'EventDate_CDP':('attribute',(-1,10),'EventDate'),
+                          'CDP_CAR_m1_p10':('car',(-1,10)),
+                          'CDP_CAR_m1_p5':('car',(-1,5)),
+                          'CDP_CAR_m1_p3':('car',(-1,3)),
+                          'CDP_CAR_m1_p1':('car',(-1,1),(-1,3)),
+                          'CDP_AbnVol_pctlog_avgm5p5':('abnvol',(-5,5),(-135,-35)),
+                          'CDP_AbnVol_pctlog_day0':('abnvol',(-5,5),(-135,-35),0),
+                          'CDP_AbnVol_pctlog_avgm10p10':('abnvol',(-10,10),(-140,-40))}
+# Earlier releases (and any release added to cdp_releases): columns prefixed by the year of the target outcomes
+# in the release (release year - 1, e.g. CDP19 for the 2020 release), latest release first
+release_measures = {'CAR_m1_p3':('car',(-1,3)),
+                    'CAR_m1_p1':('car',(-1,1),(-1,3)),
+                    'AbnVol_pctlog_avgm5p5':('abnvol',(-5,5),(-135,-35)),
+                    'AbnVol_pctlog_day0':('abnvol',(-5,5),(-135,-35),0)}
+panel_specs = {'CDPrelease':panel_CDPrelease_specs,
+               **{name: {'CDP%02d_%s' % (pd.Timestamp(date).year-2001,measure): spec for measure, spec in release_measures.items()}
+                  for name, date in sorted(cdp_releases.items(),key=lambda release: release[1],reverse=True) if name!='CDPrelease'}}
+
+
+''' 2021 CDP release CARs (-1,10), (-1,5), (-1,3) & (-1,1), Volume (-5,5) & (-10,10); other releases (-1,3) & (-1,1), Volume (-5,5) '''
+# Outliers of the 2021 release removed above
+kept = {'CDPrelease': cube_CDPrelease[0]['event_id'].isin(ds_dsf_CDPrelease_sub['event_id']).to_numpy()}
+cdp_metrics = [panel_metrics(cdp_cubes[name],cdp_daily[name],specs,kept=kept.get(name)) for name, specs in panel_specs.items()]
+
+
+''' Panel for CDP releases '''
+# One row per firm (ISIN, id) with any measure of any release
+panel_returnVolume_CDPrelease = event_panel(cdp_metrics,pd.concat([cdp_cubes[name][0] for name in panel_specs]),['ISIN','id'],
+                                            [column for specs in panel_specs.values() for column in specs])
 
+# Save Panel Data
+panel_returnVolume_CDPrelease.to_csv(output_directory+"panel_returnVolume_CDPrelease.csv",index=False)
 
-# Event plot
-achieved_20_summary = achieved_20.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-failed_20_summary = failed_20.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-disappeared_20_summary = disappeared_20.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
 
-achieved_20_summary['N'] = achieved_20.groupby('NEWDaysRelativeToEvent',as_index=False)['AbnVolume'].count()['AbnVolume']
-failed_20_summary['N'] = failed_20.groupby('NEWDaysRelativeToEvent',as_index=False)['AbnVolume'].count()['AbnVolume']
-disappeared_20_summary['N'] = disappeared_20.groupby('NEWDaysRelativeToEvent',as_index=False)['AbnVolume'].count()['AbnVolume']
 
-# t-stat
-temp_achieved20 = achieved_estWin_win20.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_achieved20['AbnVolume_mbar'] = temp_achieved20['AbnVolume'] - temp_achieved20['AbnVolume'].mean()
-temp_achieved20['AbnVol_pct_mbar'] = temp_achieved20['AbnVol_pct'] - temp_achieved20['AbnVol_pct'].mean()
-temp_achieved20['AbnVol_pctlog_mbar'] = temp_achieved20['AbnVol_pctlog'] - temp_achieved20['AbnVol_pctlog'].mean()
 
-temp_achieved20['AbnVolume_mbar_sq'] = temp_achieved20['AbnVolume_mbar']**2
-temp_achieved20['AbnVol_pct_mbar_sq'] = temp_achieved20['AbnVol_pct_mbar']**2
-temp_achieved20['AbnVol_pctlog_mbar_sq'] = temp_achieved20['AbnVol_pctlog_mbar']**2
 
-achieved_20_summary['Var_AbnVolume'] = temp_achieved20['AbnVolume_mbar_sq'].mean()
-achieved_20_summary['Var_AbnVol_pct'] = temp_achieved20['AbnVol_pct_mbar_sq'].mean()
-achieved_20_summary['Var_AbnVol_pctlog'] = temp_achieved20['AbnVol_pctlog_mbar_sq'].mean()
+''' Panel for 2020 Target Announcement Media Coverage'''
+# There can be multiple media events for a firm
+events_targetAnnounce = cube_targetAnnounce[0]
+events_targetAnnounce['ISIN_EventDate'] = events_targetAnnounce['ISIN'] + "_" + events_targetAnnounce['EventDate'].astype(str)
 
+# Drop firms without all 5 (-1,3) and 3 (-1,1) days of data, and without all 11 days of (-5,5) for volume
+panel_targetAnnounce_specs = {'TargetAnnounce_CAR_m1_p3':('car',(-1,3)),
+                              'TargetAnnounce_CAR_m1_p1':('car',(-1,1)),
+                              'TargetAnnounce_AbnVol_pctlog_avgm5p5':('abnvol',(-5,5),(-135,-35)),
+                              'TargetAnnounce_AbnVol_pctlog_day0':('abnvol',(-5,5),(-135,-35),0)}
+metrics_targetAnnounce = panel_metrics(cube_targetAnnounce,ds_dsf_targetAnnounce,panel_targetAnnounce_specs)
 
-achieved_20_summary['sd_AbnVolume'] = np.sqrt(achieved_20_summary['Var_AbnVolume'])
-achieved_20_summary['sd_AbnVol_pct'] = np.sqrt(achieved_20_summary['Var_AbnVol_pct'])
-achieved_20_summary['sd_AbnVol_pctlog'] = np.sqrt(achieved_20_summary['Var_AbnVol_pctlog'])
-
-achieved_20_summary['t_AbnVolume'] = achieved_20_summary['AbnVolume']/achieved_20_summary['sd_AbnVolume']
-achieved_20_summary['t_AbnVol_pct'] = achieved_20_summary['AbnVol_pct']/achieved_20_summary['sd_AbnVol_pct']
-achieved_20_summary['t_AbnVol_pctlog'] = achieved_20_summary['AbnVol_pctlog']/achieved_20_summary['sd_AbnVol_pctlog']
-
-temp_failed20 = failed_estWin_win20.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_failed20['AbnVolume_mbar'] = temp_failed20['AbnVolume'] - temp_failed20['AbnVolume'].mean()
-temp_failed20['AbnVol_pct_mbar'] = temp_failed20['AbnVol_pct'] - temp_failed20['AbnVol_pct'].mean()
-temp_failed20['AbnVol_pctlog_mbar'] = temp_failed20['AbnVol_pctlog'] - temp_failed20['AbnVol_pctlog'].mean()
-
-temp_failed20['AbnVolume_mbar_sq'] = temp_failed20['AbnVolume_mbar']**2
-temp_failed20['AbnVol_pct_mbar_sq'] = temp_failed20['AbnVol_pct_mbar']**2
-temp_failed20['AbnVol_pctlog_mbar_sq'] = temp_failed20['AbnVol_pctlog_mbar']**2
-
-failed_20_summary['Var_AbnVolume'] = temp_failed20['AbnVolume_mbar_sq'].mean()
-failed_20_summary['Var_AbnVol_pct'] = temp_failed20['AbnVol_pct_mbar_sq'].mean()
-failed_20_summary['Var_AbnVol_pctlog'] = temp_failed20['AbnVol_pctlog_mbar_sq'].mean()
-
-failed_20_summary['sd_AbnVolume'] = np.sqrt(failed_20_summary['Var_AbnVolume'])
-failed_20_summary['sd_AbnVol_pct'] = np.sqrt(failed_20_summary['Var_AbnVol_pct'])
-failed_20_summary['sd_AbnVol_pctlog'] = np.sqrt(failed_20_summary['Var_AbnVol_pctlog'])
-
-failed_20_summary['t_AbnVolume'] = failed_20_summary['AbnVolume']/failed_20_summary['sd_AbnVolume']
-failed_20_summary['t_AbnVol_pct'] = failed_20_summary['AbnVol_pct']/failed_20_summary['sd_AbnVol_pct']
-failed_20_summary['t_AbnVol_pctlog'] = failed_20_summary['AbnVol_pctlog']/failed_20_summary['sd_AbnVol_pctlog']
-
-
-temp_disappeared20 = disappeared_estWin_win20.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_disappeared20['AbnVolume_mbar'] = temp_disappeared20['AbnVolume'] - temp_disappeared20['AbnVolume'].mean()
-temp_disappeared20['AbnVol_pct_mbar'] = temp_disappeared20['AbnVol_pct'] - temp_disappeared20['AbnVol_pct'].mean()
-temp_disappeared20['AbnVol_pctlog_mbar'] = temp_disappeared20['AbnVol_pctlog'] - temp_disappeared20['AbnVol_pctlog'].mean()
-
-temp_disappeared20['AbnVolume_mbar_sq'] = temp_disappeared20['AbnVolume_mbar']**2
-temp_disappeared20['AbnVol_pct_mbar_sq'] = temp_disappeared20['AbnVol_pct_mbar']**2
-temp_disappeared20['AbnVol_pctlog_mbar_sq'] = temp_disappeared20['AbnVol_pctlog_mbar']**2
-
-disappeared_20_summary['Var_AbnVolume'] = temp_disappeared20['AbnVolume_mbar_sq'].mean()
-disappeared_20_summary['Var_AbnVol_pct'] = temp_disappeared20['AbnVol_pct_mbar_sq'].mean()
-disappeared_20_summary['Var_AbnVol_pctlog'] = temp_disappeared20['AbnVol_pctlog_mbar_sq'].mean()
-
-disappeared_20_summary['sd_AbnVolume'] = np.sqrt(disappeared_20_summary['Var_AbnVolume'])
-disappeared_20_summary['sd_AbnVol_pct'] = np.sqrt(disappeared_20_summary['Var_AbnVol_pct'])
-disappeared_20_summary['sd_AbnVol_pctlog'] = np.sqrt(disappeared_20_summary['Var_AbnVol_pctlog'])
-
-disappeared_20_summary['t_AbnVolume'] = disappeared_20_summary['AbnVolume']/disappeared_20_summary['sd_AbnVolume']
-disappeared_20_summary['t_AbnVol_pct'] = disappeared_20_summary['AbnVol_pct']/disappeared_20_summary['sd_AbnVol_pct']
-disappeared_20_summary['t_AbnVol_pctlog'] = disappeared_20_summary['AbnVol_pctlog']/disappeared_20_summary['sd_AbnVol_pctlog']
-
-
-
-
-
-
-'''
-####################################################################################
-##########   Around CSR Report Announcements  #######################################
-###################################################################################
-'''
-
-''' Returns Around CSR Reports (10 days window; -1 to +10) '''
-
-window_10 = ds_dsf_csrReport_sub[(ds_dsf_csrReport_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_csrReport_sub['NEWDaysRelativeToEvent']<=10)]
-
-# Drop firms without all 10 days of data
-remove_list = window_10.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<12] # This is the count of days
-window_10 = window_10[~window_10['ISIN'].isin(remove_list.ISIN)]
-
-failed_10 = window_10.copy() # There are only failed firms in this sample
-
-# Cumulative returns
-failed_10['CAR_logPct'] = failed_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-
-# Get CAAR
-failed_10_summary = failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-failed_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-
-# t-stat - Cross-sectional test
-failed_10 = pd.merge(failed_10,failed_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-failed_10['CAR-CAAR'] = failed_10['CAR_logPct'] - failed_10['CAAR_logPct']
-failed_10['CAR-CAAR_sq'] = failed_10['CAR-CAAR']**2
-
-failed_10_summary['sum_CAR-CAAR_sq'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-failed_10_summary['N'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-failed_10_summary['VAR_CAAR'] = failed_10_summary['sum_CAR-CAAR_sq'] / (failed_10_summary['N']-1)
-failed_10_summary['SD_CAAR'] = np.sqrt(failed_10_summary['VAR_CAAR'])
-
-failed_10_summary['T_CSecT'] = (np.sqrt(failed_10_summary['N']))*failed_10_summary['CAAR_logPct']/failed_10_summary['SD_CAAR']
-
-# Get AAR
-failed_10_summary['AAR_logPct'] = failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = failed_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-failed_10 = pd.merge(failed_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-failed_10['MAR-AAR'] = failed_10['adjRet_MarketModel_logPct'] - failed_10['AAR_logPct']
-failed_10['MAR-AAR_sq'] = failed_10['MAR-AAR']**2
-
-failed_10_summary['sum_MAR-AAR_sq'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-failed_10_summary['N'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-failed_10_summary['VAR_AAR'] = failed_10_summary['sum_MAR-AAR_sq'] / (failed_10_summary['N']-1)
-failed_10_summary['SD_AAR'] = np.sqrt(failed_10_summary['VAR_AAR'])
-
-failed_10_summary['T_MAR_CSecT'] = (np.sqrt(failed_10_summary['N']))*failed_10_summary['AAR_logPct']/failed_10_summary['SD_AAR']
-
-
-''' Returns Around CSR Reports - MATERIAL FIRMS ONLY ( -1 to +10) '''
-
-cross_list = pd.read_excel(data_directory+'companies_with_failed_targets_CSRreport_sentences_with_dates.xlsx',
-                           sheet_name='list of failed with CSR dates')
-
-window_10 = ds_dsf_csrReport_sub[(ds_dsf_csrReport_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_csrReport_sub['NEWDaysRelativeToEvent']<=10)]
-
-# Drop firms without all 10 days of data
-remove_list = window_10.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<12] # This is the count of days
-window_10 = window_10[~window_10['ISIN'].isin(remove_list.ISIN)]
-
-### Keep only material firms
-material_list = cross_list[cross_list['emission_industry_high']==1]
-window_10 = window_10[window_10['ISIN'].isin(material_list['isin'])]
-
-failed_10 = window_10.copy() # There are only failed firms in this sample
-
-# Cumulative returns
-failed_10['CAR_logPct'] = failed_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-
-# Get CAAR
-failed_10_summary = failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-failed_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-
-# t-stat - Cross-sectional test
-failed_10 = pd.merge(failed_10,failed_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-failed_10['CAR-CAAR'] = failed_10['CAR_logPct'] - failed_10['CAAR_logPct']
-failed_10['CAR-CAAR_sq'] = failed_10['CAR-CAAR']**2
-
-failed_10_summary['sum_CAR-CAAR_sq'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-failed_10_summary['N'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-failed_10_summary['VAR_CAAR'] = failed_10_summary['sum_CAR-CAAR_sq'] / (failed_10_summary['N']-1)
-failed_10_summary['SD_CAAR'] = np.sqrt(failed_10_summary['VAR_CAAR'])
-
-failed_10_summary['T_CSecT'] = (np.sqrt(failed_10_summary['N']))*failed_10_summary['CAAR_logPct']/failed_10_summary['SD_CAAR']
-
-# Get AAR
-failed_10_summary['AAR_logPct'] = failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = failed_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-failed_10 = pd.merge(failed_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-failed_10['MAR-AAR'] = failed_10['adjRet_MarketModel_logPct'] - failed_10['AAR_logPct']
-failed_10['MAR-AAR_sq'] = failed_10['MAR-AAR']**2
-
-failed_10_summary['sum_MAR-AAR_sq'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-failed_10_summary['N'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-failed_10_summary['VAR_AAR'] = failed_10_summary['sum_MAR-AAR_sq'] / (failed_10_summary['N']-1)
-failed_10_summary['SD_AAR'] = np.sqrt(failed_10_summary['VAR_AAR'])
-
-failed_10_summary['T_MAR_CSecT'] = (np.sqrt(failed_10_summary['N']))*failed_10_summary['AAR_logPct']/failed_10_summary['SD_AAR']
-
-
-''' Returns Around CSR Reports - NON-COVID FIRMS ONLY ( -1 to +10) '''
-
-cross_list = pd.read_excel(output_directory+'companies_with_failed_targets_CSRreport_sentences_with_dates.xlsx',
-                           sheet_name='list of failed with CSR dates')
-
-window_10 = ds_dsf_csrReport_sub[(ds_dsf_csrReport_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_csrReport_sub['NEWDaysRelativeToEvent']<=10)]
-
-# Drop firms without all 10 days of data
-remove_list = window_10.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<12] # This is the count of days
-window_10 = window_10[~window_10['ISIN'].isin(remove_list.ISIN)]
-
-### Drop covid firms
-noncovid_list = cross_list[cross_list['type_covid_industry']==0]
-window_10 = window_10[window_10['ISIN'].isin(noncovid_list['isin'])]
-
-failed_10 = window_10.copy() # There are only failed firms in this sample
-
-# Cumulative returns
-failed_10['CAR_logPct'] = failed_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-
-# Get CAAR
-failed_10_summary = failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-failed_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-
-# t-stat - Cross-sectional test
-failed_10 = pd.merge(failed_10,failed_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-failed_10['CAR-CAAR'] = failed_10['CAR_logPct'] - failed_10['CAAR_logPct']
-failed_10['CAR-CAAR_sq'] = failed_10['CAR-CAAR']**2
-
-failed_10_summary['sum_CAR-CAAR_sq'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-failed_10_summary['N'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-failed_10_summary['VAR_CAAR'] = failed_10_summary['sum_CAR-CAAR_sq'] / (failed_10_summary['N']-1)
-failed_10_summary['SD_CAAR'] = np.sqrt(failed_10_summary['VAR_CAAR'])
-
-failed_10_summary['T_CSecT'] = (np.sqrt(failed_10_summary['N']))*failed_10_summary['CAAR_logPct']/failed_10_summary['SD_CAAR']
-
-# Get AAR
-failed_10_summary['AAR_logPct'] = failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = failed_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-failed_10 = pd.merge(failed_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-failed_10['MAR-AAR'] = failed_10['adjRet_MarketModel_logPct'] - failed_10['AAR_logPct']
-failed_10['MAR-AAR_sq'] = failed_10['MAR-AAR']**2
-
-failed_10_summary['sum_MAR-AAR_sq'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-failed_10_summary['N'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-failed_10_summary['VAR_AAR'] = failed_10_summary['sum_MAR-AAR_sq'] / (failed_10_summary['N']-1)
-failed_10_summary['SD_AAR'] = np.sqrt(failed_10_summary['VAR_AAR'])
-
-failed_10_summary['T_MAR_CSecT'] = (np.sqrt(failed_10_summary['N']))*failed_10_summary['AAR_logPct']/failed_10_summary['SD_AAR']
-
-
-''' Returns Around CSR Reports - High vs. Low Ambition ( -1 to +10) '''
-
-cross_list = pd.read_excel(data_directory+'companies_with_failed_targets_CSRreport_sentences_with_dates.xlsx',
-                           sheet_name='list of failed with CSR dates')
-
-window_10 = ds_dsf_csrReport_sub[(ds_dsf_csrReport_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_csrReport_sub['NEWDaysRelativeToEvent']<=10)]
-
-# Drop firms without all 10 days of data
-remove_list = window_10.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<12] # This is the count of days
-window_10 = window_10[~window_10['ISIN'].isin(remove_list.ISIN)]
-
-failed_10 = window_10.copy() # There are only failed firms in this sample
-
-high_amb = cross_list[cross_list['failed_high_ambition']==1]
-low_amb = cross_list[cross_list['failed_high_ambition']==0]
-
-failed_high_10 = failed_10[failed_10['ISIN'].isin(high_amb['isin'])]
-failed_low_10 = failed_10[failed_10['ISIN'].isin(low_amb['isin'])]
-
-# Cumulative returns
-failed_high_10['CAR_logPct'] = failed_high_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-failed_low_10['CAR_logPct'] = failed_low_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-
-# Get CAAR
-failed_high_10_summary = failed_high_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-failed_high_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-
-failed_low_10_summary = failed_low_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-failed_low_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-
-# High ambition t-stat - Cross-sectional test
-failed_high_10 = pd.merge(failed_high_10,failed_high_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-failed_high_10['CAR-CAAR'] = failed_high_10['CAR_logPct'] - failed_high_10['CAAR_logPct']
-failed_high_10['CAR-CAAR_sq'] = failed_high_10['CAR-CAAR']**2
-
-failed_high_10_summary['sum_CAR-CAAR_sq'] = (failed_high_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-failed_high_10_summary['N'] = (failed_high_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-failed_high_10_summary['VAR_CAAR'] = failed_high_10_summary['sum_CAR-CAAR_sq'] / (failed_high_10_summary['N']-1)
-failed_high_10_summary['SD_CAAR'] = np.sqrt(failed_high_10_summary['VAR_CAAR'])
-
-failed_high_10_summary['T_CSecT'] = (np.sqrt(failed_high_10_summary['N']))*failed_high_10_summary['CAAR_logPct']/failed_high_10_summary['SD_CAAR']
-
-# Get AAR
-failed_high_10_summary['AAR_logPct'] = failed_high_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = failed_high_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-failed_high_10 = pd.merge(failed_high_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-failed_high_10['MAR-AAR'] = failed_high_10['adjRet_MarketModel_logPct'] - failed_high_10['AAR_logPct']
-failed_high_10['MAR-AAR_sq'] = failed_high_10['MAR-AAR']**2
-
-failed_high_10_summary['sum_MAR-AAR_sq'] = (failed_high_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-failed_high_10_summary['N'] = (failed_high_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-failed_high_10_summary['VAR_AAR'] = failed_high_10_summary['sum_MAR-AAR_sq'] / (failed_high_10_summary['N']-1)
-failed_high_10_summary['SD_AAR'] = np.sqrt(failed_high_10_summary['VAR_AAR'])
-
-failed_high_10_summary['T_MAR_CSecT'] = (np.sqrt(failed_high_10_summary['N']))*failed_high_10_summary['AAR_logPct']/failed_high_10_summary['SD_AAR']
-
-# Low ambition t-stat - Cross-sectional test
-failed_low_10 = pd.merge(failed_low_10,failed_low_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-failed_low_10['CAR-CAAR'] = failed_low_10['CAR_logPct'] - failed_low_10['CAAR_logPct']
-failed_low_10['CAR-CAAR_sq'] = failed_low_10['CAR-CAAR']**2
-
-failed_low_10_summary['sum_CAR-CAAR_sq'] = (failed_low_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-failed_low_10_summary['N'] = (failed_low_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-failed_low_10_summary['VAR_CAAR'] = failed_low_10_summary['sum_CAR-CAAR_sq'] / (failed_low_10_summary['N']-1)
-failed_low_10_summary['SD_CAAR'] = np.sqrt(failed_low_10_summary['VAR_CAAR'])
-
-failed_low_10_summary['T_CSecT'] = (np.sqrt(failed_low_10_summary['N']))*failed_low_10_summary['CAAR_logPct']/failed_low_10_summary['SD_CAAR']
-
-# Get AAR
-failed_low_10_summary['AAR_logPct'] = failed_low_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = failed_low_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-failed_low_10 = pd.merge(failed_low_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-failed_low_10['MAR-AAR'] = failed_low_10['adjRet_MarketModel_logPct'] - failed_low_10['AAR_logPct']
-failed_low_10['MAR-AAR_sq'] = failed_low_10['MAR-AAR']**2
-
-failed_low_10_summary['sum_MAR-AAR_sq'] = (failed_low_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-failed_low_10_summary['N'] = (failed_low_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-failed_low_10_summary['VAR_AAR'] = failed_low_10_summary['sum_MAR-AAR_sq'] / (failed_low_10_summary['N']-1)
-failed_low_10_summary['SD_AAR'] = np.sqrt(failed_low_10_summary['VAR_AAR'])
-
-failed_low_10_summary['T_MAR_CSecT'] = (np.sqrt(failed_low_10_summary['N']))*failed_low_10_summary['AAR_logPct']/failed_low_10_summary['SD_AAR']
-
-
-
-
-''' Volume Test - 20 day around CSR Report Announcements '''
-# T stats for abnormal volume are calculated based on the distribution of the abnormal volume during the estimation window (Campbell and Wasley, 1996).
-
-window_20 = ds_dsf_csrReport_sub[(ds_dsf_csrReport_sub['NEWDaysRelativeToEvent']>=-10)&(ds_dsf_csrReport_sub['NEWDaysRelativeToEvent']<=10)]
-
-# Drop firms without all 20 days of data
-remove_list = window_20.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<21] # This is the count of days
-window_20 = window_20[~window_20['ISIN'].isin(remove_list.ISIN)]
-
-failed_20 = window_20.copy() # There are only failed firms in this sample
-
-
-# Abnormal volume 
-# Estimation window = {-140,-40}; 100 days long gap 30 days
-vol_estWindow20 = ds_dsf_csrReport[(ds_dsf_csrReport['BDaysRelativeToEvent']>=-140)&(ds_dsf_csrReport['BDaysRelativeToEvent']<=-40)]
-failed_estWin_win20 = vol_estWindow20.copy() # There are only failed firms in this sample
-
-# Normal volume
-norVol_failed20 = failed_estWin_win20.groupby(['ISIN'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_failed20.columns = ['ISIN','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-
-# Merge it to window return data
-failed_20 = pd.merge(failed_20,norVol_failed20,on=['ISIN'],how='left')
-
-failed_20['AbnVolume'] = failed_20['Volume'] - failed_20['normal_Volume']
-failed_20['AbnVol_pct'] = failed_20['Volume_pct'] - failed_20['normal_Volume_pct']
-failed_20['AbnVol_pctlog'] = failed_20['Volume_pctlog'] - failed_20['normal_Volume_pctlog']
-
-# Merge normal volume to estimation window volume data to get sd
-failed_estWin_win20 = pd.merge(failed_estWin_win20,norVol_failed20,on=['ISIN'],how='left')
-failed_estWin_win20['AbnVolume'] = failed_estWin_win20['Volume'] - failed_estWin_win20['normal_Volume']
-failed_estWin_win20['AbnVol_pct'] = failed_estWin_win20['Volume_pct'] - failed_estWin_win20['normal_Volume_pct']
-failed_estWin_win20['AbnVol_pctlog'] = failed_estWin_win20['Volume_pctlog'] - failed_estWin_win20['normal_Volume_pctlog']
-
-# Event plot
-failed_20_summary = failed_20.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-failed_20_summary['N'] = (failed_20.groupby(['NEWDaysRelativeToEvent'],as_index=False)['AbnVolume'].count()['AbnVolume'])
-
-# t-stat
-temp_failed20 = failed_estWin_win20.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_failed20['AbnVolume_mbar'] = temp_failed20['AbnVolume'] - temp_failed20['AbnVolume'].mean()
-temp_failed20['AbnVol_pct_mbar'] = temp_failed20['AbnVol_pct'] - temp_failed20['AbnVol_pct'].mean()
-temp_failed20['AbnVol_pctlog_mbar'] = temp_failed20['AbnVol_pctlog'] - temp_failed20['AbnVol_pctlog'].mean()
-
-temp_failed20['AbnVolume_mbar_sq'] = temp_failed20['AbnVolume_mbar']**2
-temp_failed20['AbnVol_pct_mbar_sq'] = temp_failed20['AbnVol_pct_mbar']**2
-temp_failed20['AbnVol_pctlog_mbar_sq'] = temp_failed20['AbnVol_pctlog_mbar']**2
-
-failed_20_summary['Var_AbnVolume'] = temp_failed20['AbnVolume_mbar_sq'].mean()
-failed_20_summary['Var_AbnVol_pct'] = temp_failed20['AbnVol_pct_mbar_sq'].mean()
-failed_20_summary['Var_AbnVol_pctlog'] = temp_failed20['AbnVol_pctlog_mbar_sq'].mean()
-
-failed_20_summary['sd_AbnVolume'] = np.sqrt(failed_20_summary['Var_AbnVolume'])
-failed_20_summary['sd_AbnVol_pct'] = np.sqrt(failed_20_summary['Var_AbnVol_pct'])
-failed_20_summary['sd_AbnVol_pctlog'] = np.sqrt(failed_20_summary['Var_AbnVol_pctlog'])
-
-failed_20_summary['t_AbnVolume'] = failed_20_summary['AbnVolume']/failed_20_summary['sd_AbnVolume']
-failed_20_summary['t_AbnVol_pct'] = failed_20_summary['AbnVol_pct']/failed_20_summary['sd_AbnVol_pct']
-failed_20_summary['t_AbnVol_pctlog'] = failed_20_summary['AbnVol_pctlog']/failed_20_summary['sd_AbnVol_pctlog']
-
-
-
-
-
-
-'''
-############################################################################################################
-######   Around CDP Response Release   ###################
-############################################################################################################
-'''
-##############################################################################
-''' #### Use this code to remove outliers with other extreme events '''
-### Three companies with extreme events:  Amkor Tech, Lenovo, Pearson
-remove_list1 = ['US0316521006', 'HK0992009065', 'GB0006776081']
-ds_dsf_CDPrelease_sub = ds_dsf_CDPrelease_sub[~ds_dsf_CDPrelease_sub['ISIN'].isin(remove_list1)]
-
-### Additional outliers
-### ABB, Baker Hughes, Medtronic, Shawcor, Celestica, Loreal, Thule (achieved exp), 
-### Amorepacific, Intl Cons Airl Group (failed unexpected)
-remove_list2 = ['CH0012221716','US05722G1004','IE00BTN1Y115','CA8204391079','CA15101Q1081','FR0000120321','SE0006422390','US9497461015',
-                'KR7090430000','ES0177542018']
-ds_dsf_CDPrelease_sub = ds_dsf_CDPrelease_sub[~ds_dsf_CDPrelease_sub['ISIN'].isin(remove_list2)]
-##############################################################################
-
-
-
-''' Returns Around CDP Report Release (5 days window; -1 to +3) '''
-window_5 = ds_dsf_CDPrelease_sub[(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']<=3)]
-
-# Drop firms without all 5 days of data
-remove_list = window_5.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<5] # This is the count of days
-window_5 = window_5[~window_5['ISIN'].isin(remove_list.ISIN)]
-
-achieved_5 = window_5[window_5['type']=='Achieved']
-failed_5 = window_5[(window_5['type']=='Failed')]
-
-dis_highReduction_5 = window_5[(window_5['type']=='Disappeared High Reduction')]
-dis_lowReduction_5 = window_5[(window_5['type']=='Disappeared Low Reduction')]
-
-
-# Cumulative returns
-achieved_5['CAR_logPct'] = achieved_5.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-failed_5['CAR_logPct'] = failed_5.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-dis_highReduction_5['CAR_logPct'] = dis_highReduction_5.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-dis_lowReduction_5['CAR_logPct'] = dis_lowReduction_5.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-
-# Get CAAR
-achieved_5_summary = achieved_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-failed_5_summary = failed_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-dis_highReduction_5_summary = dis_highReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-dis_lowReduction_5_summary = dis_lowReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-
-achieved_5_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-failed_5_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-
-dis_highReduction_5_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-dis_lowReduction_5_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-
-
-# t-stat - Cross-sectional test
-achieved_5 = pd.merge(achieved_5,achieved_5_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-achieved_5['CAR-CAAR'] = achieved_5['CAR_logPct'] - achieved_5['CAAR_logPct']
-achieved_5['CAR-CAAR_sq'] = achieved_5['CAR-CAAR']**2
-
-achieved_5_summary['sum_CAR-CAAR_sq'] = (achieved_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-achieved_5_summary['N'] = (achieved_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-achieved_5_summary['VAR_CAAR'] = achieved_5_summary['sum_CAR-CAAR_sq'] / (achieved_5_summary['N']-1)
-achieved_5_summary['SD_CAAR'] = np.sqrt(achieved_5_summary['VAR_CAAR'])
-
-achieved_5_summary['T_CSecT'] = (np.sqrt(achieved_5_summary['N']))*achieved_5_summary['CAAR_logPct']/achieved_5_summary['SD_CAAR']
-
-# Get AAR
-achieved_5_summary['AAR_logPct'] = achieved_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = achieved_5_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-achieved_5 = pd.merge(achieved_5,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-achieved_5['MAR-AAR'] = achieved_5['adjRet_MarketModel_logPct'] - achieved_5['AAR_logPct']
-achieved_5['MAR-AAR_sq'] = achieved_5['MAR-AAR']**2
-
-achieved_5_summary['sum_MAR-AAR_sq'] = (achieved_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-achieved_5_summary['N'] = (achieved_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-achieved_5_summary['VAR_AAR'] = achieved_5_summary['sum_MAR-AAR_sq'] / (achieved_5_summary['N']-1)
-achieved_5_summary['SD_AAR'] = np.sqrt(achieved_5_summary['VAR_AAR'])
-
-achieved_5_summary['T_MAR_CSecT'] = (np.sqrt(achieved_5_summary['N']))*achieved_5_summary['AAR_logPct']/achieved_5_summary['SD_AAR']
-
-
-
-# Failed  t-stat - Cross-sectional test
-failed_5 = pd.merge(failed_5,failed_5_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-failed_5['CAR-CAAR'] = failed_5['CAR_logPct'] - failed_5['CAAR_logPct']
-failed_5['CAR-CAAR_sq'] = failed_5['CAR-CAAR']**2
-
-failed_5_summary['sum_CAR-CAAR_sq'] = (failed_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-failed_5_summary['N'] = (failed_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-failed_5_summary['VAR_CAAR'] = failed_5_summary['sum_CAR-CAAR_sq'] / (failed_5_summary['N']-1)
-failed_5_summary['SD_CAAR'] = np.sqrt(failed_5_summary['VAR_CAAR'])
-
-failed_5_summary['T_CSecT'] = (np.sqrt(failed_5_summary['N']))*failed_5_summary['CAAR_logPct']/failed_5_summary['SD_CAAR']
-
-# Get AAR
-failed_5_summary['AAR_logPct'] = failed_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = failed_5_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-failed_5 = pd.merge(failed_5,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-failed_5['MAR-AAR'] = failed_5['adjRet_MarketModel_logPct'] - failed_5['AAR_logPct']
-failed_5['MAR-AAR_sq'] = failed_5['MAR-AAR']**2
-
-failed_5_summary['sum_MAR-AAR_sq'] = (failed_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-failed_5_summary['N'] = (failed_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-failed_5_summary['VAR_AAR'] = failed_5_summary['sum_MAR-AAR_sq'] / (failed_5_summary['N']-1)
-failed_5_summary['SD_AAR'] = np.sqrt(failed_5_summary['VAR_AAR'])
-
-failed_5_summary['T_MAR_CSecT'] = (np.sqrt(failed_5_summary['N']))*failed_5_summary['AAR_logPct']/failed_5_summary['SD_AAR']
-
-
-# Disappeared Type3  t-stat - Cross-sectional test
-dis_highReduction_5 = pd.merge(dis_highReduction_5,dis_highReduction_5_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-dis_highReduction_5['CAR-CAAR'] = dis_highReduction_5['CAR_logPct'] - dis_highReduction_5['CAAR_logPct']
-dis_highReduction_5['CAR-CAAR_sq'] = dis_highReduction_5['CAR-CAAR']**2
-
-dis_highReduction_5_summary['sum_CAR-CAAR_sq'] = (dis_highReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-dis_highReduction_5_summary['N'] = (dis_highReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-dis_highReduction_5_summary['VAR_CAAR'] = dis_highReduction_5_summary['sum_CAR-CAAR_sq'] / (dis_highReduction_5_summary['N']-1)
-dis_highReduction_5_summary['SD_CAAR'] = np.sqrt(dis_highReduction_5_summary['VAR_CAAR'])
-
-dis_highReduction_5_summary['T_CSecT'] = (np.sqrt(dis_highReduction_5_summary['N']))*dis_highReduction_5_summary['CAAR_logPct']/dis_highReduction_5_summary['SD_CAAR']
-
-# Get AAR
-dis_highReduction_5_summary['AAR_logPct'] = dis_highReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = dis_highReduction_5_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-dis_highReduction_5 = pd.merge(dis_highReduction_5,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-dis_highReduction_5['MAR-AAR'] = dis_highReduction_5['adjRet_MarketModel_logPct'] - dis_highReduction_5['AAR_logPct']
-dis_highReduction_5['MAR-AAR_sq'] = dis_highReduction_5['MAR-AAR']**2
-
-dis_highReduction_5_summary['sum_MAR-AAR_sq'] = (dis_highReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-dis_highReduction_5_summary['N'] = (dis_highReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-dis_highReduction_5_summary['VAR_AAR'] = dis_highReduction_5_summary['sum_MAR-AAR_sq'] / (dis_highReduction_5_summary['N']-1)
-dis_highReduction_5_summary['SD_AAR'] = np.sqrt(dis_highReduction_5_summary['VAR_AAR'])
-
-dis_highReduction_5_summary['T_MAR_CSecT'] = (np.sqrt(dis_highReduction_5_summary['N']))*dis_highReduction_5_summary['AAR_logPct']/dis_highReduction_5_summary['SD_AAR']
-
-# Disappeared Type4 t-stat - Cross-sectional test
-dis_lowReduction_5 = pd.merge(dis_lowReduction_5,dis_lowReduction_5_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-dis_lowReduction_5['CAR-CAAR'] = dis_lowReduction_5['CAR_logPct'] - dis_lowReduction_5['CAAR_logPct']
-dis_lowReduction_5['CAR-CAAR_sq'] = dis_lowReduction_5['CAR-CAAR']**2
-
-dis_lowReduction_5_summary['sum_CAR-CAAR_sq'] = (dis_lowReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-dis_lowReduction_5_summary['N'] = (dis_lowReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-dis_lowReduction_5_summary['VAR_CAAR'] = dis_lowReduction_5_summary['sum_CAR-CAAR_sq'] / (dis_lowReduction_5_summary['N']-1)
-dis_lowReduction_5_summary['SD_CAAR'] = np.sqrt(dis_lowReduction_5_summary['VAR_CAAR'])
-
-dis_lowReduction_5_summary['T_CSecT'] = (np.sqrt(dis_lowReduction_5_summary['N']))*dis_lowReduction_5_summary['CAAR_logPct']/dis_lowReduction_5_summary['SD_CAAR']
-
-# Get AAR
-dis_lowReduction_5_summary['AAR_logPct'] = dis_lowReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = dis_lowReduction_5_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-dis_lowReduction_5 = pd.merge(dis_lowReduction_5,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-dis_lowReduction_5['MAR-AAR'] = dis_lowReduction_5['adjRet_MarketModel_logPct'] - dis_lowReduction_5['AAR_logPct']
-dis_lowReduction_5['MAR-AAR_sq'] = dis_lowReduction_5['MAR-AAR']**2
-
-dis_lowReduction_5_summary['sum_MAR-AAR_sq'] = (dis_lowReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-dis_lowReduction_5_summary['N'] = (dis_lowReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-dis_lowReduction_5_summary['VAR_AAR'] = dis_lowReduction_5_summary['sum_MAR-AAR_sq'] / (dis_lowReduction_5_summary['N']-1)
-dis_lowReduction_5_summary['SD_AAR'] = np.sqrt(dis_lowReduction_5_summary['VAR_AAR'])
-
-dis_lowReduction_5_summary['T_MAR_CSecT'] = (np.sqrt(dis_lowReduction_5_summary['N']))*dis_lowReduction_5_summary['AAR_logPct']/dis_lowReduction_5_summary['SD_AAR']
-
-
-
-''' Returns Around CDP Report Release (10 days window; -1 to +10) '''
-window_10 = ds_dsf_CDPrelease_sub[(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']<=10)]
-
-# Drop firms without all 10 days of data
-remove_list = window_10.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<12] # This is the count of days
-window_10 = window_10[~window_10['ISIN'].isin(remove_list.ISIN)]
-
-achieved_10 = window_10[window_10['type']=='Achieved']
-failed_10 = window_10[(window_10['type']=='Failed')]
-
-dis_highReduction_10 = window_10[(window_10['type']=='Disappeared High Reduction')]
-dis_lowReduction_10 = window_10[(window_10['type']=='Disappeared Low Reduction')]
-
-
-# Cumulative returns
-achieved_10['CAR_logPct'] = achieved_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-failed_10['CAR_logPct'] = failed_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-
-dis_highReduction_10['CAR_logPct'] = dis_highReduction_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-dis_lowReduction_10['CAR_logPct'] = dis_lowReduction_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-
-# Get CAAR
-achieved_10_summary = achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-failed_10_summary = failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-dis_highReduction_10_summary = dis_highReduction_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-dis_lowReduction_10_summary = dis_lowReduction_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-
-
-achieved_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-failed_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-dis_highReduction_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-dis_lowReduction_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-
-
-# t-stat - Cross-sectional test
-achieved_10 = pd.merge(achieved_10,achieved_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-achieved_10['CAR-CAAR'] = achieved_10['CAR_logPct'] - achieved_10['CAAR_logPct']
-achieved_10['CAR-CAAR_sq'] = achieved_10['CAR-CAAR']**2
-
-achieved_10_summary['sum_CAR-CAAR_sq'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-achieved_10_summary['N'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-achieved_10_summary['VAR_CAAR'] = achieved_10_summary['sum_CAR-CAAR_sq'] / (achieved_10_summary['N']-1)
-achieved_10_summary['SD_CAAR'] = np.sqrt(achieved_10_summary['VAR_CAAR'])
-
-achieved_10_summary['T_CSecT'] = (np.sqrt(achieved_10_summary['N']))*achieved_10_summary['CAAR_logPct']/achieved_10_summary['SD_CAAR']
-
-# Get AAR
-achieved_10_summary['AAR_logPct'] = achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = achieved_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-achieved_10 = pd.merge(achieved_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-achieved_10['MAR-AAR'] = achieved_10['adjRet_MarketModel_logPct'] - achieved_10['AAR_logPct']
-achieved_10['MAR-AAR_sq'] = achieved_10['MAR-AAR']**2
-
-achieved_10_summary['sum_MAR-AAR_sq'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-achieved_10_summary['N'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-achieved_10_summary['VAR_AAR'] = achieved_10_summary['sum_MAR-AAR_sq'] / (achieved_10_summary['N']-1)
-achieved_10_summary['SD_AAR'] = np.sqrt(achieved_10_summary['VAR_AAR'])
-
-achieved_10_summary['T_MAR_CSecT'] = (np.sqrt(achieved_10_summary['N']))*achieved_10_summary['AAR_logPct']/achieved_10_summary['SD_AAR']
-
-
-
-# Failed  t-stat - Cross-sectional test
-failed_10 = pd.merge(failed_10,failed_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-failed_10['CAR-CAAR'] = failed_10['CAR_logPct'] - failed_10['CAAR_logPct']
-failed_10['CAR-CAAR_sq'] = failed_10['CAR-CAAR']**2
-
-failed_10_summary['sum_CAR-CAAR_sq'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-failed_10_summary['N'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-failed_10_summary['VAR_CAAR'] = failed_10_summary['sum_CAR-CAAR_sq'] / (failed_10_summary['N']-1)
-failed_10_summary['SD_CAAR'] = np.sqrt(failed_10_summary['VAR_CAAR'])
-
-failed_10_summary['T_CSecT'] = (np.sqrt(failed_10_summary['N']))*failed_10_summary['CAAR_logPct']/failed_10_summary['SD_CAAR']
-
-# Get AAR
-failed_10_summary['AAR_logPct'] = failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = failed_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-failed_10 = pd.merge(failed_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-failed_10['MAR-AAR'] = failed_10['adjRet_MarketModel_logPct'] - failed_10['AAR_logPct']
-failed_10['MAR-AAR_sq'] = failed_10['MAR-AAR']**2
-
-failed_10_summary['sum_MAR-AAR_sq'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-failed_10_summary['N'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-failed_10_summary['VAR_AAR'] = failed_10_summary['sum_MAR-AAR_sq'] / (failed_10_summary['N']-1)
-failed_10_summary['SD_AAR'] = np.sqrt(failed_10_summary['VAR_AAR'])
-
-failed_10_summary['T_MAR_CSecT'] = (np.sqrt(failed_10_summary['N']))*failed_10_summary['AAR_logPct']/failed_10_summary['SD_AAR']
-
-
-# Disappeared Type3  t-stat - Cross-sectional test
-dis_highReduction_10 = pd.merge(dis_highReduction_10,dis_highReduction_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-dis_highReduction_10['CAR-CAAR'] = dis_highReduction_10['CAR_logPct'] - dis_highReduction_10['CAAR_logPct']
-dis_highReduction_10['CAR-CAAR_sq'] = dis_highReduction_10['CAR-CAAR']**2
-
-dis_highReduction_10_summary['sum_CAR-CAAR_sq'] = (dis_highReduction_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-dis_highReduction_10_summary['N'] = (dis_highReduction_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-dis_highReduction_10_summary['VAR_CAAR'] = dis_highReduction_10_summary['sum_CAR-CAAR_sq'] / (dis_highReduction_10_summary['N']-1)
-dis_highReduction_10_summary['SD_CAAR'] = np.sqrt(dis_highReduction_10_summary['VAR_CAAR'])
-
-dis_highReduction_10_summary['T_CSecT'] = (np.sqrt(dis_highReduction_10_summary['N']))*dis_highReduction_10_summary['CAAR_logPct']/dis_highReduction_10_summary['SD_CAAR']
-
-# Get AAR
-dis_highReduction_10_summary['AAR_logPct'] = dis_highReduction_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = dis_highReduction_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-dis_highReduction_10 = pd.merge(dis_highReduction_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-dis_highReduction_10['MAR-AAR'] = dis_highReduction_10['adjRet_MarketModel_logPct'] - dis_highReduction_10['AAR_logPct']
-dis_highReduction_10['MAR-AAR_sq'] = dis_highReduction_10['MAR-AAR']**2
-
-dis_highReduction_10_summary['sum_MAR-AAR_sq'] = (dis_highReduction_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-dis_highReduction_10_summary['N'] = (dis_highReduction_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-dis_highReduction_10_summary['VAR_AAR'] = dis_highReduction_10_summary['sum_MAR-AAR_sq'] / (dis_highReduction_10_summary['N']-1)
-dis_highReduction_10_summary['SD_AAR'] = np.sqrt(dis_highReduction_10_summary['VAR_AAR'])
-
-dis_highReduction_10_summary['T_MAR_CSecT'] = (np.sqrt(dis_highReduction_10_summary['N']))*dis_highReduction_10_summary['AAR_logPct']/dis_highReduction_10_summary['SD_AAR']
-
-# Disappeared Type4 t-stat - Cross-sectional test
-dis_lowReduction_10 = pd.merge(dis_lowReduction_10,dis_lowReduction_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-dis_lowReduction_10['CAR-CAAR'] = dis_lowReduction_10['CAR_logPct'] - dis_lowReduction_10['CAAR_logPct']
-dis_lowReduction_10['CAR-CAAR_sq'] = dis_lowReduction_10['CAR-CAAR']**2
-
-dis_lowReduction_10_summary['sum_CAR-CAAR_sq'] = (dis_lowReduction_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-dis_lowReduction_10_summary['N'] = (dis_lowReduction_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-dis_lowReduction_10_summary['VAR_CAAR'] = dis_lowReduction_10_summary['sum_CAR-CAAR_sq'] / (dis_lowReduction_10_summary['N']-1)
-dis_lowReduction_10_summary['SD_CAAR'] = np.sqrt(dis_lowReduction_10_summary['VAR_CAAR'])
-
-dis_lowReduction_10_summary['T_CSecT'] = (np.sqrt(dis_lowReduction_10_summary['N']))*dis_lowReduction_10_summary['CAAR_logPct']/dis_lowReduction_10_summary['SD_CAAR']
-
-# Get AAR
-dis_lowReduction_10_summary['AAR_logPct'] = dis_lowReduction_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = dis_lowReduction_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-dis_lowReduction_10 = pd.merge(dis_lowReduction_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-dis_lowReduction_10['MAR-AAR'] = dis_lowReduction_10['adjRet_MarketModel_logPct'] - dis_lowReduction_10['AAR_logPct']
-dis_lowReduction_10['MAR-AAR_sq'] = dis_lowReduction_10['MAR-AAR']**2
-
-dis_lowReduction_10_summary['sum_MAR-AAR_sq'] = (dis_lowReduction_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-dis_lowReduction_10_summary['N'] = (dis_lowReduction_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-dis_lowReduction_10_summary['VAR_AAR'] = dis_lowReduction_10_summary['sum_MAR-AAR_sq'] / (dis_lowReduction_10_summary['N']-1)
-dis_lowReduction_10_summary['SD_AAR'] = np.sqrt(dis_lowReduction_10_summary['VAR_AAR'])
-
-dis_lowReduction_10_summary['T_MAR_CSecT'] = (np.sqrt(dis_lowReduction_10_summary['N']))*dis_lowReduction_10_summary['AAR_logPct']/dis_lowReduction_10_summary['SD_AAR']
-
-
-
-
-
-''' Returns Around CDP Report Release - MATERIAL FIRM ONLY (-1 to +3) '''
-
-window_5 = ds_dsf_CDPrelease_sub[(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']<=3)]
-
-# Drop firms without all 5 days of data
-remove_list = window_5.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<5] # This is the count of days
-window_5 = window_5[~window_5['ISIN'].isin(remove_list.ISIN)]
-
-### Keep only material firms
-window_5 = window_5[window_5['emission_industry_high']==1]
-
-achieved_5 = window_5[window_5['type']=='Achieved']
-failed_5 = window_5[(window_5['type']=='Failed')]
-
-dis_highReduction_5 = window_5[(window_5['type']=='Disappeared High Reduction')]
-dis_lowReduction_5 = window_5[(window_5['type']=='Disappeared Low Reduction')]
-
-# Cumulative returns
-achieved_5['CAR_logPct'] = achieved_5.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-failed_5['CAR_logPct'] = failed_5.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-dis_highReduction_5['CAR_logPct'] = dis_highReduction_5.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-dis_lowReduction_5['CAR_logPct'] = dis_lowReduction_5.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-
-# Get CAAR
-achieved_5_summary = achieved_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-failed_5_summary = failed_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-dis_highReduction_5_summary = dis_highReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-dis_lowReduction_5_summary = dis_lowReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-
-achieved_5_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-failed_5_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-
-dis_highReduction_5_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-dis_lowReduction_5_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-
-
-# t-stat - Cross-sectional test
-achieved_5 = pd.merge(achieved_5,achieved_5_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-achieved_5['CAR-CAAR'] = achieved_5['CAR_logPct'] - achieved_5['CAAR_logPct']
-achieved_5['CAR-CAAR_sq'] = achieved_5['CAR-CAAR']**2
-
-achieved_5_summary['sum_CAR-CAAR_sq'] = (achieved_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-achieved_5_summary['N'] = (achieved_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-achieved_5_summary['VAR_CAAR'] = achieved_5_summary['sum_CAR-CAAR_sq'] / (achieved_5_summary['N']-1)
-achieved_5_summary['SD_CAAR'] = np.sqrt(achieved_5_summary['VAR_CAAR'])
-
-achieved_5_summary['T_CSecT'] = (np.sqrt(achieved_5_summary['N']))*achieved_5_summary['CAAR_logPct']/achieved_5_summary['SD_CAAR']
-
-# Get AAR
-achieved_5_summary['AAR_logPct'] = achieved_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = achieved_5_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-achieved_5 = pd.merge(achieved_5,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-achieved_5['MAR-AAR'] = achieved_5['adjRet_MarketModel_logPct'] - achieved_5['AAR_logPct']
-achieved_5['MAR-AAR_sq'] = achieved_5['MAR-AAR']**2
-
-achieved_5_summary['sum_MAR-AAR_sq'] = (achieved_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-achieved_5_summary['N'] = (achieved_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-achieved_5_summary['VAR_AAR'] = achieved_5_summary['sum_MAR-AAR_sq'] / (achieved_5_summary['N']-1)
-achieved_5_summary['SD_AAR'] = np.sqrt(achieved_5_summary['VAR_AAR'])
-
-achieved_5_summary['T_MAR_CSecT'] = (np.sqrt(achieved_5_summary['N']))*achieved_5_summary['AAR_logPct']/achieved_5_summary['SD_AAR']
-
-
-
-# Failed  t-stat - Cross-sectional test
-failed_5 = pd.merge(failed_5,failed_5_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-failed_5['CAR-CAAR'] = failed_5['CAR_logPct'] - failed_5['CAAR_logPct']
-failed_5['CAR-CAAR_sq'] = failed_5['CAR-CAAR']**2
-
-failed_5_summary['sum_CAR-CAAR_sq'] = (failed_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-failed_5_summary['N'] = (failed_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-failed_5_summary['VAR_CAAR'] = failed_5_summary['sum_CAR-CAAR_sq'] / (failed_5_summary['N']-1)
-failed_5_summary['SD_CAAR'] = np.sqrt(failed_5_summary['VAR_CAAR'])
-
-failed_5_summary['T_CSecT'] = (np.sqrt(failed_5_summary['N']))*failed_5_summary['CAAR_logPct']/failed_5_summary['SD_CAAR']
-
-# Get AAR
-failed_5_summary['AAR_logPct'] = failed_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = failed_5_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-failed_5 = pd.merge(failed_5,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-failed_5['MAR-AAR'] = failed_5['adjRet_MarketModel_logPct'] - failed_5['AAR_logPct']
-failed_5['MAR-AAR_sq'] = failed_5['MAR-AAR']**2
-
-failed_5_summary['sum_MAR-AAR_sq'] = (failed_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-failed_5_summary['N'] = (failed_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-failed_5_summary['VAR_AAR'] = failed_5_summary['sum_MAR-AAR_sq'] / (failed_5_summary['N']-1)
-failed_5_summary['SD_AAR'] = np.sqrt(failed_5_summary['VAR_AAR'])
-
-failed_5_summary['T_MAR_CSecT'] = (np.sqrt(failed_5_summary['N']))*failed_5_summary['AAR_logPct']/failed_5_summary['SD_AAR']
-
-
-# Disappeared Type3  t-stat - Cross-sectional test
-dis_highReduction_5 = pd.merge(dis_highReduction_5,dis_highReduction_5_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-dis_highReduction_5['CAR-CAAR'] = dis_highReduction_5['CAR_logPct'] - dis_highReduction_5['CAAR_logPct']
-dis_highReduction_5['CAR-CAAR_sq'] = dis_highReduction_5['CAR-CAAR']**2
-
-dis_highReduction_5_summary['sum_CAR-CAAR_sq'] = (dis_highReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-dis_highReduction_5_summary['N'] = (dis_highReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-dis_highReduction_5_summary['VAR_CAAR'] = dis_highReduction_5_summary['sum_CAR-CAAR_sq'] / (dis_highReduction_5_summary['N']-1)
-dis_highReduction_5_summary['SD_CAAR'] = np.sqrt(dis_highReduction_5_summary['VAR_CAAR'])
-
-dis_highReduction_5_summary['T_CSecT'] = (np.sqrt(dis_highReduction_5_summary['N']))*dis_highReduction_5_summary['CAAR_logPct']/dis_highReduction_5_summary['SD_CAAR']
-
-# Get AAR
-dis_highReduction_5_summary['AAR_logPct'] = dis_highReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = dis_highReduction_5_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-dis_highReduction_5 = pd.merge(dis_highReduction_5,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-dis_highReduction_5['MAR-AAR'] = dis_highReduction_5['adjRet_MarketModel_logPct'] - dis_highReduction_5['AAR_logPct']
-dis_highReduction_5['MAR-AAR_sq'] = dis_highReduction_5['MAR-AAR']**2
-
-dis_highReduction_5_summary['sum_MAR-AAR_sq'] = (dis_highReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-dis_highReduction_5_summary['N'] = (dis_highReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-dis_highReduction_5_summary['VAR_AAR'] = dis_highReduction_5_summary['sum_MAR-AAR_sq'] / (dis_highReduction_5_summary['N']-1)
-dis_highReduction_5_summary['SD_AAR'] = np.sqrt(dis_highReduction_5_summary['VAR_AAR'])
-
-dis_highReduction_5_summary['T_MAR_CSecT'] = (np.sqrt(dis_highReduction_5_summary['N']))*dis_highReduction_5_summary['AAR_logPct']/dis_highReduction_5_summary['SD_AAR']
-
-# Disappeared Type4 t-stat - Cross-sectional test
-dis_lowReduction_5 = pd.merge(dis_lowReduction_5,dis_lowReduction_5_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-dis_lowReduction_5['CAR-CAAR'] = dis_lowReduction_5['CAR_logPct'] - dis_lowReduction_5['CAAR_logPct']
-dis_lowReduction_5['CAR-CAAR_sq'] = dis_lowReduction_5['CAR-CAAR']**2
-
-dis_lowReduction_5_summary['sum_CAR-CAAR_sq'] = (dis_lowReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-dis_lowReduction_5_summary['N'] = (dis_lowReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-dis_lowReduction_5_summary['VAR_CAAR'] = dis_lowReduction_5_summary['sum_CAR-CAAR_sq'] / (dis_lowReduction_5_summary['N']-1)
-dis_lowReduction_5_summary['SD_CAAR'] = np.sqrt(dis_lowReduction_5_summary['VAR_CAAR'])
-
-dis_lowReduction_5_summary['T_CSecT'] = (np.sqrt(dis_lowReduction_5_summary['N']))*dis_lowReduction_5_summary['CAAR_logPct']/dis_lowReduction_5_summary['SD_CAAR']
-
-# Get AAR
-dis_lowReduction_5_summary['AAR_logPct'] = dis_lowReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = dis_lowReduction_5_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-dis_lowReduction_5 = pd.merge(dis_lowReduction_5,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-dis_lowReduction_5['MAR-AAR'] = dis_lowReduction_5['adjRet_MarketModel_logPct'] - dis_lowReduction_5['AAR_logPct']
-dis_lowReduction_5['MAR-AAR_sq'] = dis_lowReduction_5['MAR-AAR']**2
-
-dis_lowReduction_5_summary['sum_MAR-AAR_sq'] = (dis_lowReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-dis_lowReduction_5_summary['N'] = (dis_lowReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-dis_lowReduction_5_summary['VAR_AAR'] = dis_lowReduction_5_summary['sum_MAR-AAR_sq'] / (dis_lowReduction_5_summary['N']-1)
-dis_lowReduction_5_summary['SD_AAR'] = np.sqrt(dis_lowReduction_5_summary['VAR_AAR'])
-
-dis_lowReduction_5_summary['T_MAR_CSecT'] = (np.sqrt(dis_lowReduction_5_summary['N']))*dis_lowReduction_5_summary['AAR_logPct']/dis_lowReduction_5_summary['SD_AAR']
-
-
-
-
-''' Returns Around CDP Report Release - DROPPING COVID FIRMS  (-1 to +3) '''
-window_5 = ds_dsf_CDPrelease_sub[(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']<=3)]
-
-# Drop firms without all 5 days of data
-remove_list = window_5.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<5] # This is the count of days
-window_5 = window_5[~window_5['ISIN'].isin(remove_list.ISIN)]
-
-### Drop covid affected firms
-window_5 = window_5[window_5['type_covid_industry']==0]
-
-achieved_5 = window_5[window_5['type']=='Achieved']
-failed_5 = window_5[(window_5['type']=='Failed')]
-
-dis_highReduction_5 = window_5[(window_5['type']=='Disappeared High Reduction')]
-dis_lowReduction_5 = window_5[(window_5['type']=='Disappeared Low Reduction')]
-
-# Cumulative returns
-achieved_5['CAR_logPct'] = achieved_5.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-failed_5['CAR_logPct'] = failed_5.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-dis_highReduction_5['CAR_logPct'] = dis_highReduction_5.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-dis_lowReduction_5['CAR_logPct'] = dis_lowReduction_5.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-
-# Get CAAR
-achieved_5_summary = achieved_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-failed_5_summary = failed_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-dis_highReduction_5_summary = dis_highReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-dis_lowReduction_5_summary = dis_lowReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-
-achieved_5_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-failed_5_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-
-dis_highReduction_5_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-dis_lowReduction_5_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-
-
-# t-stat - Cross-sectional test
-achieved_5 = pd.merge(achieved_5,achieved_5_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-achieved_5['CAR-CAAR'] = achieved_5['CAR_logPct'] - achieved_5['CAAR_logPct']
-achieved_5['CAR-CAAR_sq'] = achieved_5['CAR-CAAR']**2
-
-achieved_5_summary['sum_CAR-CAAR_sq'] = (achieved_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-achieved_5_summary['N'] = (achieved_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-achieved_5_summary['VAR_CAAR'] = achieved_5_summary['sum_CAR-CAAR_sq'] / (achieved_5_summary['N']-1)
-achieved_5_summary['SD_CAAR'] = np.sqrt(achieved_5_summary['VAR_CAAR'])
-
-achieved_5_summary['T_CSecT'] = (np.sqrt(achieved_5_summary['N']))*achieved_5_summary['CAAR_logPct']/achieved_5_summary['SD_CAAR']
-
-# Get AAR
-achieved_5_summary['AAR_logPct'] = achieved_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = achieved_5_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-achieved_5 = pd.merge(achieved_5,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-achieved_5['MAR-AAR'] = achieved_5['adjRet_MarketModel_logPct'] - achieved_5['AAR_logPct']
-achieved_5['MAR-AAR_sq'] = achieved_5['MAR-AAR']**2
-
-achieved_5_summary['sum_MAR-AAR_sq'] = (achieved_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-achieved_5_summary['N'] = (achieved_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-achieved_5_summary['VAR_AAR'] = achieved_5_summary['sum_MAR-AAR_sq'] / (achieved_5_summary['N']-1)
-achieved_5_summary['SD_AAR'] = np.sqrt(achieved_5_summary['VAR_AAR'])
-
-achieved_5_summary['T_MAR_CSecT'] = (np.sqrt(achieved_5_summary['N']))*achieved_5_summary['AAR_logPct']/achieved_5_summary['SD_AAR']
-
-
-
-# Failed  t-stat - Cross-sectional test
-failed_5 = pd.merge(failed_5,failed_5_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-failed_5['CAR-CAAR'] = failed_5['CAR_logPct'] - failed_5['CAAR_logPct']
-failed_5['CAR-CAAR_sq'] = failed_5['CAR-CAAR']**2
-
-failed_5_summary['sum_CAR-CAAR_sq'] = (failed_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-failed_5_summary['N'] = (failed_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-failed_5_summary['VAR_CAAR'] = failed_5_summary['sum_CAR-CAAR_sq'] / (failed_5_summary['N']-1)
-failed_5_summary['SD_CAAR'] = np.sqrt(failed_5_summary['VAR_CAAR'])
-
-failed_5_summary['T_CSecT'] = (np.sqrt(failed_5_summary['N']))*failed_5_summary['CAAR_logPct']/failed_5_summary['SD_CAAR']
-
-# Get AAR
-failed_5_summary['AAR_logPct'] = failed_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = failed_5_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-failed_5 = pd.merge(failed_5,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-failed_5['MAR-AAR'] = failed_5['adjRet_MarketModel_logPct'] - failed_5['AAR_logPct']
-failed_5['MAR-AAR_sq'] = failed_5['MAR-AAR']**2
-
-failed_5_summary['sum_MAR-AAR_sq'] = (failed_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-failed_5_summary['N'] = (failed_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-failed_5_summary['VAR_AAR'] = failed_5_summary['sum_MAR-AAR_sq'] / (failed_5_summary['N']-1)
-failed_5_summary['SD_AAR'] = np.sqrt(failed_5_summary['VAR_AAR'])
-
-failed_5_summary['T_MAR_CSecT'] = (np.sqrt(failed_5_summary['N']))*failed_5_summary['AAR_logPct']/failed_5_summary['SD_AAR']
-
-
-# Disappeared Type3  t-stat - Cross-sectional test
-dis_highReduction_5 = pd.merge(dis_highReduction_5,dis_highReduction_5_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-dis_highReduction_5['CAR-CAAR'] = dis_highReduction_5['CAR_logPct'] - dis_highReduction_5['CAAR_logPct']
-dis_highReduction_5['CAR-CAAR_sq'] = dis_highReduction_5['CAR-CAAR']**2
-
-dis_highReduction_5_summary['sum_CAR-CAAR_sq'] = (dis_highReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-dis_highReduction_5_summary['N'] = (dis_highReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-dis_highReduction_5_summary['VAR_CAAR'] = dis_highReduction_5_summary['sum_CAR-CAAR_sq'] / (dis_highReduction_5_summary['N']-1)
-dis_highReduction_5_summary['SD_CAAR'] = np.sqrt(dis_highReduction_5_summary['VAR_CAAR'])
-
-dis_highReduction_5_summary['T_CSecT'] = (np.sqrt(dis_highReduction_5_summary['N']))*dis_highReduction_5_summary['CAAR_logPct']/dis_highReduction_5_summary['SD_CAAR']
-
-# Get AAR
-dis_highReduction_5_summary['AAR_logPct'] = dis_highReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = dis_highReduction_5_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-dis_highReduction_5 = pd.merge(dis_highReduction_5,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-dis_highReduction_5['MAR-AAR'] = dis_highReduction_5['adjRet_MarketModel_logPct'] - dis_highReduction_5['AAR_logPct']
-dis_highReduction_5['MAR-AAR_sq'] = dis_highReduction_5['MAR-AAR']**2
-
-dis_highReduction_5_summary['sum_MAR-AAR_sq'] = (dis_highReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-dis_highReduction_5_summary['N'] = (dis_highReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-dis_highReduction_5_summary['VAR_AAR'] = dis_highReduction_5_summary['sum_MAR-AAR_sq'] / (dis_highReduction_5_summary['N']-1)
-dis_highReduction_5_summary['SD_AAR'] = np.sqrt(dis_highReduction_5_summary['VAR_AAR'])
-
-dis_highReduction_5_summary['T_MAR_CSecT'] = (np.sqrt(dis_highReduction_5_summary['N']))*dis_highReduction_5_summary['AAR_logPct']/dis_highReduction_5_summary['SD_AAR']
-
-# Disappeared Type4 t-stat - Cross-sectional test
-dis_lowReduction_5 = pd.merge(dis_lowReduction_5,dis_lowReduction_5_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-dis_lowReduction_5['CAR-CAAR'] = dis_lowReduction_5['CAR_logPct'] - dis_lowReduction_5['CAAR_logPct']
-dis_lowReduction_5['CAR-CAAR_sq'] = dis_lowReduction_5['CAR-CAAR']**2
-
-dis_lowReduction_5_summary['sum_CAR-CAAR_sq'] = (dis_lowReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-dis_lowReduction_5_summary['N'] = (dis_lowReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-dis_lowReduction_5_summary['VAR_CAAR'] = dis_lowReduction_5_summary['sum_CAR-CAAR_sq'] / (dis_lowReduction_5_summary['N']-1)
-dis_lowReduction_5_summary['SD_CAAR'] = np.sqrt(dis_lowReduction_5_summary['VAR_CAAR'])
-
-dis_lowReduction_5_summary['T_CSecT'] = (np.sqrt(dis_lowReduction_5_summary['N']))*dis_lowReduction_5_summary['CAAR_logPct']/dis_lowReduction_5_summary['SD_CAAR']
-
-# Get AAR
-dis_lowReduction_5_summary['AAR_logPct'] = dis_lowReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = dis_lowReduction_5_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-dis_lowReduction_5 = pd.merge(dis_lowReduction_5,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-dis_lowReduction_5['MAR-AAR'] = dis_lowReduction_5['adjRet_MarketModel_logPct'] - dis_lowReduction_5['AAR_logPct']
-dis_lowReduction_5['MAR-AAR_sq'] = dis_lowReduction_5['MAR-AAR']**2
-
-dis_lowReduction_5_summary['sum_MAR-AAR_sq'] = (dis_lowReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-dis_lowReduction_5_summary['N'] = (dis_lowReduction_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-dis_lowReduction_5_summary['VAR_AAR'] = dis_lowReduction_5_summary['sum_MAR-AAR_sq'] / (dis_lowReduction_5_summary['N']-1)
-dis_lowReduction_5_summary['SD_AAR'] = np.sqrt(dis_lowReduction_5_summary['VAR_AAR'])
-
-dis_lowReduction_5_summary['T_MAR_CSecT'] = (np.sqrt(dis_lowReduction_5_summary['N']))*dis_lowReduction_5_summary['AAR_logPct']/dis_lowReduction_5_summary['SD_AAR']
-
-
-
-
-
-''' Returns Around CDP Report Release - Ambitious vs. Unambitious Failed  (-1 to +3) '''
-window_5 = ds_dsf_CDPrelease_sub[(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']<=3)]
-
-# Drop firms without all 5 days of data
-remove_list = window_5.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<5] # This is the count of days
-window_5 = window_5[~window_5['ISIN'].isin(remove_list.ISIN)]
-
-## High/Low target ambition (only applies to failed companies)
-failed_amb_5 = window_5[(window_5['failed_high_ambition']==1)]
-failed_unamb_5 = window_5[(window_5['failed_low_ambition']==1)]
-
-# Cumulative returns
-failed_amb_5['CAR_logPct'] = failed_amb_5.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-failed_unamb_5['CAR_logPct'] = failed_unamb_5.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-
-# Get CAAR
-failed_amb_5_summary = failed_amb_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-failed_unamb_5_summary = failed_unamb_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-
-failed_amb_5_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-failed_unamb_5_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-
-
-# Failed Ambitious  t-stat - Cross-sectional test
-failed_amb_5 = pd.merge(failed_amb_5,failed_amb_5_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-failed_amb_5['CAR-CAAR'] = failed_amb_5['CAR_logPct'] - failed_amb_5['CAAR_logPct']
-failed_amb_5['CAR-CAAR_sq'] = failed_amb_5['CAR-CAAR']**2
-
-failed_amb_5_summary['sum_CAR-CAAR_sq'] = (failed_amb_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-failed_amb_5_summary['N'] = (failed_amb_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-failed_amb_5_summary['VAR_CAAR'] = failed_amb_5_summary['sum_CAR-CAAR_sq'] / (failed_amb_5_summary['N']-1)
-failed_amb_5_summary['SD_CAAR'] = np.sqrt(failed_amb_5_summary['VAR_CAAR'])
-
-failed_amb_5_summary['T_CSecT'] = (np.sqrt(failed_amb_5_summary['N']))*failed_amb_5_summary['CAAR_logPct']/failed_amb_5_summary['SD_CAAR']
-
-# Get AAR
-failed_amb_5_summary['AAR_logPct'] = failed_amb_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = failed_amb_5_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-failed_amb_5 = pd.merge(failed_amb_5,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-failed_amb_5['MAR-AAR'] = failed_amb_5['adjRet_MarketModel_logPct'] - failed_amb_5['AAR_logPct']
-failed_amb_5['MAR-AAR_sq'] = failed_amb_5['MAR-AAR']**2
-
-failed_amb_5_summary['sum_MAR-AAR_sq'] = (failed_amb_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-failed_amb_5_summary['N'] = (failed_amb_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-failed_amb_5_summary['VAR_AAR'] = failed_amb_5_summary['sum_MAR-AAR_sq'] / (failed_amb_5_summary['N']-1)
-failed_amb_5_summary['SD_AAR'] = np.sqrt(failed_amb_5_summary['VAR_AAR'])
-
-failed_amb_5_summary['T_MAR_CSecT'] = (np.sqrt(failed_amb_5_summary['N']))*failed_amb_5_summary['AAR_logPct']/failed_amb_5_summary['SD_AAR']
-
-
-# Failed Unambitious  t-stat - Cross-sectional test
-failed_unamb_5 = pd.merge(failed_unamb_5,failed_unamb_5_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-failed_unamb_5['CAR-CAAR'] = failed_unamb_5['CAR_logPct'] - failed_unamb_5['CAAR_logPct']
-failed_unamb_5['CAR-CAAR_sq'] = failed_unamb_5['CAR-CAAR']**2
-
-failed_unamb_5_summary['sum_CAR-CAAR_sq'] = (failed_unamb_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-failed_unamb_5_summary['N'] = (failed_unamb_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-failed_unamb_5_summary['VAR_CAAR'] = failed_unamb_5_summary['sum_CAR-CAAR_sq'] / (failed_unamb_5_summary['N']-1)
-failed_unamb_5_summary['SD_CAAR'] = np.sqrt(failed_unamb_5_summary['VAR_CAAR'])
-
-failed_unamb_5_summary['T_CSecT'] = (np.sqrt(failed_unamb_5_summary['N']))*failed_unamb_5_summary['CAAR_logPct']/failed_unamb_5_summary['SD_CAAR']
-
-# Get AAR
-failed_unamb_5_summary['AAR_logPct'] = failed_unamb_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = failed_unamb_5_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-failed_unamb_5 = pd.merge(failed_unamb_5,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-failed_unamb_5['MAR-AAR'] = failed_unamb_5['adjRet_MarketModel_logPct'] - failed_unamb_5['AAR_logPct']
-failed_unamb_5['MAR-AAR_sq'] = failed_unamb_5['MAR-AAR']**2
-
-failed_unamb_5_summary['sum_MAR-AAR_sq'] = (failed_unamb_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-failed_unamb_5_summary['N'] = (failed_unamb_5.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-failed_unamb_5_summary['VAR_AAR'] = failed_unamb_5_summary['sum_MAR-AAR_sq'] / (failed_unamb_5_summary['N']-1)
-failed_unamb_5_summary['SD_AAR'] = np.sqrt(failed_unamb_5_summary['VAR_AAR'])
-
-failed_unamb_5_summary['T_MAR_CSecT'] = (np.sqrt(failed_unamb_5_summary['N']))*failed_unamb_5_summary['AAR_logPct']/failed_unamb_5_summary['SD_AAR']
-
-
-
-
-
-
-''' Volume Test - 10 day around CDP report release '''
-
-window_10 = ds_dsf_CDPrelease_sub[(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']>=-5)&(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']<=5)]
-
-# Drop firms without all 10 days of data
-remove_list = window_10.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<11] # This is the count of days
-window_10 = window_10[~window_10['ISIN'].isin(remove_list.ISIN)]
-
-achieved_10 = window_10[window_10['type']=='Achieved']
-failed_10 = window_10[(window_10['type']=='Failed')]
-dis_highReduction_10 = window_10[(window_10['type']=='Disappeared High Reduction')]
-dis_lowReduction_10 = window_10[(window_10['type']=='Disappeared Low Reduction')]
-
-
-# Abnormal volume 
-# Estimation window = {-135,-35}; 100 days long gap 30 days
-vol_estWindow10 = ds_dsf_CDPrelease[(ds_dsf_CDPrelease['BDaysRelativeToEvent']>=-135)&(ds_dsf_CDPrelease['BDaysRelativeToEvent']<=-35)]
-achieved_estWin_win10 = vol_estWindow10[vol_estWindow10['type']=='Achieved']
-failed_estWin_win10 = vol_estWindow10[(vol_estWindow10['type']=='Failed')]
-
-dis_highReduction_estWin10 = vol_estWindow10[(vol_estWindow10['type']=='Disappeared High Reduction')]
-dis_lowReduction_estWin10 = vol_estWindow10[(vol_estWindow10['type']=='Disappeared Low Reduction')]
-
-
-# Normal volume
-norVol_achieved10 = achieved_estWin_win10.groupby(['ISIN'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_achieved10.columns = ['ISIN','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-norVol_failed10 = failed_estWin_win10.groupby(['ISIN'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_failed10.columns = ['ISIN','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-
-norVol_dis_highReduction10 = dis_highReduction_estWin10.groupby(['ISIN'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_dis_highReduction10.columns = ['ISIN','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-norVol_dis_lowReduction10 = dis_lowReduction_estWin10.groupby(['ISIN'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_dis_lowReduction10.columns = ['ISIN','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-
-# Merge it to window return data
-achieved_10 = pd.merge(achieved_10,norVol_achieved10,on=['ISIN'],how='left')
-failed_10 = pd.merge(failed_10,norVol_failed10,on=['ISIN'],how='left')
-
-dis_highReduction_10 = pd.merge(dis_highReduction_10,norVol_dis_highReduction10,on=['ISIN'],how='left')
-dis_lowReduction_10 = pd.merge(dis_lowReduction_10,norVol_dis_lowReduction10,on=['ISIN'],how='left')
-
-
-achieved_10['AbnVolume'] = achieved_10['Volume'] - achieved_10['normal_Volume']
-achieved_10['AbnVol_pct'] = achieved_10['Volume_pct'] - achieved_10['normal_Volume_pct']
-achieved_10['AbnVol_pctlog'] = achieved_10['Volume_pctlog'] - achieved_10['normal_Volume_pctlog']
-
-failed_10['AbnVolume'] = failed_10['Volume'] - failed_10['normal_Volume']
-failed_10['AbnVol_pct'] = failed_10['Volume_pct'] - failed_10['normal_Volume_pct']
-failed_10['AbnVol_pctlog'] = failed_10['Volume_pctlog'] - failed_10['normal_Volume_pctlog']
-
-dis_highReduction_10['AbnVolume'] = dis_highReduction_10['Volume'] - dis_highReduction_10['normal_Volume']
-dis_highReduction_10['AbnVol_pct'] = dis_highReduction_10['Volume_pct'] - dis_highReduction_10['normal_Volume_pct']
-dis_highReduction_10['AbnVol_pctlog'] = dis_highReduction_10['Volume_pctlog'] - dis_highReduction_10['normal_Volume_pctlog']
-dis_lowReduction_10['AbnVolume'] = dis_lowReduction_10['Volume'] - dis_lowReduction_10['normal_Volume']
-dis_lowReduction_10['AbnVol_pct'] = dis_lowReduction_10['Volume_pct'] - dis_lowReduction_10['normal_Volume_pct']
-dis_lowReduction_10['AbnVol_pctlog'] = dis_lowReduction_10['Volume_pctlog'] - dis_lowReduction_10['normal_Volume_pctlog']
-
-# Merge normal volume to estimation window volume data to get sd
-achieved_estWin_win10 = pd.merge(achieved_estWin_win10,norVol_achieved10,on=['ISIN'],how='left')
-achieved_estWin_win10['AbnVolume'] = achieved_estWin_win10['Volume'] - achieved_estWin_win10['normal_Volume']
-achieved_estWin_win10['AbnVol_pct'] = achieved_estWin_win10['Volume_pct'] - achieved_estWin_win10['normal_Volume_pct']
-achieved_estWin_win10['AbnVol_pctlog'] = achieved_estWin_win10['Volume_pctlog'] - achieved_estWin_win10['normal_Volume_pctlog']
-
-failed_estWin_win10 = pd.merge(failed_estWin_win10,norVol_failed10,on=['ISIN'],how='left')
-failed_estWin_win10['AbnVolume'] = failed_estWin_win10['Volume'] - failed_estWin_win10['normal_Volume']
-failed_estWin_win10['AbnVol_pct'] = failed_estWin_win10['Volume_pct'] - failed_estWin_win10['normal_Volume_pct']
-failed_estWin_win10['AbnVol_pctlog'] = failed_estWin_win10['Volume_pctlog'] - failed_estWin_win10['normal_Volume_pctlog']
-
-dis_highReduction_estWin10 = pd.merge(dis_highReduction_estWin10,norVol_dis_highReduction10,on=['ISIN'],how='left')
-dis_highReduction_estWin10['AbnVolume'] = dis_highReduction_estWin10['Volume'] - dis_highReduction_estWin10['normal_Volume']
-dis_highReduction_estWin10['AbnVol_pct'] = dis_highReduction_estWin10['Volume_pct'] - dis_highReduction_estWin10['normal_Volume_pct']
-dis_highReduction_estWin10['AbnVol_pctlog'] = dis_highReduction_estWin10['Volume_pctlog'] - dis_highReduction_estWin10['normal_Volume_pctlog']
-
-dis_lowReduction_estWin10 = pd.merge(dis_lowReduction_estWin10,norVol_dis_lowReduction10,on=['ISIN'],how='left')
-dis_lowReduction_estWin10['AbnVolume'] = dis_lowReduction_estWin10['Volume'] - dis_lowReduction_estWin10['normal_Volume']
-dis_lowReduction_estWin10['AbnVol_pct'] = dis_lowReduction_estWin10['Volume_pct'] - dis_lowReduction_estWin10['normal_Volume_pct']
-dis_lowReduction_estWin10['AbnVol_pctlog'] = dis_lowReduction_estWin10['Volume_pctlog'] - dis_lowReduction_estWin10['normal_Volume_pctlog']
-
-
-
-# Event plot
-achieved_10_summary = achieved_10.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-failed_10_summary = failed_10.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-
-dis_highReduction_10_summary = dis_highReduction_10.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-dis_lowReduction_10_summary = dis_lowReduction_10.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-
-achieved_10_summary['N'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['AbnVolume'].count()['AbnVolume'])
-failed_10_summary['N'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['AbnVolume'].count()['AbnVolume'])
-
-dis_highReduction_10_summary['N'] = (dis_highReduction_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['AbnVolume'].count()['AbnVolume'])
-dis_lowReduction_10_summary['N'] = (dis_lowReduction_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['AbnVolume'].count()['AbnVolume'])
-
-
-# Achieved t-stat
-temp_achieved10 = achieved_estWin_win10.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_achieved10['AbnVolume_mbar'] = temp_achieved10['AbnVolume'] - temp_achieved10['AbnVolume'].mean()
-temp_achieved10['AbnVol_pct_mbar'] = temp_achieved10['AbnVol_pct'] - temp_achieved10['AbnVol_pct'].mean()
-temp_achieved10['AbnVol_pctlog_mbar'] = temp_achieved10['AbnVol_pctlog'] - temp_achieved10['AbnVol_pctlog'].mean()
-
-temp_achieved10['AbnVolume_mbar_sq'] = temp_achieved10['AbnVolume_mbar']**2
-temp_achieved10['AbnVol_pct_mbar_sq'] = temp_achieved10['AbnVol_pct_mbar']**2
-temp_achieved10['AbnVol_pctlog_mbar_sq'] = temp_achieved10['AbnVol_pctlog_mbar']**2
-
-achieved_10_summary['Var_AbnVolume'] = temp_achieved10['AbnVolume_mbar_sq'].mean()
-achieved_10_summary['Var_AbnVol_pct'] = temp_achieved10['AbnVol_pct_mbar_sq'].mean()
-achieved_10_summary['Var_AbnVol_pctlog'] = temp_achieved10['AbnVol_pctlog_mbar_sq'].mean()
-
-achieved_10_summary['sd_AbnVolume'] = np.sqrt(achieved_10_summary['Var_AbnVolume'])
-achieved_10_summary['sd_AbnVol_pct'] = np.sqrt(achieved_10_summary['Var_AbnVol_pct'])
-achieved_10_summary['sd_AbnVol_pctlog'] = np.sqrt(achieved_10_summary['Var_AbnVol_pctlog'])
-
-achieved_10_summary['t_AbnVolume'] = achieved_10_summary['AbnVolume']/achieved_10_summary['sd_AbnVolume']
-achieved_10_summary['t_AbnVol_pct'] = achieved_10_summary['AbnVol_pct']/achieved_10_summary['sd_AbnVol_pct']
-achieved_10_summary['t_AbnVol_pctlog'] = achieved_10_summary['AbnVol_pctlog']/achieved_10_summary['sd_AbnVol_pctlog']
-
-# Failed t-stat
-temp_failed10 = failed_estWin_win10.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_failed10['AbnVolume_mbar'] = temp_failed10['AbnVolume'] - temp_failed10['AbnVolume'].mean()
-temp_failed10['AbnVol_pct_mbar'] = temp_failed10['AbnVol_pct'] - temp_failed10['AbnVol_pct'].mean()
-temp_failed10['AbnVol_pctlog_mbar'] = temp_failed10['AbnVol_pctlog'] - temp_failed10['AbnVol_pctlog'].mean()
-
-temp_failed10['AbnVolume_mbar_sq'] = temp_failed10['AbnVolume_mbar']**2
-temp_failed10['AbnVol_pct_mbar_sq'] = temp_failed10['AbnVol_pct_mbar']**2
-temp_failed10['AbnVol_pctlog_mbar_sq'] = temp_failed10['AbnVol_pctlog_mbar']**2
-
-failed_10_summary['Var_AbnVolume'] = temp_failed10['AbnVolume_mbar_sq'].mean()
-failed_10_summary['Var_AbnVol_pct'] = temp_failed10['AbnVol_pct_mbar_sq'].mean()
-failed_10_summary['Var_AbnVol_pctlog'] = temp_failed10['AbnVol_pctlog_mbar_sq'].mean()
-
-failed_10_summary['sd_AbnVolume'] = np.sqrt(failed_10_summary['Var_AbnVolume'])
-failed_10_summary['sd_AbnVol_pct'] = np.sqrt(failed_10_summary['Var_AbnVol_pct'])
-failed_10_summary['sd_AbnVol_pctlog'] = np.sqrt(failed_10_summary['Var_AbnVol_pctlog'])
-
-failed_10_summary['t_AbnVolume'] = failed_10_summary['AbnVolume']/failed_10_summary['sd_AbnVolume']
-failed_10_summary['t_AbnVol_pct'] = failed_10_summary['AbnVol_pct']/failed_10_summary['sd_AbnVol_pct']
-failed_10_summary['t_AbnVol_pctlog'] = failed_10_summary['AbnVol_pctlog']/failed_10_summary['sd_AbnVol_pctlog']
-
-
-# Disappeared Type3 t-test
-temp_dis_highReduction10 = dis_highReduction_estWin10.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_dis_highReduction10['AbnVolume_mbar'] = temp_dis_highReduction10['AbnVolume'] - temp_dis_highReduction10['AbnVolume'].mean()
-temp_dis_highReduction10['AbnVol_pct_mbar'] = temp_dis_highReduction10['AbnVol_pct'] - temp_dis_highReduction10['AbnVol_pct'].mean()
-temp_dis_highReduction10['AbnVol_pctlog_mbar'] = temp_dis_highReduction10['AbnVol_pctlog'] - temp_dis_highReduction10['AbnVol_pctlog'].mean()
-
-temp_dis_highReduction10['AbnVolume_mbar_sq'] = temp_dis_highReduction10['AbnVolume_mbar']**2
-temp_dis_highReduction10['AbnVol_pct_mbar_sq'] = temp_dis_highReduction10['AbnVol_pct_mbar']**2
-temp_dis_highReduction10['AbnVol_pctlog_mbar_sq'] = temp_dis_highReduction10['AbnVol_pctlog_mbar']**2
-
-dis_highReduction_10_summary['Var_AbnVolume'] = temp_dis_highReduction10['AbnVolume_mbar_sq'].mean()
-dis_highReduction_10_summary['Var_AbnVol_pct'] = temp_dis_highReduction10['AbnVol_pct_mbar_sq'].mean()
-dis_highReduction_10_summary['Var_AbnVol_pctlog'] = temp_dis_highReduction10['AbnVol_pctlog_mbar_sq'].mean()
-
-dis_highReduction_10_summary['sd_AbnVolume'] = np.sqrt(dis_highReduction_10_summary['Var_AbnVolume'])
-dis_highReduction_10_summary['sd_AbnVol_pct'] = np.sqrt(dis_highReduction_10_summary['Var_AbnVol_pct'])
-dis_highReduction_10_summary['sd_AbnVol_pctlog'] = np.sqrt(dis_highReduction_10_summary['Var_AbnVol_pctlog'])
-
-dis_highReduction_10_summary['t_AbnVolume'] = dis_highReduction_10_summary['AbnVolume']/dis_highReduction_10_summary['sd_AbnVolume']
-dis_highReduction_10_summary['t_AbnVol_pct'] = dis_highReduction_10_summary['AbnVol_pct']/dis_highReduction_10_summary['sd_AbnVol_pct']
-dis_highReduction_10_summary['t_AbnVol_pctlog'] = dis_highReduction_10_summary['AbnVol_pctlog']/dis_highReduction_10_summary['sd_AbnVol_pctlog']
-
-# Disappeared Type4 t-test
-temp_dis_lowReduction10 = dis_lowReduction_estWin10.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_dis_lowReduction10['AbnVolume_mbar'] = temp_dis_lowReduction10['AbnVolume'] - temp_dis_lowReduction10['AbnVolume'].mean()
-temp_dis_lowReduction10['AbnVol_pct_mbar'] = temp_dis_lowReduction10['AbnVol_pct'] - temp_dis_lowReduction10['AbnVol_pct'].mean()
-temp_dis_lowReduction10['AbnVol_pctlog_mbar'] = temp_dis_lowReduction10['AbnVol_pctlog'] - temp_dis_lowReduction10['AbnVol_pctlog'].mean()
-
-temp_dis_lowReduction10['AbnVolume_mbar_sq'] = temp_dis_lowReduction10['AbnVolume_mbar']**2
-temp_dis_lowReduction10['AbnVol_pct_mbar_sq'] = temp_dis_lowReduction10['AbnVol_pct_mbar']**2
-temp_dis_lowReduction10['AbnVol_pctlog_mbar_sq'] = temp_dis_lowReduction10['AbnVol_pctlog_mbar']**2
-
-dis_lowReduction_10_summary['Var_AbnVolume'] = temp_dis_lowReduction10['AbnVolume_mbar_sq'].mean()
-dis_lowReduction_10_summary['Var_AbnVol_pct'] = temp_dis_lowReduction10['AbnVol_pct_mbar_sq'].mean()
-dis_lowReduction_10_summary['Var_AbnVol_pctlog'] = temp_dis_lowReduction10['AbnVol_pctlog_mbar_sq'].mean()
-
-dis_lowReduction_10_summary['sd_AbnVolume'] = np.sqrt(dis_lowReduction_10_summary['Var_AbnVolume'])
-dis_lowReduction_10_summary['sd_AbnVol_pct'] = np.sqrt(dis_lowReduction_10_summary['Var_AbnVol_pct'])
-dis_lowReduction_10_summary['sd_AbnVol_pctlog'] = np.sqrt(dis_lowReduction_10_summary['Var_AbnVol_pctlog'])
-
-dis_lowReduction_10_summary['t_AbnVolume'] = dis_lowReduction_10_summary['AbnVolume']/dis_lowReduction_10_summary['sd_AbnVolume']
-dis_lowReduction_10_summary['t_AbnVol_pct'] = dis_lowReduction_10_summary['AbnVol_pct']/dis_lowReduction_10_summary['sd_AbnVol_pct']
-dis_lowReduction_10_summary['t_AbnVol_pctlog'] = dis_lowReduction_10_summary['AbnVol_pctlog']/dis_lowReduction_10_summary['sd_AbnVol_pctlog']
-
-
-
-''' Volume Test - 20 day around CDP report release - MATERIAL FIRMS ONLY '''
-window_20 = ds_dsf_CDPrelease_sub[(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']>=-10)&(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']<=10)]
-
-# Drop firms without all 10 days of data
-remove_list = window_20.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<21] # This is the count of days
-window_20 = window_20[~window_20['ISIN'].isin(remove_list.ISIN)]
-
-### Keep only material firms
-window_20 = window_20[window_20['emission_industry_high']==1]
-
-achieved_20 = window_20[window_20['type']=='Achieved']
-failed_20 = window_20[(window_20['type']=='Failed')]
-dis_highReduction_20 = window_20[(window_20['type']=='Disappeared High Reduction')]
-dis_lowReduction_20 = window_20[(window_20['type']=='Disappeared Low Reduction')]
-
-
-# Abnormal volume 
-# Estimation window = {-140,-40}; 100 days long gap 30 days
-vol_estWindow20 = ds_dsf_CDPrelease[(ds_dsf_CDPrelease['BDaysRelativeToEvent']>=-140)&(ds_dsf_CDPrelease['BDaysRelativeToEvent']<=-40)]
-achieved_estWin_win20 = vol_estWindow20[vol_estWindow20['type']=='Achieved']
-failed_estWin_win20 = vol_estWindow20[(vol_estWindow20['type']=='Failed')]
-
-dis_highReduction_estWin20 = vol_estWindow20[(vol_estWindow20['type']=='Disappeared High Reduction')]
-dis_lowReduction_estWin20 = vol_estWindow20[(vol_estWindow20['type']=='Disappeared Low Reduction')]
-
-
-# Normal volume
-norVol_achieved20 = achieved_estWin_win20.groupby(['ISIN'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_achieved20.columns = ['ISIN','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-norVol_failed20 = failed_estWin_win20.groupby(['ISIN'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_failed20.columns = ['ISIN','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-
-norVol_dis_highReduction20 = dis_highReduction_estWin20.groupby(['ISIN'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_dis_highReduction20.columns = ['ISIN','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-norVol_dis_lowReduction20 = dis_lowReduction_estWin20.groupby(['ISIN'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_dis_lowReduction20.columns = ['ISIN','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-
-# Merge it to window return data
-achieved_20 = pd.merge(achieved_20,norVol_achieved20,on=['ISIN'],how='left')
-failed_20 = pd.merge(failed_20,norVol_failed20,on=['ISIN'],how='left')
-
-dis_highReduction_20 = pd.merge(dis_highReduction_20,norVol_dis_highReduction20,on=['ISIN'],how='left')
-dis_lowReduction_20 = pd.merge(dis_lowReduction_20,norVol_dis_lowReduction20,on=['ISIN'],how='left')
-
-
-achieved_20['AbnVolume'] = achieved_20['Volume'] - achieved_20['normal_Volume']
-achieved_20['AbnVol_pct'] = achieved_20['Volume_pct'] - achieved_20['normal_Volume_pct']
-achieved_20['AbnVol_pctlog'] = achieved_20['Volume_pctlog'] - achieved_20['normal_Volume_pctlog']
-
-failed_20['AbnVolume'] = failed_20['Volume'] - failed_20['normal_Volume']
-failed_20['AbnVol_pct'] = failed_20['Volume_pct'] - failed_20['normal_Volume_pct']
-failed_20['AbnVol_pctlog'] = failed_20['Volume_pctlog'] - failed_20['normal_Volume_pctlog']
-
-dis_highReduction_20['AbnVolume'] = dis_highReduction_20['Volume'] - dis_highReduction_20['normal_Volume']
-dis_highReduction_20['AbnVol_pct'] = dis_highReduction_20['Volume_pct'] - dis_highReduction_20['normal_Volume_pct']
-dis_highReduction_20['AbnVol_pctlog'] = dis_highReduction_20['Volume_pctlog'] - dis_highReduction_20['normal_Volume_pctlog']
-dis_lowReduction_20['AbnVolume'] = dis_lowReduction_20['Volume'] - dis_lowReduction_20['normal_Volume']
-dis_lowReduction_20['AbnVol_pct'] = dis_lowReduction_20['Volume_pct'] - dis_lowReduction_20['normal_Volume_pct']
-dis_lowReduction_20['AbnVol_pctlog'] = dis_lowReduction_20['Volume_pctlog'] - dis_lowReduction_20['normal_Volume_pctlog']
-
-# Merge normal volume to estimation window volume data to get sd
-achieved_estWin_win20 = pd.merge(achieved_estWin_win20,norVol_achieved20,on=['ISIN'],how='left')
-achieved_estWin_win20['AbnVolume'] = achieved_estWin_win20['Volume'] - achieved_estWin_win20['normal_Volume']
-achieved_estWin_win20['AbnVol_pct'] = achieved_estWin_win20['Volume_pct'] - achieved_estWin_win20['normal_Volume_pct']
-achieved_estWin_win20['AbnVol_pctlog'] = achieved_estWin_win20['Volume_pctlog'] - achieved_estWin_win20['normal_Volume_pctlog']
-
-failed_estWin_win20 = pd.merge(failed_estWin_win20,norVol_failed20,on=['ISIN'],how='left')
-failed_estWin_win20['AbnVolume'] = failed_estWin_win20['Volume'] - failed_estWin_win20['normal_Volume']
-failed_estWin_win20['AbnVol_pct'] = failed_estWin_win20['Volume_pct'] - failed_estWin_win20['normal_Volume_pct']
-failed_estWin_win20['AbnVol_pctlog'] = failed_estWin_win20['Volume_pctlog'] - failed_estWin_win20['normal_Volume_pctlog']
-
-dis_highReduction_estWin20 = pd.merge(dis_highReduction_estWin20,norVol_dis_highReduction20,on=['ISIN'],how='left')
-dis_highReduction_estWin20['AbnVolume'] = dis_highReduction_estWin20['Volume'] - dis_highReduction_estWin20['normal_Volume']
-dis_highReduction_estWin20['AbnVol_pct'] = dis_highReduction_estWin20['Volume_pct'] - dis_highReduction_estWin20['normal_Volume_pct']
-dis_highReduction_estWin20['AbnVol_pctlog'] = dis_highReduction_estWin20['Volume_pctlog'] - dis_highReduction_estWin20['normal_Volume_pctlog']
-
-dis_lowReduction_estWin20 = pd.merge(dis_lowReduction_estWin20,norVol_dis_lowReduction20,on=['ISIN'],how='left')
-dis_lowReduction_estWin20['AbnVolume'] = dis_lowReduction_estWin20['Volume'] - dis_lowReduction_estWin20['normal_Volume']
-dis_lowReduction_estWin20['AbnVol_pct'] = dis_lowReduction_estWin20['Volume_pct'] - dis_lowReduction_estWin20['normal_Volume_pct']
-dis_lowReduction_estWin20['AbnVol_pctlog'] = dis_lowReduction_estWin20['Volume_pctlog'] - dis_lowReduction_estWin20['normal_Volume_pctlog']
-
-
-
-# Event plot
-achieved_20_summary = achieved_20.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-failed_20_summary = failed_20.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-
-dis_highReduction_20_summary = dis_highReduction_20.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-dis_lowReduction_20_summary = dis_lowReduction_20.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-
-achieved_20_summary['N'] = (achieved_20.groupby(['NEWDaysRelativeToEvent'],as_index=False)['AbnVolume'].count()['AbnVolume'])
-failed_20_summary['N'] = (failed_20.groupby(['NEWDaysRelativeToEvent'],as_index=False)['AbnVolume'].count()['AbnVolume'])
-
-dis_highReduction_20_summary['N'] = (dis_highReduction_20.groupby(['NEWDaysRelativeToEvent'],as_index=False)['AbnVolume'].count()['AbnVolume'])
-dis_lowReduction_20_summary['N'] = (dis_lowReduction_20.groupby(['NEWDaysRelativeToEvent'],as_index=False)['AbnVolume'].count()['AbnVolume'])
-
-
-# Achieved t-stat
-temp_achieved20 = achieved_estWin_win20.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_achieved20['AbnVolume_mbar'] = temp_achieved20['AbnVolume'] - temp_achieved20['AbnVolume'].mean()
-temp_achieved20['AbnVol_pct_mbar'] = temp_achieved20['AbnVol_pct'] - temp_achieved20['AbnVol_pct'].mean()
-temp_achieved20['AbnVol_pctlog_mbar'] = temp_achieved20['AbnVol_pctlog'] - temp_achieved20['AbnVol_pctlog'].mean()
-
-temp_achieved20['AbnVolume_mbar_sq'] = temp_achieved20['AbnVolume_mbar']**2
-temp_achieved20['AbnVol_pct_mbar_sq'] = temp_achieved20['AbnVol_pct_mbar']**2
-temp_achieved20['AbnVol_pctlog_mbar_sq'] = temp_achieved20['AbnVol_pctlog_mbar']**2
-
-achieved_20_summary['Var_AbnVolume'] = temp_achieved20['AbnVolume_mbar_sq'].mean()
-achieved_20_summary['Var_AbnVol_pct'] = temp_achieved20['AbnVol_pct_mbar_sq'].mean()
-achieved_20_summary['Var_AbnVol_pctlog'] = temp_achieved20['AbnVol_pctlog_mbar_sq'].mean()
-
-achieved_20_summary['sd_AbnVolume'] = np.sqrt(achieved_20_summary['Var_AbnVolume'])
-achieved_20_summary['sd_AbnVol_pct'] = np.sqrt(achieved_20_summary['Var_AbnVol_pct'])
-achieved_20_summary['sd_AbnVol_pctlog'] = np.sqrt(achieved_20_summary['Var_AbnVol_pctlog'])
-
-achieved_20_summary['t_AbnVolume'] = achieved_20_summary['AbnVolume']/achieved_20_summary['sd_AbnVolume']
-achieved_20_summary['t_AbnVol_pct'] = achieved_20_summary['AbnVol_pct']/achieved_20_summary['sd_AbnVol_pct']
-achieved_20_summary['t_AbnVol_pctlog'] = achieved_20_summary['AbnVol_pctlog']/achieved_20_summary['sd_AbnVol_pctlog']
-
-# Failed t-stat
-temp_failed20 = failed_estWin_win20.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_failed20['AbnVolume_mbar'] = temp_failed20['AbnVolume'] - temp_failed20['AbnVolume'].mean()
-temp_failed20['AbnVol_pct_mbar'] = temp_failed20['AbnVol_pct'] - temp_failed20['AbnVol_pct'].mean()
-temp_failed20['AbnVol_pctlog_mbar'] = temp_failed20['AbnVol_pctlog'] - temp_failed20['AbnVol_pctlog'].mean()
-
-temp_failed20['AbnVolume_mbar_sq'] = temp_failed20['AbnVolume_mbar']**2
-temp_failed20['AbnVol_pct_mbar_sq'] = temp_failed20['AbnVol_pct_mbar']**2
-temp_failed20['AbnVol_pctlog_mbar_sq'] = temp_failed20['AbnVol_pctlog_mbar']**2
-
-failed_20_summary['Var_AbnVolume'] = temp_failed20['AbnVolume_mbar_sq'].mean()
-failed_20_summary['Var_AbnVol_pct'] = temp_failed20['AbnVol_pct_mbar_sq'].mean()
-failed_20_summary['Var_AbnVol_pctlog'] = temp_failed20['AbnVol_pctlog_mbar_sq'].mean()
-
-failed_20_summary['sd_AbnVolume'] = np.sqrt(failed_20_summary['Var_AbnVolume'])
-failed_20_summary['sd_AbnVol_pct'] = np.sqrt(failed_20_summary['Var_AbnVol_pct'])
-failed_20_summary['sd_AbnVol_pctlog'] = np.sqrt(failed_20_summary['Var_AbnVol_pctlog'])
-
-failed_20_summary['t_AbnVolume'] = failed_20_summary['AbnVolume']/failed_20_summary['sd_AbnVolume']
-failed_20_summary['t_AbnVol_pct'] = failed_20_summary['AbnVol_pct']/failed_20_summary['sd_AbnVol_pct']
-failed_20_summary['t_AbnVol_pctlog'] = failed_20_summary['AbnVol_pctlog']/failed_20_summary['sd_AbnVol_pctlog']
-
-# Disappeared Type3 t-test
-temp_dis_highReduction20 = dis_highReduction_estWin20.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_dis_highReduction20['AbnVolume_mbar'] = temp_dis_highReduction20['AbnVolume'] - temp_dis_highReduction20['AbnVolume'].mean()
-temp_dis_highReduction20['AbnVol_pct_mbar'] = temp_dis_highReduction20['AbnVol_pct'] - temp_dis_highReduction20['AbnVol_pct'].mean()
-temp_dis_highReduction20['AbnVol_pctlog_mbar'] = temp_dis_highReduction20['AbnVol_pctlog'] - temp_dis_highReduction20['AbnVol_pctlog'].mean()
-
-temp_dis_highReduction20['AbnVolume_mbar_sq'] = temp_dis_highReduction20['AbnVolume_mbar']**2
-temp_dis_highReduction20['AbnVol_pct_mbar_sq'] = temp_dis_highReduction20['AbnVol_pct_mbar']**2
-temp_dis_highReduction20['AbnVol_pctlog_mbar_sq'] = temp_dis_highReduction20['AbnVol_pctlog_mbar']**2
-
-dis_highReduction_20_summary['Var_AbnVolume'] = temp_dis_highReduction20['AbnVolume_mbar_sq'].mean()
-dis_highReduction_20_summary['Var_AbnVol_pct'] = temp_dis_highReduction20['AbnVol_pct_mbar_sq'].mean()
-dis_highReduction_20_summary['Var_AbnVol_pctlog'] = temp_dis_highReduction20['AbnVol_pctlog_mbar_sq'].mean()
-
-dis_highReduction_20_summary['sd_AbnVolume'] = np.sqrt(dis_highReduction_20_summary['Var_AbnVolume'])
-dis_highReduction_20_summary['sd_AbnVol_pct'] = np.sqrt(dis_highReduction_20_summary['Var_AbnVol_pct'])
-dis_highReduction_20_summary['sd_AbnVol_pctlog'] = np.sqrt(dis_highReduction_20_summary['Var_AbnVol_pctlog'])
-
-dis_highReduction_20_summary['t_AbnVolume'] = dis_highReduction_20_summary['AbnVolume']/dis_highReduction_20_summary['sd_AbnVolume']
-dis_highReduction_20_summary['t_AbnVol_pct'] = dis_highReduction_20_summary['AbnVol_pct']/dis_highReduction_20_summary['sd_AbnVol_pct']
-dis_highReduction_20_summary['t_AbnVol_pctlog'] = dis_highReduction_20_summary['AbnVol_pctlog']/dis_highReduction_20_summary['sd_AbnVol_pctlog']
-
-# Disappeared Type4 t-test
-temp_dis_lowReduction20 = dis_lowReduction_estWin20.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_dis_lowReduction20['AbnVolume_mbar'] = temp_dis_lowReduction20['AbnVolume'] - temp_dis_lowReduction20['AbnVolume'].mean()
-temp_dis_lowReduction20['AbnVol_pct_mbar'] = temp_dis_lowReduction20['AbnVol_pct'] - temp_dis_lowReduction20['AbnVol_pct'].mean()
-temp_dis_lowReduction20['AbnVol_pctlog_mbar'] = temp_dis_lowReduction20['AbnVol_pctlog'] - temp_dis_lowReduction20['AbnVol_pctlog'].mean()
-
-temp_dis_lowReduction20['AbnVolume_mbar_sq'] = temp_dis_lowReduction20['AbnVolume_mbar']**2
-temp_dis_lowReduction20['AbnVol_pct_mbar_sq'] = temp_dis_lowReduction20['AbnVol_pct_mbar']**2
-temp_dis_lowReduction20['AbnVol_pctlog_mbar_sq'] = temp_dis_lowReduction20['AbnVol_pctlog_mbar']**2
-
-dis_lowReduction_20_summary['Var_AbnVolume'] = temp_dis_lowReduction20['AbnVolume_mbar_sq'].mean()
-dis_lowReduction_20_summary['Var_AbnVol_pct'] = temp_dis_lowReduction20['AbnVol_pct_mbar_sq'].mean()
-dis_lowReduction_20_summary['Var_AbnVol_pctlog'] = temp_dis_lowReduction20['AbnVol_pctlog_mbar_sq'].mean()
-
-dis_lowReduction_20_summary['sd_AbnVolume'] = np.sqrt(dis_lowReduction_20_summary['Var_AbnVolume'])
-dis_lowReduction_20_summary['sd_AbnVol_pct'] = np.sqrt(dis_lowReduction_20_summary['Var_AbnVol_pct'])
-dis_lowReduction_20_summary['sd_AbnVol_pctlog'] = np.sqrt(dis_lowReduction_20_summary['Var_AbnVol_pctlog'])
-
-dis_lowReduction_20_summary['t_AbnVolume'] = dis_lowReduction_20_summary['AbnVolume']/dis_lowReduction_20_summary['sd_AbnVolume']
-dis_lowReduction_20_summary['t_AbnVol_pct'] = dis_lowReduction_20_summary['AbnVol_pct']/dis_lowReduction_20_summary['sd_AbnVol_pct']
-dis_lowReduction_20_summary['t_AbnVol_pctlog'] = dis_lowReduction_20_summary['AbnVol_pctlog']/dis_lowReduction_20_summary['sd_AbnVol_pctlog']
-
-
-
-''' Volume Test - 20 day around CDP report release - DROPPING COVID FIRMS '''
-window_20 = ds_dsf_CDPrelease_sub[(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']>=-10)&(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']<=10)]
-
-# Drop firms without all 20 days of data
-remove_list = window_20.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<21] # This is the count of days
-window_20 = window_20[~window_20['ISIN'].isin(remove_list.ISIN)]
-
-### Drop covid affected firms
-window_20 = window_20[window_20['type_covid_industry']==0]
-
-achieved_20 = window_20[window_20['type']=='Achieved']
-failed_20 = window_20[(window_20['type']=='Failed')]
-dis_highReduction_20 = window_20[(window_20['type']=='Disappeared High Reduction')]
-dis_lowReduction_20 = window_20[(window_20['type']=='Disappeared Low Reduction')]
-
-
-# Abnormal volume 
-# Estimation window = {-140,-40}; 100 days long gap 30 days
-vol_estWindow20 = ds_dsf_CDPrelease[(ds_dsf_CDPrelease['BDaysRelativeToEvent']>=-140)&(ds_dsf_CDPrelease['BDaysRelativeToEvent']<=-40)]
-achieved_estWin_win20 = vol_estWindow20[vol_estWindow20['type']=='Achieved']
-failed_estWin_win20 = vol_estWindow20[(vol_estWindow20['type']=='Failed')]
-
-dis_highReduction_estWin20 = vol_estWindow20[(vol_estWindow20['type']=='Disappeared High Reduction')]
-dis_lowReduction_estWin20 = vol_estWindow20[(vol_estWindow20['type']=='Disappeared Low Reduction')]
-
-
-# Normal volume
-norVol_achieved20 = achieved_estWin_win20.groupby(['ISIN'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_achieved20.columns = ['ISIN','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-norVol_failed20 = failed_estWin_win20.groupby(['ISIN'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_failed20.columns = ['ISIN','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-
-norVol_dis_highReduction20 = dis_highReduction_estWin20.groupby(['ISIN'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_dis_highReduction20.columns = ['ISIN','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-norVol_dis_lowReduction20 = dis_lowReduction_estWin20.groupby(['ISIN'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_dis_lowReduction20.columns = ['ISIN','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-
-# Merge it to window return data
-achieved_20 = pd.merge(achieved_20,norVol_achieved20,on=['ISIN'],how='left')
-failed_20 = pd.merge(failed_20,norVol_failed20,on=['ISIN'],how='left')
-
-dis_highReduction_20 = pd.merge(dis_highReduction_20,norVol_dis_highReduction20,on=['ISIN'],how='left')
-dis_lowReduction_20 = pd.merge(dis_lowReduction_20,norVol_dis_lowReduction20,on=['ISIN'],how='left')
-
-
-achieved_20['AbnVolume'] = achieved_20['Volume'] - achieved_20['normal_Volume']
-achieved_20['AbnVol_pct'] = achieved_20['Volume_pct'] - achieved_20['normal_Volume_pct']
-achieved_20['AbnVol_pctlog'] = achieved_20['Volume_pctlog'] - achieved_20['normal_Volume_pctlog']
-
-failed_20['AbnVolume'] = failed_20['Volume'] - failed_20['normal_Volume']
-failed_20['AbnVol_pct'] = failed_20['Volume_pct'] - failed_20['normal_Volume_pct']
-failed_20['AbnVol_pctlog'] = failed_20['Volume_pctlog'] - failed_20['normal_Volume_pctlog']
-
-dis_highReduction_20['AbnVolume'] = dis_highReduction_20['Volume'] - dis_highReduction_20['normal_Volume']
-dis_highReduction_20['AbnVol_pct'] = dis_highReduction_20['Volume_pct'] - dis_highReduction_20['normal_Volume_pct']
-dis_highReduction_20['AbnVol_pctlog'] = dis_highReduction_20['Volume_pctlog'] - dis_highReduction_20['normal_Volume_pctlog']
-dis_lowReduction_20['AbnVolume'] = dis_lowReduction_20['Volume'] - dis_lowReduction_20['normal_Volume']
-dis_lowReduction_20['AbnVol_pct'] = dis_lowReduction_20['Volume_pct'] - dis_lowReduction_20['normal_Volume_pct']
-dis_lowReduction_20['AbnVol_pctlog'] = dis_lowReduction_20['Volume_pctlog'] - dis_lowReduction_20['normal_Volume_pctlog']
-
-# Merge normal volume to estimation window volume data to get sd
-achieved_estWin_win20 = pd.merge(achieved_estWin_win20,norVol_achieved20,on=['ISIN'],how='left')
-achieved_estWin_win20['AbnVolume'] = achieved_estWin_win20['Volume'] - achieved_estWin_win20['normal_Volume']
-achieved_estWin_win20['AbnVol_pct'] = achieved_estWin_win20['Volume_pct'] - achieved_estWin_win20['normal_Volume_pct']
-achieved_estWin_win20['AbnVol_pctlog'] = achieved_estWin_win20['Volume_pctlog'] - achieved_estWin_win20['normal_Volume_pctlog']
-
-failed_estWin_win20 = pd.merge(failed_estWin_win20,norVol_failed20,on=['ISIN'],how='left')
-failed_estWin_win20['AbnVolume'] = failed_estWin_win20['Volume'] - failed_estWin_win20['normal_Volume']
-failed_estWin_win20['AbnVol_pct'] = failed_estWin_win20['Volume_pct'] - failed_estWin_win20['normal_Volume_pct']
-failed_estWin_win20['AbnVol_pctlog'] = failed_estWin_win20['Volume_pctlog'] - failed_estWin_win20['normal_Volume_pctlog']
-
-dis_highReduction_estWin20 = pd.merge(dis_highReduction_estWin20,norVol_dis_highReduction20,on=['ISIN'],how='left')
-dis_highReduction_estWin20['AbnVolume'] = dis_highReduction_estWin20['Volume'] - dis_highReduction_estWin20['normal_Volume']
-dis_highReduction_estWin20['AbnVol_pct'] = dis_highReduction_estWin20['Volume_pct'] - dis_highReduction_estWin20['normal_Volume_pct']
-dis_highReduction_estWin20['AbnVol_pctlog'] = dis_highReduction_estWin20['Volume_pctlog'] - dis_highReduction_estWin20['normal_Volume_pctlog']
-
-dis_lowReduction_estWin20 = pd.merge(dis_lowReduction_estWin20,norVol_dis_lowReduction20,on=['ISIN'],how='left')
-dis_lowReduction_estWin20['AbnVolume'] = dis_lowReduction_estWin20['Volume'] - dis_lowReduction_estWin20['normal_Volume']
-dis_lowReduction_estWin20['AbnVol_pct'] = dis_lowReduction_estWin20['Volume_pct'] - dis_lowReduction_estWin20['normal_Volume_pct']
-dis_lowReduction_estWin20['AbnVol_pctlog'] = dis_lowReduction_estWin20['Volume_pctlog'] - dis_lowReduction_estWin20['normal_Volume_pctlog']
-
-
-
-# Event plot
-achieved_20_summary = achieved_20.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-failed_20_summary = failed_20.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-
-dis_highReduction_20_summary = dis_highReduction_20.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-dis_lowReduction_20_summary = dis_lowReduction_20.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-
-achieved_20_summary['N'] = (achieved_20.groupby(['NEWDaysRelativeToEvent'],as_index=False)['AbnVolume'].count()['AbnVolume'])
-failed_20_summary['N'] = (failed_20.groupby(['NEWDaysRelativeToEvent'],as_index=False)['AbnVolume'].count()['AbnVolume'])
-
-dis_highReduction_20_summary['N'] = (dis_highReduction_20.groupby(['NEWDaysRelativeToEvent'],as_index=False)['AbnVolume'].count()['AbnVolume'])
-dis_lowReduction_20_summary['N'] = (dis_lowReduction_20.groupby(['NEWDaysRelativeToEvent'],as_index=False)['AbnVolume'].count()['AbnVolume'])
-
-
-# Achieved t-stat
-temp_achieved20 = achieved_estWin_win20.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_achieved20['AbnVolume_mbar'] = temp_achieved20['AbnVolume'] - temp_achieved20['AbnVolume'].mean()
-temp_achieved20['AbnVol_pct_mbar'] = temp_achieved20['AbnVol_pct'] - temp_achieved20['AbnVol_pct'].mean()
-temp_achieved20['AbnVol_pctlog_mbar'] = temp_achieved20['AbnVol_pctlog'] - temp_achieved20['AbnVol_pctlog'].mean()
-
-temp_achieved20['AbnVolume_mbar_sq'] = temp_achieved20['AbnVolume_mbar']**2
-temp_achieved20['AbnVol_pct_mbar_sq'] = temp_achieved20['AbnVol_pct_mbar']**2
-temp_achieved20['AbnVol_pctlog_mbar_sq'] = temp_achieved20['AbnVol_pctlog_mbar']**2
-
-achieved_20_summary['Var_AbnVolume'] = temp_achieved20['AbnVolume_mbar_sq'].mean()
-achieved_20_summary['Var_AbnVol_pct'] = temp_achieved20['AbnVol_pct_mbar_sq'].mean()
-achieved_20_summary['Var_AbnVol_pctlog'] = temp_achieved20['AbnVol_pctlog_mbar_sq'].mean()
-
-achieved_20_summary['sd_AbnVolume'] = np.sqrt(achieved_20_summary['Var_AbnVolume'])
-achieved_20_summary['sd_AbnVol_pct'] = np.sqrt(achieved_20_summary['Var_AbnVol_pct'])
-achieved_20_summary['sd_AbnVol_pctlog'] = np.sqrt(achieved_20_summary['Var_AbnVol_pctlog'])
-
-achieved_20_summary['t_AbnVolume'] = achieved_20_summary['AbnVolume']/achieved_20_summary['sd_AbnVolume']
-achieved_20_summary['t_AbnVol_pct'] = achieved_20_summary['AbnVol_pct']/achieved_20_summary['sd_AbnVol_pct']
-achieved_20_summary['t_AbnVol_pctlog'] = achieved_20_summary['AbnVol_pctlog']/achieved_20_summary['sd_AbnVol_pctlog']
-
-# Failed t-stat
-temp_failed20 = failed_estWin_win20.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_failed20['AbnVolume_mbar'] = temp_failed20['AbnVolume'] - temp_failed20['AbnVolume'].mean()
-temp_failed20['AbnVol_pct_mbar'] = temp_failed20['AbnVol_pct'] - temp_failed20['AbnVol_pct'].mean()
-temp_failed20['AbnVol_pctlog_mbar'] = temp_failed20['AbnVol_pctlog'] - temp_failed20['AbnVol_pctlog'].mean()
-
-temp_failed20['AbnVolume_mbar_sq'] = temp_failed20['AbnVolume_mbar']**2
-temp_failed20['AbnVol_pct_mbar_sq'] = temp_failed20['AbnVol_pct_mbar']**2
-temp_failed20['AbnVol_pctlog_mbar_sq'] = temp_failed20['AbnVol_pctlog_mbar']**2
-
-failed_20_summary['Var_AbnVolume'] = temp_failed20['AbnVolume_mbar_sq'].mean()
-failed_20_summary['Var_AbnVol_pct'] = temp_failed20['AbnVol_pct_mbar_sq'].mean()
-failed_20_summary['Var_AbnVol_pctlog'] = temp_failed20['AbnVol_pctlog_mbar_sq'].mean()
-
-failed_20_summary['sd_AbnVolume'] = np.sqrt(failed_20_summary['Var_AbnVolume'])
-failed_20_summary['sd_AbnVol_pct'] = np.sqrt(failed_20_summary['Var_AbnVol_pct'])
-failed_20_summary['sd_AbnVol_pctlog'] = np.sqrt(failed_20_summary['Var_AbnVol_pctlog'])
-
-failed_20_summary['t_AbnVolume'] = failed_20_summary['AbnVolume']/failed_20_summary['sd_AbnVolume']
-failed_20_summary['t_AbnVol_pct'] = failed_20_summary['AbnVol_pct']/failed_20_summary['sd_AbnVol_pct']
-failed_20_summary['t_AbnVol_pctlog'] = failed_20_summary['AbnVol_pctlog']/failed_20_summary['sd_AbnVol_pctlog']
-
-
-# Disappeared Type3 t-test
-temp_dis_highReduction20 = dis_highReduction_estWin20.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_dis_highReduction20['AbnVolume_mbar'] = temp_dis_highReduction20['AbnVolume'] - temp_dis_highReduction20['AbnVolume'].mean()
-temp_dis_highReduction20['AbnVol_pct_mbar'] = temp_dis_highReduction20['AbnVol_pct'] - temp_dis_highReduction20['AbnVol_pct'].mean()
-temp_dis_highReduction20['AbnVol_pctlog_mbar'] = temp_dis_highReduction20['AbnVol_pctlog'] - temp_dis_highReduction20['AbnVol_pctlog'].mean()
-
-temp_dis_highReduction20['AbnVolume_mbar_sq'] = temp_dis_highReduction20['AbnVolume_mbar']**2
-temp_dis_highReduction20['AbnVol_pct_mbar_sq'] = temp_dis_highReduction20['AbnVol_pct_mbar']**2
-temp_dis_highReduction20['AbnVol_pctlog_mbar_sq'] = temp_dis_highReduction20['AbnVol_pctlog_mbar']**2
-
-dis_highReduction_20_summary['Var_AbnVolume'] = temp_dis_highReduction20['AbnVolume_mbar_sq'].mean()
-dis_highReduction_20_summary['Var_AbnVol_pct'] = temp_dis_highReduction20['AbnVol_pct_mbar_sq'].mean()
-dis_highReduction_20_summary['Var_AbnVol_pctlog'] = temp_dis_highReduction20['AbnVol_pctlog_mbar_sq'].mean()
-
-dis_highReduction_20_summary['sd_AbnVolume'] = np.sqrt(dis_highReduction_20_summary['Var_AbnVolume'])
-dis_highReduction_20_summary['sd_AbnVol_pct'] = np.sqrt(dis_highReduction_20_summary['Var_AbnVol_pct'])
-dis_highReduction_20_summary['sd_AbnVol_pctlog'] = np.sqrt(dis_highReduction_20_summary['Var_AbnVol_pctlog'])
-
-dis_highReduction_20_summary['t_AbnVolume'] = dis_highReduction_20_summary['AbnVolume']/dis_highReduction_20_summary['sd_AbnVolume']
-dis_highReduction_20_summary['t_AbnVol_pct'] = dis_highReduction_20_summary['AbnVol_pct']/dis_highReduction_20_summary['sd_AbnVol_pct']
-dis_highReduction_20_summary['t_AbnVol_pctlog'] = dis_highReduction_20_summary['AbnVol_pctlog']/dis_highReduction_20_summary['sd_AbnVol_pctlog']
-
-# Disappeared Type4 t-test
-temp_dis_lowReduction20 = dis_lowReduction_estWin20.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_dis_lowReduction20['AbnVolume_mbar'] = temp_dis_lowReduction20['AbnVolume'] - temp_dis_lowReduction20['AbnVolume'].mean()
-temp_dis_lowReduction20['AbnVol_pct_mbar'] = temp_dis_lowReduction20['AbnVol_pct'] - temp_dis_lowReduction20['AbnVol_pct'].mean()
-temp_dis_lowReduction20['AbnVol_pctlog_mbar'] = temp_dis_lowReduction20['AbnVol_pctlog'] - temp_dis_lowReduction20['AbnVol_pctlog'].mean()
-
-temp_dis_lowReduction20['AbnVolume_mbar_sq'] = temp_dis_lowReduction20['AbnVolume_mbar']**2
-temp_dis_lowReduction20['AbnVol_pct_mbar_sq'] = temp_dis_lowReduction20['AbnVol_pct_mbar']**2
-temp_dis_lowReduction20['AbnVol_pctlog_mbar_sq'] = temp_dis_lowReduction20['AbnVol_pctlog_mbar']**2
-
-dis_lowReduction_20_summary['Var_AbnVolume'] = temp_dis_lowReduction20['AbnVolume_mbar_sq'].mean()
-dis_lowReduction_20_summary['Var_AbnVol_pct'] = temp_dis_lowReduction20['AbnVol_pct_mbar_sq'].mean()
-dis_lowReduction_20_summary['Var_AbnVol_pctlog'] = temp_dis_lowReduction20['AbnVol_pctlog_mbar_sq'].mean()
-
-dis_lowReduction_20_summary['sd_AbnVolume'] = np.sqrt(dis_lowReduction_20_summary['Var_AbnVolume'])
-dis_lowReduction_20_summary['sd_AbnVol_pct'] = np.sqrt(dis_lowReduction_20_summary['Var_AbnVol_pct'])
-dis_lowReduction_20_summary['sd_AbnVol_pctlog'] = np.sqrt(dis_lowReduction_20_summary['Var_AbnVol_pctlog'])
-
-dis_lowReduction_20_summary['t_AbnVolume'] = dis_lowReduction_20_summary['AbnVolume']/dis_lowReduction_20_summary['sd_AbnVolume']
-dis_lowReduction_20_summary['t_AbnVol_pct'] = dis_lowReduction_20_summary['AbnVol_pct']/dis_lowReduction_20_summary['sd_AbnVol_pct']
-dis_lowReduction_20_summary['t_AbnVol_pctlog'] = dis_lowReduction_20_summary['AbnVol_pctlog']/dis_lowReduction_20_summary['sd_AbnVol_pctlog']
-
-
-
-''' Volume Test - 20 day around CDP report release - Ambitious vs. Unambitious Failed '''
-window_20 = ds_dsf_CDPrelease_sub[(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']>=-10)&(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']<=10)]
-
-# Drop firms without all 10 days of data
-remove_list = window_20.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<21] # This is the count of days
-window_20 = window_20[~window_20['ISIN'].isin(remove_list.ISIN)]
-
-## High/Low target ambition (only applies to failed companies)
-failed_amb_20 = window_20[window_20['failed_high_ambition']==1]
-failed_unamb_20 = window_20[window_20['failed_low_ambition']==1]
-
-
-# Abnormal volume 
-# Estimation window = {-140,-40}; 100 days long gap 30 days
-vol_estWindow20 = ds_dsf_CDPrelease[(ds_dsf_CDPrelease['BDaysRelativeToEvent']>=-140)&(ds_dsf_CDPrelease['BDaysRelativeToEvent']<=-40)]
-failed_amb_estWin = vol_estWindow20[(vol_estWindow20['failed_high_ambition']==1)]
-failed_unamb_estWin = vol_estWindow20[(vol_estWindow20['failed_low_ambition']==1)]
-
-
-# Normal volume
-norVol_failed_amb = failed_amb_estWin.groupby(['ISIN'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_failed_amb.columns = ['ISIN','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-norVol_failed_unamb = failed_unamb_estWin.groupby(['ISIN'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_failed_unamb.columns = ['ISIN','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-
-# Merge it to window return data
-failed_amb_20 = pd.merge(failed_amb_20,norVol_failed_amb,on=['ISIN'],how='left')
-failed_unamb_20 = pd.merge(failed_unamb_20,norVol_failed_unamb,on=['ISIN'],how='left')
-
-
-failed_amb_20['AbnVolume'] = failed_amb_20['Volume'] - failed_amb_20['normal_Volume']
-failed_amb_20['AbnVol_pct'] = failed_amb_20['Volume_pct'] - failed_amb_20['normal_Volume_pct']
-failed_amb_20['AbnVol_pctlog'] = failed_amb_20['Volume_pctlog'] - failed_amb_20['normal_Volume_pctlog']
-
-failed_unamb_20['AbnVolume'] = failed_unamb_20['Volume'] - failed_unamb_20['normal_Volume']
-failed_unamb_20['AbnVol_pct'] = failed_unamb_20['Volume_pct'] - failed_unamb_20['normal_Volume_pct']
-failed_unamb_20['AbnVol_pctlog'] = failed_unamb_20['Volume_pctlog'] - failed_unamb_20['normal_Volume_pctlog']
-
-# Merge normal volume to estimation window volume data to get sd
-failed_amb_estWin = pd.merge(failed_amb_estWin,norVol_failed_amb,on=['ISIN'],how='left')
-failed_amb_estWin['AbnVolume'] = failed_amb_estWin['Volume'] - failed_amb_estWin['normal_Volume']
-failed_amb_estWin['AbnVol_pct'] = failed_amb_estWin['Volume_pct'] - failed_amb_estWin['normal_Volume_pct']
-failed_amb_estWin['AbnVol_pctlog'] = failed_amb_estWin['Volume_pctlog'] - failed_amb_estWin['normal_Volume_pctlog']
-
-failed_unamb_estWin = pd.merge(failed_unamb_estWin,norVol_failed_unamb,on=['ISIN'],how='left')
-failed_unamb_estWin['AbnVolume'] = failed_unamb_estWin['Volume'] - failed_unamb_estWin['normal_Volume']
-failed_unamb_estWin['AbnVol_pct'] = failed_unamb_estWin['Volume_pct'] - failed_unamb_estWin['normal_Volume_pct']
-failed_unamb_estWin['AbnVol_pctlog'] = failed_unamb_estWin['Volume_pctlog'] - failed_unamb_estWin['normal_Volume_pctlog']
-
-
-# Event plot
-failed_amb_20_summary = failed_amb_20.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-failed_unamb_20_summary = failed_unamb_20.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-
-failed_amb_20_summary['N'] = (failed_amb_20.groupby(['NEWDaysRelativeToEvent'],as_index=False)['AbnVolume'].count()['AbnVolume'])
-failed_unamb_20_summary['N'] = (failed_unamb_20.groupby(['NEWDaysRelativeToEvent'],as_index=False)['AbnVolume'].count()['AbnVolume'])
-
-
-# failed_amb t-stat
-temp_failed_amb20 = failed_amb_estWin.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_failed_amb20['AbnVolume_mbar'] = temp_failed_amb20['AbnVolume'] - temp_failed_amb20['AbnVolume'].mean()
-temp_failed_amb20['AbnVol_pct_mbar'] = temp_failed_amb20['AbnVol_pct'] - temp_failed_amb20['AbnVol_pct'].mean()
-temp_failed_amb20['AbnVol_pctlog_mbar'] = temp_failed_amb20['AbnVol_pctlog'] - temp_failed_amb20['AbnVol_pctlog'].mean()
-
-temp_failed_amb20['AbnVolume_mbar_sq'] = temp_failed_amb20['AbnVolume_mbar']**2
-temp_failed_amb20['AbnVol_pct_mbar_sq'] = temp_failed_amb20['AbnVol_pct_mbar']**2
-temp_failed_amb20['AbnVol_pctlog_mbar_sq'] = temp_failed_amb20['AbnVol_pctlog_mbar']**2
-
-failed_amb_20_summary['Var_AbnVolume'] = temp_failed_amb20['AbnVolume_mbar_sq'].mean()
-failed_amb_20_summary['Var_AbnVol_pct'] = temp_failed_amb20['AbnVol_pct_mbar_sq'].mean()
-failed_amb_20_summary['Var_AbnVol_pctlog'] = temp_failed_amb20['AbnVol_pctlog_mbar_sq'].mean()
-
-failed_amb_20_summary['sd_AbnVolume'] = np.sqrt(failed_amb_20_summary['Var_AbnVolume'])
-failed_amb_20_summary['sd_AbnVol_pct'] = np.sqrt(failed_amb_20_summary['Var_AbnVol_pct'])
-failed_amb_20_summary['sd_AbnVol_pctlog'] = np.sqrt(failed_amb_20_summary['Var_AbnVol_pctlog'])
-
-failed_amb_20_summary['t_AbnVolume'] = failed_amb_20_summary['AbnVolume']/failed_amb_20_summary['sd_AbnVolume']
-failed_amb_20_summary['t_AbnVol_pct'] = failed_amb_20_summary['AbnVol_pct']/failed_amb_20_summary['sd_AbnVol_pct']
-failed_amb_20_summary['t_AbnVol_pctlog'] = failed_amb_20_summary['AbnVol_pctlog']/failed_amb_20_summary['sd_AbnVol_pctlog']
-
-# failed_unamb t-stat
-temp_failed_unamb20 = failed_unamb_estWin.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_failed_unamb20['AbnVolume_mbar'] = temp_failed_unamb20['AbnVolume'] - temp_failed_unamb20['AbnVolume'].mean()
-temp_failed_unamb20['AbnVol_pct_mbar'] = temp_failed_unamb20['AbnVol_pct'] - temp_failed_unamb20['AbnVol_pct'].mean()
-temp_failed_unamb20['AbnVol_pctlog_mbar'] = temp_failed_unamb20['AbnVol_pctlog'] - temp_failed_unamb20['AbnVol_pctlog'].mean()
-
-temp_failed_unamb20['AbnVolume_mbar_sq'] = temp_failed_unamb20['AbnVolume_mbar']**2
-temp_failed_unamb20['AbnVol_pct_mbar_sq'] = temp_failed_unamb20['AbnVol_pct_mbar']**2
-temp_failed_unamb20['AbnVol_pctlog_mbar_sq'] = temp_failed_unamb20['AbnVol_pctlog_mbar']**2
-
-failed_unamb_20_summary['Var_AbnVolume'] = temp_failed_unamb20['AbnVolume_mbar_sq'].mean()
-failed_unamb_20_summary['Var_AbnVol_pct'] = temp_failed_unamb20['AbnVol_pct_mbar_sq'].mean()
-failed_unamb_20_summary['Var_AbnVol_pctlog'] = temp_failed_unamb20['AbnVol_pctlog_mbar_sq'].mean()
-
-failed_unamb_20_summary['sd_AbnVolume'] = np.sqrt(failed_unamb_20_summary['Var_AbnVolume'])
-failed_unamb_20_summary['sd_AbnVol_pct'] = np.sqrt(failed_unamb_20_summary['Var_AbnVol_pct'])
-failed_unamb_20_summary['sd_AbnVol_pctlog'] = np.sqrt(failed_unamb_20_summary['Var_AbnVol_pctlog'])
-
-failed_unamb_20_summary['t_AbnVolume'] = failed_unamb_20_summary['AbnVolume']/failed_unamb_20_summary['sd_AbnVolume']
-failed_unamb_20_summary['t_AbnVol_pct'] = failed_unamb_20_summary['AbnVol_pct']/failed_unamb_20_summary['sd_AbnVol_pct']
-failed_unamb_20_summary['t_AbnVol_pctlog'] = failed_unamb_20_summary['AbnVol_pctlog']/failed_unamb_20_summary['sd_AbnVol_pctlog']
-
-
-
-
-
-
-'''
-############################################################################################################
-######  Market Response to 2019 Target Completion Info   ###################
-############################################################################################################
-'''
-
-''' Market Response to 2019 Target Completion Info (12 days window; -1 t0 +10) '''
-window_10 = ds_dsf_CDPrelease20_sub[(ds_dsf_CDPrelease20_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_CDPrelease20_sub['NEWDaysRelativeToEvent']<=10)]
-
-# Drop firms without all 10 days of data
-remove_list = window_10.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<12] # This is the count of days
-window_10 = window_10[~window_10['ISIN'].isin(remove_list.ISIN)]
-
-lagbehind_10 = window_10[window_10['lag_behind_2020']==1]
-ontrack_10 = window_10[window_10['lag_behind_2020']==0]
-
-lagbehind_top10_10 = window_10[window_10['lag_top10_2020']==1]
-lagbehind_top20_10 = window_10[window_10['lag_top20_2020']==1]
-ontrack_top10_10 = window_10[window_10['ontrack_top10_2020']==1]
-ontrack_top20_10 = window_10[window_10['ontrack_top20_2020']==1]
-
-
-# Cumulative returns
-lagbehind_10['CAR_logPct'] = lagbehind_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-ontrack_10['CAR_logPct'] = ontrack_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-lagbehind_top10_10['CAR_logPct'] = lagbehind_top10_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-lagbehind_top20_10['CAR_logPct'] = lagbehind_top20_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-ontrack_top10_10['CAR_logPct'] = ontrack_top10_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-ontrack_top20_10['CAR_logPct'] = ontrack_top20_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-
-
-# Get CAAR
-lagbehind_10_summary = lagbehind_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-ontrack_10_summary = ontrack_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-lagbehind_top10_10_summary = lagbehind_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-lagbehind_top20_10_summary = lagbehind_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-ontrack_top10_10_summary = ontrack_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-ontrack_top20_10_summary = ontrack_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-
-
-lagbehind_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-ontrack_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-lagbehind_top10_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-lagbehind_top20_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-ontrack_top10_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-ontrack_top20_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-
-
-# Lag Behind t-stat - Cross-sectional test
-lagbehind_10 = pd.merge(lagbehind_10,lagbehind_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-lagbehind_10['CAR-CAAR'] = lagbehind_10['CAR_logPct'] - lagbehind_10['CAAR_logPct']
-lagbehind_10['CAR-CAAR_sq'] = lagbehind_10['CAR-CAAR']**2
-
-lagbehind_10_summary['sum_CAR-CAAR_sq'] = (lagbehind_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-lagbehind_10_summary['N'] = (lagbehind_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-lagbehind_10_summary['VAR_CAAR'] = lagbehind_10_summary['sum_CAR-CAAR_sq'] / (lagbehind_10_summary['N']-1)
-lagbehind_10_summary['SD_CAAR'] = np.sqrt(lagbehind_10_summary['VAR_CAAR'])
-
-lagbehind_10_summary['T_CSecT'] = (np.sqrt(lagbehind_10_summary['N']))*lagbehind_10_summary['CAAR_logPct']/lagbehind_10_summary['SD_CAAR']
-
-# Get AAR
-lagbehind_10_summary['AAR_logPct'] = lagbehind_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = lagbehind_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-lagbehind_10 = pd.merge(lagbehind_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-lagbehind_10['MAR-AAR'] = lagbehind_10['adjRet_MarketModel_logPct'] - lagbehind_10['AAR_logPct']
-lagbehind_10['MAR-AAR_sq'] = lagbehind_10['MAR-AAR']**2
-
-lagbehind_10_summary['sum_MAR-AAR_sq'] = (lagbehind_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-lagbehind_10_summary['N'] = (lagbehind_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-lagbehind_10_summary['VAR_AAR'] = lagbehind_10_summary['sum_MAR-AAR_sq'] / (lagbehind_10_summary['N']-1)
-lagbehind_10_summary['SD_AAR'] = np.sqrt(lagbehind_10_summary['VAR_AAR'])
-
-lagbehind_10_summary['T_MAR_CSecT'] = (np.sqrt(lagbehind_10_summary['N']))*lagbehind_10_summary['AAR_logPct']/lagbehind_10_summary['SD_AAR']
-
-
-
-# On Track t-stat - Cross-sectional test
-ontrack_10 = pd.merge(ontrack_10,ontrack_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-ontrack_10['CAR-CAAR'] = ontrack_10['CAR_logPct'] - ontrack_10['CAAR_logPct']
-ontrack_10['CAR-CAAR_sq'] = ontrack_10['CAR-CAAR']**2
-
-ontrack_10_summary['sum_CAR-CAAR_sq'] = (ontrack_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-ontrack_10_summary['N'] = (ontrack_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-ontrack_10_summary['VAR_CAAR'] = ontrack_10_summary['sum_CAR-CAAR_sq'] / (ontrack_10_summary['N']-1)
-ontrack_10_summary['SD_CAAR'] = np.sqrt(ontrack_10_summary['VAR_CAAR'])
-
-ontrack_10_summary['T_CSecT'] = (np.sqrt(ontrack_10_summary['N']))*ontrack_10_summary['CAAR_logPct']/ontrack_10_summary['SD_CAAR']
-
-# Get AAR
-ontrack_10_summary['AAR_logPct'] = ontrack_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = ontrack_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-ontrack_10 = pd.merge(ontrack_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-ontrack_10['MAR-AAR'] = ontrack_10['adjRet_MarketModel_logPct'] - ontrack_10['AAR_logPct']
-ontrack_10['MAR-AAR_sq'] = ontrack_10['MAR-AAR']**2
-
-ontrack_10_summary['sum_MAR-AAR_sq'] = (ontrack_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-ontrack_10_summary['N'] = (ontrack_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-ontrack_10_summary['VAR_AAR'] = ontrack_10_summary['sum_MAR-AAR_sq'] / (ontrack_10_summary['N']-1)
-ontrack_10_summary['SD_AAR'] = np.sqrt(ontrack_10_summary['VAR_AAR'])
-
-ontrack_10_summary['T_MAR_CSecT'] = (np.sqrt(ontrack_10_summary['N']))*ontrack_10_summary['AAR_logPct']/ontrack_10_summary['SD_AAR']
-
-
-# lagbehind_top10  t-stat - Cross-sectional test
-lagbehind_top10_10 = pd.merge(lagbehind_top10_10,lagbehind_top10_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-lagbehind_top10_10['CAR-CAAR'] = lagbehind_top10_10['CAR_logPct'] - lagbehind_top10_10['CAAR_logPct']
-lagbehind_top10_10['CAR-CAAR_sq'] = lagbehind_top10_10['CAR-CAAR']**2
-
-lagbehind_top10_10_summary['sum_CAR-CAAR_sq'] = (lagbehind_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-lagbehind_top10_10_summary['N'] = (lagbehind_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-lagbehind_top10_10_summary['VAR_CAAR'] = lagbehind_top10_10_summary['sum_CAR-CAAR_sq'] / (lagbehind_top10_10_summary['N']-1)
-lagbehind_top10_10_summary['SD_CAAR'] = np.sqrt(lagbehind_top10_10_summary['VAR_CAAR'])
-
-lagbehind_top10_10_summary['T_CSecT'] = (np.sqrt(lagbehind_top10_10_summary['N']))*lagbehind_top10_10_summary['CAAR_logPct']/lagbehind_top10_10_summary['SD_CAAR']
-
-# Get AAR
-lagbehind_top10_10_summary['AAR_logPct'] = lagbehind_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = lagbehind_top10_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-lagbehind_top10_10 = pd.merge(lagbehind_top10_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-lagbehind_top10_10['MAR-AAR'] = lagbehind_top10_10['adjRet_MarketModel_logPct'] - lagbehind_top10_10['AAR_logPct']
-lagbehind_top10_10['MAR-AAR_sq'] = lagbehind_top10_10['MAR-AAR']**2
-
-lagbehind_top10_10_summary['sum_MAR-AAR_sq'] = (lagbehind_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-lagbehind_top10_10_summary['N'] = (lagbehind_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-lagbehind_top10_10_summary['VAR_AAR'] = lagbehind_top10_10_summary['sum_MAR-AAR_sq'] / (lagbehind_top10_10_summary['N']-1)
-lagbehind_top10_10_summary['SD_AAR'] = np.sqrt(lagbehind_top10_10_summary['VAR_AAR'])
-
-lagbehind_top10_10_summary['T_MAR_CSecT'] = (np.sqrt(lagbehind_top10_10_summary['N']))*lagbehind_top10_10_summary['AAR_logPct']/lagbehind_top10_10_summary['SD_AAR']
-
-
-# lagbehind_top20  t-stat - Cross-sectional test
-lagbehind_top20_10 = pd.merge(lagbehind_top20_10,lagbehind_top20_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-lagbehind_top20_10['CAR-CAAR'] = lagbehind_top20_10['CAR_logPct'] - lagbehind_top20_10['CAAR_logPct']
-lagbehind_top20_10['CAR-CAAR_sq'] = lagbehind_top20_10['CAR-CAAR']**2
-
-lagbehind_top20_10_summary['sum_CAR-CAAR_sq'] = (lagbehind_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-lagbehind_top20_10_summary['N'] = (lagbehind_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-lagbehind_top20_10_summary['VAR_CAAR'] = lagbehind_top20_10_summary['sum_CAR-CAAR_sq'] / (lagbehind_top20_10_summary['N']-1)
-lagbehind_top20_10_summary['SD_CAAR'] = np.sqrt(lagbehind_top20_10_summary['VAR_CAAR'])
-
-lagbehind_top20_10_summary['T_CSecT'] = (np.sqrt(lagbehind_top20_10_summary['N']))*lagbehind_top20_10_summary['CAAR_logPct']/lagbehind_top20_10_summary['SD_CAAR']
-
-# Get AAR
-lagbehind_top20_10_summary['AAR_logPct'] = lagbehind_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = lagbehind_top20_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-lagbehind_top20_10 = pd.merge(lagbehind_top20_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-lagbehind_top20_10['MAR-AAR'] = lagbehind_top20_10['adjRet_MarketModel_logPct'] - lagbehind_top20_10['AAR_logPct']
-lagbehind_top20_10['MAR-AAR_sq'] = lagbehind_top20_10['MAR-AAR']**2
-
-lagbehind_top20_10_summary['sum_MAR-AAR_sq'] = (lagbehind_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-lagbehind_top20_10_summary['N'] = (lagbehind_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-lagbehind_top20_10_summary['VAR_AAR'] = lagbehind_top20_10_summary['sum_MAR-AAR_sq'] / (lagbehind_top20_10_summary['N']-1)
-lagbehind_top20_10_summary['SD_AAR'] = np.sqrt(lagbehind_top20_10_summary['VAR_AAR'])
-
-lagbehind_top20_10_summary['T_MAR_CSecT'] = (np.sqrt(lagbehind_top20_10_summary['N']))*lagbehind_top20_10_summary['AAR_logPct']/lagbehind_top20_10_summary['SD_AAR']
-
-
-# ontrack_top10  t-stat - Cross-sectional test
-ontrack_top10_10 = pd.merge(ontrack_top10_10,ontrack_top10_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-ontrack_top10_10['CAR-CAAR'] = ontrack_top10_10['CAR_logPct'] - ontrack_top10_10['CAAR_logPct']
-ontrack_top10_10['CAR-CAAR_sq'] = ontrack_top10_10['CAR-CAAR']**2
-
-ontrack_top10_10_summary['sum_CAR-CAAR_sq'] = (ontrack_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-ontrack_top10_10_summary['N'] = (ontrack_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-ontrack_top10_10_summary['VAR_CAAR'] = ontrack_top10_10_summary['sum_CAR-CAAR_sq'] / (ontrack_top10_10_summary['N']-1)
-ontrack_top10_10_summary['SD_CAAR'] = np.sqrt(ontrack_top10_10_summary['VAR_CAAR'])
-
-ontrack_top10_10_summary['T_CSecT'] = (np.sqrt(ontrack_top10_10_summary['N']))*ontrack_top10_10_summary['CAAR_logPct']/ontrack_top10_10_summary['SD_CAAR']
-
-# Get AAR
-ontrack_top10_10_summary['AAR_logPct'] = ontrack_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = ontrack_top10_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-ontrack_top10_10 = pd.merge(ontrack_top10_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-ontrack_top10_10['MAR-AAR'] = ontrack_top10_10['adjRet_MarketModel_logPct'] - ontrack_top10_10['AAR_logPct']
-ontrack_top10_10['MAR-AAR_sq'] = ontrack_top10_10['MAR-AAR']**2
-
-ontrack_top10_10_summary['sum_MAR-AAR_sq'] = (ontrack_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-ontrack_top10_10_summary['N'] = (ontrack_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-ontrack_top10_10_summary['VAR_AAR'] = ontrack_top10_10_summary['sum_MAR-AAR_sq'] / (ontrack_top10_10_summary['N']-1)
-ontrack_top10_10_summary['SD_AAR'] = np.sqrt(ontrack_top10_10_summary['VAR_AAR'])
-
-ontrack_top10_10_summary['T_MAR_CSecT'] = (np.sqrt(ontrack_top10_10_summary['N']))*ontrack_top10_10_summary['AAR_logPct']/ontrack_top10_10_summary['SD_AAR']
-
-
-# ontrack_top20  t-stat - Cross-sectional test
-ontrack_top20_10 = pd.merge(ontrack_top20_10,ontrack_top20_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-ontrack_top20_10['CAR-CAAR'] = ontrack_top20_10['CAR_logPct'] - ontrack_top20_10['CAAR_logPct']
-ontrack_top20_10['CAR-CAAR_sq'] = ontrack_top20_10['CAR-CAAR']**2
-
-ontrack_top20_10_summary['sum_CAR-CAAR_sq'] = (ontrack_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-ontrack_top20_10_summary['N'] = (ontrack_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-ontrack_top20_10_summary['VAR_CAAR'] = ontrack_top20_10_summary['sum_CAR-CAAR_sq'] / (ontrack_top20_10_summary['N']-1)
-ontrack_top20_10_summary['SD_CAAR'] = np.sqrt(ontrack_top20_10_summary['VAR_CAAR'])
-
-ontrack_top20_10_summary['T_CSecT'] = (np.sqrt(ontrack_top20_10_summary['N']))*ontrack_top20_10_summary['CAAR_logPct']/ontrack_top20_10_summary['SD_CAAR']
-
-# Get AAR
-ontrack_top20_10_summary['AAR_logPct'] = ontrack_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = ontrack_top20_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-ontrack_top20_10 = pd.merge(ontrack_top20_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-ontrack_top20_10['MAR-AAR'] = ontrack_top20_10['adjRet_MarketModel_logPct'] - ontrack_top20_10['AAR_logPct']
-ontrack_top20_10['MAR-AAR_sq'] = ontrack_top20_10['MAR-AAR']**2
-
-ontrack_top20_10_summary['sum_MAR-AAR_sq'] = (ontrack_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-ontrack_top20_10_summary['N'] = (ontrack_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-ontrack_top20_10_summary['VAR_AAR'] = ontrack_top20_10_summary['sum_MAR-AAR_sq'] / (ontrack_top20_10_summary['N']-1)
-ontrack_top20_10_summary['SD_AAR'] = np.sqrt(ontrack_top20_10_summary['VAR_AAR'])
-
-ontrack_top20_10_summary['T_MAR_CSecT'] = (np.sqrt(ontrack_top20_10_summary['N']))*ontrack_top20_10_summary['AAR_logPct']/ontrack_top20_10_summary['SD_AAR']
-
-
-
-
-''' Volume Test - Around 2019 Target Completion Info '''
-
-window_20 = ds_dsf_CDPrelease20_sub[(ds_dsf_CDPrelease20_sub['NEWDaysRelativeToEvent']>=-10)&(ds_dsf_CDPrelease20_sub['NEWDaysRelativeToEvent']<=10)]
-
-# Drop firms without all 20 days of data
-remove_list = window_20.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<21] # This is the count of days
-window_20 = window_20[~window_20['ISIN'].isin(remove_list.ISIN)]
-
-lagbehind_20 = window_20[window_20['lag_behind_2020']==1]
-
-# Abnormal volume 
-# Estimation window = {-140,-40}; 100 days long gap 30 days
-vol_estWindow20 = ds_dsf_CDPrelease20[(ds_dsf_CDPrelease20['BDaysRelativeToEvent']>=-140)&(ds_dsf_CDPrelease20['BDaysRelativeToEvent']<=-40)]
-lagbehind_estWin = vol_estWindow20[vol_estWindow20['lag_behind_2020']==1]
-
-# Normal volume
-norVol_lagbehind20 = lagbehind_estWin.groupby(['ISIN'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_lagbehind20.columns = ['ISIN','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-
-# Merge it to window return data
-lagbehind_20 = pd.merge(lagbehind_20,norVol_lagbehind20,on=['ISIN'],how='left')
-
-lagbehind_20['AbnVolume'] = lagbehind_20['Volume'] - lagbehind_20['normal_Volume']
-lagbehind_20['AbnVol_pct'] = lagbehind_20['Volume_pct'] - lagbehind_20['normal_Volume_pct']
-lagbehind_20['AbnVol_pctlog'] = lagbehind_20['Volume_pctlog'] - lagbehind_20['normal_Volume_pctlog']
-
-# Merge normal volume to estimation window volume data to get sd
-lagbehind_estWin = pd.merge(lagbehind_estWin,norVol_lagbehind20,on=['ISIN'],how='left')
-lagbehind_estWin['AbnVolume'] = lagbehind_estWin['Volume'] - lagbehind_estWin['normal_Volume']
-lagbehind_estWin['AbnVol_pct'] = lagbehind_estWin['Volume_pct'] - lagbehind_estWin['normal_Volume_pct']
-lagbehind_estWin['AbnVol_pctlog'] = lagbehind_estWin['Volume_pctlog'] - lagbehind_estWin['normal_Volume_pctlog']
-
-# Event plot
-lagbehind_20_summary = lagbehind_20.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-lagbehind_20_summary['N'] = (lagbehind_20.groupby(['NEWDaysRelativeToEvent'],as_index=False)['AbnVolume'].count()['AbnVolume'])
-
-# t-stat
-temp_lagbehind20 = lagbehind_estWin.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_lagbehind20['AbnVolume_mbar'] = temp_lagbehind20['AbnVolume'] - temp_lagbehind20['AbnVolume'].mean()
-temp_lagbehind20['AbnVol_pct_mbar'] = temp_lagbehind20['AbnVol_pct'] - temp_lagbehind20['AbnVol_pct'].mean()
-temp_lagbehind20['AbnVol_pctlog_mbar'] = temp_lagbehind20['AbnVol_pctlog'] - temp_lagbehind20['AbnVol_pctlog'].mean()
-
-temp_lagbehind20['AbnVolume_mbar_sq'] = temp_lagbehind20['AbnVolume_mbar']**2
-temp_lagbehind20['AbnVol_pct_mbar_sq'] = temp_lagbehind20['AbnVol_pct_mbar']**2
-temp_lagbehind20['AbnVol_pctlog_mbar_sq'] = temp_lagbehind20['AbnVol_pctlog_mbar']**2
-
-lagbehind_20_summary['Var_AbnVolume'] = temp_lagbehind20['AbnVolume_mbar_sq'].mean()
-lagbehind_20_summary['Var_AbnVol_pct'] = temp_lagbehind20['AbnVol_pct_mbar_sq'].mean()
-lagbehind_20_summary['Var_AbnVol_pctlog'] = temp_lagbehind20['AbnVol_pctlog_mbar_sq'].mean()
-
-lagbehind_20_summary['sd_AbnVolume'] = np.sqrt(lagbehind_20_summary['Var_AbnVolume'])
-lagbehind_20_summary['sd_AbnVol_pct'] = np.sqrt(lagbehind_20_summary['Var_AbnVol_pct'])
-lagbehind_20_summary['sd_AbnVol_pctlog'] = np.sqrt(lagbehind_20_summary['Var_AbnVol_pctlog'])
-
-lagbehind_20_summary['t_AbnVolume'] = lagbehind_20_summary['AbnVolume']/lagbehind_20_summary['sd_AbnVolume']
-lagbehind_20_summary['t_AbnVol_pct'] = lagbehind_20_summary['AbnVol_pct']/lagbehind_20_summary['sd_AbnVol_pct']
-lagbehind_20_summary['t_AbnVol_pctlog'] = lagbehind_20_summary['AbnVol_pctlog']/lagbehind_20_summary['sd_AbnVol_pctlog']
-
-
-
-
-'''
-############################################################################################################
-######  Market Response to 2018 Target Completion Info   ###################
-############################################################################################################
-'''
-
-''' Market Response to 2018 Target Completion Info (10 days window) '''
-window_10 = ds_dsf_CDPrelease19_sub[(ds_dsf_CDPrelease19_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_CDPrelease19_sub['NEWDaysRelativeToEvent']<=10)]
-
-# Drop firms without all 20 days of data
-remove_list = window_10.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<12] # This is the count of days
-window_10 = window_10[~window_10['ISIN'].isin(remove_list.ISIN)]
-
-lagbehind_10 = window_10[window_10['lag_behind_2019']==1]
-ontrack_10 = window_10[window_10['lag_behind_2019']==0]
-
-lagbehind_top10_10 = window_10[window_10['lag_top10_2019']==1]
-lagbehind_top20_10 = window_10[window_10['lag_top20_2019']==1]
-ontrack_top10_10 = window_10[window_10['ontrack_top10_2019']==1]
-ontrack_top20_10 = window_10[window_10['ontrack_top20_2019']==1]
-
-
-# Cumulative returns
-lagbehind_10['CAR_logPct'] = lagbehind_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-ontrack_10['CAR_logPct'] = ontrack_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-lagbehind_top10_10['CAR_logPct'] = lagbehind_top10_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-lagbehind_top20_10['CAR_logPct'] = lagbehind_top20_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-ontrack_top10_10['CAR_logPct'] = ontrack_top10_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-ontrack_top20_10['CAR_logPct'] = ontrack_top20_10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-
-
-# Get CAAR
-lagbehind_10_summary = lagbehind_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-ontrack_10_summary = ontrack_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-lagbehind_top10_10_summary = lagbehind_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-lagbehind_top20_10_summary = lagbehind_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-ontrack_top10_10_summary = ontrack_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-ontrack_top20_10_summary = ontrack_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-
-
-lagbehind_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-ontrack_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-lagbehind_top10_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-lagbehind_top20_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-ontrack_top10_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-ontrack_top20_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-
-
-# Lag Behind t-stat - Cross-sectional test
-lagbehind_10 = pd.merge(lagbehind_10,lagbehind_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-lagbehind_10['CAR-CAAR'] = lagbehind_10['CAR_logPct'] - lagbehind_10['CAAR_logPct']
-lagbehind_10['CAR-CAAR_sq'] = lagbehind_10['CAR-CAAR']**2
-
-lagbehind_10_summary['sum_CAR-CAAR_sq'] = (lagbehind_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-lagbehind_10_summary['N'] = (lagbehind_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-lagbehind_10_summary['VAR_CAAR'] = lagbehind_10_summary['sum_CAR-CAAR_sq'] / (lagbehind_10_summary['N']-1)
-lagbehind_10_summary['SD_CAAR'] = np.sqrt(lagbehind_10_summary['VAR_CAAR'])
-
-lagbehind_10_summary['T_CSecT'] = (np.sqrt(lagbehind_10_summary['N']))*lagbehind_10_summary['CAAR_logPct']/lagbehind_10_summary['SD_CAAR']
-
-# Get AAR
-lagbehind_10_summary['AAR_logPct'] = lagbehind_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = lagbehind_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-lagbehind_10 = pd.merge(lagbehind_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-lagbehind_10['MAR-AAR'] = lagbehind_10['adjRet_MarketModel_logPct'] - lagbehind_10['AAR_logPct']
-lagbehind_10['MAR-AAR_sq'] = lagbehind_10['MAR-AAR']**2
-
-lagbehind_10_summary['sum_MAR-AAR_sq'] = (lagbehind_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-lagbehind_10_summary['N'] = (lagbehind_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-lagbehind_10_summary['VAR_AAR'] = lagbehind_10_summary['sum_MAR-AAR_sq'] / (lagbehind_10_summary['N']-1)
-lagbehind_10_summary['SD_AAR'] = np.sqrt(lagbehind_10_summary['VAR_AAR'])
-
-lagbehind_10_summary['T_MAR_CSecT'] = (np.sqrt(lagbehind_10_summary['N']))*lagbehind_10_summary['AAR_logPct']/lagbehind_10_summary['SD_AAR']
-
-
-
-# On Track t-stat - Cross-sectional test
-ontrack_10 = pd.merge(ontrack_10,ontrack_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-ontrack_10['CAR-CAAR'] = ontrack_10['CAR_logPct'] - ontrack_10['CAAR_logPct']
-ontrack_10['CAR-CAAR_sq'] = ontrack_10['CAR-CAAR']**2
-
-ontrack_10_summary['sum_CAR-CAAR_sq'] = (ontrack_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-ontrack_10_summary['N'] = (ontrack_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-ontrack_10_summary['VAR_CAAR'] = ontrack_10_summary['sum_CAR-CAAR_sq'] / (ontrack_10_summary['N']-1)
-ontrack_10_summary['SD_CAAR'] = np.sqrt(ontrack_10_summary['VAR_CAAR'])
-
-ontrack_10_summary['T_CSecT'] = (np.sqrt(ontrack_10_summary['N']))*ontrack_10_summary['CAAR_logPct']/ontrack_10_summary['SD_CAAR']
-
-# Get AAR
-ontrack_10_summary['AAR_logPct'] = ontrack_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = ontrack_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-ontrack_10 = pd.merge(ontrack_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-ontrack_10['MAR-AAR'] = ontrack_10['adjRet_MarketModel_logPct'] - ontrack_10['AAR_logPct']
-ontrack_10['MAR-AAR_sq'] = ontrack_10['MAR-AAR']**2
-
-ontrack_10_summary['sum_MAR-AAR_sq'] = (ontrack_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-ontrack_10_summary['N'] = (ontrack_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-ontrack_10_summary['VAR_AAR'] = ontrack_10_summary['sum_MAR-AAR_sq'] / (ontrack_10_summary['N']-1)
-ontrack_10_summary['SD_AAR'] = np.sqrt(ontrack_10_summary['VAR_AAR'])
-
-ontrack_10_summary['T_MAR_CSecT'] = (np.sqrt(ontrack_10_summary['N']))*ontrack_10_summary['AAR_logPct']/ontrack_10_summary['SD_AAR']
-
-
-# lagbehind_top10  t-stat - Cross-sectional test
-lagbehind_top10_10 = pd.merge(lagbehind_top10_10,lagbehind_top10_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-lagbehind_top10_10['CAR-CAAR'] = lagbehind_top10_10['CAR_logPct'] - lagbehind_top10_10['CAAR_logPct']
-lagbehind_top10_10['CAR-CAAR_sq'] = lagbehind_top10_10['CAR-CAAR']**2
-
-lagbehind_top10_10_summary['sum_CAR-CAAR_sq'] = (lagbehind_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-lagbehind_top10_10_summary['N'] = (lagbehind_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-lagbehind_top10_10_summary['VAR_CAAR'] = lagbehind_top10_10_summary['sum_CAR-CAAR_sq'] / (lagbehind_top10_10_summary['N']-1)
-lagbehind_top10_10_summary['SD_CAAR'] = np.sqrt(lagbehind_top10_10_summary['VAR_CAAR'])
-
-lagbehind_top10_10_summary['T_CSecT'] = (np.sqrt(lagbehind_top10_10_summary['N']))*lagbehind_top10_10_summary['CAAR_logPct']/lagbehind_top10_10_summary['SD_CAAR']
-
-# Get AAR
-lagbehind_top10_10_summary['AAR_logPct'] = lagbehind_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = lagbehind_top10_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-lagbehind_top10_10 = pd.merge(lagbehind_top10_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-lagbehind_top10_10['MAR-AAR'] = lagbehind_top10_10['adjRet_MarketModel_logPct'] - lagbehind_top10_10['AAR_logPct']
-lagbehind_top10_10['MAR-AAR_sq'] = lagbehind_top10_10['MAR-AAR']**2
-
-lagbehind_top10_10_summary['sum_MAR-AAR_sq'] = (lagbehind_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-lagbehind_top10_10_summary['N'] = (lagbehind_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-lagbehind_top10_10_summary['VAR_AAR'] = lagbehind_top10_10_summary['sum_MAR-AAR_sq'] / (lagbehind_top10_10_summary['N']-1)
-lagbehind_top10_10_summary['SD_AAR'] = np.sqrt(lagbehind_top10_10_summary['VAR_AAR'])
-
-lagbehind_top10_10_summary['T_MAR_CSecT'] = (np.sqrt(lagbehind_top10_10_summary['N']))*lagbehind_top10_10_summary['AAR_logPct']/lagbehind_top10_10_summary['SD_AAR']
-
-
-# lagbehind_top20  t-stat - Cross-sectional test
-lagbehind_top20_10 = pd.merge(lagbehind_top20_10,lagbehind_top20_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-lagbehind_top20_10['CAR-CAAR'] = lagbehind_top20_10['CAR_logPct'] - lagbehind_top20_10['CAAR_logPct']
-lagbehind_top20_10['CAR-CAAR_sq'] = lagbehind_top20_10['CAR-CAAR']**2
-
-lagbehind_top20_10_summary['sum_CAR-CAAR_sq'] = (lagbehind_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-lagbehind_top20_10_summary['N'] = (lagbehind_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-lagbehind_top20_10_summary['VAR_CAAR'] = lagbehind_top20_10_summary['sum_CAR-CAAR_sq'] / (lagbehind_top20_10_summary['N']-1)
-lagbehind_top20_10_summary['SD_CAAR'] = np.sqrt(lagbehind_top20_10_summary['VAR_CAAR'])
-
-lagbehind_top20_10_summary['T_CSecT'] = (np.sqrt(lagbehind_top20_10_summary['N']))*lagbehind_top20_10_summary['CAAR_logPct']/lagbehind_top20_10_summary['SD_CAAR']
-
-# Get AAR
-lagbehind_top20_10_summary['AAR_logPct'] = lagbehind_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = lagbehind_top20_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-lagbehind_top20_10 = pd.merge(lagbehind_top20_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-lagbehind_top20_10['MAR-AAR'] = lagbehind_top20_10['adjRet_MarketModel_logPct'] - lagbehind_top20_10['AAR_logPct']
-lagbehind_top20_10['MAR-AAR_sq'] = lagbehind_top20_10['MAR-AAR']**2
-
-lagbehind_top20_10_summary['sum_MAR-AAR_sq'] = (lagbehind_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-lagbehind_top20_10_summary['N'] = (lagbehind_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-lagbehind_top20_10_summary['VAR_AAR'] = lagbehind_top20_10_summary['sum_MAR-AAR_sq'] / (lagbehind_top20_10_summary['N']-1)
-lagbehind_top20_10_summary['SD_AAR'] = np.sqrt(lagbehind_top20_10_summary['VAR_AAR'])
-
-lagbehind_top20_10_summary['T_MAR_CSecT'] = (np.sqrt(lagbehind_top20_10_summary['N']))*lagbehind_top20_10_summary['AAR_logPct']/lagbehind_top20_10_summary['SD_AAR']
-
-
-# ontrack_top10  t-stat - Cross-sectional test
-ontrack_top10_10 = pd.merge(ontrack_top10_10,ontrack_top10_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-ontrack_top10_10['CAR-CAAR'] = ontrack_top10_10['CAR_logPct'] - ontrack_top10_10['CAAR_logPct']
-ontrack_top10_10['CAR-CAAR_sq'] = ontrack_top10_10['CAR-CAAR']**2
-
-ontrack_top10_10_summary['sum_CAR-CAAR_sq'] = (ontrack_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-ontrack_top10_10_summary['N'] = (ontrack_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-ontrack_top10_10_summary['VAR_CAAR'] = ontrack_top10_10_summary['sum_CAR-CAAR_sq'] / (ontrack_top10_10_summary['N']-1)
-ontrack_top10_10_summary['SD_CAAR'] = np.sqrt(ontrack_top10_10_summary['VAR_CAAR'])
-
-ontrack_top10_10_summary['T_CSecT'] = (np.sqrt(ontrack_top10_10_summary['N']))*ontrack_top10_10_summary['CAAR_logPct']/ontrack_top10_10_summary['SD_CAAR']
-
-# Get AAR
-ontrack_top10_10_summary['AAR_logPct'] = ontrack_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = ontrack_top10_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-ontrack_top10_10 = pd.merge(ontrack_top10_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-ontrack_top10_10['MAR-AAR'] = ontrack_top10_10['adjRet_MarketModel_logPct'] - ontrack_top10_10['AAR_logPct']
-ontrack_top10_10['MAR-AAR_sq'] = ontrack_top10_10['MAR-AAR']**2
-
-ontrack_top10_10_summary['sum_MAR-AAR_sq'] = (ontrack_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-ontrack_top10_10_summary['N'] = (ontrack_top10_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-ontrack_top10_10_summary['VAR_AAR'] = ontrack_top10_10_summary['sum_MAR-AAR_sq'] / (ontrack_top10_10_summary['N']-1)
-ontrack_top10_10_summary['SD_AAR'] = np.sqrt(ontrack_top10_10_summary['VAR_AAR'])
-
-ontrack_top10_10_summary['T_MAR_CSecT'] = (np.sqrt(ontrack_top10_10_summary['N']))*ontrack_top10_10_summary['AAR_logPct']/ontrack_top10_10_summary['SD_AAR']
-
-
-# ontrack_top20  t-stat - Cross-sectional test
-ontrack_top20_10 = pd.merge(ontrack_top20_10,ontrack_top20_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-ontrack_top20_10['CAR-CAAR'] = ontrack_top20_10['CAR_logPct'] - ontrack_top20_10['CAAR_logPct']
-ontrack_top20_10['CAR-CAAR_sq'] = ontrack_top20_10['CAR-CAAR']**2
-
-ontrack_top20_10_summary['sum_CAR-CAAR_sq'] = (ontrack_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-ontrack_top20_10_summary['N'] = (ontrack_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-ontrack_top20_10_summary['VAR_CAAR'] = ontrack_top20_10_summary['sum_CAR-CAAR_sq'] / (ontrack_top20_10_summary['N']-1)
-ontrack_top20_10_summary['SD_CAAR'] = np.sqrt(ontrack_top20_10_summary['VAR_CAAR'])
-
-ontrack_top20_10_summary['T_CSecT'] = (np.sqrt(ontrack_top20_10_summary['N']))*ontrack_top20_10_summary['CAAR_logPct']/ontrack_top20_10_summary['SD_CAAR']
-
-# Get AAR
-ontrack_top20_10_summary['AAR_logPct'] = ontrack_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = ontrack_top20_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-ontrack_top20_10 = pd.merge(ontrack_top20_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-ontrack_top20_10['MAR-AAR'] = ontrack_top20_10['adjRet_MarketModel_logPct'] - ontrack_top20_10['AAR_logPct']
-ontrack_top20_10['MAR-AAR_sq'] = ontrack_top20_10['MAR-AAR']**2
-
-ontrack_top20_10_summary['sum_MAR-AAR_sq'] = (ontrack_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-ontrack_top20_10_summary['N'] = (ontrack_top20_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-ontrack_top20_10_summary['VAR_AAR'] = ontrack_top20_10_summary['sum_MAR-AAR_sq'] / (ontrack_top20_10_summary['N']-1)
-ontrack_top20_10_summary['SD_AAR'] = np.sqrt(ontrack_top20_10_summary['VAR_AAR'])
-
-ontrack_top20_10_summary['T_MAR_CSecT'] = (np.sqrt(ontrack_top20_10_summary['N']))*ontrack_top20_10_summary['AAR_logPct']/ontrack_top20_10_summary['SD_AAR']
-
-
-
-''' Volume Test - Around 2018 Target Completion Info '''
-
-window_20 = ds_dsf_CDPrelease19_sub[(ds_dsf_CDPrelease19_sub['NEWDaysRelativeToEvent']>=-10)&(ds_dsf_CDPrelease19_sub['NEWDaysRelativeToEvent']<=10)]
-
-# Drop firms without all 20 days of data
-remove_list = window_20.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<21] # This is the count of days
-window_20 = window_20[~window_20['ISIN'].isin(remove_list.ISIN)]
-
-lagbehind_20 = window_20[window_20['lag_behind_2019']==1]
-
-# Abnormal volume 
-# Estimation window = {-140,-40}; 100 days long gap 30 days
-vol_estWindow20 = ds_dsf_CDPrelease19[(ds_dsf_CDPrelease19['BDaysRelativeToEvent']>=-140)&(ds_dsf_CDPrelease19['BDaysRelativeToEvent']<=-40)]
-lagbehind_estWin = vol_estWindow20[vol_estWindow20['lag_behind_2019']==1]
-
-# Normal volume
-norVol_lagbehind20 = lagbehind_estWin.groupby(['ISIN'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_lagbehind20.columns = ['ISIN','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-
-# Merge it to window return data
-lagbehind_20 = pd.merge(lagbehind_20,norVol_lagbehind20,on=['ISIN'],how='left')
-
-lagbehind_20['AbnVolume'] = lagbehind_20['Volume'] - lagbehind_20['normal_Volume']
-lagbehind_20['AbnVol_pct'] = lagbehind_20['Volume_pct'] - lagbehind_20['normal_Volume_pct']
-lagbehind_20['AbnVol_pctlog'] = lagbehind_20['Volume_pctlog'] - lagbehind_20['normal_Volume_pctlog']
-
-# Merge normal volume to estimation window volume data to get sd
-lagbehind_estWin = pd.merge(lagbehind_estWin,norVol_lagbehind20,on=['ISIN'],how='left')
-lagbehind_estWin['AbnVolume'] = lagbehind_estWin['Volume'] - lagbehind_estWin['normal_Volume']
-lagbehind_estWin['AbnVol_pct'] = lagbehind_estWin['Volume_pct'] - lagbehind_estWin['normal_Volume_pct']
-lagbehind_estWin['AbnVol_pctlog'] = lagbehind_estWin['Volume_pctlog'] - lagbehind_estWin['normal_Volume_pctlog']
-
-# Event plot
-lagbehind_20_summary = lagbehind_20.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-lagbehind_20_summary['N'] = (lagbehind_20.groupby(['NEWDaysRelativeToEvent'],as_index=False)['AbnVolume'].count()['AbnVolume'])
-
-# t-stat
-temp_lagbehind20 = lagbehind_estWin.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_lagbehind20['AbnVolume_mbar'] = temp_lagbehind20['AbnVolume'] - temp_lagbehind20['AbnVolume'].mean()
-temp_lagbehind20['AbnVol_pct_mbar'] = temp_lagbehind20['AbnVol_pct'] - temp_lagbehind20['AbnVol_pct'].mean()
-temp_lagbehind20['AbnVol_pctlog_mbar'] = temp_lagbehind20['AbnVol_pctlog'] - temp_lagbehind20['AbnVol_pctlog'].mean()
-
-temp_lagbehind20['AbnVolume_mbar_sq'] = temp_lagbehind20['AbnVolume_mbar']**2
-temp_lagbehind20['AbnVol_pct_mbar_sq'] = temp_lagbehind20['AbnVol_pct_mbar']**2
-temp_lagbehind20['AbnVol_pctlog_mbar_sq'] = temp_lagbehind20['AbnVol_pctlog_mbar']**2
-
-lagbehind_20_summary['Var_AbnVolume'] = temp_lagbehind20['AbnVolume_mbar_sq'].mean()
-lagbehind_20_summary['Var_AbnVol_pct'] = temp_lagbehind20['AbnVol_pct_mbar_sq'].mean()
-lagbehind_20_summary['Var_AbnVol_pctlog'] = temp_lagbehind20['AbnVol_pctlog_mbar_sq'].mean()
-
-lagbehind_20_summary['sd_AbnVolume'] = np.sqrt(lagbehind_20_summary['Var_AbnVolume'])
-lagbehind_20_summary['sd_AbnVol_pct'] = np.sqrt(lagbehind_20_summary['Var_AbnVol_pct'])
-lagbehind_20_summary['sd_AbnVol_pctlog'] = np.sqrt(lagbehind_20_summary['Var_AbnVol_pctlog'])
-
-lagbehind_20_summary['t_AbnVolume'] = lagbehind_20_summary['AbnVolume']/lagbehind_20_summary['sd_AbnVolume']
-lagbehind_20_summary['t_AbnVol_pct'] = lagbehind_20_summary['AbnVol_pct']/lagbehind_20_summary['sd_AbnVol_pct']
-lagbehind_20_summary['t_AbnVol_pctlog'] = lagbehind_20_summary['AbnVol_pctlog']/lagbehind_20_summary['sd_AbnVol_pctlog']
-
-
-
-
-
-
-'''
-############################################################################################################
-######   Around Announcement/Media coverage of 2020 targets   ###################
-############################################################################################################
-'''
-''' Market Response to 2020 target announcement media coverage (10 days window) '''
-window_10 = ds_dsf_targetAnnounce_sub[(ds_dsf_targetAnnounce_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_targetAnnounce_sub['NEWDaysRelativeToEvent']<=10)]
-
-# Drop firms without all 10 days of data
-remove_list = window_10.groupby(['ISIN','EventDate'],as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<12] # This is the count of days
-remove_list['ISIN_EventDate'] = remove_list['ISIN'] + "_" + remove_list['EventDate'].astype(str)
-window_10['ISIN_EventDate'] = window_10['ISIN'] + "_" + window_10['EventDate'].astype(str)
-
-window_10 = window_10[~window_10['ISIN_EventDate'].isin(remove_list.ISIN_EventDate)]
-
-
-all_10 = window_10.copy()
-achieved_10 = window_10[window_10['achieved']==1]
-failed_10 = window_10[window_10['failed']==1]
-disappeared_10 = window_10[window_10['disappeared']==1]
-
-
-# Cumulative returns
-all_10['CAR_logPct'] = all_10.groupby(['ISIN_EventDate'])['adjRet_MarketModel_logPct'].cumsum()
-achieved_10['CAR_logPct'] = achieved_10.groupby(['ISIN_EventDate'])['adjRet_MarketModel_logPct'].cumsum()
-failed_10['CAR_logPct'] = failed_10.groupby(['ISIN_EventDate'])['adjRet_MarketModel_logPct'].cumsum()
-disappeared_10['CAR_logPct'] = disappeared_10.groupby(['ISIN_EventDate'])['adjRet_MarketModel_logPct'].cumsum()
-
-
-# Get CAAR
-all_10_summary = all_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-achieved_10_summary = achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-failed_10_summary = failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-disappeared_10_summary = disappeared_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR_logPct'].mean()
-
-
-all_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-achieved_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-failed_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-disappeared_10_summary.columns = ['NEWDaysRelativeToEvent','CAAR_logPct']
-
-
-# All media t-stat - Cross-sectional test
-all_10 = pd.merge(all_10,all_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-all_10['CAR-CAAR'] = all_10['CAR_logPct'] - all_10['CAAR_logPct']
-all_10['CAR-CAAR_sq'] = all_10['CAR-CAAR']**2
-
-all_10_summary['sum_CAR-CAAR_sq'] = (all_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-all_10_summary['N'] = (all_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-all_10_summary['VAR_CAAR'] = all_10_summary['sum_CAR-CAAR_sq'] / (all_10_summary['N']-1)
-all_10_summary['SD_CAAR'] = np.sqrt(all_10_summary['VAR_CAAR'])
-
-all_10_summary['T_CSecT'] = (np.sqrt(all_10_summary['N']))*all_10_summary['CAAR_logPct']/all_10_summary['SD_CAAR']
-
-# Get AAR
-all_10_summary['AAR_logPct'] = all_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = all_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-all_10 = pd.merge(all_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-all_10['MAR-AAR'] = all_10['adjRet_MarketModel_logPct'] - all_10['AAR_logPct']
-all_10['MAR-AAR_sq'] = all_10['MAR-AAR']**2
-
-all_10_summary['sum_MAR-AAR_sq'] = (all_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-all_10_summary['N'] = (all_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-all_10_summary['VAR_AAR'] = all_10_summary['sum_MAR-AAR_sq'] / (all_10_summary['N']-1)
-all_10_summary['SD_AAR'] = np.sqrt(all_10_summary['VAR_AAR'])
-
-all_10_summary['T_MAR_CSecT'] = (np.sqrt(all_10_summary['N']))*all_10_summary['AAR_logPct']/all_10_summary['SD_AAR']
-
-
-# Achieved announcement/media t-stat - Cross-sectional test
-achieved_10 = pd.merge(achieved_10,achieved_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-achieved_10['CAR-CAAR'] = achieved_10['CAR_logPct'] - achieved_10['CAAR_logPct']
-achieved_10['CAR-CAAR_sq'] = achieved_10['CAR-CAAR']**2
-
-achieved_10_summary['sum_CAR-CAAR_sq'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-achieved_10_summary['N'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-achieved_10_summary['VAR_CAAR'] = achieved_10_summary['sum_CAR-CAAR_sq'] / (achieved_10_summary['N']-1)
-achieved_10_summary['SD_CAAR'] = np.sqrt(achieved_10_summary['VAR_CAAR'])
-
-achieved_10_summary['T_CSecT'] = (np.sqrt(achieved_10_summary['N']))*achieved_10_summary['CAAR_logPct']/achieved_10_summary['SD_CAAR']
-
-# Get AAR
-achieved_10_summary['AAR_logPct'] = achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = achieved_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-achieved_10 = pd.merge(achieved_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-achieved_10['MAR-AAR'] = achieved_10['adjRet_MarketModel_logPct'] - achieved_10['AAR_logPct']
-achieved_10['MAR-AAR_sq'] = achieved_10['MAR-AAR']**2
-
-achieved_10_summary['sum_MAR-AAR_sq'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-achieved_10_summary['N'] = (achieved_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-achieved_10_summary['VAR_AAR'] = achieved_10_summary['sum_MAR-AAR_sq'] / (achieved_10_summary['N']-1)
-achieved_10_summary['SD_AAR'] = np.sqrt(achieved_10_summary['VAR_AAR'])
-
-achieved_10_summary['T_MAR_CSecT'] = (np.sqrt(achieved_10_summary['N']))*achieved_10_summary['AAR_logPct']/achieved_10_summary['SD_AAR']
-
-
-# Failed announcement/media t-stat - Cross-sectional test
-failed_10 = pd.merge(failed_10,failed_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-failed_10['CAR-CAAR'] = failed_10['CAR_logPct'] - failed_10['CAAR_logPct']
-failed_10['CAR-CAAR_sq'] = failed_10['CAR-CAAR']**2
-
-failed_10_summary['sum_CAR-CAAR_sq'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-failed_10_summary['N'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-failed_10_summary['VAR_CAAR'] = failed_10_summary['sum_CAR-CAAR_sq'] / (failed_10_summary['N']-1)
-failed_10_summary['SD_CAAR'] = np.sqrt(failed_10_summary['VAR_CAAR'])
-
-failed_10_summary['T_CSecT'] = (np.sqrt(failed_10_summary['N']))*failed_10_summary['CAAR_logPct']/failed_10_summary['SD_CAAR']
-
-# Get AAR
-failed_10_summary['AAR_logPct'] = failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = failed_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-failed_10 = pd.merge(failed_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-failed_10['MAR-AAR'] = failed_10['adjRet_MarketModel_logPct'] - failed_10['AAR_logPct']
-failed_10['MAR-AAR_sq'] = failed_10['MAR-AAR']**2
-
-failed_10_summary['sum_MAR-AAR_sq'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-failed_10_summary['N'] = (failed_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-failed_10_summary['VAR_AAR'] = failed_10_summary['sum_MAR-AAR_sq'] / (failed_10_summary['N']-1)
-failed_10_summary['SD_AAR'] = np.sqrt(failed_10_summary['VAR_AAR'])
-
-failed_10_summary['T_MAR_CSecT'] = (np.sqrt(failed_10_summary['N']))*failed_10_summary['AAR_logPct']/failed_10_summary['SD_AAR']
-
-
-# Disappeared media t-stat - Cross-sectional test
-disappeared_10 = pd.merge(disappeared_10,disappeared_10_summary,on=['NEWDaysRelativeToEvent']) # Get CAAR
-disappeared_10['CAR-CAAR'] = disappeared_10['CAR_logPct'] - disappeared_10['CAAR_logPct']
-disappeared_10['CAR-CAAR_sq'] = disappeared_10['CAR-CAAR']**2
-
-disappeared_10_summary['sum_CAR-CAAR_sq'] = (disappeared_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].sum())['CAR-CAAR_sq']
-disappeared_10_summary['N'] = (disappeared_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['CAR-CAAR_sq'].count()['CAR-CAAR_sq'])
-disappeared_10_summary['VAR_CAAR'] = disappeared_10_summary['sum_CAR-CAAR_sq'] / (disappeared_10_summary['N']-1)
-disappeared_10_summary['SD_CAAR'] = np.sqrt(disappeared_10_summary['VAR_CAAR'])
-
-disappeared_10_summary['T_CSecT'] = (np.sqrt(disappeared_10_summary['N']))*disappeared_10_summary['CAAR_logPct']/disappeared_10_summary['SD_CAAR']
-
-# Get AAR
-disappeared_10_summary['AAR_logPct'] = disappeared_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['adjRet_MarketModel_logPct'].mean()['adjRet_MarketModel_logPct']
-temp = disappeared_10_summary[['NEWDaysRelativeToEvent','AAR_logPct']]
-disappeared_10 = pd.merge(disappeared_10,temp,on=['NEWDaysRelativeToEvent']) # merge AAR
-disappeared_10['MAR-AAR'] = disappeared_10['adjRet_MarketModel_logPct'] - disappeared_10['AAR_logPct']
-disappeared_10['MAR-AAR_sq'] = disappeared_10['MAR-AAR']**2
-
-disappeared_10_summary['sum_MAR-AAR_sq'] = (disappeared_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].sum())['MAR-AAR_sq']
-disappeared_10_summary['N'] = (disappeared_10.groupby(['NEWDaysRelativeToEvent'],as_index=False)['MAR-AAR_sq'].count()['MAR-AAR_sq'])
-disappeared_10_summary['VAR_AAR'] = disappeared_10_summary['sum_MAR-AAR_sq'] / (disappeared_10_summary['N']-1)
-disappeared_10_summary['SD_AAR'] = np.sqrt(disappeared_10_summary['VAR_AAR'])
-
-disappeared_10_summary['T_MAR_CSecT'] = (np.sqrt(disappeared_10_summary['N']))*disappeared_10_summary['AAR_logPct']/disappeared_10_summary['SD_AAR']
-
-
-
-
-''' Volume Test - 20 day around 2020 Target announcement media coverage '''
-
-window_20 = ds_dsf_targetAnnounce_sub[(ds_dsf_targetAnnounce_sub['NEWDaysRelativeToEvent']>=-10)&(ds_dsf_targetAnnounce_sub['NEWDaysRelativeToEvent']<=10)]
-
-
-# Drop firms without all 20 days of data
-remove_list = window_20.groupby(['ISIN','EventDate'],as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<21] # This is the count of days
-remove_list['ISIN_EventDate'] = remove_list['ISIN'] + "_" + remove_list['EventDate'].astype(str)
-window_20['ISIN_EventDate'] = window_20['ISIN'] + "_" + window_20['EventDate'].astype(str)
-
-window_20 = window_20[~window_20['ISIN_EventDate'].isin(remove_list.ISIN_EventDate)]
-
-
-all_20 = window_20.copy()
-achieved_20 = window_20[window_20['achieved']==1]
-failed_20 = window_20[(window_20['failed']==1)]
-disappeared_20 = window_20[(window_20['disappeared']==1)]
-
-
-# Abnormal volume 
-# Estimation window = {-140,-40}; 100 days long gap 30 days
-vol_estWindow20 = ds_dsf_targetAnnounce[(ds_dsf_targetAnnounce['BDaysRelativeToEvent']>=-140)&(ds_dsf_targetAnnounce['BDaysRelativeToEvent']<=-40)]
-vol_estWindow20['ISIN_EventDate'] = vol_estWindow20['ISIN'] + "_" + vol_estWindow20['EventDate'].astype(str)
-
-all_estWin_win20 = vol_estWindow20.copy()
-achieved_estWin_win20 = vol_estWindow20[vol_estWindow20['achieved']==1]
-failed_estWin_win20 = vol_estWindow20[(vol_estWindow20['failed']==1)]
-disappeared_estWin_win20 = vol_estWindow20[(vol_estWindow20['disappeared']==1)]
-
-
-# Normal volume
-norVol_all20 = all_estWin_win20.groupby(['ISIN_EventDate'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_all20.columns = ['ISIN_EventDate','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-norVol_achieved20 = achieved_estWin_win20.groupby(['ISIN_EventDate'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_achieved20.columns = ['ISIN_EventDate','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-norVol_failed20 = failed_estWin_win20.groupby(['ISIN_EventDate'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_failed20.columns = ['ISIN_EventDate','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-norVol_disappeared20 = disappeared_estWin_win20.groupby(['ISIN_EventDate'],as_index=False)[['Volume','Volume_pct','Volume_pctlog']].mean()
-norVol_disappeared20.columns = ['ISIN_EventDate','normal_Volume','normal_Volume_pct','normal_Volume_pctlog']
-
-
-# Merge it to window return/volume data
-all_20 = pd.merge(all_20,norVol_all20,on=['ISIN_EventDate'],how='left')
-achieved_20 = pd.merge(achieved_20,norVol_achieved20,on=['ISIN_EventDate'],how='left')
-failed_20 = pd.merge(failed_20,norVol_failed20,on=['ISIN_EventDate'],how='left')
-disappeared_20 = pd.merge(disappeared_20,norVol_disappeared20,on=['ISIN_EventDate'],how='left')
-
-all_20['AbnVolume'] = all_20['Volume'] - all_20['normal_Volume']
-all_20['AbnVol_pct'] = all_20['Volume_pct'] - all_20['normal_Volume_pct']
-all_20['AbnVol_pctlog'] = all_20['Volume_pctlog'] - all_20['normal_Volume_pctlog']
-
-achieved_20['AbnVolume'] = achieved_20['Volume'] - achieved_20['normal_Volume']
-achieved_20['AbnVol_pct'] = achieved_20['Volume_pct'] - achieved_20['normal_Volume_pct']
-achieved_20['AbnVol_pctlog'] = achieved_20['Volume_pctlog'] - achieved_20['normal_Volume_pctlog']
-
-failed_20['AbnVolume'] = failed_20['Volume'] - failed_20['normal_Volume']
-failed_20['AbnVol_pct'] = failed_20['Volume_pct'] - failed_20['normal_Volume_pct']
-failed_20['AbnVol_pctlog'] = failed_20['Volume_pctlog'] - failed_20['normal_Volume_pctlog']
-
-disappeared_20['AbnVolume'] = disappeared_20['Volume'] - disappeared_20['normal_Volume']
-disappeared_20['AbnVol_pct'] = disappeared_20['Volume_pct'] - disappeared_20['normal_Volume_pct']
-disappeared_20['AbnVol_pctlog'] = disappeared_20['Volume_pctlog'] - disappeared_20['normal_Volume_pctlog']
-
-
-# Merge normal volume to estimation window volume data to get sd
-all_estWin_win20 = pd.merge(all_estWin_win20,norVol_all20,on=['ISIN_EventDate'],how='left')
-all_estWin_win20['AbnVolume'] = all_estWin_win20['Volume'] - all_estWin_win20['normal_Volume']
-all_estWin_win20['AbnVol_pct'] = all_estWin_win20['Volume_pct'] - all_estWin_win20['normal_Volume_pct']
-all_estWin_win20['AbnVol_pctlog'] = all_estWin_win20['Volume_pctlog'] - all_estWin_win20['normal_Volume_pctlog']
-
-achieved_estWin_win20 = pd.merge(achieved_estWin_win20,norVol_achieved20,on=['ISIN_EventDate'],how='left')
-achieved_estWin_win20['AbnVolume'] = achieved_estWin_win20['Volume'] - achieved_estWin_win20['normal_Volume']
-achieved_estWin_win20['AbnVol_pct'] = achieved_estWin_win20['Volume_pct'] - achieved_estWin_win20['normal_Volume_pct']
-achieved_estWin_win20['AbnVol_pctlog'] = achieved_estWin_win20['Volume_pctlog'] - achieved_estWin_win20['normal_Volume_pctlog']
-
-failed_estWin_win20 = pd.merge(failed_estWin_win20,norVol_failed20,on=['ISIN_EventDate'],how='left')
-failed_estWin_win20['AbnVolume'] = failed_estWin_win20['Volume'] - failed_estWin_win20['normal_Volume']
-failed_estWin_win20['AbnVol_pct'] = failed_estWin_win20['Volume_pct'] - failed_estWin_win20['normal_Volume_pct']
-failed_estWin_win20['AbnVol_pctlog'] = failed_estWin_win20['Volume_pctlog'] - failed_estWin_win20['normal_Volume_pctlog']
-
-disappeared_estWin_win20 = pd.merge(disappeared_estWin_win20,norVol_disappeared20,on=['ISIN_EventDate'],how='left')
-disappeared_estWin_win20['AbnVolume'] = disappeared_estWin_win20['Volume'] - disappeared_estWin_win20['normal_Volume']
-disappeared_estWin_win20['AbnVol_pct'] = disappeared_estWin_win20['Volume_pct'] - disappeared_estWin_win20['normal_Volume_pct']
-disappeared_estWin_win20['AbnVol_pctlog'] = disappeared_estWin_win20['Volume_pctlog'] - disappeared_estWin_win20['normal_Volume_pctlog']
-
-
-# Event plot
-all_20_summary = all_20.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-achieved_20_summary = achieved_20.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-failed_20_summary = failed_20.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-disappeared_20_summary = disappeared_20.groupby('NEWDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-
-all_20_summary['N'] = all_20.groupby('NEWDaysRelativeToEvent',as_index=False)['AbnVolume'].count()['AbnVolume']
-achieved_20_summary['N'] = achieved_20.groupby('NEWDaysRelativeToEvent',as_index=False)['AbnVolume'].count()['AbnVolume']
-failed_20_summary['N'] = failed_20.groupby('NEWDaysRelativeToEvent',as_index=False)['AbnVolume'].count()['AbnVolume']
-disappeared_20_summary['N'] = disappeared_20.groupby('NEWDaysRelativeToEvent',as_index=False)['AbnVolume'].count()['AbnVolume']
-
-# t-stat
-temp_all20 = all_estWin_win20.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_all20['AbnVolume_mbar'] = temp_all20['AbnVolume'] - temp_all20['AbnVolume'].mean()
-temp_all20['AbnVol_pct_mbar'] = temp_all20['AbnVol_pct'] - temp_all20['AbnVol_pct'].mean()
-temp_all20['AbnVol_pctlog_mbar'] = temp_all20['AbnVol_pctlog'] - temp_all20['AbnVol_pctlog'].mean()
-
-temp_all20['AbnVolume_mbar_sq'] = temp_all20['AbnVolume_mbar']**2
-temp_all20['AbnVol_pct_mbar_sq'] = temp_all20['AbnVol_pct_mbar']**2
-temp_all20['AbnVol_pctlog_mbar_sq'] = temp_all20['AbnVol_pctlog_mbar']**2
-
-all_20_summary['Var_AbnVolume'] = temp_all20['AbnVolume_mbar_sq'].mean()
-all_20_summary['Var_AbnVol_pct'] = temp_all20['AbnVol_pct_mbar_sq'].mean()
-all_20_summary['Var_AbnVol_pctlog'] = temp_all20['AbnVol_pctlog_mbar_sq'].mean()
-
-
-all_20_summary['sd_AbnVolume'] = np.sqrt(all_20_summary['Var_AbnVolume'])
-all_20_summary['sd_AbnVol_pct'] = np.sqrt(all_20_summary['Var_AbnVol_pct'])
-all_20_summary['sd_AbnVol_pctlog'] = np.sqrt(all_20_summary['Var_AbnVol_pctlog'])
-
-all_20_summary['t_AbnVolume'] = all_20_summary['AbnVolume']/all_20_summary['sd_AbnVolume']
-all_20_summary['t_AbnVol_pct'] = all_20_summary['AbnVol_pct']/all_20_summary['sd_AbnVol_pct']
-all_20_summary['t_AbnVol_pctlog'] = all_20_summary['AbnVol_pctlog']/all_20_summary['sd_AbnVol_pctlog']
-
-
-temp_achieved20 = achieved_estWin_win20.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_achieved20['AbnVolume_mbar'] = temp_achieved20['AbnVolume'] - temp_achieved20['AbnVolume'].mean()
-temp_achieved20['AbnVol_pct_mbar'] = temp_achieved20['AbnVol_pct'] - temp_achieved20['AbnVol_pct'].mean()
-temp_achieved20['AbnVol_pctlog_mbar'] = temp_achieved20['AbnVol_pctlog'] - temp_achieved20['AbnVol_pctlog'].mean()
-
-temp_achieved20['AbnVolume_mbar_sq'] = temp_achieved20['AbnVolume_mbar']**2
-temp_achieved20['AbnVol_pct_mbar_sq'] = temp_achieved20['AbnVol_pct_mbar']**2
-temp_achieved20['AbnVol_pctlog_mbar_sq'] = temp_achieved20['AbnVol_pctlog_mbar']**2
-
-achieved_20_summary['Var_AbnVolume'] = temp_achieved20['AbnVolume_mbar_sq'].mean()
-achieved_20_summary['Var_AbnVol_pct'] = temp_achieved20['AbnVol_pct_mbar_sq'].mean()
-achieved_20_summary['Var_AbnVol_pctlog'] = temp_achieved20['AbnVol_pctlog_mbar_sq'].mean()
-
-
-achieved_20_summary['sd_AbnVolume'] = np.sqrt(achieved_20_summary['Var_AbnVolume'])
-achieved_20_summary['sd_AbnVol_pct'] = np.sqrt(achieved_20_summary['Var_AbnVol_pct'])
-achieved_20_summary['sd_AbnVol_pctlog'] = np.sqrt(achieved_20_summary['Var_AbnVol_pctlog'])
-
-achieved_20_summary['t_AbnVolume'] = achieved_20_summary['AbnVolume']/achieved_20_summary['sd_AbnVolume']
-achieved_20_summary['t_AbnVol_pct'] = achieved_20_summary['AbnVol_pct']/achieved_20_summary['sd_AbnVol_pct']
-achieved_20_summary['t_AbnVol_pctlog'] = achieved_20_summary['AbnVol_pctlog']/achieved_20_summary['sd_AbnVol_pctlog']
-
-temp_failed20 = failed_estWin_win20.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_failed20['AbnVolume_mbar'] = temp_failed20['AbnVolume'] - temp_failed20['AbnVolume'].mean()
-temp_failed20['AbnVol_pct_mbar'] = temp_failed20['AbnVol_pct'] - temp_failed20['AbnVol_pct'].mean()
-temp_failed20['AbnVol_pctlog_mbar'] = temp_failed20['AbnVol_pctlog'] - temp_failed20['AbnVol_pctlog'].mean()
-
-temp_failed20['AbnVolume_mbar_sq'] = temp_failed20['AbnVolume_mbar']**2
-temp_failed20['AbnVol_pct_mbar_sq'] = temp_failed20['AbnVol_pct_mbar']**2
-temp_failed20['AbnVol_pctlog_mbar_sq'] = temp_failed20['AbnVol_pctlog_mbar']**2
-
-failed_20_summary['Var_AbnVolume'] = temp_failed20['AbnVolume_mbar_sq'].mean()
-failed_20_summary['Var_AbnVol_pct'] = temp_failed20['AbnVol_pct_mbar_sq'].mean()
-failed_20_summary['Var_AbnVol_pctlog'] = temp_failed20['AbnVol_pctlog_mbar_sq'].mean()
-
-failed_20_summary['sd_AbnVolume'] = np.sqrt(failed_20_summary['Var_AbnVolume'])
-failed_20_summary['sd_AbnVol_pct'] = np.sqrt(failed_20_summary['Var_AbnVol_pct'])
-failed_20_summary['sd_AbnVol_pctlog'] = np.sqrt(failed_20_summary['Var_AbnVol_pctlog'])
-
-failed_20_summary['t_AbnVolume'] = failed_20_summary['AbnVolume']/failed_20_summary['sd_AbnVolume']
-failed_20_summary['t_AbnVol_pct'] = failed_20_summary['AbnVol_pct']/failed_20_summary['sd_AbnVol_pct']
-failed_20_summary['t_AbnVol_pctlog'] = failed_20_summary['AbnVol_pctlog']/failed_20_summary['sd_AbnVol_pctlog']
-
-
-temp_disappeared20 = disappeared_estWin_win20.groupby('BDaysRelativeToEvent',as_index=False)[['AbnVolume','AbnVol_pct','AbnVol_pctlog']].mean()
-temp_disappeared20['AbnVolume_mbar'] = temp_disappeared20['AbnVolume'] - temp_disappeared20['AbnVolume'].mean()
-temp_disappeared20['AbnVol_pct_mbar'] = temp_disappeared20['AbnVol_pct'] - temp_disappeared20['AbnVol_pct'].mean()
-temp_disappeared20['AbnVol_pctlog_mbar'] = temp_disappeared20['AbnVol_pctlog'] - temp_disappeared20['AbnVol_pctlog'].mean()
-
-temp_disappeared20['AbnVolume_mbar_sq'] = temp_disappeared20['AbnVolume_mbar']**2
-temp_disappeared20['AbnVol_pct_mbar_sq'] = temp_disappeared20['AbnVol_pct_mbar']**2
-temp_disappeared20['AbnVol_pctlog_mbar_sq'] = temp_disappeared20['AbnVol_pctlog_mbar']**2
-
-disappeared_20_summary['Var_AbnVolume'] = temp_disappeared20['AbnVolume_mbar_sq'].mean()
-disappeared_20_summary['Var_AbnVol_pct'] = temp_disappeared20['AbnVol_pct_mbar_sq'].mean()
-disappeared_20_summary['Var_AbnVol_pctlog'] = temp_disappeared20['AbnVol_pctlog_mbar_sq'].mean()
-
-disappeared_20_summary['sd_AbnVolume'] = np.sqrt(disappeared_20_summary['Var_AbnVolume'])
-disappeared_20_summary['sd_AbnVol_pct'] = np.sqrt(disappeared_20_summary['Var_AbnVol_pct'])
-disappeared_20_summary['sd_AbnVol_pctlog'] = np.sqrt(disappeared_20_summary['Var_AbnVol_pctlog'])
-
-disappeared_20_summary['t_AbnVolume'] = disappeared_20_summary['AbnVolume']/disappeared_20_summary['sd_AbnVolume']
-disappeared_20_summary['t_AbnVol_pct'] = disappeared_20_summary['AbnVol_pct']/disappeared_20_summary['sd_AbnVol_pct']
-disappeared_20_summary['t_AbnVol_pctlog'] = disappeared_20_summary['AbnVol_pctlog']/disappeared_20_summary['sd_AbnVol_pctlog']
-
-
-
-
-
-
-'''
-############################################################################################################
-###### FIrm-Year Panel data on market response around CDP releases  ###################
-############################################################################################################
-'''
-
-##############################################################################
-''' #### Use this code to remove outliers with other extreme events '''
-### Three companies with extreme events:  Amkor Tech, Lenovo, Pearson
-remove_list1 = ['US0316521006', 'HK0992009065', 'GB0006776081']
-ds_dsf_CDPrelease_sub = ds_dsf_CDPrelease_sub[~ds_dsf_CDPrelease_sub['ISIN'].isin(remove_list1)]
-
-### Additional outliers
-### ABB, Baker Hughes, Medtronic, Shawcor, Celestica, Loreal, Thule (achieved exp), 
-### Amorepacific, Intl Cons Airl Group (failed unexpected)
-remove_list2 = ['CH0012221716','US05722G1004','IE00BTN1Y115','CA8204391079','CA15101Q1081','FR0000120321','SE0006422390','US9497461015',
-                'KR7090430000','ES0177542018']
-ds_dsf_CDPrelease_sub = ds_dsf_CDPrelease_sub[~ds_dsf_CDPrelease_sub['ISIN'].isin(remove_list2)]
-##############################################################################
-
-### Dataset to save panel data
-panel_returnVolume_CDPrelease = pd.DataFrame()
-
-
-''' 2021 CDP release (-1,10) '''
-window_m1p10 = ds_dsf_CDPrelease_sub[(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']<=10)]
-
-# Drop firms without all 12 days of data
-remove_list = window_m1p10.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<12] # This is the count of days
-window_m1p10 = window_m1p10[~window_m1p10['ISIN'].isin(remove_list.ISIN)]
-
-# Cumulative returns
-window_m1p10['CAR_logPct'] = window_m1p10.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-
-# CAR (-1,10)
-car_m1p10 = window_m1p10[window_m1p10['NEWDaysRelativeToEvent']==10] # cumulated over 12 days
-car_m1p10 = car_m1p10[['ISIN','id','EventDate','CAR_logPct']]
-car_m1p10.columns = ['ISIN','id','EventDate_CDP','CDP_CAR_m1_p10'] # rename columns
-
-# Merge
-panel_returnVolume_CDPrelease = pd.concat([panel_returnVolume_CDPrelease,car_m1p10])
-
-
-''' 2021 CDP release (-1,5) '''
-window_m1p5 = ds_dsf_CDPrelease_sub[(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']<=5)]
-
-# Drop firms without all 7 days of data
-remove_list = window_m1p5.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<7] # This is the count of days
-window_m1p5 = window_m1p5[~window_m1p5['ISIN'].isin(remove_list.ISIN)]
-
-# Cumulative returns
-window_m1p5['CAR_logPct'] = window_m1p5.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-
-# CAR (-1,5)
-car_m1p5 = window_m1p5[window_m1p5['NEWDaysRelativeToEvent']==5] # cumulated over 7 days
-car_m1p5 = car_m1p5[['ISIN','id','CAR_logPct']]
-car_m1p5.columns = ['ISIN','id','CDP_CAR_m1_p5'] # rename columns
-
-# Merge
-panel_returnVolume_CDPrelease = pd.merge(panel_returnVolume_CDPrelease,car_m1p5,
-                                                            on=['ISIN','id'],how='outer')
-
-
-''' 2021 CDP release (-1,3) & (-1,1)'''
-window_m1p3 = ds_dsf_CDPrelease_sub[(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']<=3)]
-
-# Drop firms without all 5 days of data
-remove_list = window_m1p3.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<5] # This is the count of days
-window_m1p3 = window_m1p3[~window_m1p3['ISIN'].isin(remove_list.ISIN)]
-
-# Cumulative returns
-window_m1p3['CAR_logPct'] = window_m1p3.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-
-# CAR (-1,3)
-car_m1p3 = window_m1p3[window_m1p3['NEWDaysRelativeToEvent']==3] # cumulated over 5 days
-car_m1p3 = car_m1p3[['ISIN','id','CAR_logPct']]
-car_m1p3.columns = ['ISIN','id','CDP_CAR_m1_p3'] # rename columns
-
-# Merge
-panel_returnVolume_CDPrelease = pd.merge(panel_returnVolume_CDPrelease,car_m1p3,
-                                                            on=['ISIN','id'],how='outer')
-
-# CAR (-1,1)
-car_m1p1 = window_m1p3[window_m1p3['NEWDaysRelativeToEvent']==1] # cumulated over 3 days
-car_m1p1 = car_m1p1[['ISIN','id','CAR_logPct']]
-car_m1p1.columns = ['ISIN','id','CDP_CAR_m1_p1'] # rename columns
-
-# Merge
-panel_returnVolume_CDPrelease = pd.merge(panel_returnVolume_CDPrelease,car_m1p1,
-                                                            on=['ISIN','id'],how='outer')
-
-
-
-
-''' 2021 CDP release Volume (-5,5) '''
-window_10 = ds_dsf_CDPrelease_sub[(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']>=-5)&(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']<=5)]
-
-# Drop firms without all 10 days of data
-remove_list = window_10.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<11] # This is the count of days
-window_10 = window_10[~window_10['ISIN'].isin(remove_list.ISIN)]
-
-# Abnormal volume 
-# Estimation window = {-135,-35}; 100 days long gap 30 days
-vol_estWindow10 = ds_dsf_CDPrelease[(ds_dsf_CDPrelease['BDaysRelativeToEvent']>=-135)&(ds_dsf_CDPrelease['BDaysRelativeToEvent']<=-35)]
-
-# Normal volume
-norVol_10 = vol_estWindow10.groupby(['ISIN'],as_index=False)[['Volume_pctlog']].mean()
-norVol_10.columns = ['ISIN','normal_Volume_pctlog']
-
-# Merge it to window return data
-window_10 = pd.merge(window_10,norVol_10,on=['ISIN'],how='left')
-
-window_10['AbnVol_pctlog'] = window_10['Volume_pctlog'] - window_10['normal_Volume_pctlog']
-
-vol_sum = window_10.groupby(['ISIN','id'],as_index=False)[['AbnVol_pctlog']].mean()
-vol_sum.columns = ['ISIN','id','CDP_AbnVol_pctlog_avgm5p5']
-
-# Event date volume (day=0)
-temp = window_10[window_10['NEWDaysRelativeToEvent']==0] 
-temp = temp[['ISIN','id','AbnVol_pctlog']]
-temp.columns = ['ISIN','id','CDP_AbnVol_pctlog_day0']
-
-vol_sum = pd.merge(vol_sum,temp,on=['ISIN','id'])
-
-# Merge
-panel_returnVolume_CDPrelease = pd.merge(panel_returnVolume_CDPrelease,vol_sum,
-                                                            on=['ISIN','id'],how='outer')
-
-''' 2021 CDP release Volume (-10,10) '''
-window_20 = ds_dsf_CDPrelease_sub[(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']>=-10)&(ds_dsf_CDPrelease_sub['NEWDaysRelativeToEvent']<=10)]
-
-# Drop firms without all 21 days of data
-remove_list = window_20.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<21] # This is the count of days
-window_20 = window_20[~window_20['ISIN'].isin(remove_list.ISIN)]
-
-# Abnormal volume 
-# Estimation window = {-140,-40}; 100 days long gap 30 days
-vol_estWindow20 = ds_dsf_CDPrelease[(ds_dsf_CDPrelease['BDaysRelativeToEvent']>=-140)&(ds_dsf_CDPrelease['BDaysRelativeToEvent']<=-40)]
-
-# Normal volume
-norVol_20 = vol_estWindow20.groupby(['ISIN'],as_index=False)[['Volume_pctlog']].mean()
-norVol_20.columns = ['ISIN','normal_Volume_pctlog']
-
-# Merge it to window return data
-window_20 = pd.merge(window_20,norVol_20,on=['ISIN'],how='left')
-
-window_20['AbnVol_pctlog'] = window_20['Volume_pctlog'] - window_20['normal_Volume_pctlog']
-
-vol_sum = window_20.groupby(['ISIN','id'],as_index=False)[['AbnVol_pctlog']].mean()
-vol_sum.columns = ['ISIN','id','CDP_AbnVol_pctlog_avgm10p10']
-
-
-# Merge
-panel_returnVolume_CDPrelease = pd.merge(panel_returnVolume_CDPrelease,vol_sum,
-                                                            on=['ISIN','id'],how='outer')
-
-# Save Panel Data
-panel_returnVolume_CDPrelease.to_csv(output_directory+"panel_returnVolume_CDPrelease.csv",index=False)
-
-
-
-
-
-''' 2020 CDP release (-1,3) & (-1,1) '''
-window_m1p3 = ds_dsf_CDPrelease20_sub[(ds_dsf_CDPrelease20_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_CDPrelease20_sub['NEWDaysRelativeToEvent']<=3)]
-
-# Drop firms without all 5 days of data
-remove_list = window_m1p3.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<5] # This is the count of days
-window_m1p3 = window_m1p3[~window_m1p3['ISIN'].isin(remove_list.ISIN)]
-
-# Cumulative returns
-window_m1p3['CAR_logPct'] = window_m1p3.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-
-# CAR (-1,3)
-car_m1p3 = window_m1p3[window_m1p3['NEWDaysRelativeToEvent']==3] # cumulated over 5 days
-car_m1p3 = car_m1p3[['ISIN','id','CAR_logPct']]
-car_m1p3.columns = ['ISIN','id','CDP19_CAR_m1_p3'] # rename columns
-
-# Merge
-panel_returnVolume_CDPrelease = pd.merge(panel_returnVolume_CDPrelease,car_m1p3,
-                                                            on=['ISIN','id'],how='outer')
-
-# CAR (-1,1)
-car_m1p1 = window_m1p3[window_m1p3['NEWDaysRelativeToEvent']==1] # cumulated over 3 days
-car_m1p1 = car_m1p1[['ISIN','id','CAR_logPct']]
-car_m1p1.columns = ['ISIN','id','CDP19_CAR_m1_p1'] # rename columns
-
-# Merge
-panel_returnVolume_CDPrelease = pd.merge(panel_returnVolume_CDPrelease,car_m1p1,
-                                                            on=['ISIN','id'],how='outer')
-
-
-''' 2020 CDP release Volume (-5,5) '''
-window_10 = ds_dsf_CDPrelease20_sub[(ds_dsf_CDPrelease20_sub['NEWDaysRelativeToEvent']>=-5)&(ds_dsf_CDPrelease20_sub['NEWDaysRelativeToEvent']<=5)]
-
-# Drop firms without all 10 days of data
-remove_list = window_10.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<11] # This is the count of days
-window_10 = window_10[~window_10['ISIN'].isin(remove_list.ISIN)]
-
-# Abnormal volume 
-# Estimation window = {-135,-35}; 100 days long gap 30 days
-vol_estWindow10 = ds_dsf_CDPrelease20[(ds_dsf_CDPrelease20['BDaysRelativeToEvent']>=-135)&(ds_dsf_CDPrelease20['BDaysRelativeToEvent']<=-35)]
-
-# Normal volume
-norVol_10 = vol_estWindow10.groupby(['ISIN'],as_index=False)[['Volume_pctlog']].mean()
-norVol_10.columns = ['ISIN','normal_Volume_pctlog']
-
-# Merge it to window return data
-window_10 = pd.merge(window_10,norVol_10,on=['ISIN'],how='left')
-
-window_10['AbnVol_pctlog'] = window_10['Volume_pctlog'] - window_10['normal_Volume_pctlog']
-
-vol_sum = window_10.groupby(['ISIN','id'],as_index=False)[['AbnVol_pctlog']].mean()
-vol_sum.columns = ['ISIN','id','CDP19_AbnVol_pctlog_avgm5p5']
-
-# Event date volume (day=0)
-temp = window_10[window_10['NEWDaysRelativeToEvent']==0] 
-temp = temp[['ISIN','id','AbnVol_pctlog']]
-temp.columns = ['ISIN','id','CDP19_AbnVol_pctlog_day0']
-
-vol_sum = pd.merge(vol_sum,temp,on=['ISIN','id'])
-
-# Merge
-panel_returnVolume_CDPrelease = pd.merge(panel_returnVolume_CDPrelease,vol_sum,
-                                                            on=['ISIN','id'],how='outer')
-
-
-
-''' 2019 CDP release (-1,3) & (-1,1) '''
-window_m1p3 = ds_dsf_CDPrelease19_sub[(ds_dsf_CDPrelease19_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_CDPrelease19_sub['NEWDaysRelativeToEvent']<=3)]
-
-# Drop firms without all 5 days of data
-remove_list = window_m1p3.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<5] # This is the count of days
-window_m1p3 = window_m1p3[~window_m1p3['ISIN'].isin(remove_list.ISIN)]
-
-# Cumulative returns
-window_m1p3['CAR_logPct'] = window_m1p3.groupby(['ISIN'])['adjRet_MarketModel_logPct'].cumsum()
-
-# CAR (-1,3)
-car_m1p3 = window_m1p3[window_m1p3['NEWDaysRelativeToEvent']==3] # cumulated over 5 days
-car_m1p3 = car_m1p3[['ISIN','id','CAR_logPct']]
-car_m1p3.columns = ['ISIN','id','CDP18_CAR_m1_p3'] # rename columns
-
-# Merge
-panel_returnVolume_CDPrelease = pd.merge(panel_returnVolume_CDPrelease,car_m1p3,
-                                                            on=['ISIN','id'],how='outer')
-
-# CAR (-1,1)
-car_m1p1 = window_m1p3[window_m1p3['NEWDaysRelativeToEvent']==1] # cumulated over 3 days
-car_m1p1 = car_m1p1[['ISIN','id','CAR_logPct']]
-car_m1p1.columns = ['ISIN','id','CDP18_CAR_m1_p1'] # rename columns
-
-# Merge
-panel_returnVolume_CDPrelease = pd.merge(panel_returnVolume_CDPrelease,car_m1p1,
-                                                            on=['ISIN','id'],how='outer')
-
-''' 2019 CDP release Volume (-5,5) '''
-window_10 = ds_dsf_CDPrelease19_sub[(ds_dsf_CDPrelease19_sub['NEWDaysRelativeToEvent']>=-5)&(ds_dsf_CDPrelease19_sub['NEWDaysRelativeToEvent']<=5)]
-
-# Drop firms without all 10 days of data
-remove_list = window_10.groupby('ISIN',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<11] # This is the count of days
-window_10 = window_10[~window_10['ISIN'].isin(remove_list.ISIN)]
-
-# Abnormal volume 
-# Estimation window = {-135,-35}; 100 days long gap 30 days
-vol_estWindow10 = ds_dsf_CDPrelease19[(ds_dsf_CDPrelease19['BDaysRelativeToEvent']>=-135)&(ds_dsf_CDPrelease19['BDaysRelativeToEvent']<=-35)]
-
-# Normal volume
-norVol_10 = vol_estWindow10.groupby(['ISIN'],as_index=False)[['Volume_pctlog']].mean()
-norVol_10.columns = ['ISIN','normal_Volume_pctlog']
-
-# Merge it to window return data
-window_10 = pd.merge(window_10,norVol_10,on=['ISIN'],how='left')
-
-window_10['AbnVol_pctlog'] = window_10['Volume_pctlog'] - window_10['normal_Volume_pctlog']
-
-vol_sum = window_10.groupby(['ISIN','id'],as_index=False)[['AbnVol_pctlog']].mean()
-vol_sum.columns = ['ISIN','id','CDP18_AbnVol_pctlog_avgm5p5']
-
-# Event date volume (day=0)
-temp = window_10[window_10['NEWDaysRelativeToEvent']==0] 
-temp = temp[['ISIN','id','AbnVol_pctlog']]
-temp.columns = ['ISIN','id','CDP18_AbnVol_pctlog_day0']
-
-vol_sum = pd.merge(vol_sum,temp,on=['ISIN','id'])
-
-# Merge
-panel_returnVolume_CDPrelease = pd.merge(panel_returnVolume_CDPrelease,vol_sum,
-                                                            on=['ISIN','id'],how='outer')
-
-# Save Panel Data
-panel_returnVolume_CDPrelease.to_csv(output_directory+"panel_returnVolume_CDPrelease.csv",index=False)
-
-
-
-
-
-''' Panel for 2020 Target Announcement Media Coverage'''
-
-panel_returnVolume_TargetAnnounce = pd.DataFrame()
-
-''' 2020 Target Announcement Media (-1,3)  '''
-window_m1p3 = ds_dsf_targetAnnounce_sub[(ds_dsf_targetAnnounce_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_targetAnnounce_sub['NEWDaysRelativeToEvent']<=3)]
-
-# There can be multiple media events for a firm
-window_m1p3['ISIN_EventDate'] = window_m1p3['ISIN'] + "_" + window_m1p3['EventDate'].astype(str)
-
-# Drop firms without all 5 days of data
-remove_list = window_m1p3.groupby('ISIN_EventDate',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<5] # This is the count of days
-window_m1p3 = window_m1p3[~window_m1p3['ISIN_EventDate'].isin(remove_list.ISIN_EventDate)]
-
-# Cumulative returns
-window_m1p3['CAR_logPct'] = window_m1p3.groupby(['ISIN_EventDate'])['adjRet_MarketModel_logPct'].cumsum()
-
-# CAR (-1,3)
-car_m1p3 = window_m1p3[window_m1p3['NEWDaysRelativeToEvent']==3] # cumulated over 5 days
-car_m1p3 = car_m1p3[['ISIN','ISIN_EventDate','id','CAR_logPct']]
-car_m1p3.columns = ['ISIN','ISIN_EventDate','id','TargetAnnounce_CAR_m1_p3'] # rename columns
-
-# Merge
-panel_returnVolume_TargetAnnounce = pd.concat([panel_returnVolume_TargetAnnounce,car_m1p3])
-
-
-''' 2020 Target Announcement Media (-1,1) '''
-window_m1p1 = ds_dsf_targetAnnounce_sub[(ds_dsf_targetAnnounce_sub['NEWDaysRelativeToEvent']>=-1)&(ds_dsf_targetAnnounce_sub['NEWDaysRelativeToEvent']<=1)]
-
-# There can be multiple media events for a firm
-window_m1p1['ISIN_EventDate'] = window_m1p1['ISIN'] + "_" + window_m1p1['EventDate'].astype(str)
-
-# Drop firms without all 3 days of data
-remove_list = window_m1p1.groupby('ISIN_EventDate',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<3] # This is the count of days
-window_m1p1 = window_m1p1[~window_m1p1['ISIN_EventDate'].isin(remove_list.ISIN_EventDate)]
-
-# Cumulative returns
-window_m1p1['CAR_logPct'] = window_m1p1.groupby(['ISIN_EventDate'])['adjRet_MarketModel_logPct'].cumsum()
-
-# CAR (-1,1)
-car_m1p1 = window_m1p1[window_m1p1['NEWDaysRelativeToEvent']==1] # cumulated over 3 days
-car_m1p1 = car_m1p1[['ISIN','ISIN_EventDate','id','CAR_logPct']]
-car_m1p1.columns = ['ISIN','ISIN_EventDate','id','TargetAnnounce_CAR_m1_p1'] # rename columns
-
-# Merge
-panel_returnVolume_TargetAnnounce = pd.merge(panel_returnVolume_TargetAnnounce,car_m1p1,
-                                                            on=['ISIN','ISIN_EventDate','id'],how='outer')
-
-''' 2020 Target Announcement Media Volume (-5,5) '''
-window_10 = ds_dsf_targetAnnounce_sub[(ds_dsf_targetAnnounce_sub['NEWDaysRelativeToEvent']>=-5)&(ds_dsf_targetAnnounce_sub['NEWDaysRelativeToEvent']<=5)]
-
-# There can be multiple media events for a firm
-window_10['ISIN_EventDate'] = window_10['ISIN'] + "_" + window_10['EventDate'].astype(str)
-
-# Drop firms without all 10 days of data
-remove_list = window_10.groupby('ISIN_EventDate',as_index=False)['NEWDaysRelativeToEvent'].count()
-remove_list = remove_list[remove_list['NEWDaysRelativeToEvent']<11] # This is the count of days
-window_10 = window_10[~window_10['ISIN_EventDate'].isin(remove_list.ISIN_EventDate)]
-
-# Abnormal volume 
-# Estimation window = {-135,-35}; 100 days long gap 30 days
-vol_estWindow10 = ds_dsf_targetAnnounce[(ds_dsf_targetAnnounce['BDaysRelativeToEvent']>=-135)&(ds_dsf_targetAnnounce['BDaysRelativeToEvent']<=-35)]
-
-# Normal volume
-vol_estWindow10['ISIN_EventDate'] = vol_estWindow10['ISIN'] + "_" + vol_estWindow10['EventDate'].astype(str)
-norVol_10 = vol_estWindow10.groupby(['ISIN_EventDate'],as_index=False)[['Volume_pctlog']].mean()
-norVol_10.columns = ['ISIN_EventDate','normal_Volume_pctlog']
-
-# Merge it to window return data
-window_10 = pd.merge(window_10,norVol_10,on=['ISIN_EventDate'],how='left')
-
-window_10['AbnVol_pctlog'] = window_10['Volume_pctlog'] - window_10['normal_Volume_pctlog']
-
-vol_sum = window_10.groupby(['ISIN','ISIN_EventDate','id'],as_index=False)[['AbnVol_pctlog']].mean()
-vol_sum.columns = ['ISIN','ISIN_EventDate','id','TargetAnnounce_AbnVol_pctlog_avgm5p5']
-
-# Event date volume (day=0)
-temp = window_10[window_10['NEWDaysRelativeToEvent']==0] 
-temp = temp[['ISIN','ISIN_EventDate','id','AbnVol_pctlog']]
-temp.columns = ['ISIN','ISIN_EventDate','id','TargetAnnounce_AbnVol_pctlog_day0']
-
-vol_sum = pd.merge(vol_sum,temp,on=['ISIN','ISIN_EventDate','id'])
-
-# Merge
-panel_returnVolume_TargetAnnounce = pd.merge(panel_returnVolume_TargetAnnounce,vol_sum,
-                                                            on=['ISIN','ISIN_EventDate','id'],how='outer')
+panel_returnVolume_TargetAnnounce = event_panel([metrics_targetAnnounce],events_targetAnnounce,['ISIN','ISIN_EventDate','id'],
+                                                list(panel_targetAnnounce_specs))
 
 # Save Panel
 panel_returnVolume_TargetAnnounce.to_csv(output_directory+"panel_returnVolume_TargetAnnounce.csv",index=False)
-
-
-
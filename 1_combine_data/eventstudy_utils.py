@@ -0,0 +1,1379 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Helper functions for the market tests in 1.3.2_EventStudy_clean.py.
+
+The functions work on the daily event-study frames (ds_dsf_*), i.e. one row per
+firm (or firm-event) and market date with BDaysRelativeToEvent attached.
+
+"""
+
+import os
+import json
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+import datetime as dt
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+
+''' Daily stock files '''
+# Schema of the WRDS-Datastream daily stock files (columns not listed here are inferred)
+DAILY_FILE_SCHEMA = {'InfoCode':pa.int64(),'dscode':pa.string(),'MarketDate':pa.timestamp('ns'),
+                     'close':pa.float64(),'adjclose':pa.float64(),'close_usd':pa.float64(),'open':pa.float64(),
+                     'high':pa.float64(),'low':pa.float64(),'bid':pa.float64(),'ask':pa.float64(),
+                     'vwap':pa.float64(),'mosttrdprc':pa.float64(),'RI':pa.float64(),'ret':pa.string(),
+                     'ri_usd':pa.float64(),'ret_usd':pa.string(),'ISIN':pa.string(),
+                     'Region':pa.dictionary(pa.int32(),pa.string()),'Volume':pa.float64(),'numshrs':pa.float64()}
+# Returns are given as percent strings, e.g. '-4.121545%'
+PERCENT_COLUMNS = ['ret','ret_usd']
+DATE_FORMAT = '%Y-%m-%d'
+
+# Parsed daily files, keyed by path and load filters (shared by all samples drawn from the same file)
+_daily_files = {}
+
+def _calendar_days(bdays):
+    # Calendar days that cover `bdays` trading days (weekends and up to ~15 holidays a year)
+    return bdays*3//2 + 7
+
+
+def read_daily_file(path, columns=None, events=None, max_bdays=365, dedup=None, primary=None):
+    """
+    Read a WRDS-Datastream daily stock file once, sorted by ISIN and MarketDate.
+
+    The file is parsed with the multi-threaded pyarrow csv reader using DAILY_FILE_SCHEMA:
+    MarketDate is parsed with DATE_FORMAT, Region is categorical, and the percent strings
+    in PERCENT_COLUMNS are converted to numbers (in percent, i.e. '-4.12%' -> -4.12).
+
+    Rows and columns that are never used can be dropped while scanning, so that memory is
+    bounded by the event windows rather than by the raw pull:
+    - `columns` keeps only these columns;
+    - `events` (a frame with ISIN and EventDate, one row per event of every sample that
+      uses this file) keeps only rows of these ISINs that lie within `max_bdays` business
+      days of one of the ISIN's events. The bound is applied in calendar days and is
+      slightly wider, the exact business-day window is applied afterwards as before.
+
+    With `primary` (a rule or mapping, see primary_listings), only the rows of the
+    primary quote line (InfoCode) of each ISIN are kept, so that the other lines of
+    multi-line securities never reach the event windows; the number of rows removed is
+    recorded in daily.attrs['secondary_lines_removed'].
+
+    With `dedup` (a list of columns), rows repeating the values of these columns are
+    dropped (the first row in ISIN/MarketDate order is kept). Each row is reduced to a
+    64-bit fingerprint of these columns (row_fingerprint), so this is one pass over a
+    uint64 array instead of a multi-column comparison; the number of rows removed is
+    recorded in daily.attrs['duplicates_removed'].
+
+    Several samples are drawn from the same raw file (e.g. the three CDP releases from
+    tr_ds_equities_allCDP.csv), so the parsed table is cached and the same frame is
+    returned on every later call with the same arguments. It is shared: build samples
+    from it with merges or selections and do not modify it in place.
+    """
+    key = (path, None if columns is None else tuple(columns),
+           None if events is None else int(pd.util.hash_pandas_object(events[['ISIN','EventDate']],index=False).sum()),
+           max_bdays, None if dedup is None else tuple(dedup),
+           primary if primary is None or isinstance(primary,str) else int(pd.util.hash_pandas_object(pd.Series(primary)).sum()))
+    if key in _daily_files:
+        return _daily_files[key]
+
+    if events is not None:
+        # Calendar-day bounds per ISIN that cover max_bdays business days around its events
+        margin = pd.Timedelta(days=_calendar_days(max_bdays))
+        bounds = events.dropna(subset=['ISIN','EventDate']).groupby('ISIN')['EventDate'].agg(['min','max'])
+        isins = pa.array(bounds.index.to_numpy(dtype=object),type=pa.string())
+        lower = pa.array((bounds['min']-margin).to_numpy(dtype='datetime64[ns]'))
+        upper = pa.array((bounds['max']+margin).to_numpy(dtype='datetime64[ns]'))
+
+    reader = pacsv.open_csv(path,
+                            read_options=pacsv.ReadOptions(use_threads=True,block_size=64<<20),
+                            convert_options=pacsv.ConvertOptions(column_types=DAILY_FILE_SCHEMA,
+                                                                 include_columns=columns,
+                                                                 timestamp_parsers=[DATE_FORMAT],
+                                                                 strings_can_be_null=True))
+    batches = []
+    for batch in reader:
+        if events is not None:
+            idx = pc.index_in(batch['ISIN'],value_set=isins)
+            keep = pc.and_(pc.greater_equal(batch['MarketDate'],pc.take(lower,idx)),
+                           pc.less_equal(batch['MarketDate'],pc.take(upper,idx)))
+            batch = batch.filter(pc.fill_null(keep,False))
+        batches.append(batch)
+    table = pa.Table.from_batches(batches,schema=reader.schema)
+
+    for c in PERCENT_COLUMNS:
+        if c in table.column_names:
+            values = pc.cast(pc.utf8_rtrim(table[c],characters='%'),pa.float64())
+            table = table.set_column(table.column_names.index(c),c,values)
+    daily = table.to_pandas()
+    daily = daily.sort_values(by=['ISIN','MarketDate'])
+
+    if primary is not None:
+        lines = primary_listings(daily,primary)
+        secondary = daily['InfoCode'].to_numpy() != daily['ISIN'].map(lines).to_numpy()
+        daily = daily[~secondary]
+        daily.attrs['secondary_lines_removed'] = int(secondary.sum())
+
+    if dedup is not None:
+        duplicated = pd.Series(row_fingerprint(daily,dedup)).duplicated().to_numpy()
+        daily = daily[~duplicated]
+        daily.attrs['duplicates_removed'] = int(duplicated.sum())
+
+    _daily_files[key] = daily
+    return daily
+
+
+# Order of preference of the quote lines of an ISIN under each rule (larger first)
+PRIMARY_LISTING_RULES = {'coverage':['coverage','rows','liquidity'],
+                         'liquidity':['liquidity','coverage','rows']}
+
+def primary_listings(daily, rule='coverage', line='InfoCode'):
+    """
+    Primary quote line of each ISIN (a Series ISIN -> InfoCode).
+
+    The Datastream pulls can contain several quote lines (InfoCode/dscode) for one ISIN.
+    The lines of each ISIN are ranked by one of PRIMARY_LISTING_RULES:
+    - 'coverage': most days with a return (ret), then most rows, then highest volume;
+    - 'liquidity': highest total Volume, then coverage;
+    remaining ties go to the lowest InfoCode. A Series or dict ISIN -> InfoCode sets the
+    line explicitly; ISINs it does not list are resolved by 'coverage'.
+
+    The ranking is computed on one (ISIN, line) index of the daily file, so the cost is
+    one groupby regardless of the number of samples or events.
+    """
+    explicit = None
+    if not isinstance(rule,str):
+        explicit, rule = pd.Series(rule), 'coverage'
+    order = PRIMARY_LISTING_RULES[rule]
+    stats = daily.groupby(['ISIN',line],sort=True,observed=True).agg(rows=('MarketDate','size'),
+                                                                     coverage=('ret','count'),
+                                                                     liquidity=('Volume','sum')).reset_index()
+    stats = stats.sort_values(by=['ISIN']+order+[line],ascending=[True]+[False]*len(order)+[True],kind='stable')
+    lines = stats.drop_duplicates(subset=['ISIN'],keep='first').set_index('ISIN')[line]
+    if explicit is not None:
+        lines.update(explicit[explicit.index.isin(lines.index)].astype(lines.dtype))
+    return lines
+
+
+def row_fingerprint(df, columns):
+    """ 64-bit hash (uint64 array) of the values of `columns` in each row of df. """
+    return pd.util.hash_pandas_object(df[columns],index=False).to_numpy()
+
+
+''' Event identifiers '''
+def event_ids(events, keys):
+    """
+    Dense int32 event_id of each row of an event table, numbered in `keys` order (e.g.
+    ['ISIN','EventDate'] for samples with several events per firm, ['ISIN'] for one
+    event per firm). Rows with the same keys share an id, so grouping or merging on
+    event_id gives the same groups, in the same order, as on `keys`.
+    """
+    return events.groupby(keys,sort=True).ngroup().astype(np.int32)
+
+
+def event_attributes(df, events, key='event_id'):
+    """
+    Rows of df with the columns of the event table `events` that df does not have yet
+    (e.g. type, achieved, failed and the COVID and materiality flags), looked up by `key`.
+
+    The daily frames carry only the event key, so the firm attributes are stored once per
+    event; they are attached here to the (much smaller) event-window frames. If an event
+    has several rows in `events`, the last one is used. The rows and index of df are kept.
+    """
+    events = events.drop_duplicates(subset=[key],keep='last').set_index(key)
+    columns = [c for c in events.columns if c not in df.columns]
+    attributes = events[columns].reindex(df[key].to_numpy()).set_axis(df.index)
+    return pd.concat([df,attributes],axis=1)
+
+
+''' Memory policy '''
+# Relative-day columns (whole trading days, stored as int16)
+DAY_COLUMNS = ['BDaysRelativeToEvent','NEWDaysRelativeToEvent']
+# Daily returns and volume, stored as float32 with float32=True
+FLOAT32_COLUMNS = ['close','adjclose','close_usd','RI','ret','ri_usd','ret_usd','Volume','numshrs']
+
+def lean_frame(df, float32=False, exclude=('ISIN',)):
+    """
+    Copy of df with compact dtypes:
+    - string columns (e.g. type, dscode) become categoricals, except those in `exclude`
+      (ISIN is the merge key of the daily and event tables and stays a string);
+    - DAY_COLUMNS become int16 (a day column holding fractional days, i.e. tied
+      positions from event_days, stays float);
+    - with float32=True, FLOAT32_COLUMNS become float32. This is optional because
+      the returns then carry about 7 significant digits.
+    """
+    dtypes = {}
+    for c in df.columns:
+        if c in exclude:
+            continue
+        if df[c].dtype==object:
+            dtypes[c] = 'category'
+        elif c in DAY_COLUMNS:
+            d = df[c].to_numpy(dtype=float)
+            if (d==np.floor(d)).all():
+                dtypes[c] = np.int16
+        elif float32 and c in FLOAT32_COLUMNS:
+            dtypes[c] = np.float32
+    return df.astype(dtypes)
+
+
+def frame_memory(frames):
+    """ Rows and memory (MB, including strings) of each frame of a dict name -> frame. """
+    return pd.DataFrame({'rows':[len(df) for df in frames.values()],
+                         'MB':[df.memory_usage(deep=True).sum()/2**20 for df in frames.values()]},
+                        index=list(frames))
+
+
+''' Trading calendar '''
+# Day 0 of the trading-day index of a np.busdaycalendar
+CALENDAR_EPOCH = np.datetime64('1970-01-01','D')
+
+def trading_calendar(holidays=None, daily=None, date='MarketDate', region='Region'):
+    """
+    Trading calendar mapping dates to an integer trading-day index (see trading_day_index).
+
+    - Default: Monday-Friday business days, i.e. the days counted by np.busday_count.
+    - holidays: Monday-Friday less the given holidays; a list of dates for all regions,
+      or a dict region -> list of dates.
+    - daily: a daily frame (or a list of frames) from which the trading days of each
+      region are the dates with at least one observation in that region. The calendar
+      of all observed dates is used for rows whose region is not in the calendar.
+
+    Returns a np.busdaycalendar, or a dict region -> calendar where a calendar is either
+    a np.busdaycalendar or a sorted datetime64[D] array of trading days.
+    """
+    if daily is not None:
+        daily = pd.concat([df[[date,region]] for df in daily]) if isinstance(daily,list) else daily[[date,region]]
+        days = daily[date].to_numpy().astype('datetime64[D]')
+        calendar = {None: np.unique(days)}
+        codes, uniques = pd.factorize(daily[region])
+        for k, r in enumerate(uniques):
+            calendar[r] = np.unique(days[codes==k])
+        return calendar
+    if isinstance(holidays,dict):
+        return {r: np.busdaycalendar(holidays=pd.to_datetime(list(h)).to_numpy().astype('datetime64[D]'))
+                for r, h in holidays.items()}
+    if holidays is not None:
+        return np.busdaycalendar(holidays=pd.to_datetime(list(holidays)).to_numpy().astype('datetime64[D]'))
+    return np.busdaycalendar()
+
+
+def _day_index(days, calendar):
+    # Number of trading days before each date (datetime64[D] array)
+    if isinstance(calendar,np.busdaycalendar):
+        return np.busday_count(CALENDAR_EPOCH,days,busdaycal=calendar)
+    return np.searchsorted(calendar,days,side='left').astype(np.int64)
+
+
+def trading_day_index(dates, calendar, regions=None):
+    """
+    Integer trading-day index of each date: the number of trading days of the calendar
+    (of the row's region for a per-region calendar) before the date. The difference of
+    two indices is the number of trading days in [first, second), so a date that is not
+    a trading day has the index of the next trading day.
+    """
+    days = np.asarray(dates).astype('datetime64[D]')
+    if not isinstance(calendar,dict):
+        return _day_index(days,calendar)
+
+    regions = np.asarray(regions,dtype=object)
+    index = np.zeros(len(days),dtype=np.int64)
+    done = np.zeros(len(days),dtype=bool)
+    for r, cal in calendar.items():
+        if r is None:
+            continue
+        rows = regions==r
+        index[rows] = _day_index(days[rows],cal)
+        done |= rows
+    if not done.all():
+        if None not in calendar:
+            raise KeyError("no trading calendar for regions "+str(sorted(set(regions[~done].astype(str)))))
+        index[~done] = _day_index(days[~done],calendar[None])
+    return index
+
+
+def relative_trading_days(df, calendar, event='EventDate', date='MarketDate', region='Region'):
+    """
+    Trading days from the event date to the market date of each row of a daily frame, as
+    a difference of trading-day indices; with the default calendar this is
+    np.busday_count(event, date).
+
+    Same conventions as np.busday_count: on or after the event date the count is over
+    [event, date), and before it the count is minus the trading days in (date, event].
+    An event on a non-trading day is thus day 0 for both the previous and the next
+    trading day.
+    """
+    regions = df[region].to_numpy() if isinstance(calendar,dict) else None
+    market = df[date].to_numpy().astype('datetime64[D]')
+    event = df[event].to_numpy().astype('datetime64[D]')
+    shift = np.where(market>=event,0,1).astype('timedelta64[D]')
+    return (trading_day_index(market+shift,calendar,regions)
+            - trading_day_index(event+shift,calendar,regions))
+
+
+''' Multi-event samples '''
+def event_ranges(daily, events, max_bdays=365, date='MarketDate'):
+    """
+    Row range of each event in a daily frame stored once per firm (sorted by ISIN and
+    date, as returned by read_daily_file).
+
+    Returns a copy of `events` (one row per event, with ISIN and EventDate) with row_start
+    and row_end: daily.iloc[row_start:row_end] are the firm's rows within a calendar-day
+    margin that covers `max_bdays` trading days on either side of the event date. Events
+    of firms without daily data get an empty range.
+    """
+    codes, uniques = pd.factorize(daily['ISIN'],sort=True)
+    codes = np.where(codes<0,len(uniques),codes).astype(np.int64) # missing ISINs are sorted last
+    days = daily[date].to_numpy().astype('datetime64[D]')
+    day = np.where(np.isnat(days),(1<<32)-1,days.astype(np.int64)+(1<<31))
+    key = (codes<<32) + day # sorted, since daily is sorted by ISIN and date
+
+    ranges = events.copy()
+    firm = pd.Index(uniques).get_indexer(ranges['ISIN']).astype(np.int64)
+    event_day = ranges['EventDate'].to_numpy().astype('datetime64[D]')
+    margin = np.timedelta64(_calendar_days(max_bdays),'D')
+    lo = (firm<<32) + (event_day-margin).astype(np.int64) + (1<<31)
+    hi = (firm<<32) + (event_day+margin).astype(np.int64) + (1<<31)
+    empty = (firm<0)|np.isnat(event_day)
+    ranges['row_start'] = np.where(empty,0,np.searchsorted(key,lo,side='left'))
+    ranges['row_end'] = np.where(empty,0,np.searchsorted(key,hi,side='right'))
+    return ranges
+
+
+def event_rows(daily, ranges, calendar, max_bdays=365):
+    """
+    Daily rows of every event within `max_bdays` trading days of its event date, from the
+    row ranges of event_ranges(). This is what merging the event table on ISIN and keeping
+    |BDaysRelativeToEvent| <= max_bdays gives, but only the rows in the event ranges are
+    ever copied (a firm with many events does not get a copy of its full history per
+    event). Rows are in event order and, within an event, in daily order; the event
+    columns follow the daily columns and BDaysRelativeToEvent is added on `calendar`.
+    """
+    start = ranges['row_start'].to_numpy()
+    length = ranges['row_end'].to_numpy() - start
+    event = np.repeat(np.arange(len(ranges)),length)
+    rows = np.repeat(start-np.cumsum(length)+length,length) + np.arange(length.sum())
+
+    attributes = ranges.drop(columns=['ISIN','row_start','row_end']).iloc[event].reset_index(drop=True)
+    df = pd.concat([daily.iloc[rows].reset_index(drop=True),attributes],axis=1)
+    df['BDaysRelativeToEvent'] = relative_trading_days(df,calendar)
+    return df[(df['BDaysRelativeToEvent']>=-max_bdays)&(df['BDaysRelativeToEvent']<=max_bdays)]
+
+
+''' Event registry '''
+def event_registry(sources, keys=('ISIN','EventDate'), previous=None):
+    """
+    One event table for all samples, from a dict sample -> event table (ISIN, EventDate
+    and the attributes of the sample's events, e.g. the firm-level outcomes for each CDP
+    release). Returns the rows of all samples with event_id, ISIN, EventDate and sample
+    first, then the attribute columns (missing for the samples that do not have them).
+
+    event_id is a dense int32 numbered by sample (in the order of `sources`) and `keys`, so
+    it is unique across samples and the stages can handle the events of several samples
+    in one frame; rows with the same sample and keys (e.g. several outcome rows of a firm)
+    share an id. Strings are stored as categoricals (see lean_frame).
+
+    With the registry of an earlier run (`previous`), its events keep their event_id and
+    the new events are numbered after the largest one, so the stage outputs keyed by
+    event_id stay valid and the new events sort after the stored ones.
+    """
+    registry = pd.concat([events.drop(columns='event_id',errors='ignore').assign(sample=name)
+                          for name, events in sources.items()],ignore_index=True)
+    order = list(sources) if previous is None else list(previous['sample'].cat.categories)+[n for n in sources if n not in previous['sample'].cat.categories]
+    registry['sample'] = pd.Categorical(registry['sample'],categories=order)
+    registry['event_id'] = event_ids(registry.assign(sample=registry['sample'].cat.codes),['sample']+list(keys))
+    if previous is not None:
+        # Ids of the events already registered; new events after the largest one
+        known = previous[['event_id','sample']+list(keys)].astype({'sample':str}).drop_duplicates(subset=['sample']+list(keys))
+        known = pd.merge(registry[['sample']+list(keys)].astype({'sample':str}),known,on=['sample']+list(keys),how='left')['event_id'].to_numpy(dtype=float)
+        new = registry.loc[np.isnan(known),'event_id'].to_numpy()
+        _, rank = np.unique(new,return_inverse=True)
+        known[np.isnan(known)] = np.where(new>=0,previous['event_id'].max()+1+rank,-1)
+        registry['event_id'] = known.astype(np.int32)
+    first = ['event_id']+list(keys)+['sample']
+    return lean_frame(registry[first+[c for c in registry.columns if c not in first]])
+
+
+def registry_events(registry, sample):
+    """
+    Event table of one sample of the registry: its rows without the sample column and
+    without the attribute columns of the other samples (missing for all its events).
+    """
+    events = registry[registry['sample']==sample].drop(columns='sample')
+    return events.loc[:,events.notna().any().to_numpy()|events.columns.isin(['event_id','ISIN','EventDate'])]
+
+
+def registry_rows(daily, registry, samples, calendar, max_bdays=365):
+    """
+    Daily rows of the events of `samples`, all drawn from the same daily frame (sorted by
+    ISIN and date, as returned by read_daily_file), in one pass: the row ranges and the
+    relative trading days of every event of every sample are computed at once (see
+    event_ranges and event_rows).
+
+    Returns the daily columns with EventDate, event_id, sample and BDaysRelativeToEvent of
+    the rows within `max_bdays` trading days of each event; the samples stay in one frame
+    for sample_pipeline, which splits its outputs by sample.
+    """
+    events = registry.loc[registry['sample'].isin(samples),['ISIN','EventDate','event_id','sample']].drop_duplicates(subset=['event_id'])
+    return event_rows(daily,event_ranges(daily,events,max_bdays),calendar,max_bdays)
+
+
+''' Checkpoints '''
+def save_checkpoint(df, path, csv=False):
+    """
+    Save an intermediate daily frame to `path`.parquet (path is given without extension).
+
+    Parquet keeps the dtypes (dates stay datetime64) and is much faster to write and read
+    than csv. With csv=True a csv copy is written as well, e.g. for inspection.
+    """
+    df.to_parquet(path+".parquet",index=False)
+    if csv:
+        df.to_csv(path+".csv",index=False)
+
+
+def load_checkpoint(path, columns=None):
+    """ Read a frame saved by save_checkpoint(); `columns` reads only these columns. """
+    return pd.read_parquet(path+".parquet",columns=columns)
+
+
+''' Shared frames '''
+def publish_frame(df, path):
+    """
+    Write df once as an uncompressed Arrow IPC file `path`.arrow (path without extension)
+    that any process can attach to with attach_frame(path), e.g. the daily frames and
+    event windows used by the worker processes of run_samples.
+
+    Floats are written as values (NaN stays NaN rather than becoming null), so numeric
+    and date columns can be used in place from the mapped file. The index is not kept.
+    Returns `path`, the name to attach to. On Linux, a path on /dev/shm keeps the file in
+    shared memory.
+    """
+    table = pa.Table.from_pandas(df,preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_floating(field.type):
+            table = table.set_column(i,field,pa.array(df[field.name].to_numpy(),type=field.type,from_pandas=False))
+    os.makedirs(os.path.dirname(path) or '.',exist_ok=True)
+    with pa.OSFile(path+".arrow.tmp",'wb') as sink:
+        with pa.ipc.new_file(sink,table.schema) as writer:
+            writer.write_table(table)
+    os.replace(path+".arrow.tmp",path+".arrow")
+    return path
+
+
+def attach_frame(path, columns=None):
+    """
+    Frame published by publish_frame(df, path), read through a memory map: numeric and date
+    columns without nulls are read-only views of the mapped pages, so every process that
+    attaches to the same file shares one copy in the page cache and nothing is deserialized.
+    Strings and categoricals are materialized. `columns` attaches only these columns.
+    """
+    table = pa.ipc.open_file(pa.memory_map(path+".arrow",'r')).read_all()
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas(split_blocks=True)
+
+
+''' Benchmark returns '''
+WINDICES_TABLE = 'wrdsapps_windices.dwcountryreturns'
+
+def _read_sql(connection, sql):
+    """ Run a query on a wrds.Connection, or on a DB-API/SQLAlchemy connection (e.g. sqlite3). """
+    if hasattr(connection,'raw_sql'):
+        return connection.raw_sql(sql,date_cols=['date'])
+    return pd.read_sql(sql,connection,parse_dates=['date'])
+
+
+def windices_returns(cache_path, connection=None, start=None, end=None, fics=None):
+    """
+    WRDS World Indices daily country returns (date, portret, fic), served from a local cache.
+
+    The table is cached in `cache_path` (parquet). The parquet metadata records the cache
+    version, the fetch time and what the cache covers (first date, countries), so a rerun
+    only queries dates after the last cached date. The date range [start, end] and the
+    country list `fics` are pushed down into the query and applied to the returned frame.
+
+    `connection` is a wrds.Connection, or any DB-API/SQLAlchemy connection on which
+    wrdsapps_windices.dwcountryreturns can be queried (e.g. a local Postgres copy, or a
+    sqlite3 database with the table in a database attached as wrdsapps_windices).
+    With connection=None the cache is used as is (offline mode).
+    """
+    start = None if start is None else pd.Timestamp(start)
+    end = None if end is None else pd.Timestamp(end)
+    fics = None if fics is None else sorted(set(fics))
+
+    cache, meta = None, {'version':0}
+    if os.path.exists(cache_path):
+        table = pq.read_table(cache_path)
+        cache = table.to_pandas()
+        meta = json.loads(table.schema.metadata.get(b'windices',b'{"version": 0}'))
+
+    if connection is not None:
+        # Fetch only the dates after the last cached date if the cache covers the requested
+        # start date and countries, otherwise fetch everything requested
+        covered = cache is not None and 'end' in meta
+        if covered and start is not None and meta['start']!='*':
+            covered = pd.Timestamp(meta['start'])<=start
+        if covered and meta['fics']!='*':
+            covered = fics is not None and set(fics)<=set(meta['fics'])
+        # An update keeps the countries of the cache, so that all of them stay up to date
+        fetch_fics = (None if meta['fics']=='*' else meta['fics']) if covered else fics
+
+        where = []
+        if covered:
+            where.append("date > '%s'" % pd.Timestamp(meta['end']).strftime('%Y-%m-%d'))
+        elif start is not None:
+            where.append("date >= '%s'" % start.strftime('%Y-%m-%d'))
+        if end is not None:
+            where.append("date <= '%s'" % end.strftime('%Y-%m-%d'))
+        if fetch_fics is not None:
+            where.append("fic in (%s)" % ",".join("'%s'" % f.replace("'","''") for f in fetch_fics))
+        sql = "select date, portret, fic from %s" % WINDICES_TABLE
+        if where:
+            sql += " where " + " and ".join(where)
+        new = _read_sql(connection,sql)[['date','portret','fic']]
+        new['date'] = pd.to_datetime(new['date'])
+
+        if covered:
+            cache = pd.concat([cache,new],ignore_index=True)
+        else:
+            cache = new
+            meta['start'] = '*' if start is None else start.strftime('%Y-%m-%d')
+            meta['fics'] = '*' if fics is None else fics
+        if len(cache):
+            meta['end'] = cache['date'].max().strftime('%Y-%m-%d')
+        meta['version'] = meta.get('version',0) + 1
+        meta['fetched_at'] = dt.datetime.now().isoformat(timespec='seconds')
+
+        table = pa.Table.from_pandas(cache,preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}),b'windices':json.dumps(meta).encode()})
+        pq.write_table(table,cache_path+'.tmp')
+        os.replace(cache_path+'.tmp',cache_path)
+    elif cache is None:
+        raise FileNotFoundError("No cached World Indices returns in %s; run once with a WRDS connection" % cache_path)
+
+    # Requested subset
+    keep = np.ones(len(cache),dtype=bool)
+    if start is not None:
+        keep &= (cache['date']>=start).to_numpy()
+    if end is not None:
+        keep &= (cache['date']<=end).to_numpy()
+    if fics is not None:
+        keep &= cache['fic'].isin(fics).to_numpy()
+    return cache[keep].reset_index(drop=True)
+
+
+def market_return_table(windices, crsp, us_regions=('US','CA')):
+    """
+    Dense market returns by trading day and region.
+
+    `windices` holds MarketDate, Region and MarketReturn of the World Indices (ex-US
+    countries); `crsp` holds MarketDate and MarketReturn of the CRSP value-weighted index,
+    which is used for all regions in `us_regions`. Returns (dates, regions, values) where
+    values[i, j] is the return of region regions[j] on dates[i] (NaN if not available).
+    """
+    dates = pd.DatetimeIndex(pd.concat([windices['MarketDate'],crsp['MarketDate']]).dropna().unique()).sort_values()
+    regions = pd.Index(list(pd.Series(windices['Region'].dropna().unique()).sort_values())
+                       + [r for r in us_regions if r not in set(windices['Region'].dropna())])
+    values = np.full((len(dates),len(regions)),np.nan)
+
+    ex_us = windices[windices['Region'].notna()&~windices['Region'].isin(us_regions)]
+    values[dates.get_indexer(ex_us['MarketDate']),regions.get_indexer(ex_us['Region'])] = ex_us['MarketReturn'].to_numpy(dtype=float)
+    us = crsp.dropna(subset=['MarketDate'])
+    for r in us_regions:
+        values[dates.get_indexer(us['MarketDate']),regions.get_loc(r)] = us['MarketReturn'].to_numpy(dtype=float)
+    return dates, regions, values
+
+
+def market_return(df, table, date='MarketDate', region='Region'):
+    """ Market return of every row of df (by MarketDate and Region), looked up in market_return_table(). """
+    dates, regions, values = table
+    i = dates.get_indexer(df[date])
+    if isinstance(df[region].dtype,pd.CategoricalDtype):
+        codes = regions.get_indexer(df[region].cat.categories)
+        j = np.where(df[region].cat.codes.to_numpy()>=0,codes[df[region].cat.codes.to_numpy()],-1)
+    else:
+        j = regions.get_indexer(df[region])
+    found = (i>=0)&(j>=0)
+    out = np.full(len(df),np.nan)
+    out[found] = values[i[found],j[found]]
+    return out
+
+
+''' Market model '''
+def market_model(df, keys, est_start=-130, est_end=-30, min_obs=60,
+                 ret='ret', market='MarketReturn', day='BDaysRelativeToEvent'):
+    """
+    Estimate the market model ret = alpha + beta*MarketReturn for all events in one pass.
+
+    Each event is identified by `keys` (e.g. ['ISIN'] or ['ISIN','EventDate']) and is
+    estimated over the window [est_start, est_end) of `day`. The OLS solution is computed
+    in closed form from grouped sums of x, y, x^2, xy and y^2, which gives the same
+    alpha and beta as sm.OLS(Y, sm.add_constant(X)).fit() for each event.
+
+    Returns one row per event with alpha, beta, sigma2 (residual variance, n-2 dof),
+    r2 and nobs. Events with fewer than `min_obs` valid observations get missing
+    parameters, as in the original loop.
+    """
+    est = df.loc[(df[day]>=est_start)&(df[day]<est_end), keys+[ret,market]]
+    est = est.dropna(subset=[ret,market])
+
+    x = est[market].to_numpy(dtype=float)
+    y = est[ret].to_numpy(dtype=float)
+    moments = pd.DataFrame({'n':1,'x':x,'y':y,'xx':x*x,'xy':x*y,'yy':y*y},index=est.index)
+    sums = pd.concat([est[keys],moments],axis=1).groupby(keys).sum()
+
+    n = sums['n']
+    sxx = sums['xx'] - sums['x']**2/n
+    sxy = sums['xy'] - sums['x']*sums['y']/n
+    syy = sums['yy'] - sums['y']**2/n
+
+    params = pd.DataFrame(index=sums.index)
+    params['beta'] = sxy/sxx
+    params['alpha'] = (sums['y'] - params['beta']*sums['x'])/n
+    ssr = syy - params['beta']*sxy
+    params['sigma2'] = ssr/(n-2)
+    params['r2'] = 1 - ssr/syy
+    params['nobs'] = n
+    params.loc[n<min_obs,['alpha','beta','sigma2','r2']] = np.nan
+
+    # Keep every event of the sample, including those without an estimation window
+    events = df[keys].dropna().drop_duplicates()
+    summary = pd.merge(events,params[['alpha','beta','sigma2','r2','nobs']].reset_index(),on=keys,how='left')
+    summary['nobs'] = summary['nobs'].fillna(0).astype(int)
+
+    return summary
+
+
+''' Event-time alignment '''
+def event_days(sub, event='event_id', date='MarketDate', bdays='BDaysRelativeToEvent',
+               day='NEWDaysRelativeToEvent'):
+    """
+    Trading days relative to the event counted on the rows of each event, ignoring the
+    days without data: the last row before the event date (bdays<0) is day -1, the one
+    before it -2, ..., and the first row on or after the event date is day 0.
+
+    The rows are put in (event, date) order (stable, so rows with the same date keep
+    their order), the event position (first row with bdays>=0) is located with
+    searchsorted, and `day` is the row position minus the event position. Rows of an
+    event with the same date share the average of their positions, which gives the
+    same values as the average ranks of MarketDate before and after the event date.
+
+    Returns the rows of `sub` in (event, date) order with `day` added.
+    """
+    ev = sub[event].to_numpy()
+    d = sub[date].to_numpy()
+    if len(sub)>1 and not ((ev[1:]>ev[:-1])|((ev[1:]==ev[:-1])&(d[1:]>=d[:-1]))).all():
+        order = np.lexsort((d,ev))
+        sub, ev, d = sub.iloc[order], ev[order], d[order]
+    sub = sub.copy()
+
+    # Event position: first row of the event plus its number of pre-event rows
+    n = len(sub)
+    start = np.searchsorted(ev,ev,side='left')
+    end = np.searchsorted(ev,ev,side='right')
+    pre = np.concatenate([[0],np.cumsum(sub[bdays].to_numpy()<0)])
+    position = start + (pre[end]-pre[start])
+
+    # Rows with the same event and date share their average position
+    new = np.ones(n,dtype=bool)
+    new[1:] = (ev[1:]!=ev[:-1])|(d[1:]!=d[:-1])
+    first = np.flatnonzero(new)
+    last = np.append(first[1:],n) - 1
+    run = np.cumsum(new) - 1
+
+    sub[day] = (first[run]+last[run])/2 - position
+    return sub
+
+
+''' Event-window cube '''
+# Metrics stored in the event-window cubes
+CUBE_METRICS = ['adjRet_MarketModel_logPct','MAReturn_logPct','Volume','Volume_pct','Volume_pctlog']
+
+def event_cube(sub, keys, attributes, metrics=CUBE_METRICS, days=(-15,15), day='NEWDaysRelativeToEvent'):
+    """
+    Dense (event x relative day x metric) array of an event-window frame (ds_dsf_*_sub).
+
+    Returns (events, cube, valid):
+    - events: one row per event (sorted by `keys`) with the event `attributes` (constant
+      within an event, e.g. type, achieved, failed, ambition and COVID flags) and 'regular';
+    - cube: float array of shape (n_events, days[1]-days[0]+1, len(metrics)), NaN where
+      an event has no row on a relative day;
+    - valid: bool array of shape (n_events, n_days), True where the event has a row.
+
+    An event is regular if its relative days within `days` are distinct integers. Events
+    with tied ranks (e.g. two listings of the same ISIN trading on the same dates, which
+    gives relative days such as -1.5) are not regular; they are kept in `events` but have
+    no valid days in the cube, i.e. they never pass a window completeness requirement.
+    """
+    first, last = days
+    n_days = last - first + 1
+    event = sub.groupby(keys,sort=True).ngroup().to_numpy()
+    events = sub.groupby(keys,sort=True)[attributes].first().reset_index()
+
+    d = sub[day].to_numpy(dtype=float)
+    inside = (event>=0)&(d>=first)&(d<=last)
+    integer = d==np.floor(d)
+    pos = np.where(inside&integer,d,first).astype(int) - first
+
+    # Regular events: no fractional days and no repeated days in the window
+    regular = np.ones(len(events),dtype=bool)
+    regular[event[inside&~integer]] = False
+    cell = event[inside&integer]*n_days + pos[inside&integer]
+    _, first_row, counts = np.unique(cell,return_index=True,return_counts=True)
+    regular[cell[first_row[counts>1]]//n_days] = False
+    events['regular'] = regular
+
+    ok = inside & integer
+    ok[ok] = regular[event[ok]]
+    cube = np.full((len(events),n_days,len(metrics)),np.nan)
+    valid = np.zeros((len(events),n_days),dtype=bool)
+    cube[event[ok],pos[ok],:] = sub[metrics].to_numpy(dtype=float)[ok]
+    valid[event[ok],pos[ok]] = True
+
+    return events, cube, valid
+
+
+def save_event_cube(path, events, cube, valid):
+    """ Save an event-window cube as path_events.parquet, path_cube.npy and path_valid.npy. """
+    events.to_parquet(path+"_events.parquet",index=False)
+    np.save(path+"_cube.npy",cube)
+    np.save(path+"_valid.npy",valid)
+
+
+def load_event_cube(path, mmap=True):
+    """ Load a cube saved by save_event_cube(); the arrays are memory-mapped (read-only) by default. """
+    mode = 'r' if mmap else None
+    return (pd.read_parquet(path+"_events.parquet"),
+            np.load(path+"_cube.npy",mmap_mode=mode),
+            np.load(path+"_valid.npy",mmap_mode=mode))
+
+
+''' Window completeness '''
+def day_bits(sub, keys, valid):
+    """
+    Bitmask of the relative days with data of each row's event, from the `valid` array of
+    event_cube(sub, keys, ...). Bit k of the uint32 is set when the event has a row on day
+    days[0]+k (k=0..30 for the default days=(-15,15)); rows are matched to events by `keys`.
+    """
+    bits = (valid.astype(np.uint32) << np.arange(valid.shape[1],dtype=np.uint32)).sum(axis=1,dtype=np.uint32)
+    event = sub.groupby(keys,sort=True).ngroup().to_numpy()
+    return np.where(event>=0,bits[event],0).astype(np.uint32)
+
+
+def has_days(bits, start, end, days=(-15,15)):
+    """
+    True where a day bitmask (see day_bits) has every relative day of [start, end], i.e.
+    the event has all end-start+1 days of data in the window.
+    """
+    if start<days[0] or end>days[1]:
+        raise ValueError(f"window ({start},{end}) is outside the day bitmask range {days}")
+    mask = np.uint32(((1<<(end-start+1))-1) << (start-days[0]))
+    return (np.asarray(bits,dtype=np.uint32) & mask) == mask
+
+
+''' Sample pipeline '''
+def event_stages(daily, events, attributes, market_returns, isin_dedup=(), days=(-15,15)):
+    """
+    Returns, volume, market model, event-time alignment and event-window cube of the
+    events of any number of samples in one pass, i.e. the stages that are the same for
+    every sample:
+    - market return (market_return) and market-adjusted returns in percent and logs;
+    - turnover Volume_pct = Volume/numshrs*100 and its log;
+    - market-model alpha and beta per event (market_model) and abnormal returns;
+    - the event window `days` without missing market-adjusted returns and repeated rows,
+      NEWDaysRelativeToEvent (event_days) and the event attributes (event_attributes);
+    - the event-window cube and DayBits.
+
+    `daily` holds the daily rows of the events (with event_id, sample and
+    BDaysRelativeToEvent, see registry_rows) and `events` their registry rows. Every stage
+    is keyed by event_id, which is unique across samples, so the events of all samples
+    (e.g. every CDP release year) share one market-model fit, one event window and one
+    cube. In the samples of `isin_dedup`, rows with the same ISIN, MarketDate and
+    BDaysRelativeToEvent are dropped before event_days (the target announcement sample).
+
+    Returns (df, sub, cube, summary): the daily frame with the new columns, the event
+    window with DayBits, the event_cube() tuple (with the sample and `attributes` of each
+    event) and the market-model summary.
+    """
+    df = daily.copy()
+
+    # Market-adjusted returns (in percentages); ret is read in as a number in percent
+    df['MarketReturn'] = market_return(df,market_returns)
+    df['MarketReturn_pct'] = df['MarketReturn']*100
+    df['ret_pct'] = df['ret']
+    df['ret'] = df['ret_pct']/100
+    df['MAReturn'] = df['ret'] - df['MarketReturn']
+    df['MAReturn_pct'] = df['ret_pct'] - df['MarketReturn_pct']
+    df['MAReturn_log'] = np.log(1+df['MAReturn'])
+    df['MAReturn_logPct'] = df['MAReturn_log']*100
+
+    # Trading volume (in percentages); small number added to prevent log transforming zero
+    df['Volume_pct'] = df['Volume']/df['numshrs']*100
+    df['Volume_pctlog'] = np.log(df['Volume_pct']+0.000255)
+
+    # Market model abnormal returns; estimation window [-130,-30)
+    summary = market_model(df,['event_id'])
+    df = pd.merge(df,summary[['event_id','alpha','beta']],on=['event_id'],how='left')
+    df['ret_MarketModel'] = df['alpha'] + df['beta']*df['MarketReturn']
+    df['adjRet_MarketModel'] = df['ret'] - df['ret_MarketModel']
+    df['adjRet_MarketModel_log'] = np.log(1+df['adjRet_MarketModel'])
+    df['adjRet_MarketModel_logPct'] = df['adjRet_MarketModel_log']*100
+
+    # Event window without missing market-adjusted returns and without repeated rows
+    sub = df[(df['BDaysRelativeToEvent']>=days[0])&(df['BDaysRelativeToEvent']<=days[1])]
+    sub = sub.dropna(subset=['MAReturn_logPct'])
+    sub = sub.drop_duplicates(subset=['event_id','MarketDate','MAReturn_logPct','BDaysRelativeToEvent'],keep='last')
+    dedup = sub['sample'].isin(isin_dedup).to_numpy()
+    repeated = np.zeros(len(sub),dtype=bool)
+    repeated[dedup] = sub[dedup].duplicated(subset=['sample','ISIN','MarketDate','BDaysRelativeToEvent']).to_numpy()
+    sub = lean_frame(event_attributes(event_days(sub[~repeated]),events))
+
+    cube = event_cube(sub,['event_id'],['sample']+list(attributes),days=days)
+    sub['DayBits'] = day_bits(sub,['event_id'],cube[2])
+    return df, sub, cube, summary
+
+
+def _stage_part(name, daily, shared_directory, **stages):
+    # event_stages of one part of the events (run by run_samples), with its outputs published in shared_directory
+    # under names of their own (the part itself is shared_directory+"ds_dsf_"+name)
+    df, sub, cube, summary = event_stages(attach_frame(daily),**stages)
+    save_event_cube(shared_directory+"cube_"+name,*cube)
+    return (publish_frame(df,shared_directory+"stages_"+name),publish_frame(sub,shared_directory+"stages_"+name+"_sub"),
+            shared_directory+"cube_"+name,summary)
+
+
+def _remove_parts(shared_directory, names):
+    # Delete the files of the parts published by sample_pipeline and _stage_part
+    for name in names:
+        for file in ["ds_dsf_"+name+".arrow","stages_"+name+".arrow","stages_"+name+"_sub.arrow",
+                     "cube_"+name+"_events.parquet","cube_"+name+"_cube.npy","cube_"+name+"_valid.npy"]:
+            if os.path.exists(shared_directory+file):
+                os.remove(shared_directory+file)
+
+
+def sample_pipeline(daily, events, samples, market_returns, output_directory, checkpoint_csv=False,
+                    isin_dedup=(), days=(-15,15), shared_directory=None, processes=1, append=()):
+    """
+    The stages of event_stages for the events of all `samples` in one pass, saved per sample.
+
+    `daily` holds the daily rows of the events (see registry_rows), `events` is the event
+    registry and `samples` maps each sample to the attribute columns of its events (see
+    registry_events). With `processes` > 1 and a `shared_directory`, the events are split
+    by firm into one part per process: each part is published in shared_directory, run on
+    a pool of worker processes (see run_samples) that attach to it and publish their
+    outputs, and the parts are put back together in event_id order. shared_directory is
+    scratch space: the files of the parts are deleted once they are put back together
+    (or the run fails), and only the published event windows of the samples are left
+    there, to be overwritten by the next run.
+
+    The outputs are then split by sample and saved in output_directory: the daily frame
+    with the new columns as the checkpoint "ds_dsf_"+name, the event window as
+    "ds_dsf_"+name+"_sub", the cube as "cube_"+name and the market-model summary as
+    "marketModel_"+name. For the samples in `append`, the events are new to the sample
+    (see event_registry) and their outputs are appended to the saved ones, from which the
+    events no longer in the registry are dropped (see stored_sample).
+
+    Returns a dict sample -> (sub, cube, summary): the event window, the event_cube() tuple
+    and the market-model summary of all the sample's events. With a shared_directory, the
+    names of the published event window and of the saved cube are returned instead of the
+    frame and arrays (see attach_frame and load_event_cube).
+    """
+    attributes = list(dict.fromkeys(c for columns in samples.values() for c in columns))
+    stages = {'events':events,'attributes':attributes,'market_returns':market_returns,'isin_dedup':isin_dedup,'days':days}
+    firm = pd.factorize(daily['ISIN'])[0]
+    # One pass without rows, e.g. new events whose firms are not in the daily files yet
+    processes = 1 if len(daily)==0 else min(processes or os.cpu_count() or 1,firm.max()+1)
+    if processes<=1 or shared_directory is None:
+        df, sub, cube, summary = event_stages(daily,**stages)
+    else:
+        names = ['part%d' % i for i in range(processes)]
+        try:
+            tasks = {name: {'daily':publish_frame(daily[firm%processes==i],shared_directory+"ds_dsf_"+name)}
+                     for i, name in enumerate(names)}
+            parts = list(run_samples(_stage_part,tasks,shared=dict(stages,shared_directory=shared_directory),processes=processes).values())
+            df = lean_frame(pd.concat([attach_frame(p[0]) for p in parts],ignore_index=True))
+            sub = lean_frame(pd.concat([attach_frame(p[1]) for p in parts],ignore_index=True)).sort_values('event_id',kind='stable')
+            cubes = [load_event_cube(p[2],mmap=False) for p in parts]
+            order = np.argsort(np.concatenate([c[0]['event_id'].to_numpy() for c in cubes]),kind='stable')
+            cube = (pd.concat([c[0] for c in cubes],ignore_index=True).iloc[order].reset_index(drop=True),
+                    np.concatenate([c[1] for c in cubes])[order],np.concatenate([c[2] for c in cubes])[order])
+            summary = pd.concat([p[3] for p in parts],ignore_index=True)
+        finally:
+            # The parts are scratch files
+            _remove_parts(shared_directory,names)
+
+    results = {}
+    for name, columns in samples.items():
+        other = [c for c in attributes if c not in columns]
+        path = output_directory+"ds_dsf_"+name
+        sample_daily = df[df['sample']==name].drop(columns='sample')
+        keep = (cube[0]['sample']==name).to_numpy()
+        sample_cube = (cube[0].loc[keep].drop(columns=['sample']+other).reset_index(drop=True),cube[1][keep],cube[2][keep])
+        sample_sub = sub[sub['sample']==name].drop(columns=['sample']+other)
+        sample_summary = summary[summary['event_id'].isin(sample_daily['event_id'].unique())]
+        if name in append:
+            current = events.loc[events['sample']==name,['event_id']+columns]
+            stored_sub, stored_cube, stored_summary = _stored_outputs(name,output_directory,current)
+            sample_daily = lean_frame(pd.concat([_registered(load_checkpoint(path),current),sample_daily],ignore_index=True))
+            sample_cube = (pd.concat([stored_cube[0],sample_cube[0]],ignore_index=True),
+                           np.concatenate([stored_cube[1],sample_cube[1]]),np.concatenate([stored_cube[2],sample_cube[2]]))
+            sample_sub = lean_frame(pd.concat([stored_sub,sample_sub],ignore_index=True))
+            sample_summary = pd.concat([stored_summary,sample_summary],ignore_index=True)
+        save_checkpoint(sample_daily,path,csv=checkpoint_csv)
+        save_event_cube(output_directory+"cube_"+name,*sample_cube)
+        save_checkpoint(sample_sub,path+"_sub")
+        save_checkpoint(sample_summary,output_directory+"marketModel_"+name)
+        if shared_directory is not None:
+            results[name] = (publish_frame(sample_sub,shared_directory+"ds_dsf_"+name+"_sub"),output_directory+"cube_"+name,sample_summary)
+        else:
+            results[name] = (sample_sub,sample_cube,sample_summary)
+    return results
+
+
+def _registered(df, events, key='event_id'):
+    # Rows of df of the events still registered in `events` (the current registry rows of a sample)
+    return df[df[key].isin(events[key])]
+
+
+def _current(df, events, key='event_id'):
+    # Rows of df of the events still registered, with the current attributes of `events` (in the columns of df)
+    attributes = [c for c in df.columns if c in events.columns and c!=key]
+    return event_attributes(_registered(df,events,key).drop(columns=attributes),events[[key]+attributes])[df.columns]
+
+
+def _stored_outputs(name, output_directory, events):
+    """
+    Event window, cube and market-model summary of a sample saved by sample_pipeline in an
+    earlier run, restricted to the events still in the registry rows `events` of the sample
+    (e.g. without a firm dropped from the sample) and with their current attributes.
+    """
+    path = output_directory+"ds_dsf_"+name
+    sub = _current(load_checkpoint(path+"_sub"),events)
+    cube = load_event_cube(output_directory+"cube_"+name,mmap=False)
+    keep = cube[0]['event_id'].isin(events['event_id']).to_numpy()
+    cube = (_current(cube[0],events).reset_index(drop=True),cube[1][keep],cube[2][keep])
+    summary = _registered(load_checkpoint(output_directory+"marketModel_"+name),events)
+    return sub, cube, summary
+
+
+def stored_sample(name, output_directory, events, shared_directory=None, checkpoint_csv=False):
+    """
+    Stage outputs of a sample saved by sample_pipeline in an earlier run, returned as
+    sample_pipeline returns those of each sample (for a sample without new events).
+
+    `events` are the current registry rows of the sample (see registry_events): the outputs
+    of events that are no longer registered are dropped and the attributes of the others
+    are refreshed, and the outputs are saved again, so that the tests and panels only see
+    the current events with their current attributes.
+    """
+    sub, cube, summary = _stored_outputs(name,output_directory,events)
+    path = output_directory+"ds_dsf_"+name
+    if not load_checkpoint(path,columns=['event_id'])['event_id'].isin(events['event_id']).all():
+        save_checkpoint(_registered(load_checkpoint(path),events),path,csv=checkpoint_csv)
+    save_event_cube(output_directory+"cube_"+name,*cube)
+    save_checkpoint(sub,path+"_sub")
+    save_checkpoint(summary,output_directory+"marketModel_"+name)
+    if shared_directory is not None:
+        return publish_frame(sub,shared_directory+"ds_dsf_"+name+"_sub"), output_directory+"cube_"+name, summary
+    return sub, cube, summary
+
+
+# Inputs of the samples run by run_samples (set in the parent, inherited by the forked workers)
+_sample_inputs = None
+
+def _run_sample(name):
+    function, tasks, shared = _sample_inputs
+    return function(name,**tasks[name],**shared)
+
+
+def run_samples(function, tasks, shared=None, processes=None):
+    """
+    Run function(name, **tasks[name], **shared) for every task of `tasks` (a dict
+    name -> keyword arguments, e.g. the parts of the events in sample_pipeline) on a pool
+    of `processes` worker processes (default: one per task, at most os.cpu_count()).
+
+    The workers are forked, so the task inputs and the read-only `shared` inputs (e.g. the
+    market return table) are inherited rather than copied to each worker; only the results
+    are sent back. Large frames are best passed as names of frames published with
+    publish_frame, which the workers attach to (see attach_frame). Results are returned
+    as a dict in the order of `tasks`, whatever the order in which the tasks finish.
+    With processes=1, or where fork is not available, the tasks are run one after
+    another in this process.
+    """
+    global _sample_inputs
+    shared = {} if shared is None else shared
+    processes = min(len(tasks),processes or os.cpu_count() or 1)
+    if processes<=1 or 'fork' not in mp.get_all_start_methods():
+        return {name: function(name,**tasks[name],**shared) for name in tasks}
+
+    _sample_inputs = (function,tasks,shared)
+    try:
+        with ProcessPoolExecutor(processes,mp_context=mp.get_context('fork')) as pool:
+            futures = {name: pool.submit(_run_sample,name) for name in tasks}
+            return {name: future.result() for name, future in futures.items()}
+    finally:
+        _sample_inputs = None
+
+
+''' Window CARs '''
+def car_prefix(cube, valid, metric=0):
+    """
+    Per-event prefix sums over the relative days of an event-window cube.
+
+    Returns (csum, nobs, missing), each of shape (n_events, n_days+1) for csum and nobs:
+    csum[:, k] is the sum of the (non-missing) `metric` values over the first k days of
+    the cube and nobs[:, k] the number of days with a row; missing (n_events, n_days)
+    marks days with a row but no value of the metric. Computed once, these give the CAR
+    and the day count of any window with two lookups (see window_car).
+    """
+    values = cube[:,:,metric]
+    n_events, n_days = values.shape
+    csum = np.zeros((n_events,n_days+1))
+    nobs = np.zeros((n_events,n_days+1),dtype=np.int32)
+    csum[:,1:] = np.nancumsum(values,axis=1)
+    nobs[:,1:] = np.cumsum(valid,axis=1)
+    return csum, nobs, valid & np.isnan(values)
+
+
+def window_car(prefix, windows, complete=None, days=(-15,15)):
+    """
+    CAR of every event over each (start, end) window in `windows`, from car_prefix().
+
+    The CAR of a window is the cumulative return at its end day, i.e. what
+    groupby(event)[ret].cumsum() gives on the window rows at day `end`: missing returns
+    before the end day are skipped and a missing return on the end day gives a missing
+    CAR. An event is complete for a window if it has a row on every day of the matching
+    window in `complete` (default: the window itself), which is the "drop firms without
+    all N days of data" rule; e.g. CAR(-1,1) of the events with all days of (-1,3) is
+    window_car(prefix,[(-1,1)],complete=[(-1,3)]).
+
+    Returns (car, ok), both of shape (n_events, len(windows)); car is NaN where ok is False.
+    """
+    csum, nobs, missing = prefix
+    first = days[0]
+    complete = windows if complete is None else complete
+    start = np.array([s for s, e in windows]) - first
+    end = np.array([e for s, e in windows]) - first
+    car = csum[:,end+1] - csum[:,start]
+    car[missing[:,end]] = np.nan
+
+    c_start = np.array([s for s, e in complete]) - first
+    c_end = np.array([e for s, e in complete]) - first
+    ok = (nobs[:,c_end+1] - nobs[:,c_start]) == (c_end - c_start + 1)
+    car[~ok] = np.nan
+    return car, ok
+
+
+''' Group specification '''
+def group_mask(df, spec, events=None, key='event_id'):
+    """
+    Boolean row mask for one group of a grouping spec.
+
+    `spec` is None (all rows), or a (column, value) pair: a scalar value selects rows
+    with df[column]==value and a list-like value selects rows with df[column].isin(value).
+    A column that df does not have is an event attribute: it is evaluated once per event
+    on the event table `events` and the result is looked up by `key`.
+    """
+    if spec is None:
+        return np.ones(len(df),dtype=bool)
+    column, value = spec
+    if column not in df.columns and events is not None:
+        events = events.drop_duplicates(subset=[key],keep='last')
+        mask = group_mask(events,spec)
+        pos = pd.Index(events[key]).get_indexer(df[key])
+        return (pos>=0) & mask[pos]
+    if pd.api.types.is_list_like(value):
+        return df[column].isin(value).to_numpy()
+    return (df[column]==value).to_numpy()
+
+
+def group_counts(df, spec, events=None, key='event_id'):
+    """
+    Number of times each row of df enters one group of a grouping spec: as group_mask(),
+    but a row whose group is looked up in the event table `events` counts once per row of
+    its event in the table that is in the group (e.g. a CDP firm with several ids, each
+    with its own type), as when the event table is merged onto the daily rows.
+    """
+    if events is None or (spec is not None and spec[0] in df.columns):
+        return group_mask(df,spec,events,key).astype(np.int64)
+    counts = pd.Series(group_mask(events,spec).astype(np.int64)).groupby(events[key].to_numpy()).sum()
+    return counts.reindex(df[key].to_numpy(),fill_value=0).to_numpy()
+
+
+def subsample_bits(df, subsamples, keys, events=None):
+    """
+    Per-event bitmask of subsample membership of every row of df: bit i (of a uint64) is
+    set when the row's event is in the i-th subsample of `subsamples`, a dict mapping a
+    label to a spec understood by group_mask(), e.g. {'all':None,
+    'material':('emission_industry_high',1),'noncovid':('type_covid_industry',0)}.
+
+    Subsamples select events, so the specs are evaluated once per event (`keys`) on its
+    first row; as for the groups, a column that df does not have is looked up in the
+    event table `events` (see group_mask). At most 64 subsamples.
+    """
+    if len(subsamples)>64:
+        raise ValueError("at most 64 subsamples fit in the bitmask")
+    event = df.groupby(keys,sort=False).ngroup().to_numpy()
+    _, first = np.unique(event,return_index=True)
+    first_rows = df.iloc[first]
+    bits = np.zeros(len(first_rows),dtype=np.uint64)
+    for i, spec in enumerate(subsamples.values()):
+        bits |= group_mask(first_rows,spec,events,keys[0]).astype(np.uint64) << np.uint64(i)
+    return bits[event]
+
+
+def _combinations(df, keys, groups, subsamples=None, events=None):
+    # Row masks (rows x combinations) of every subsample x group combination, with their labels
+    masks = np.column_stack([group_mask(df,groups[label],events,keys[0]) for label in groups]) if groups else np.zeros((len(df),0),dtype=bool)
+    if subsamples is None:
+        return masks, list(groups), None
+    bits = subsample_bits(df,subsamples,keys,events)
+    inside = (bits[:,None] >> np.arange(len(subsamples),dtype=np.uint64)) & np.uint64(1) == 1
+    combined = (inside[:,:,None] & masks[:,None,:]).reshape(len(df),-1)
+    labels = [(s,g) for s in subsamples for g in groups]
+    return combined, labels, list(subsamples)
+
+
+def _label_columns(summary, combination, labels, subsamples, groups):
+    # 'subsample' and 'group' columns (categoricals) of a summary with combination codes
+    if subsamples is None:
+        summary.insert(0,'group',pd.Categorical.from_codes(combination,categories=labels))
+        return summary
+    summary.insert(0,'group',pd.Categorical.from_codes(combination%len(groups),categories=list(groups)))
+    summary.insert(0,'subsample',pd.Categorical.from_codes(combination//len(groups),categories=subsamples))
+    return summary
+
+
+def split_groups(summary):
+    """
+    Split a long summary (with a 'group' column) into one summary frame per group; with a
+    'subsample' column (subsamples= of car_test and volume_test), per (subsample, group).
+    """
+    if 'subsample' in summary.columns:
+        return {(s, g): summary[(summary['subsample']==s)&(summary['group']==g)].drop(columns=['subsample','group']).reset_index(drop=True)
+                for s in summary['subsample'].cat.categories for g in summary['group'].cat.categories}
+    return {label: summary[summary['group']==label].drop(columns='group').reset_index(drop=True)
+            for label in summary['group'].cat.categories}
+
+
+''' CAAR/AAR cross-sectional test '''
+def car_test(window, keys, groups, ret='adjRet_MarketModel_logPct', day='NEWDaysRelativeToEvent',
+             subsamples=None, events=None):
+    """
+    CAAR, AAR and their cross-sectional t-stats for several groups of events at once.
+
+    `window` holds the event-window rows (sorted by event and day), `keys` identify an
+    event (e.g. ['ISIN'] or ['ISIN','EventDate']) and `groups` maps a group label to a
+    spec understood by group_mask(), e.g. {'achieved':('achieved',1),'failed':('failed',1)}.
+    With `subsamples` (a dict label -> spec, see subsample_bits), the statistics are given
+    for every subsample x group combination, e.g. material firms only or without COVID
+    industries, with a 'subsample' column in the summary.
+
+    CARs are cumulated once per event. The count, sum and sum of squares of CAR and
+    abnormal returns of every (combination, day) cell then come from one product per day
+    of the (combination x row) membership matrix with the (row x statistic) values, so an
+    extra group or subsample adds a column rather than a pass over the window; the
+    variances follow from these moments. Returns one row per combination and day with
+    data, with the columns of the *_summary frames: CAAR_logPct, sum_CAR-CAAR_sq, N,
+    VAR_CAAR, SD_CAAR, T_CSecT, AAR_logPct, sum_MAR-AAR_sq, VAR_AAR, SD_AAR, T_MAR_CSecT.
+    """
+    # Cumulative returns (groups are firm/event attributes, so CARs do not depend on the group)
+    ar = window[ret].to_numpy(dtype=float)
+    car = window.groupby(keys,sort=False)[ret].cumsum().to_numpy(dtype=float)
+    codes, days = pd.factorize(window[day],sort=True)
+
+    # Moments of every (combination, day) cell: membership (rows x combinations) times the statistics
+    # (rows x count, sum, sum of squares) of the rows of each day
+    masks, labels, subsample_labels = _combinations(window,keys,groups,subsamples,events)
+    stats = np.column_stack([np.ones(len(window)),
+                             ~np.isnan(car),np.nan_to_num(car),np.nan_to_num(car)**2,
+                             ~np.isnan(ar),np.nan_to_num(ar),np.nan_to_num(ar)**2])
+    order = np.argsort(codes,kind='stable')
+    bounds = np.searchsorted(codes[order],np.arange(len(days)+1))
+    moments = np.zeros((masks.shape[1],len(days),stats.shape[1])) # combination x day x stat
+    for d, (i, j) in enumerate(zip(bounds[:-1],bounds[1:])):
+        moments[:,d,:] = masks[order[i:j]].T.astype(float) @ stats[order[i:j]]
+    combination, cell = np.nonzero(moments[:,:,0]>0)
+    moments = pd.DataFrame(moments[combination,cell],columns=['rows','n_car','car','car_sq','n_ar','ar','ar_sq'])
+    moments[['n_car','n_ar']] = moments[['n_car','n_ar']].round().astype(np.int64)
+
+    summary = pd.DataFrame({day:days.to_numpy()[cell]})
+    summary = _label_columns(summary,combination,labels,subsample_labels,groups)
+    n_car = moments['n_car']
+    summary['CAAR_logPct'] = moments['car']/n_car
+    summary['sum_CAR-CAAR_sq'] = moments['car_sq'] - moments['car']**2/n_car
+    summary['N'] = n_car
+    summary['VAR_CAAR'] = summary['sum_CAR-CAAR_sq'] / (n_car-1)
+    summary['SD_CAAR'] = np.sqrt(summary['VAR_CAAR'])
+    summary['T_CSecT'] = (np.sqrt(n_car))*summary['CAAR_logPct']/summary['SD_CAAR']
+
+    n_ar = moments['n_ar']
+    summary['AAR_logPct'] = moments['ar']/n_ar
+    summary['sum_MAR-AAR_sq'] = moments['ar_sq'] - moments['ar']**2/n_ar
+    summary['N'] = n_ar
+    summary['VAR_AAR'] = summary['sum_MAR-AAR_sq'] / (n_ar-1)
+    summary['SD_AAR'] = np.sqrt(summary['VAR_AAR'])
+    summary['T_MAR_CSecT'] = (np.sqrt(n_ar))*summary['AAR_logPct']/summary['SD_AAR']
+
+    return summary
+
+
+''' Abnormal volume test '''
+# Volume measure -> abnormal volume column of the *_summary frames
+VOLUME_METRICS = {'Volume':'AbnVolume','Volume_pct':'AbnVol_pct','Volume_pctlog':'AbnVol_pctlog'}
+
+def volume_test(window, daily, keys, groups, est_window=(-140,-40), metrics=VOLUME_METRICS,
+                day='NEWDaysRelativeToEvent', est_day='BDaysRelativeToEvent', events=None, subsamples=None):
+    """
+    Abnormal volume and Campbell-Wasley (1996) t-stats for several groups of events at once.
+
+    Normal volume is the mean of each volume measure over the estimation window
+    [est_window[0], est_window[1]] (inclusive, in `est_day`) of the full daily frame
+    `daily`; abnormal volume is the measure minus its normal level. The t-stat of a day
+    in the event window `window` divides the mean abnormal volume of the group by the
+    time-series standard deviation of the group's daily mean abnormal volume over the
+    estimation window.
+
+    `groups` maps a group label to a spec understood by group_mask(); group columns that
+    `daily` does not carry are looked up per event in the event table `events`. With
+    `subsamples` (see subsample_bits), the event window statistics are given for every
+    subsample x group combination (with a 'subsample' column); the estimation window
+    variance is that of the group in the full daily frame, as when the window is filtered
+    before the test. In the estimation window, an event whose group is looked up in
+    `events` counts once per row of its event in the table that is in the group (see
+    group_counts), as in a daily frame merged with the event table. Normal volume is
+    computed once per event and merged once onto each window, and all (combination, day)
+    cells are then reduced in one grouped pass per window. Returns one row per combination
+    and day with the columns of the volume *_summary frames.
+    """
+    abn = list(metrics.values())
+
+    # Normal volume, once per event
+    est = daily[(daily[est_day]>=est_window[0])&(daily[est_day]<=est_window[1])]
+    normal = est.groupby(keys,as_index=False)[list(metrics)].mean()
+
+    def abnormal(df, d, subsamples=None, counts=False):
+        # Abnormal volume of every row in df, stacked over the combinations the row belongs to
+        # (with counts=True, over the groups, with the number of times the row enters each in 'weight')
+        values = pd.merge(df[keys],normal,on=keys,how='left')
+        values = df[list(metrics)].to_numpy(dtype=float) - values[list(metrics)].to_numpy(dtype=float)
+        if counts:
+            masks = np.column_stack([group_counts(df,groups[label],events,keys[0]) for label in groups]) if groups else np.zeros((len(df),0),dtype=np.int64)
+            labels = subsample_labels = None
+        else:
+            masks, labels, subsample_labels = _combinations(df,keys,groups,subsamples,events)
+        combination, rows = np.nonzero(masks.T)
+        stacked = pd.DataFrame(values[rows],columns=abn)
+        stacked.insert(0,d,df[d].to_numpy()[rows])
+        stacked.insert(0,'combination',combination)
+        if counts:
+            stacked['weight'] = masks[rows,combination]
+        return stacked, labels, subsample_labels
+
+    # Event plot: mean abnormal volume per combination and day
+    event, labels, subsample_labels = abnormal(window,day,subsamples)
+    summary = event.groupby(['combination',day],as_index=False)[abn].mean()
+    summary['N'] = event.groupby(['combination',day])[abn[0]].count().to_numpy()
+    summary = _label_columns(summary,summary.pop('combination').to_numpy(),labels,subsample_labels,groups)
+
+    # t-stat: variance of the group's daily cross-sectional mean over the estimation window
+    est, _, _ = abnormal(est,est_day,counts=True)
+    cells = [est['combination'],est[est_day]]
+    weight = est.pop('weight')
+    daily_mean = est[abn].mul(weight,axis=0).groupby(cells).sum() / est[abn].notna().mul(weight,axis=0).groupby(cells).sum()
+    var = daily_mean.groupby(level='combination').var(ddof=0)
+    var.columns = ['Var_'+c for c in abn]
+    var = var.reset_index()
+    var.insert(0,'group',pd.Categorical.from_codes(var.pop('combination'),categories=list(groups)))
+    summary = pd.merge(summary,var,on='group',how='left')
+
+    for c in abn:
+        summary['sd_'+c] = np.sqrt(summary['Var_'+c])
+    for c in abn:
+        summary['t_'+c] = summary[c]/summary['sd_'+c]
+
+    return summary
+
+
+''' Firm-level panel '''
+def _complete(valid, window, days=(-15,15)):
+    # Events with a row on every day of window
+    start, end = window[0]-days[0], window[1]-days[0]
+    return valid[:,start:end+1].all(axis=1)
+
+
+def panel_metrics(cube, daily, specs, kept=None, metrics=CUBE_METRICS, volume='Volume_pctlog',
+                  key='event_id', est_day='BDaysRelativeToEvent', days=(-15,15)):
+    """
+    Per-event panel measures of one sample, as a long (key, column, value) frame.
+
+    `cube` is the (events, cube, valid) triple of event_cube() for the sample and `daily`
+    its full daily frame (ds_dsf_*, for the volume estimation windows). `specs` maps an
+    output column to one of
+    - ('car', window) or ('car', window, complete): CAR over window (see window_car) of
+      the events with all days of `complete` (default: the window itself);
+    - ('abnvol', window, est_window): mean abnormal `volume` over window, normal volume
+      being its mean over est_window in `est_day`;
+    - ('abnvol', window, est_window, day): abnormal `volume` on relative day `day`;
+    - ('attribute', window, name): the event attribute `name` (e.g. EventDate);
+    the last three for the events with all days of window. `kept` (bool, one per event)
+    restricts every measure to a subset of the events, e.g. once outliers are removed.
+
+    An event gets a row for each measure it is complete for, even when the value itself
+    is missing, so that pivoting the rows gives the union of the events of all windows
+    (see event_panel).
+    """
+    events, values, valid = cube
+    kept = np.ones(len(events),dtype=bool) if kept is None else np.asarray(kept,dtype=bool)
+    parts = []
+
+    # All CAR windows with one prefix sum
+    car_specs = {c:s for c, s in specs.items() if s[0]=='car'}
+    if car_specs:
+        car, ok = window_car(car_prefix(values,valid),[s[1] for s in car_specs.values()],
+                             complete=[s[2] if len(s)>2 else s[1] for s in car_specs.values()],days=days)
+        for i, c in enumerate(car_specs):
+            parts.append((c,car[:,i],ok[:,i]&kept))
+
+    # Normal volume, once per estimation window
+    normal = {}
+    for s in specs.values():
+        if s[0]=='abnvol' and s[2] not in normal:
+            est = daily[(daily[est_day]>=s[2][0])&(daily[est_day]<=s[2][1])]
+            normal[s[2]] = est.groupby(key)[volume].mean().reindex(events[key]).to_numpy(dtype=float)
+    vol = values[:,:,metrics.index(volume)]
+
+    for c, s in specs.items():
+        if s[0]=='car':
+            continue
+        ok = _complete(valid,s[1],days) & kept
+        if s[0]=='attribute':
+            measure = events[s[2]].to_numpy()
+        elif len(s)>3:
+            measure = vol[:,s[3]-days[0]] - normal[s[2]]
+        else:
+            window = vol[:,s[1][0]-days[0]:s[1][1]-days[0]+1]
+            with np.errstate(invalid='ignore'):
+                measure = np.nansum(window,axis=1)/(~np.isnan(window)).sum(axis=1) - normal[s[2]]
+        parts.append((c,measure,ok))
+
+    return pd.concat([pd.DataFrame({key:events[key].to_numpy()[ok],'column':c,'value':measure[ok]})
+                      for c, measure, ok in parts],ignore_index=True)
+
+
+def event_panel(metrics, events, keys, columns, key='event_id'):
+    """
+    Wide panel from the long frames of panel_metrics(), with one pivot.
+
+    One row per value of the identifiers `keys` (looked up by `key` in `events`) with at
+    least one measure, and one column per measure (in the order of `columns`); this is the
+    outer merge of the per-window frames on `keys`. The events of several samples with the
+    same identifiers (e.g. a firm in the CDP releases of several years) share a row.
+    """
+    long = pd.merge(pd.concat(metrics,ignore_index=True),events[[key]+keys].drop_duplicates(subset=[key]),on=key)
+    panel = long.pivot(index=keys,columns='column',values='value').reindex(columns=columns).infer_objects()
+    panel.columns.name = None
+    return panel.reset_index().sort_values(keys).reset_index(drop=True)
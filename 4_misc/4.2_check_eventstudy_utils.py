@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Self-check of the vectorized helpers in 1_combine_data/eventstudy_utils.py.
+
+On a small random sample, the event-window cube, the window CARs, the CAAR/AAR and
+abnormal volume tests and the event registry are compared with the direct per-window
+pandas computations they replace (groupby cumsum / mean / var on the filtered window).
+Run with: python 4_misc/4.2_check_eventstudy_utils.py
+
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),'..','1_combine_data'))
+from eventstudy_utils import (event_registry, event_days, event_cube, day_bits, has_days, car_prefix, window_car,
+                              car_test, volume_test, split_groups)
+
+rng = np.random.default_rng(0)
+
+
+''' Random sample: 40 events, daily rows over [-150,15] with about 10% of the days missing '''
+n_events = 40
+events = pd.DataFrame({'event_id':np.arange(n_events,dtype=np.int32),'failed':np.arange(n_events)%2})
+daily = pd.DataFrame({'event_id':np.repeat(events['event_id'],166),
+                      'BDaysRelativeToEvent':np.tile(np.arange(-150,16),n_events)})
+daily = daily[rng.random(len(daily))>0.1].reset_index(drop=True)
+daily['MarketDate'] = pd.Timestamp('2021-10-11') + pd.to_timedelta(daily['BDaysRelativeToEvent'],unit='D')
+for c in ['adjRet_MarketModel_logPct','MAReturn_logPct']:
+    daily[c] = rng.normal(0,2,len(daily))
+daily['Volume'] = rng.integers(1,200000,len(daily)).astype(float)
+daily['Volume_pct'] = daily['Volume']/1e6*100
+daily['Volume_pctlog'] = np.log(daily['Volume_pct']+0.000255)
+
+# Event window [-15,15]: days relative to the event counted on the rows with data
+sub = event_days(daily[daily['BDaysRelativeToEvent']>=-15])
+sub = sub[(sub['NEWDaysRelativeToEvent']>=-15)&(sub['NEWDaysRelativeToEvent']<=15)]
+cube_events, cube, valid = event_cube(sub,['event_id'],[])
+sub['DayBits'] = day_bits(sub,['event_id'],valid)
+
+
+''' Event-window cube '''
+direct = sub.pivot(index='event_id',columns='NEWDaysRelativeToEvent',values='adjRet_MarketModel_logPct').reindex(columns=range(-15,16))
+assert np.array_equal(valid,direct.notna().to_numpy())
+assert np.allclose(cube[:,:,0],direct.to_numpy(),equal_nan=True)
+
+
+''' Window completeness and CARs, window (-1,3) '''
+window = sub[(sub['NEWDaysRelativeToEvent']>=-1)&(sub['NEWDaysRelativeToEvent']<=3)]
+n_days = window.groupby('event_id')['NEWDaysRelativeToEvent'].count()
+complete = n_days[n_days==5].index
+assert set(window.loc[has_days(window['DayBits'],-1,3),'event_id']) == set(complete)
+
+car, ok = window_car(car_prefix(cube,valid),[(-1,3)])
+direct = window[window['event_id'].isin(complete)].groupby('event_id')['adjRet_MarketModel_logPct'].sum()
+assert set(cube_events.loc[ok[:,0],'event_id']) == set(complete)
+assert np.allclose(car[ok[:,0],0],direct.reindex(cube_events.loc[ok[:,0],'event_id']).to_numpy())
+
+
+''' CAAR/AAR, window (-1,3), groups on an event attribute '''
+window = window[window['event_id'].isin(complete)]
+groups = {'all':None,'failed':('failed',1)}
+summaries = split_groups(car_test(window,['event_id'],groups,events=events))
+for label, spec in groups.items():
+    w = window if spec is None else window[window['event_id'].isin(events.loc[events['failed']==1,'event_id'])]
+    w = w.assign(CAR=w.groupby('event_id')['adjRet_MarketModel_logPct'].cumsum())
+    direct = w.groupby('NEWDaysRelativeToEvent').agg(CAAR_logPct=('CAR','mean'),SD_CAAR=('CAR','std'),N=('CAR','count'),
+                                                     AAR_logPct=('adjRet_MarketModel_logPct','mean'),
+                                                     SD_AAR=('adjRet_MarketModel_logPct','std'))
+    direct['T_CSecT'] = np.sqrt(direct['N'])*direct['CAAR_logPct']/direct['SD_CAAR']
+    direct['T_MAR_CSecT'] = np.sqrt(direct['N'])*direct['AAR_logPct']/direct['SD_AAR']
+    summary = summaries[label].set_index('NEWDaysRelativeToEvent')
+    for c in direct.columns:
+        assert np.allclose(summary[c].to_numpy(dtype=float),direct[c].to_numpy(dtype=float)), (label,c)
+
+
+''' Abnormal volume, window (-1,3), estimation window {-140,-40} '''
+summaries = split_groups(volume_test(window,daily,['event_id'],groups,est_window=(-140,-40),events=events))
+est = daily[(daily['BDaysRelativeToEvent']>=-140)&(daily['BDaysRelativeToEvent']<=-40)]
+normal = est.groupby('event_id')['Volume_pctlog'].mean()
+for label, spec in groups.items():
+    keep = events['event_id'] if spec is None else events.loc[events['failed']==1,'event_id']
+    w = window[window['event_id'].isin(keep)]
+    w = w.assign(AbnVol_pctlog=w['Volume_pctlog']-normal.reindex(w['event_id']).to_numpy())
+    e = est[est['event_id'].isin(keep)]
+    e = e.assign(AbnVol_pctlog=e['Volume_pctlog']-normal.reindex(e['event_id']).to_numpy())
+    sd = np.sqrt(e.groupby('BDaysRelativeToEvent')['AbnVol_pctlog'].mean().var(ddof=0))
+    direct = w.groupby('NEWDaysRelativeToEvent')['AbnVol_pctlog'].mean()
+    summary = summaries[label].set_index('NEWDaysRelativeToEvent')
+    assert np.allclose(summary['AbnVol_pctlog'].to_numpy(),direct.to_numpy())
+    assert np.allclose(summary['t_AbnVol_pctlog'].to_numpy(),direct.to_numpy()/sd)
+
+
+''' Abnormal volume with several event-table rows per event (e.g. a CDP firm with two ids) '''
+# The window takes the last row's group; the estimation window counts the event once per row in the group
+# (a second row in the other group for every 5th event, in the same group for every 3rd)
+multi = pd.concat([events,events[events['event_id']%5==0].assign(failed=lambda d: 1-d['failed']),
+                   events[events['event_id']%3==0]],ignore_index=True)
+summary = split_groups(volume_test(window,daily,['event_id'],{'failed':('failed',1)},est_window=(-140,-40),events=multi))['failed']
+last = multi.drop_duplicates(subset=['event_id'],keep='last')
+w = window[window['event_id'].isin(last.loc[last['failed']==1,'event_id'])]
+direct = (w['Volume_pctlog']-normal.reindex(w['event_id']).to_numpy()).groupby(w['NEWDaysRelativeToEvent']).mean()
+e = pd.merge(est,multi[multi['failed']==1][['event_id']],on='event_id')
+e = e.assign(AbnVol_pctlog=e['Volume_pctlog']-normal.reindex(e['event_id']).to_numpy())
+sd = np.sqrt(e.groupby('BDaysRelativeToEvent')['AbnVol_pctlog'].mean().var(ddof=0))
+assert np.allclose(summary['AbnVol_pctlog'].to_numpy(),direct.to_numpy())
+assert np.allclose(summary['t_AbnVol_pctlog'].to_numpy(),direct.to_numpy()/sd)
+
+
+''' Event registry '''
+firms = pd.DataFrame({'ISIN':['A','B','C'],'id':[1.,2.,3.]})
+sources = {'CDPrelease19':firms.assign(EventDate=pd.Timestamp('2019-10-31')),
+           'CDPrelease':firms.assign(EventDate=pd.Timestamp('2021-10-11'))}
+registry = event_registry(sources)
+assert registry['event_id'].is_unique
+# A new release keeps the ids of the registered events and numbers the new ones after them
+sources['CDPrelease22'] = firms.assign(EventDate=pd.Timestamp('2022-10-10'))
+extended = event_registry(sources,previous=registry)
+assert extended.loc[extended['sample']!='CDPrelease22','event_id'].tolist() == registry['event_id'].tolist()
+assert extended.loc[extended['sample']=='CDPrelease22','event_id'].min() > registry['event_id'].max()
+
+print("eventstudy_utils: all checks passed")